@@ -7,6 +7,7 @@
 
 ##### Local app #####
 from .testBridge import *
+from .testHistoryCursor import *
 from .testModelClassScanner import *
 
 ##### Theory app #####
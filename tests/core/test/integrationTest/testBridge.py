@@ -115,3 +115,19 @@ class TestBridgeTestCase(TestCase):
     firstCmd.paramForm = firstCmd.ParamForm()
     firstCmd.run()
     self.bridge.bridgeToSelf(firstCmd)
+
+  def testExecutePipeline(self):
+    firstCmdModel = self._getMockCommandObject(
+        self.simpleChain1CommandModel,
+        "SimpleChain1"
+        )
+    secondCmdModel = self._getMockCommandObject(
+        self.simpleChain2CommandModel,
+        "SimpleChain2"
+        )
+    (cmdLst, isSuccess) = self.bridge.executePipeline(
+        [(firstCmdModel, [], {}), (secondCmdModel, [], {})]
+        )
+    self.assertTrue(isSuccess)
+    self.assertEqual(len(cmdLst), 2)
+    self.assertEqual(cmdLst[-1]._stdOut, "simpleChain1 received")
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+from datetime import datetime, timedelta
+from importlib import import_module
+
+##### Theory lib #####
+from theory.apps import apps
+from theory.apps.model import History, Mood
+from theory.core.history import HistoryCursor
+from theory.db import connection
+from theory.test.testcases import TestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('HistoryCursorTestCase',)
+
+class HistoryCursorTestCase(TestCase):
+  def setUp(self):
+    Mood.objects.getOrCreate(name="norm")
+    now = datetime.utcnow()
+    for i in range(10):
+      History.objects.create(
+          commandName="cmd%d" % i,
+          jsonData="{}",
+          touched=now - timedelta(seconds=i),
+          )
+
+  def testWalkThroughPages(self):
+    cursor = HistoryCursor(pageSize=3, maxPageNum=2)
+    self.assertEqual(len(cursor), 10)
+    with self.assertNumQueries(4):
+      nameLst = [cursor.get(i).commandName for i in range(10)]
+    self.assertEqual(nameLst, ["cmd%d" % i for i in range(10)])
+    self.assertEqual(len(cursor._pageDict), 2)
+    self.assertIsNone(cursor.get(10))
+
+    # Walking back is served by keyset from the cached pages
+    with self.assertNumQueries(2):
+      nameLst = [cursor.get(i).commandName for i in range(9, -1, -1)]
+    self.assertEqual(nameLst, ["cmd%d" % i for i in range(9, -1, -1)])
+
+  def testRecordUpsert(self):
+    cursor = HistoryCursor(pageSize=3)
+    self.assertEqual(len(cursor), 10)
+    cursor.record("cmd5", "{}", "norm")
+    self.assertEqual(len(cursor), 10)
+    self.assertEqual(cursor.get(0).commandName, "cmd5")
+    self.assertEqual(History.objects.get(commandName="cmd5").repeated, 2)
+
+    cursor.record("cmd5", '{"a": 1}', "norm")
+    self.assertEqual(len(cursor), 11)
+    history = History.objects.get(commandName="cmd5", jsonData='{"a": 1}')
+    self.assertEqual(history.repeated, 1)
+    self.assertEqual(
+        history.hashKey,
+        History.makeHashKey("cmd5", '{"a": 1}')
+        )
+    self.assertEqual(history.moodSet.get().name, "norm")
+
+  def testBulkCreateHashKey(self):
+    History.objects.bulkCreate([
+      History(commandName="bulkCmd%d" % i, jsonData="{}") for i in range(3)
+    ])
+    history = History.objects.get(commandName="bulkCmd1")
+    self.assertEqual(history.hashKey, History.makeHashKey("bulkCmd1", "{}"))
+
+  def testBackfillHashKey(self):
+    migration = import_module("theory.apps.migrations.0002HistoryHashKey")
+    History.objects.filter(commandName="cmd1").update(repeated=2)
+    History.objects.all().update(hashKey=None)
+    # The raw saved duplicate is merged into the latest entry
+    History(
+        commandName="cmd1",
+        jsonData="{}",
+        touched=datetime.utcnow() - timedelta(days=1),
+        ).saveBase(raw=True)
+    with connection.schemaEditor() as schemaEditor:
+      migration.backfillHashKey(apps, schemaEditor)
+    self.assertEqual(History.objects.count(), 10)
+    self.assertFalse(History.objects.filter(hashKey=None).exists())
+    history = History.objects.get(commandName="cmd1")
+    self.assertEqual(history.hashKey, History.makeHashKey("cmd1", "{}"))
+    self.assertEqual(history.repeated, 3)
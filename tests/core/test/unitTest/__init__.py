@@ -8,6 +8,14 @@
 ##### Local app #####
 from .testTxtCmdParser import *
 from .testBridge import *
+from .testProfiler import *
+from .testStream import *
+from .testAsyncBackend import *
+from .testFanOut import *
+from .testHotReloader import *
+from .testModelScanManager import *
+from .testModelCatalog import *
+from .testStorage import *
 
 ##### Theory app #####
 
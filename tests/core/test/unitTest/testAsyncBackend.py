@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+import json
+import threading
+import time
+
+##### Theory lib #####
+from theory.apps.model import AdapterBuffer
+from theory.core.asyncBackend import AsyncJob, LocalBackend, runJob
+from theory.test.testcases import SimpleTestCase, TestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+from tests.testBase.command import *
+
+__all__ = ('LocalBackendTestCase', 'RunJobTestCase',)
+
+class SampleCmd(object):
+  name = "sampleCmd"
+
+class LocalBackendTestCase(SimpleTestCase):
+  def setUp(self):
+    self.releaseEvent = threading.Event()
+    self.startedLst = []
+    self.backend = LocalBackend(maxWorkers=1, isProcess=False, jobFxn=self._run)
+
+  def tearDown(self):
+    self.releaseEvent.set()
+    self.backend.shutdown()
+
+  def _run(self, classImportPath, cmdModelId, paramFormData):
+    self.startedLst.append(paramFormData["idx"])
+    self.releaseEvent.wait(5)
+    if(paramFormData.get("isFailed")):
+      raise ValueError("failed")
+    return paramFormData["idx"]
+
+  def _waitFinishedLst(self, num):
+    jobLst = []
+    for i in range(500):
+      jobLst.extend(self.backend.popFinishedLst())
+      if(len(jobLst)>=num):
+        break
+      time.sleep(0.01)
+    return jobLst
+
+  def testMaxWorkers(self):
+    jobLst = [
+        self.backend.submit(SampleCmd(), None, {"idx": i}) for i in range(3)
+        ]
+    self._waitFinishedLst(0)
+    self.assertEqual(self.backend.runningNum, 1)
+    self.assertEqual(self.backend.pendingNum, 2)
+    self.assertEqual(jobLst[0].args, (__name__ + ".SampleCmd", None, {"idx": 0}))
+
+    self.releaseEvent.set()
+    finishedLst = self._waitFinishedLst(3)
+    self.assertEqual(sorted(i.result for i in finishedLst), [0, 1, 2])
+    self.assertTrue(all(i.status==AsyncJob.STATUS_SUCCESS for i in jobLst))
+    self.assertEqual(self.startedLst, [0, 1, 2])
+
+  def testCancel(self):
+    runningJob = self.backend.submit(SampleCmd(), None, {"idx": 0})
+    pendingJob = self.backend.submit(SampleCmd(), None, {"idx": 1})
+    self.assertFalse(self.backend.cancel(runningJob))
+    self.assertTrue(self.backend.cancel(pendingJob))
+    self.assertEqual(pendingJob.status, AsyncJob.STATUS_CANCELLED)
+
+    self.releaseEvent.set()
+    finishedLst = self._waitFinishedLst(2)
+    self.assertEqual(finishedLst, [pendingJob, runningJob])
+    self.assertEqual(self.startedLst, [0])
+
+  def testFailure(self):
+    self.releaseEvent.set()
+    job = self.backend.submit(SampleCmd(), None, {"idx": 0, "isFailed": True})
+    self.assertEqual(self._waitFinishedLst(1), [job])
+    self.assertEqual(job.status, AsyncJob.STATUS_FAILURE)
+    self.assertIn("ValueError: failed", job.result)
+    self.assertTrue(job.isDone)
+
+class RunJobTestCase(TestCase):
+  fixtures = ["adapter",]
+
+  def testBridgeToNextCmd(self):
+    firstCmdModel = AsyncChain1.getCmdModel()
+    secondCmdModel = AsyncChain2.getCmdModel()
+    firstCmdModel.nextAvblCmd.add(secondCmdModel)
+
+    self.assertEqual(
+        runJob(firstCmdModel.classImportPath, firstCmdModel.id, {}),
+        ["asyncChain2"]
+        )
+    adapterBufferModel = AdapterBuffer.objects.get()
+    self.assertEqual(adapterBufferModel.toCmd, secondCmdModel)
+    self.assertEqual(
+        json.loads(adapterBufferModel.data),
+        {"stdIn": "asyncChain1"}
+        )
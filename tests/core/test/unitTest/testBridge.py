@@ -117,3 +117,48 @@ class BridgeTestCase(TestCase):
     firstCmd.paramForm = firstCmd.ParamForm()
     self.bridge._executeCommand(firstCmd, cmdModel)
     self.assertTrue(firstCmd.paramForm.isValid())
+
+  def testStreamPipeline(self):
+    firstCmdModel = StreamChain1.getCmdModel()
+    secondCmdModel = StreamChain2.getCmdModel()
+    (cmdLst, isSuccess) = self.bridge.executePipeline([
+      (firstCmdModel, [], {}),
+      (secondCmdModel, [], {}),
+      ])
+    self.assertTrue(isSuccess)
+    (firstCmd, secondCmd) = cmdLst
+    self.assertEqual(firstCmd._streamedGongs, ["FilenameList",])
+    self.assertFalse(isinstance(firstCmd.filenameLst, list))
+    self.assertEqual(
+        secondCmd.consumedLst,
+        ["file%d" % i for i in range(StreamChain1.itemNum)]
+        )
+    self.assertEqual(
+        [i["consumedNum"] for i in self.bridge.streamStats()],
+        [StreamChain1.itemNum,]
+        )
+
+  def testStreamNeedsStreamingConsumer(self):
+    firstCmdModel = StreamChain1.getCmdModel()
+    secondCmdModel = StreamChain2.getCmdModel()
+    streamNotationLst = StreamChain2._streamNotations
+    StreamChain2._streamNotations = []
+    try:
+      (cmdLst, isSuccess) = self.bridge.executePipeline([
+        (firstCmdModel, [], {}),
+        (secondCmdModel, [], {}),
+        ])
+    finally:
+      StreamChain2._streamNotations = streamNotationLst
+    self.assertTrue(isSuccess)
+    self.assertEqual(cmdLst[0]._streamedGongs, [])
+    self.assertEqual(
+        cmdLst[0].filenameLst,
+        ["file%d" % i for i in range(StreamChain1.itemNum)]
+        )
+    self.assertEqual(self.bridge.streamStats(), [])
+
+    # A command run on its own materializes its gongs
+    cmd = self.bridge.getCmdComplex(firstCmdModel, [], {})
+    self.bridge._executeCommand(cmd, firstCmdModel)
+    self.assertIsInstance(cmd.filenameLst, list)
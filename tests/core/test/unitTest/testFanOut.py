@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+
+##### Theory lib #####
+from theory.core.bridge import Bridge
+from theory.core.exceptions import (
+    CommandSyntaxError,
+    NON_FIELD_ERRORS,
+    ValidationError,
+    )
+from theory.core.fanOut import FanOutResult
+from theory.test.testcases import TestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+from tests.testBase.command import *
+
+__all__ = ('FanOutTestCase',)
+
+class FanOutTestCase(TestCase):
+  def setUp(self):
+    self.bridge = Bridge()
+    self.cmdModel = SimpleChain2.getCmdModel()
+    self.inputLst = [{"stdIn": "a"}, {"stdIn": ""}, {"stdIn": "c"}]
+
+  def _executeMany(self, **kwargs):
+    itemLst = []
+    result = self.bridge.executeMany(
+        self.cmdModel,
+        iter(self.inputLst),
+        itemFxn=itemLst.append,
+        **kwargs
+        )
+    self.assertEqual([i.idx for i in itemLst], [0, 1, 2])
+    return result
+
+  def _assertResult(self, result):
+    self.assertIsInstance(result, FanOutResult)
+    self.assertEqual(len(result), 3)
+    self.assertEqual(result._stdOut, ["a received", "c received"])
+    self.assertEqual([i.idx for i in result.errorLst], [1])
+    self.assertIn("stdIn", result.errorLst[0].error)
+    self.assertEqual(result.name, "simpleChain2")
+
+  def testExecuteMany(self):
+    self._assertResult(self._executeMany(chunkSize=2))
+
+  def testExecuteManyConcurrently(self):
+    self._assertResult(self._executeMany(chunkSize=1, concurrency=2))
+
+  def testTemplateReuse(self):
+    result = self._executeMany(chunkSize=3)
+    formLst = [i.cmd.paramForm for i in result.successLst]
+    self.assertEqual(
+        [i.clean()["stdIn"] for i in formLst],
+        ["a", "c"]
+        )
+    # Each run reads its own input from the fields
+    self.assertIsNot(formLst[0].fields, formLst[1].fields)
+    self.assertIsNot(formLst[1].fields, result.paramForm.fields)
+    self.assertEqual(
+        [i.fields["stdIn"].finalData for i in formLst],
+        ["a", "c"]
+        )
+    self.assertEqual(result.paramForm.fields["stdIn"].finalData, "a")
+
+  def testFormCleanPerInput(self):
+    def clean(form):
+      if(form.cleanedData.get("stdIn")=="b"):
+        raise ValidationError("b is not allowed")
+      return form.cleanedData
+
+    formKlass = SimpleChain2.ParamForm
+    formKlass.clean = clean
+    self.inputLst = [{"stdIn": "a"}, {"stdIn": "b"}, {"stdIn": "c"}]
+    try:
+      result = self._executeMany(chunkSize=3)
+    finally:
+      del formKlass.clean
+    # The inputs after the first one go through the same form cleaning
+    self.assertEqual(result._stdOut, ["a received", "c received"])
+    self.assertEqual([i.idx for i in result.errorLst], [1])
+    self.assertIn(NON_FIELD_ERRORS, result.errorLst[0].error)
+
+  def testFieldCleanPerInput(self):
+    def cleanStdIn(form):
+      return form.cleanedData["stdIn"].upper()
+
+    formKlass = SimpleChain2.ParamForm
+    formKlass.clean_stdIn = cleanStdIn
+    try:
+      result = self._executeMany(chunkSize=3)
+    finally:
+      del formKlass.clean_stdIn
+    self.assertEqual(result._stdOut, ["A received", "C received"])
+
+  def testOutputAttr(self):
+    result = self._executeMany(chunkSize=3)
+    self.assertEqual(result.stdOut, ["a received", "c received"])
+    # Neither a method nor an unknown name is aggregated
+    self.assertFalse(hasattr(result, "serializableProperty"))
+    self.assertRaises(AttributeError, getattr, result, "run")
+
+  def testNoInput(self):
+    result = self.bridge.executeMany(self.cmdModel, [])
+    self.assertEqual(len(result), 0)
+    self.assertEqual(result._stdOut, [])
+    self.assertEqual(result.name, "simpleChain2")
+
+  def testGetFanOutInput(self):
+    (inputIter, sharedKwargs) = self.bridge._getFanOutInput(
+        {"stdIn": ["a", "b"], "customField": "x"}
+        )
+    self.assertEqual(list(inputIter), [{"stdIn": "a"}, {"stdIn": "b"}])
+    self.assertEqual(sharedKwargs, {"customField": "x"})
+    self.assertRaises(
+        CommandSyntaxError,
+        self.bridge._getFanOutInput,
+        {"stdIn": "a"}
+        )
+
+  def testGetNamedFanOutInput(self):
+    storage = {"stdIn": ["a", "b"], "customField": ["x"]}
+    self.assertRaises(
+        CommandSyntaxError,
+        self.bridge._getFanOutInput,
+        storage
+        )
+    (inputIter, sharedKwargs) = self.bridge._getFanOutInput(storage, "stdIn")
+    self.assertEqual(list(inputIter), [{"stdIn": "a"}, {"stdIn": "b"}])
+    self.assertEqual(sharedKwargs, {"customField": ["x"]})
+    self.assertRaises(
+        CommandSyntaxError,
+        self.bridge._getFanOutInput,
+        storage,
+        "filenameLst"
+        )
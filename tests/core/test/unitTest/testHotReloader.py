@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+import os
+import shutil
+import sys
+import tempfile
+
+##### Theory lib #####
+from theory.apps import apps
+from theory.apps.model import (
+    Adapter,
+    AdapterBuffer,
+    AppModel,
+    Command,
+    Mood,
+    )
+from theory.core.loader.hotReloader import HotReloader
+from theory.test.testcases import SimpleTestCase, TestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('HotReloaderTestCase', 'HotReloaderReloadFileTestCase',)
+
+class HotReloaderTestCase(SimpleTestCase):
+  def setUp(self):
+    self.appPath = tempfile.mkdtemp()
+    self.cmdPath = os.path.join(self.appPath, "command")
+    os.mkdir(self.cmdPath)
+    self._touch(os.path.join(self.cmdPath, "__init__.py"))
+    self._touch(os.path.join(self.cmdPath, "sampleCmd.py"))
+    self._touch(os.path.join(self.appPath, "model.py"))
+
+    self.reloader = HotReloader([], interval=0)
+    self.reloader._watchLst = [
+        ("sampleApp", "command", self.cmdPath, True),
+        ("sampleApp", "model", self.appPath, False),
+    ]
+    self.reloader._mtimeDict = self.reloader._snapshot()
+
+  def tearDown(self):
+    shutil.rmtree(self.appPath)
+
+  def _touch(self, path, mtime=None):
+    with open(path, "a"):
+      pass
+    if(mtime is not None):
+      os.utime(path, (mtime, mtime))
+
+  def testNoChange(self):
+    self.assertEqual(self.reloader.findChangeLst(), [])
+
+  def testFindChangeLst(self):
+    cmdFilePath = os.path.join(self.cmdPath, "sampleCmd.py")
+    newCmdFilePath = os.path.join(self.cmdPath, "newCmd.py")
+    modelFilePath = os.path.join(self.appPath, "model.py")
+    self._touch(cmdFilePath, os.stat(cmdFilePath).st_mtime + 10)
+    self._touch(newCmdFilePath)
+    self._touch(modelFilePath, os.stat(modelFilePath).st_mtime + 10)
+    os.remove(os.path.join(self.cmdPath, "__init__.py"))
+
+    changeLst = self.reloader.findChangeLst()
+    # The models come first
+    self.assertEqual(
+        changeLst[0],
+        ("sampleApp", "model", "__init__", modelFilePath, False)
+        )
+    self.assertEqual(
+        sorted(changeLst[1:]),
+        [
+          (
+            "sampleApp",
+            "command",
+            "__init__",
+            os.path.join(self.cmdPath, "__init__.py"),
+            True
+          ),
+          ("sampleApp", "command", "newCmd", newCmdFilePath, False),
+          ("sampleApp", "command", "sampleCmd", cmdFilePath, False),
+        ]
+        )
+    # Each change is only reported once
+    self.assertEqual(self.reloader.findChangeLst(), [])
+
+  def testGetModuleName(self):
+    self.assertEqual(
+        self.reloader.getModuleName("sampleApp", "command", "sampleCmd"),
+        "sampleApp.command.sampleCmd"
+        )
+    self.assertEqual(
+        self.reloader.getModuleName("sampleApp", "model", "__init__"),
+        "sampleApp.model"
+        )
+
+class HotReloaderReloadFileTestCase(TestCase):
+  appName = "hotReloadApp"
+  cmdSrc = (
+      "from theory.apps.command.baseCommand import SimpleCommand\n"
+      "class HotCmd(SimpleCommand):\n"
+      "  name = 'hotCmd'\n"
+      "  verboseName = 'hotCmd'\n"
+      "  def run(self):\n"
+      "    pass\n"
+      )
+  adapterSrc = (
+      "from theory.apps.adapter import BaseAdapter\n"
+      "class HotAdapter(BaseAdapter):\n"
+      "  def _getValue(self):\n"
+      "    return None\n"
+      "  def _setValue(self, value):\n"
+      "    pass\n"
+      "%s"
+      )
+  modelSrc = (
+      "from theory.db import model\n"
+      "class HotModel(model.Model):\n"
+      "  name = model.CharField(maxLength=32)\n"
+      )
+
+  def setUp(self):
+    self.oldDontWriteBytecode = sys.dont_write_bytecode
+    # Keep the rewritten files from being shadowed by a stale .pyc
+    sys.dont_write_bytecode = True
+    self.rootPath = tempfile.mkdtemp()
+    self.appPath = os.path.join(self.rootPath, self.appName)
+    for dirName in ("", "command", "adapter"):
+      os.mkdir(os.path.join(self.appPath, dirName))
+      self._write(os.path.join(self.appPath, dirName, "__init__.py"), "")
+    self.cmdFilePath = os.path.join(self.appPath, "command", "hotCmd.py")
+    self._write(self.cmdFilePath, self.cmdSrc)
+    self.adapterFilePath = os.path.join(self.appPath, "adapter", "hotAdapter.py")
+    self._write(
+        self.adapterFilePath,
+        self.adapterSrc % "  value = property(_getValue, _setValue)\n"
+        )
+    self.modelFilePath = os.path.join(self.appPath, "model.py")
+    self._write(self.modelFilePath, self.modelSrc)
+    sys.path.insert(0, self.rootPath)
+
+    self.refreshLst = []
+    self.reloader = HotReloader([], refreshFxn=self.refreshLst.append)
+
+  def tearDown(self):
+    sys.path.remove(self.rootPath)
+    for moduleName in list(sys.modules):
+      if(moduleName.split(".")[0]==self.appName):
+        del sys.modules[moduleName]
+    apps.allModels.pop(self.appName, None)
+    apps.clearCache()
+    shutil.rmtree(self.rootPath)
+    sys.dont_write_bytecode = self.oldDontWriteBytecode
+
+  def _write(self, path, src):
+    with open(path, "w") as fd:
+      fd.write(src)
+
+  def _reloadFile(self, dirName, fileName, filePath, isDeleted=False):
+    return self.reloader.reloadFile(
+        self.appName,
+        dirName,
+        fileName,
+        filePath,
+        isDeleted
+        )
+
+  def testReloadCommand(self):
+    cmd = Command.objects.create(
+        name="hotCmd",
+        app=self.appName,
+        sourceFile=self.cmdFilePath
+        )
+    cmd.moodSet.add(Mood.objects.create(name="hotMood"))
+
+    otherCmd = Command.objects.create(
+        name="otherCmd",
+        app=self.appName,
+        sourceFile=self.cmdFilePath
+        )
+    adapterBuffer = AdapterBuffer.objects.create(
+        fromCmd=cmd,
+        toCmd=otherCmd,
+        adapter=Adapter.objects.create(name="Hot", importPath="hot.Hot"),
+        )
+
+    self.assertTrue(self._reloadFile("command", "hotCmd", self.cmdFilePath))
+    self.assertEqual(self.refreshLst, ["hotReloadApp.command.hotCmd"])
+    # The command is updated in place
+    self.assertEqual(
+        Command.objects.get(app=self.appName, name="hotCmd").id,
+        cmd.id
+        )
+    self.assertEqual(AdapterBuffer.objects.get().fromCmd.id, cmd.id)
+    # The moods set by the user are kept
+    self.assertEqual([i.name for i in cmd.moodSet.all()], ["hotMood"])
+    self.assertTrue(cmd.parameterSet.exists())
+
+    os.remove(self.cmdFilePath)
+    self.assertTrue(
+        self._reloadFile("command", "hotCmd", self.cmdFilePath, True)
+        )
+    self.assertFalse(
+        Command.objects.filter(app=self.appName, name="hotCmd").exists()
+        )
+    self.assertNotIn("hotReloadApp.command.hotCmd", sys.modules)
+
+  def testReloadAdapter(self):
+    importPath = "hotReloadApp.adapter.hotAdapter.HotAdapter"
+    self.assertTrue(
+        self._reloadFile("adapter", "hotAdapter", self.adapterFilePath)
+        )
+    adapter = Adapter.objects.get(importPath=importPath)
+    self.assertEqual(adapter.propertyLst, ["value"])
+    cmd = Command.objects.create(name="hotCmd", app=self.appName)
+    AdapterBuffer.objects.create(fromCmd=cmd, toCmd=cmd, adapter=adapter)
+
+    self._write(
+        self.adapterFilePath,
+        self.adapterSrc % "  newValue = property(_getValue, _setValue)\n"
+        )
+    self.assertTrue(
+        self._reloadFile("adapter", "hotAdapter", self.adapterFilePath)
+        )
+    newAdapter = Adapter.objects.get(importPath=importPath)
+    self.assertEqual(newAdapter.propertyLst, ["newValue"])
+    # The adapter is updated in place
+    self.assertEqual(newAdapter.id, adapter.id)
+    self.assertEqual(AdapterBuffer.objects.get().adapter.id, adapter.id)
+
+    os.remove(self.adapterFilePath)
+    self.assertTrue(
+        self._reloadFile("adapter", "hotAdapter", self.adapterFilePath, True)
+        )
+    self.assertFalse(Adapter.objects.filter(importPath=importPath).exists())
+
+  def testReloadModel(self):
+    self.assertTrue(self._reloadFile("model", "__init__", self.modelFilePath))
+    oldModel = apps.allModels[self.appName]["hotmodel"]
+    self.assertEqual(
+        list(AppModel.objects.filter(app=self.appName).valuesList(
+          "name",
+          flat=True
+          )),
+        ["HotModel"]
+        )
+
+    # The module is reloaded into a new model class
+    self.assertTrue(self._reloadFile("model", "__init__", self.modelFilePath))
+    self.assertIsNot(apps.allModels[self.appName]["hotmodel"], oldModel)
+    self.assertEqual(self.refreshLst, ["hotReloadApp.model"] * 2)
+
+  def testRestoreModelAfterFailedReload(self):
+    self.assertTrue(self._reloadFile("model", "__init__", self.modelFilePath))
+    oldModel = apps.allModels[self.appName]["hotmodel"]
+
+    self._write(self.modelFilePath, self.modelSrc + "raise ValueError\n")
+    self.assertFalse(self._reloadFile("model", "__init__", self.modelFilePath))
+    # The previous model and its records are kept
+    self.assertIs(apps.allModels[self.appName]["hotmodel"], oldModel)
+    self.assertTrue(
+        AppModel.objects.filter(app=self.appName, name="HotModel").exists()
+        )
+    self.assertEqual(self.refreshLst, ["hotReloadApp.model"])
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+
+##### Theory lib #####
+from theory.core.modelCatalog import ModelCatalogEntry
+from theory.test.testcases import SimpleTestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('ModelCatalogEntryTestCase',)
+
+class ModelCatalogEntryTestCase(SimpleTestCase):
+  def setUp(self):
+    # (id, name, data, isField, isCircular, parent)
+    rowLst = [
+        (1, "name", "CharField", True, False, None),
+        (2, "parent", "ForeignKey", True, True, None),
+        (3, "foreignApp", "testBase", False, False, 2),
+        (4, "foreignModel", "DummyModel", False, False, 2),
+        (5, "tagLst", "ArrayField", True, False, None),
+        (6, "ArrayField", "CharField", True, False, 5),
+        ]
+    self.entry = ModelCatalogEntry(None, rowLst)
+
+  def testTree(self):
+    self.assertEqual(
+        [i.name for i in self.entry.rootFieldParamLst],
+        ["name", "parent", "tagLst"]
+        )
+    self.assertEqual([i.id for i in self.entry.fieldParamLst], range(1, 7))
+    parent = self.entry.getFieldParam("parent")
+    self.assertTrue(parent.isCircular)
+    self.assertEqual(
+        [(i.name, i.data) for i in parent.childParamLst],
+        [("foreignApp", "testBase"), ("foreignModel", "DummyModel")]
+        )
+    self.assertIsNone(self.entry.getFieldParam("foreignApp"))
+
+  def testGetChildParamLst(self):
+    self.assertEqual(
+        [i.id for i in self.entry.getChildParamLst("parent")],
+        [3, 4]
+        )
+    self.assertEqual(self.entry.getChildParamLst("tagLst")[0].data, "CharField")
+    self.assertEqual(self.entry.getChildParamLst("name"), ())
+
+  def testImmutable(self):
+    with self.assertRaises(AttributeError):
+      self.entry.getFieldParam("name").data = "TextField"
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+import sys
+
+##### Theory lib #####
+from theory.core.resourceScan.modelScanManager import \
+    getStronglyConnectedComponentMap
+from theory.test.testcases import SimpleTestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('StronglyConnectedComponentTestCase',)
+
+class StronglyConnectedComponentTestCase(SimpleTestCase):
+  def _isSameComponent(self, componentMap, *nodeLst):
+    return len(set(componentMap[i] for i in nodeLst))==1
+
+  def testCycleAndSelfLoop(self):
+    graph = {
+        "app|A": ["app|B"],
+        "app|B": ["app|C", "app|D"],
+        "app|C": ["app|A"],
+        "app|D": ["app|D", "other|E"],
+        }
+    componentMap = getStronglyConnectedComponentMap(graph)
+    self.assertTrue(
+        self._isSameComponent(componentMap, "app|A", "app|B", "app|C")
+        )
+    self.assertFalse(self._isSameComponent(componentMap, "app|C", "app|D"))
+    # A model which is only referred still gets its own component
+    self.assertFalse(self._isSameComponent(componentMap, "app|D", "other|E"))
+    self.assertEqual(len(set(componentMap.values())), 3)
+
+  def testLongChainWithoutRecursion(self):
+    nodeNum = sys.getrecursionlimit() * 2
+    graph = dict((i, [i + 1]) for i in xrange(nodeNum))
+    graph[nodeNum] = [0]
+    componentMap = getStronglyConnectedComponentMap(graph)
+    self.assertEqual(len(set(componentMap.values())), 1)
+
+    del graph[nodeNum]
+    componentMap = getStronglyConnectedComponentMap(graph)
+    self.assertEqual(len(set(componentMap.values())), nodeNum + 1)
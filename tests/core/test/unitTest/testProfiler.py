@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+from StringIO import StringIO
+
+##### Theory lib #####
+from theory.core.profiler import (
+    CommandProfile,
+    CommandProfiler,
+    commandProfiler,
+    setupCommandProfiler,
+    )
+from theory.core.signals import commandStarted, commandFinished
+from theory.db import connection
+from theory.test.testcases import TestCase
+from theory.test.util import overrideSettings
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = (
+    'CommandProfileTestCase',
+    'CommandProfilerTestCase',
+    'SetupCommandProfilerTestCase',
+    )
+
+class DummyCommand(object):
+  name = "dummyCommand"
+
+class CommandProfileTestCase(TestCase):
+  def testSlowQueryLst(self):
+    profile = CommandProfile("dummyCommand", 2)
+    profile.recordQuery("SELECT 1", 0.1)
+    profile.recordQuery("SELECT 2", 0.3)
+    profile.recordQuery("SELECT 3", 0.2)
+    self.assertEqual(profile.queryNum, 3)
+    self.assertAlmostEqual(profile.sqlTime, 0.6)
+    self.assertEqual(
+        [i["sql"] for i in profile.slowQueryLst],
+        ["SELECT 2", "SELECT 3"]
+    )
+
+class CommandProfilerTestCase(TestCase):
+  def setUp(self):
+    self.profiler = CommandProfiler(bufferSize=2, slowQueryNum=3)
+    self.profiler.enable()
+
+  def tearDown(self):
+    self.profiler.disable()
+
+  def _runCmd(self, cmd):
+    commandStarted.send(sender=cmd.__class__, cmd=cmd)
+    with connection.cursor() as cursor:
+      cursor.execute("SELECT 1")
+      cursor.fetchall()
+    commandFinished.send(sender=cmd.__class__, cmd=cmd, isSuccess=True)
+
+  def testRecordQueryWithoutDebug(self):
+    self._runCmd(DummyCommand())
+    profile = self.profiler.profileLst[0]
+    self.assertEqual(profile.cmdName, "dummyCommand")
+    self.assertEqual(profile.queryNum, 1)
+    self.assertEqual(profile.rowNum, 1)
+    self.assertTrue(profile.isSuccess)
+    self.assertEqual(connection.queryObservers, [])
+
+  def testBoundedBuffer(self):
+    for i in range(3):
+      self._runCmd(DummyCommand())
+    self.assertEqual(len(self.profiler.profileLst), 2)
+    summary = self.profiler.summarize()
+    self.assertEqual(summary[0]["runNum"], 2)
+    self.assertEqual(summary[0]["queryNum"], 2)
+
+  def testExportCsv(self):
+    self._runCmd(DummyCommand())
+    stream = StringIO()
+    self.profiler.exportCsv(stream)
+    lineLst = stream.getvalue().splitlines()
+    self.assertEqual(lineLst[0].split(",")[0], "cmdName")
+    self.assertEqual(len(lineLst), 2)
+
+class SetupCommandProfilerTestCase(TestCase):
+  def setUp(self):
+    commandProfiler.clear()
+
+  def tearDown(self):
+    commandProfiler.disable()
+    commandProfiler.clear()
+
+  def _runCmd(self):
+    cmd = DummyCommand()
+    commandStarted.send(sender=cmd.__class__, cmd=cmd)
+    commandFinished.send(sender=cmd.__class__, cmd=cmd, isSuccess=True)
+
+  def testDisabledByDefault(self):
+    import theory.core.bridge
+
+    setupCommandProfiler()
+    self._runCmd()
+    self.assertEqual(commandProfiler.profileLst, [])
+
+  def testEnabled(self):
+    with overrideSettings(COMMAND_PROFILER_ENABLED=True):
+      setupCommandProfiler()
+      # Being set up again does not record a command twice
+      setupCommandProfiler()
+    self._runCmd()
+    self.assertEqual(
+        [i.cmdName for i in commandProfiler.profileLst],
+        ["dummyCommand"]
+        )
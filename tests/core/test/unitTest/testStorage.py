@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+import os
+import shutil
+import tempfile
+import threading
+
+##### Theory lib #####
+from theory.core.files.base import ContentFile
+from theory.core.files.storage import (
+    ContentAddressedStorage,
+    FileSystemStorage,
+    )
+from theory.test.testcases import SimpleTestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('ContentAddressedStorageTestCase', 'FileSystemStorageTestCase',)
+
+class FileSystemStorageTestCase(SimpleTestCase):
+  def setUp(self):
+    self.location = tempfile.mkdtemp()
+    self.storage = FileSystemStorage(
+        location=self.location,
+        baseUrl="/",
+        filePermissionsMode=0o644,
+        directoryPermissionsMode=0o755,
+        )
+
+  def tearDown(self):
+    shutil.rmtree(self.location)
+
+  def testGetAvailableName(self):
+    self.assertEqual(self.storage.getAvailableName("a.txt"), "a.txt")
+    for name in ("a.txt", "a_1.txt", "a_3.txt"):
+      self.storage.save(name, ContentFile(b"data"))
+    self.assertEqual(self.storage.getAvailableName("a.txt"), "a_2.txt")
+    self.storage.save("a.txt", ContentFile(b"data"))
+    self.assertEqual(self.storage.getAvailableName("a.txt"), "a_4.txt")
+
+class ContentAddressedStorageTestCase(SimpleTestCase):
+  def setUp(self):
+    self.location = tempfile.mkdtemp()
+    self.storage = ContentAddressedStorage(
+        location=self.location,
+        baseUrl="/",
+        filePermissionsMode=0o644,
+        directoryPermissionsMode=0o755,
+        )
+
+  def tearDown(self):
+    shutil.rmtree(self.location)
+
+  def _getBlobPathLst(self):
+    r = []
+    for dirPath, dirNameLst, fileNameLst in os.walk(self.storage.blobLocation):
+      if os.path.basename(dirPath) != "tmp":
+        r.extend(os.path.join(dirPath, i) for i in fileNameLst)
+    return r
+
+  def testDeduplicate(self):
+    name1 = self.storage.save("report.txt", ContentFile(b"same content"))
+    name2 = self.storage.save("sub/copy.txt", ContentFile(b"same content"))
+    name3 = self.storage.save("report.txt", ContentFile(b"other content"))
+    self.assertEqual(name3, "report_1.txt")
+
+    self.assertEqual(len(self._getBlobPathLst()), 2)
+    self.assertEqual(
+        os.stat(self.storage.path(name1)).st_ino,
+        os.stat(self.storage.path(name2)).st_ino
+        )
+    self.assertEqual(
+        os.stat(self.storage.path(name1)).st_ino,
+        os.stat(self.storage.blobPath(self.storage.digest(name1))).st_ino
+        )
+    with self.storage.open(name2) as f:
+      self.assertEqual(f.read(), b"same content")
+    self.assertEqual(self.storage.listdir("")[0], ["sub"])
+
+  def testDeleteLastName(self):
+    name1 = self.storage.save("a.txt", ContentFile(b"content"))
+    name2 = self.storage.save("b.txt", ContentFile(b"content"))
+    self.storage.delete(name1)
+    self.assertFalse(self.storage.exists(name1))
+    self.assertEqual(len(self._getBlobPathLst()), 1)
+    self.storage.delete(name2)
+    self.assertEqual(self._getBlobPathLst(), [])
+
+  def testCollectGarbage(self):
+    name = self.storage.save("a.txt", ContentFile(b"content"))
+    os.remove(self.storage.path(name))
+    self.assertEqual(self.storage.collectGarbage(), 1)
+    self.assertEqual(self._getBlobPathLst(), [])
+
+  def testWriteThroughOneName(self):
+    name1 = self.storage.save("a.txt", ContentFile(b"content"))
+    name2 = self.storage.save("b.txt", ContentFile(b"content"))
+    name3 = self.storage.save("c.txt", ContentFile(b"content"))
+    digest = self.storage.digest(name1)
+    blobPath = self.storage.blobPath(digest)
+    self.assertFalse(os.stat(blobPath).st_mode & 0o222)
+
+    with self.storage.open(name1, "ab") as f:
+      f.write(b" appended")
+    with self.storage.open(name2, "wb") as f:
+      f.write(b"rewritten")
+
+    with self.storage.open(name1) as f:
+      self.assertEqual(f.read(), b"content appended")
+    with self.storage.open(name2) as f:
+      self.assertEqual(f.read(), b"rewritten")
+    with self.storage.open(name3) as f:
+      self.assertEqual(f.read(), b"content")
+    self.assertEqual(self.storage._hashFile(blobPath).hexdigest(), digest)
+    self.assertEqual(self.storage.digest(name3), digest)
+    self.assertEqual(
+        os.stat(self.storage.path(name1)).st_mode & 0o777,
+        0o644
+        )
+    self.assertEqual(os.stat(blobPath).st_nlink, 2)
+
+  def testCollectGarbageWaitForSave(self):
+    storage = self.storage
+    saveBlob = storage._saveBlob
+    gcThread = threading.Thread(target=storage.collectGarbage)
+
+    def saveBlobThenCollectGarbage(content):
+      # The new blob has no name yet when the garbage is being collected
+      blobPath = saveBlob(content)
+      gcThread.start()
+      gcThread.join(0.2)
+      self.assertTrue(gcThread.is_alive())
+      return blobPath
+
+    storage._saveBlob = saveBlobThenCollectGarbage
+    name = storage.save("a.txt", ContentFile(b"content"))
+    gcThread.join()
+
+    with storage.open(name) as f:
+      self.assertEqual(f.read(), b"content")
+    self.assertEqual(len(self._getBlobPathLst()), 1)
+    self.assertEqual(
+        os.stat(storage.path(name)).st_ino,
+        os.stat(storage.blobPath(storage.digest(name))).st_ino
+        )
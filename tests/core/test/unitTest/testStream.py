@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+import gevent
+
+##### Theory lib #####
+from theory.core.exceptions import StreamCancelled
+from theory.core.stream import StreamChannel
+from theory.test.testcases import SimpleTestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('StreamChannelTestCase',)
+
+class StreamChannelTestCase(SimpleTestCase):
+  def setUp(self):
+    self.producedLst = []
+
+  def _generate(self, num):
+    for i in range(num):
+      self.producedLst.append(i)
+      yield i
+
+  def testConsumeWhileProducing(self):
+    channel = StreamChannel("test", self._generate(10), maxSize=2)
+    producedNumLst = []
+    for i in channel:
+      producedNumLst.append(len(self.producedLst))
+      gevent.sleep(0)
+    self.assertEqual(channel.consumedNum, 10)
+    self.assertTrue(channel.isDone)
+    # The consumer got the first item before the producer was done
+    self.assertLess(producedNumLst[0], 10)
+
+  def testBackpressure(self):
+    channel = StreamChannel("test", self._generate(100), maxSize=3).start()
+    gevent.sleep(0.01)
+    # The items in the queue plus the one waiting to be put
+    self.assertLessEqual(len(self.producedLst), 4)
+    self.assertEqual(channel.stats()["queuedNum"], 3)
+    self.assertGreater(channel.blockedNum, 0)
+
+  def testCancel(self):
+    channel = StreamChannel("test", self._generate(100), maxSize=3)
+    it = iter(channel)
+    self.assertEqual(next(it), 0)
+    channel.cancel()
+    self.assertRaises(StreamCancelled, next, it)
+    self.assertTrue(channel.stats()["isCancelled"])
+    self.assertLess(len(self.producedLst), 100)
+
+  def testProducerError(self):
+    def generate():
+      yield 1
+      raise KeyError("missing")
+
+    channel = StreamChannel("test", generate(), maxSize=3)
+    it = iter(channel)
+    self.assertEqual(next(it), 1)
+    self.assertRaises(KeyError, next, it)
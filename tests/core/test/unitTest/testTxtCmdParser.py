@@ -171,3 +171,77 @@ class TestCmdParserTestCase(TestCase):
     self.assertEqual(self.o.mode, self.o.MODE_DOUBLE_QUOTE)
     self.o.initVar()
 
+
+  def testPipeline(self):
+    self.o.cmdInTxt = "cmdA(1, b='x') | cmdB(c=2)"
+    self.o.run()
+    self.assertEqual(
+        [(i.cmdName, i.args, i.kwargs) for i in self.o.pipeline],
+        [("cmdA", ["1"], {"b": "x"}), ("cmdB", [], {"c": "2"})]
+        )
+    self.assertEqual(self.o.cmdName, "cmdB")
+    self.assertEqual(self.o.mode, self.o.MODE_COMMAND)
+
+    self.o.cmdInTxt = "cmdA(1) | cm"
+    self.o.run()
+    self.assertEqual(self.o.partialInput, (self.o.MODE_COMMAND, "cm"))
+
+    self.o.cmdInTxt = "cmdA(1) | cmdB(1"
+    self.o.run()
+    self.assertEqual(self.o.mode, self.o.MODE_ARGS)
+
+    self.o.cmdInTxt = "| cmdB()"
+    self.o.run()
+    self.assertEqual(self.o.mode, self.o.MODE_ERROR)
+
+    self.o.cmdInTxt = "cmdA('a|b')"
+    self.o.run()
+    self.assertEqual(len(self.o.pipeline), 1)
+    self.assertEqual(self.o.args, ["a|b"])
+
+  def testFanOutPipeline(self):
+    self.o.cmdInTxt = "cmdA(1) |* cmdB(c=2) | cmdC()"
+    self.o.run()
+    self.assertEqual(
+        [(i.cmdName, i.isFanOut) for i in self.o.pipeline],
+        [("cmdA", False), ("cmdB", True), ("cmdC", False)]
+        )
+    self.assertEqual(self.o.pipeline[1].kwargs, {"c": "2"})
+
+    # The pipe being typed becomes a fan-out pipe
+    self.o.cmdInTxt = "cmdA(1) |"
+    self.o.run()
+    self.o.cmdInTxt = "cmdA(1) |* cmdB"
+    self.o.run()
+    self.assertTrue(self.o.pipeline[1].isFanOut)
+
+    self.o.cmdInTxt = "|* cmdB()"
+    self.o.run()
+    self.assertEqual(self.o.mode, self.o.MODE_ERROR)
+
+  def testIncrementalParsing(self):
+    cmdInTxt = "cmdA(rootLst='/tmp', depth=2) | cmdB(a, \"b c\", k=v)"
+    for i in range(1, len(cmdInTxt) + 1):
+      self.o.cmdInTxt = cmdInTxt[:i]
+      self.o.run()
+    firstNode = self.o.pipeline[0]
+
+    # Editing the second command keeps the first one
+    self.o.cmdInTxt = cmdInTxt.replace("k=v", "k=w")
+    self.o.run()
+    self.assertIs(self.o.pipeline[0], firstNode)
+    self.assertEqual(self.o.kwargs, {"k": "w"})
+
+    # Editing the first command reparses everything
+    self.o.cmdInTxt = cmdInTxt.replace("depth=2", "depth=3")
+    self.o.run()
+    self.assertEqual(self.o.pipeline[0].kwargs, {"rootLst": "/tmp", "depth": "3"})
+    self.assertEqual(self.o.pipeline[1].args, ["a", "b c"])
+
+    parser = TxtCmdParser()
+    parser.cmdInTxt = self.o.cmdInTxt
+    parser.run()
+    self.assertEqual(
+        [(i.cmdName, i.args, i.kwargs) for i in self.o.pipeline],
+        [(i.cmdName, i.args, i.kwargs) for i in parser.pipeline],
+        )
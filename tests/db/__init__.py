@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+
+##### Theory lib #####
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+
+##### Theory lib #####
+
+##### Theory third-party lib #####
+
+##### Local app #####
+from unitTest import *
+from integrationTest import *
+
+##### Theory app #####
+
+##### Misc #####
+
+
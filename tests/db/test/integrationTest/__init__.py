@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+
+##### Theory lib #####
+
+##### Theory third-party lib #####
+
+##### Local app #####
+from .testModelFromDb import *
+from .testQuerySetRows import *
+from .testDeletion import *
+from .testQuerySetIterator import *
+from .testInstanceCache import *
+from .testSqliteArrayField import *
+from .testSignal import *
+from .testModelCheck import *
+
+##### Theory app #####
+
+##### Misc #####
+
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+
+##### Theory lib #####
+from theory.apps.model import Command, Parameter
+from theory.db import connection
+from theory.db.model.deletion import Collector
+from theory.db.model.signals import preDelete
+from theory.test.testcases import TestCase
+from theory.test.util import CaptureQueriesContext
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('SetBasedDeleteTestCase',)
+
+class SetBasedDeleteTestCase(TestCase):
+  def _createCmd(self, app, paramNum=3):
+    cmd = Command.objects.create(name="cmd", app=app, sourceFile="cmd.py")
+    for i in range(paramNum):
+      Parameter.objects.create(
+          name="param%d" % i,
+          type="String",
+          command=cmd,
+          comment="",
+          )
+    return cmd
+
+  def _countDeleteQueries(self, qs):
+    with CaptureQueriesContext(connection) as ctx:
+      qs.delete()
+    return len([q for q in ctx.capturedQueries if "DELETE" in q["sql"]])
+
+  def testPlan(self):
+    qs = Command.objects.filter(app="planApp")
+    stepLst = Collector(using="default").planSetBasedDelete(qs)
+    self.assertIsNotNone(stepLst)
+    self.assertIs(stepLst[-1][0], qs)
+    self.assertIn(Parameter, [i[0].modal for i in stepLst])
+
+  def testStatementNumIsIndependentOfRowNum(self):
+    self._createCmd("smallApp", paramNum=1)
+    for i in range(5):
+      self._createCmd("bigApp", paramNum=10)
+
+    smallNum = self._countDeleteQueries(Command.objects.filter(app="smallApp"))
+    bigNum = self._countDeleteQueries(Command.objects.filter(app="bigApp"))
+    self.assertEqual(smallNum, bigNum)
+    self.assertFalse(Command.objects.filter(app__in=["smallApp", "bigApp"]).exists())
+    self.assertEqual(Parameter.objects.count(), 0)
+
+  def testFallbackOnReceivers(self):
+    self._createCmd("receiverApp")
+    deletedLst = []
+
+    def receiver(sender, instance, **kwargs):
+      deletedLst.append(instance.name)
+    preDelete.connect(receiver, sender=Parameter)
+    try:
+      qs = Command.objects.filter(app="receiverApp")
+      self.assertIsNone(Collector(using="default").planSetBasedDelete(qs))
+      qs.delete()
+    finally:
+      preDelete.disconnect(receiver, sender=Parameter)
+    self.assertEqual(sorted(deletedLst), ["param0", "param1", "param2"])
+    self.assertEqual(Parameter.objects.count(), 0)
+
+  def testRelatedObjectsAreBatched(self):
+    cmdLst = [self._createCmd("batchApp", paramNum=0) for i in range(5)]
+    field = Parameter._meta.getField("command")
+    batchLst = Collector(using="default").getDelBatches(cmdLst, field)
+    self.assertEqual(sum(len(i) for i in batchLst), 5)
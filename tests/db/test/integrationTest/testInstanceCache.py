@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+
+##### Theory lib #####
+from theory.apps.model import Command, Mood, Parameter
+from theory.db import connection, transaction
+from theory.db.model.instanceCache import getFilterKey, instanceCache
+from theory.db.model.signals import postInit
+from theory.test.testcases import SimpleTestCase, _AssertNumQueriesContext
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('InstanceCacheTestCase',)
+
+class InstanceCacheTestCase(SimpleTestCase):
+  """The rows are only cached out of the transactions, so the tests commit
+  their rows in autocommit and delete them afterward instead of being rolled
+  back by TestCase."""
+  def setUp(self):
+    instanceCache.invalidate()
+    instanceCache.resetStats()
+    self.mood = Mood.objects.create(name="cacheMood")
+    self.firstMoodId = self.mood.id
+
+  def tearDown(self):
+    Command.objects.filter(app="cacheApp").delete()
+    Mood.objects.filter(id__gte=self.firstMoodId).delete()
+    instanceCache.invalidate()
+
+  def assertNumQueries(self, num):
+    return _AssertNumQueriesContext(self, num, connection)
+
+  def _getStat(self, label="apps.Mood"):
+    return instanceCache.stats().get(label, (0, 0, 0.0))[:2]
+
+  def testGetIsCached(self):
+    with self.assertNumQueries(1):
+      mood = Mood.objects.get(name="cacheMood")
+    with self.assertNumQueries(0):
+      cachedMood = Mood.objects.get(name="cacheMood")
+    self.assertEqual(cachedMood, mood)
+    # Every read gets its own instance
+    self.assertIsNot(cachedMood, mood)
+    self.assertEqual(self._getStat(), (1, 1))
+
+  def testNotCachedInTransaction(self):
+    with transaction.atomic():
+      Mood.objects.get(name="cacheMood")
+      with self.assertNumQueries(1):
+        Mood.objects.get(name="cacheMood")
+      Mood.objects.filter(id=self.mood.id).update(name="rolledBackMood")
+      transaction.setRollback(True)
+    # The rolled back rows have never been cached
+    with self.assertNumQueries(1):
+      self.assertEqual(Mood.objects.get(id=self.mood.id).name, "cacheMood")
+    with self.assertNumQueries(0):
+      Mood.objects.get(id=self.mood.id)
+
+  def testInvalidatedWhileReading(self):
+    def receiver(sender, instance, **kwargs):
+      # As if another thread saved a mood meanwhile
+      instanceCache.invalidate(Mood)
+    postInit.connect(receiver, sender=Mood)
+    try:
+      Mood.objects.get(id=self.mood.id)
+    finally:
+      postInit.disconnect(receiver, sender=Mood)
+    with self.assertNumQueries(1):
+      Mood.objects.get(id=self.mood.id)
+
+  def testSimpleQuerysetIsCached(self):
+    list(Mood.objects.filter(name__startswith="cache").orderBy("-id")[:5])
+    with self.assertNumQueries(0):
+      moodLst = list(
+          Mood.objects.filter(name__startswith="cache").orderBy("-id")[:5]
+          )
+    self.assertEqual(moodLst, [self.mood])
+
+  def testSaveInvalidate(self):
+    Mood.objects.get(id=self.mood.id)
+    self.mood.name = "renamedMood"
+    self.mood.save()
+    with self.assertNumQueries(1):
+      self.assertEqual(Mood.objects.get(id=self.mood.id).name, "renamedMood")
+
+  def testBulkOperationInvalidate(self):
+    self.assertEqual(Mood.objects.filter(name="cacheMood").count(), 1)
+    self.assertEqual(len(Mood.objects.filter(name="cacheMood")), 1)
+    Mood.objects.filter(id=self.mood.id).update(name="updatedMood")
+    self.assertEqual(len(Mood.objects.filter(name="cacheMood")), 0)
+    Mood.objects.bulkCreate([Mood(name="cacheMood")])
+    self.assertEqual(len(Mood.objects.filter(name="cacheMood")), 1)
+    Mood.objects.filter(name="cacheMood").delete()
+    self.assertEqual(len(Mood.objects.filter(name="cacheMood")), 0)
+
+  def testDeleteInvalidate(self):
+    cmd = Command.objects.create(
+        name="cacheCmd",
+        app="cacheApp",
+        sourceFile="cacheCmd.py",
+        )
+    cmd.moodSet.add(self.mood)
+    Command.objects.get(id=cmd.id)
+    Mood.objects.get(id=self.mood.id)
+    self.mood.delete()
+    self.assertRaises(Mood.DoesNotExist, Mood.objects.get, name="cacheMood")
+    # The cached rows of the other models are kept
+    with self.assertNumQueries(0):
+      Command.objects.get(id=cmd.id)
+
+  def testComplexQuerysetIsNotCached(self):
+    list(Mood.objects.filter(command__name="cacheCmd"))
+    with self.assertNumQueries(1):
+      list(Mood.objects.filter(command__name="cacheCmd"))
+    list(Mood.objects.exclude(name="cacheMood"))
+    with self.assertNumQueries(1):
+      list(Mood.objects.exclude(name="cacheMood"))
+
+  def testUncachedModel(self):
+    list(Parameter.objects.all())
+    self.assertNotIn("apps.Parameter", instanceCache.stats())
+
+  def testGetFilterKey(self):
+    self.assertEqual(
+        getFilterKey(Command, {"name": "a", "app__in": ["b", "c"]}),
+        (("app__in", ("b", "c")), ("name", "a"))
+        )
+    self.assertEqual(getFilterKey(Command, {"pk": 1}), (("pk", 1),))
+    self.assertIsNone(getFilterKey(Command, {"moodSet__name": "norm"}))
+    self.assertIsNone(getFilterKey(Command, {"name__foo": "a"}))
+    self.assertIsNone(getFilterKey(Command, {"moodSet": self.mood}))
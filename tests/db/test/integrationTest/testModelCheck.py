@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+import os
+import shutil
+import tempfile
+
+##### Theory lib #####
+from theory.apps import apps
+from theory.apps.model import Command, Parameter
+from theory.core.checks import modelChecks
+from theory.core.checks.modelChecks import (
+    checkAllModels,
+    getModelDefinitionHash,
+    ModelCheckCache,
+    )
+from theory.test.testcases import SimpleTestCase
+from theory.test.util import overrideSettings
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('ModelCheckCacheTestCase',)
+
+class ModelCheckCacheTestCase(SimpleTestCase):
+  def setUp(self):
+    self.tmpDir = tempfile.mkdtemp()
+    self.path = os.path.join(self.tmpDir, "modelCheck.json")
+    self.oldCache = modelChecks._modelCheckCache
+    modelChecks._modelCheckCache = ModelCheckCache(self.path)
+    self.modelNum = len(apps.getModels())
+
+  def tearDown(self):
+    modelChecks._modelCheckCache = self.oldCache
+    shutil.rmtree(self.tmpDir)
+
+  def testDefinitionHash(self):
+    self.assertEqual(
+        getModelDefinitionHash(Command),
+        getModelDefinitionHash(Command)
+        )
+    self.assertNotEqual(
+        getModelDefinitionHash(Command),
+        getModelDefinitionHash(Parameter)
+        )
+
+  def testSkipUnchangedModels(self):
+    errorLst = checkAllModels()
+    cache = modelChecks._modelCheckCache
+    self.assertEqual(cache.checkedNum, self.modelNum)
+    failedModelNum = len(set(i.obj.modal for i in errorLst))
+
+    # Only the models having failed are checked again
+    self.assertEqual(checkAllModels(), errorLst)
+    self.assertEqual(cache.checkedNum, failedModelNum)
+    self.assertEqual(cache.skippedNum, self.modelNum - failedModelNum)
+
+    # The result is kept for the next run
+    modelChecks._modelCheckCache = ModelCheckCache(self.path)
+    checkAllModels()
+    self.assertEqual(modelChecks._modelCheckCache.checkedNum, failedModelNum)
+
+  def testChangedModel(self):
+    cache = modelChecks._modelCheckCache
+    keyDict = cache.getKeyDict([Command, Parameter])
+    field = Command._meta.getField("name")
+    oldMaxLength = field.maxLength
+    field.maxLength = oldMaxLength + 1
+    try:
+      newKeyDict = cache.getKeyDict([Command, Parameter])
+    finally:
+      field.maxLength = oldMaxLength
+    # The model relating to the changed one is checked again too
+    self.assertNotEqual(keyDict[Command], newKeyDict[Command])
+    self.assertNotEqual(keyDict[Parameter], newKeyDict[Parameter])
+    self.assertEqual(cache.getKeyDict([Command]), {Command: keyDict[Command]})
+
+  def testChangedCheckCode(self):
+    cache = modelChecks._modelCheckCache
+    keyDict = cache.getKeyDict([Command, Parameter])
+    # e.x: a custom check() of the field has been edited
+    fieldModuleName = type(Command._meta.getField("name")).__module__
+    getModuleStamp = modelChecks._getModuleStamp
+    modelChecks._getModuleStamp = lambda moduleName: \
+        getModuleStamp(moduleName) + (
+          ":edited" if moduleName==fieldModuleName else ""
+        )
+    try:
+      newKeyDict = cache.getKeyDict([Command, Parameter])
+    finally:
+      modelChecks._getModuleStamp = getModuleStamp
+    self.assertNotEqual(keyDict[Command], newKeyDict[Command])
+    self.assertNotEqual(keyDict[Parameter], newKeyDict[Parameter])
+    self.assertEqual(cache.getKeyDict([Command]), {Command: keyDict[Command]})
+
+  def testWithPool(self):
+    errorLst = checkAllModels()
+    modelChecks._modelCheckCache = ModelCheckCache()
+    with overrideSettings(MODEL_CHECK_WORKERS=4):
+      self.assertEqual(checkAllModels(), errorLst)
+    self.assertEqual(modelChecks._modelCheckCache.checkedNum, self.modelNum)
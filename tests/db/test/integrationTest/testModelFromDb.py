@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+import os
+import sys
+import time
+from unittest import skipUnless
+
+##### Theory lib #####
+from theory.apps.model import Command, History, Parameter
+from theory.db.model.signals import postInit
+from theory.test.testcases import TestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('ModelFromDbTestCase', 'ModelFromDbBenchmarkTestCase',)
+
+class ModelFromDbTestCase(TestCase):
+  def setUp(self):
+    self.history = History.objects.create(
+        commandName="listCommand",
+        jsonData="{}",
+        )
+
+  def testIteratorState(self):
+    obj = History.objects.get(pk=self.history.pk)
+    self.assertEqual(obj._state.db, "default")
+    self.assertFalse(obj._state.adding)
+    self.assertEqual(obj.commandName, "listCommand")
+    self.assertEqual(obj.repeated, 1)
+
+  def testSameAsInit(self):
+    attnames = History._meta.concreteAttnames
+    values = [getattr(self.history, k) for k in attnames]
+    obj = History.fromDb("default", attnames, values)
+    self.assertEqual(obj, self.history)
+    for k in attnames:
+      self.assertEqual(getattr(obj, k), getattr(self.history, k))
+
+  def testDeferredClass(self):
+    obj = History.objects.only("commandName").get(pk=self.history.pk)
+    self.assertTrue(obj._deferred)
+    self.assertNotIn("jsonData", obj.__dict__)
+    self.assertEqual(obj.commandName, "listCommand")
+    self.assertEqual(obj.jsonData, "{}")
+
+  def testLoaderIsCachedPerClassAndAttnames(self):
+    list(History.objects.all())
+    list(History.objects.only("commandName"))
+    self.assertIn(History._meta.concreteAttnames, History.__dict__["_dbLoaderMap"])
+    deferredKlass = History.objects.only("commandName")[0].__class__
+    self.assertIn("_dbLoaderMap", deferredKlass.__dict__)
+
+  def testFastPath(self):
+    attnames = History._meta.concreteAttnames
+    values = [getattr(self.history, k) for k in attnames]
+    History.__dict__.get("_dbLoaderMap", {}).clear()
+    loader = History._buildDbLoader(attnames)
+    def failedInit(*args, **kwargs):
+      raise AssertionError("History.__init__ called by the loader")
+    History.__init__ = failedInit
+    try:
+      obj = loader("default", values)
+    finally:
+      del History.__init__
+    self.assertEqual(obj, self.history)
+    self.assertFalse(obj._state.adding)
+
+  def testPostInitReceiver(self):
+    instanceLst = []
+    def receiver(sender, instance, **kwargs):
+      instanceLst.append(instance)
+    postInit.connect(receiver, sender=History)
+    try:
+      obj = History.objects.get(pk=self.history.pk)
+    finally:
+      postInit.disconnect(receiver, sender=History)
+    self.assertEqual(instanceLst, [obj])
+
+  def testSelectRelated(self):
+    cmd = Command.objects.create(name="dummyCmd", app="theory.apps")
+    Parameter.objects.create(
+        name="dummyParam",
+        type="Text",
+        command=cmd,
+        comment="",
+        )
+    param = Parameter.objects.selectRelated("command").get(name="dummyParam")
+    self.assertFalse(param._state.adding)
+    self.assertEqual(param.command.name, "dummyCmd")
+
+  def testRawQuerySet(self):
+    obj = list(History.objects.raw(
+      "SELECT id, \"commandName\" FROM %s" % History._meta.dbTable
+    ))[0]
+    self.assertEqual(obj.commandName, "listCommand")
+    self.assertFalse(obj._state.adding)
+
+@skipUnless(
+    os.environ.get("THEORY_BENCHMARK"),
+    "Set THEORY_BENCHMARK to run the benchmarks"
+    )
+class ModelFromDbBenchmarkTestCase(TestCase):
+  rowNum = 5000
+
+  def setUp(self):
+    History.objects.bulkCreate([
+      History(commandName="cmd%d" % i, jsonData="{}")
+      for i in range(self.rowNum)
+    ])
+
+  def _rowsPerSecond(self, fxn):
+    start = time.time()
+    count = fxn()
+    return count / (time.time() - start)
+
+  def testRowsPerSecond(self):
+    rowLst = list(History.objects.valuesList(*History._meta.concreteAttnames))
+    attnames = History._meta.concreteAttnames
+
+    initRate = self._rowsPerSecond(
+        lambda: len([History(*row) for row in rowLst])
+        )
+    fromDbRate = self._rowsPerSecond(
+        lambda: len([History.fromDb("default", attnames, row) for row in rowLst])
+        )
+    iteratorRate = self._rowsPerSecond(
+        lambda: len(list(History.objects.all().iterator()))
+        )
+    sys.stderr.write(
+        "\nHistory rows/s: __init__ %d, fromDb %d, iterator() %d\n" % (
+          initRate, fromDbRate, iteratorRate
+        )
+    )
+    self.assertGreater(fromDbRate, 0)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+
+##### Theory lib #####
+from theory.apps.model import Command, Mood
+from theory.core import serializers
+from theory.test.testcases import TestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('QuerySetIteratorPrefetchTestCase',)
+
+class QuerySetIteratorPrefetchTestCase(TestCase):
+  def setUp(self):
+    self.moodLst = [
+        Mood.objects.create(name="iterMood%d" % i) for i in range(2)
+        ]
+    for i in range(5):
+      cmd = Command.objects.create(
+          name="iterCmd%d" % i,
+          app="iterApp",
+          sourceFile="iterCmd%d.py" % i,
+          )
+      cmd.moodSet.add(*self.moodLst[:i % 3])
+    self.queryset = Command.objects.filter(app="iterApp").orderBy("id")
+
+  def testPrefetchPerChunk(self):
+    # One query for the commands and one for each chunk of 2 commands
+    with self.assertNumQueries(4):
+      moodNameLstLst = [
+          sorted(i.name for i in cmd.moodSet.all())
+          for cmd in self.queryset.prefetchRelated("moodSet").iterator(
+            chunkSize=2
+            )
+          ]
+    self.assertEqual(
+        moodNameLstLst,
+        [
+          [],
+          ["iterMood0"],
+          ["iterMood0", "iterMood1"],
+          [],
+          ["iterMood0"],
+        ]
+        )
+
+  def testIteratorWithoutPrefetch(self):
+    with self.assertNumQueries(1):
+      self.assertEqual(len(list(self.queryset.iterator())), 5)
+
+  def testFetchAllPrefetchOnce(self):
+    with self.assertNumQueries(2):
+      cmdLst = list(self.queryset.prefetchRelated("moodSet"))
+      self.assertEqual(len(cmdLst[2].moodSet.all()), 2)
+
+  def testSerializeUsesPrefetchedObjects(self):
+    with self.assertNumQueries(2):
+      data = serializers.serialize(
+          "python",
+          self.queryset.prefetchRelated("moodSet").iterator(),
+          fields=("name", "moodSet"),
+          )
+    self.assertEqual(
+        sorted(data[2]["fields"]["moodSet"]),
+        sorted(i.pk for i in self.moodLst)
+        )
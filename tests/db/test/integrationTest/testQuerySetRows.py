@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+import pickle
+
+##### Theory lib #####
+from theory.apps.model import History
+from theory.db.model import Count
+from theory.db.model.queryUtils import InvalidQuery
+from theory.test.testcases import TestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('QuerySetRowsTestCase',)
+
+class QuerySetRowsTestCase(TestCase):
+  def setUp(self):
+    self.history = History.objects.create(
+        commandName="listCommand",
+        jsonData="{}",
+        )
+
+  def testAllFields(self):
+    row = History.objects.rows().get(pk=self.history.pk)
+    self.assertIsInstance(row, tuple)
+    self.assertEqual(row._fields, History._meta.concreteAttnames)
+    self.assertEqual(row.commandName, "listCommand")
+    self.assertEqual(row.id, self.history.pk)
+    self.assertEqual(
+        tuple(row),
+        History.objects.valuesList().get(pk=self.history.pk)
+        )
+
+  def testSelectedFields(self):
+    row = History.objects.rows("jsonData", "commandName")[0]
+    self.assertEqual(row._fields, ("jsonData", "commandName"))
+    self.assertEqual(tuple(row), ("{}", "listCommand"))
+    self.assertEqual(row.toDict(), {"jsonData": "{}", "commandName": "listCommand"})
+    self.assertRaises(AttributeError, setattr, row, "commandName", "x")
+    self.assertFalse(hasattr(row, "__dict__"))
+
+  def testAnnotation(self):
+    row = History.objects.values("commandName").annotate(
+        num=Count("id")).rows("commandName", "num")[0]
+    self.assertEqual(row._fields, ("commandName", "num"))
+    self.assertEqual(row.num, 1)
+
+  def testRecordClassIsCached(self):
+    klass = History.objects.rows("commandName")[0].__class__
+    self.assertIs(History.objects.rows("commandName")[0].__class__, klass)
+
+  def testToModel(self):
+    obj = History.objects.rows().get(pk=self.history.pk).toModel()
+    self.assertEqual(obj, self.history)
+    self.assertFalse(obj._state.adding)
+
+    obj = History.objects.rows("id", "commandName")[0].toModel()
+    self.assertTrue(obj._deferred)
+    self.assertEqual(obj.jsonData, "{}")
+
+    row = History.objects.rows("commandName")[0]
+    self.assertRaises(InvalidQuery, row.toModel)
+
+  def testPickle(self):
+    row = History.objects.rows("id", "commandName")[0]
+    self.assertEqual(pickle.loads(pickle.dumps(row)), row)
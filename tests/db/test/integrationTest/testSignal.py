@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+
+##### Theory lib #####
+from theory.apps.model import Command, History
+from theory.db.model.signals import postDelete, postSave, preInit
+from theory.dispatch import Signal
+from theory.test.testcases import TestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('SendBatchTestCase',)
+
+class SendBatchTestCase(TestCase):
+  def setUp(self):
+    self.callLst = []
+
+  def _receiver(self, sender, instance, **kwargs):
+    self.callLst.append(instance)
+
+  def _batchReceiver(self, sender, instanceLst, **kwargs):
+    self.callLst.append(list(instanceLst))
+
+  def _createCmd(self, name):
+    return Command(name=name, app="signalApp", sourceFile="cmd.py")
+
+  def testSendBatch(self):
+    signal = Signal(providingArgs=["instance"], useCaching=True)
+    signal.connect(self._receiver, sender=Command)
+    signal.connect(self._batchReceiver, sender=Command, isBatch=True)
+
+    signal.sendBatch(sender=Command, instanceLst=[1, 2])
+    self.assertEqual(self.callLst, [1, 2, [1, 2]])
+
+    del self.callLst[:]
+    signal.sendBatch(sender=Command, instanceLst=[1, 2], isBatchOnly=True)
+    self.assertEqual(self.callLst, [[1, 2]])
+
+    # The batch receivers are forgotten once disconnected
+    signal.disconnect(self._batchReceiver, sender=Command)
+    del self.callLst[:]
+    signal.sendBatch(sender=Command, instanceLst=[1, 2], isBatchOnly=True)
+    self.assertEqual(self.callLst, [])
+
+  def testBatchPerSender(self):
+    def receiver(sender, instance=None, instanceLst=None, **kwargs):
+      self.callLst.append((sender, instance, instanceLst))
+
+    signal = Signal(providingArgs=["instance"], useCaching=True)
+    signal.connect(receiver, sender=Command, isBatch=True)
+    signal.connect(receiver, sender=History)
+
+    signal.sendBatch(sender=Command, instanceLst=[1, 2])
+    signal.sendBatch(sender=History, instanceLst=[1, 2])
+    self.assertEqual(self.callLst, [
+      (Command, None, [1, 2]),
+      (History, 1, None),
+      (History, 2, None),
+      ])
+
+    # Disconnecting from one sender keeps the flag of the other
+    signal.disconnect(receiver, sender=History)
+    del self.callLst[:]
+    signal.sendBatch(sender=Command, instanceLst=[1, 2])
+    self.assertEqual(self.callLst, [(Command, None, [1, 2])])
+
+  def testNoReceivers(self):
+    self.assertTrue(preInit.hasNoReceivers(Command))
+    signal = Signal(useCaching=True)
+    signal.connect(self._receiver, sender=Command)
+    self.assertFalse(signal.hasNoReceivers(Command))
+    signal.send(sender=int, instance=None)
+    self.assertTrue(signal.hasNoReceivers(int))
+
+  def testBulkCreate(self):
+    postSave.connect(self._receiver, sender=Command)
+    postSave.connect(self._batchReceiver, sender=Command, isBatch=True)
+    try:
+      cmdLst = [self._createCmd("cmd%d" % i) for i in range(3)]
+      Command.objects.bulkCreate(cmdLst)
+    finally:
+      postSave.disconnect(self._receiver, sender=Command)
+      postSave.disconnect(self._batchReceiver, sender=Command)
+    self.assertEqual(self.callLst, [cmdLst])
+
+  def testDelete(self):
+    Command.objects.bulkCreate([self._createCmd("cmd%d" % i) for i in range(3)])
+    postDelete.connect(self._batchReceiver, sender=Command, isBatch=True)
+    try:
+      Command.objects.filter(app="signalApp").delete()
+    finally:
+      postDelete.disconnect(self._batchReceiver, sender=Command)
+    self.assertEqual(len(self.callLst), 1)
+    self.assertEqual(
+        sorted(i.name for i in self.callLst[0]),
+        ["cmd0", "cmd1", "cmd2"]
+        )
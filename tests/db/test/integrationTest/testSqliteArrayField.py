@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+from decimal import Decimal
+from unittest import skipUnless
+
+##### Theory lib #####
+from theory.apps.model import Adapter, BinaryClassifierHistory, History
+from theory.contrib.postgres.fields import ArrayField
+from theory.db import connection, model
+from theory.db.utils import MetadataRouter
+from theory.test.testcases import SimpleTestCase, TestCase, skipUnlessDBFeature
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('SqliteArrayFieldTestCase', 'MetadataRouterTestCase',)
+
+@skipUnless(connection.vendor == "sqlite", "The json emulation is for sqlite")
+class SqliteArrayFieldTestCase(TestCase):
+  def setUp(self):
+    self.adapter = Adapter.objects.create(
+        name="sampleAdapter",
+        importPath="sampleApp.adapter.sampleAdapter",
+        propertyLst=["stdOut", "stdErr", u"r\xe9sum\xe9"],
+        )
+    self.otherAdapter = Adapter.objects.create(
+        name="otherAdapter",
+        importPath="sampleApp.adapter.otherAdapter",
+        propertyLst=["stdErr"],
+        )
+
+  def _getNameLst(self, **kwargs):
+    return sorted(
+        Adapter.objects.filter(**kwargs).valuesList("name", flat=True)
+        )
+
+  def testRoundTrip(self):
+    self.assertEqual(
+        Adapter.objects.get(id=self.adapter.id).propertyLst,
+        ["stdOut", "stdErr", u"r\xe9sum\xe9"]
+        )
+    history = BinaryClassifierHistory.objects.create(
+        ref=1,
+        initState=[True, False],
+        finalState=[],
+        )
+    history = BinaryClassifierHistory.objects.get(id=history.id)
+    self.assertEqual(history.initState, [True, False])
+    self.assertEqual(history.finalState, [])
+
+  def testDecimalRoundTrip(self):
+    field = ArrayField(model.DecimalField(maxDigits=5, decimalPlaces=3))
+    value = field.getDbPrepValue([Decimal("1"), Decimal("2.5")], connection)
+    with connection.cursor() as cursor:
+      # The column name picks the json converter like a jsontext column
+      cursor.execute('SELECT %s AS "value [jsontext]"', [value])
+      (row,) = cursor.fetchall()
+    self.assertEqual(
+        field.toPython(row[0]),
+        [Decimal("1.000"), Decimal("2.500")]
+        )
+
+  def testDeserializeOnAssignment(self):
+    adapter = Adapter(propertyLst='["stdOut"]')
+    self.assertEqual(adapter.propertyLst, ["stdOut"])
+    history = BinaryClassifierHistory(initState=["1", "0"])
+    self.assertEqual(history.initState, [True, False])
+
+  @skipUnlessDBFeature("supportsJson")
+  def testContainLookup(self):
+    self.assertEqual(
+        self._getNameLst(propertyLst__contains=["stdErr"]),
+        ["otherAdapter", "sampleAdapter"]
+        )
+    self.assertEqual(
+        self._getNameLst(propertyLst__contains=["stdOut", "stdErr"]),
+        ["sampleAdapter"]
+        )
+    self.assertEqual(
+        self._getNameLst(propertyLst__containedBy=["stdErr", "stdIn"]),
+        ["otherAdapter"]
+        )
+    self.assertEqual(
+        self._getNameLst(propertyLst__overlap=["stdOut", "stdIn"]),
+        ["sampleAdapter"]
+        )
+
+  @skipUnlessDBFeature("supportsJson")
+  def testTransform(self):
+    self.assertEqual(self._getNameLst(propertyLst__len=1), ["otherAdapter"])
+    self.assertEqual(self._getNameLst(propertyLst__1="stdErr"), ["sampleAdapter"])
+    self.assertEqual(
+        self._getNameLst(propertyLst__0_2=["stdOut", "stdErr"]),
+        ["sampleAdapter"]
+        )
+
+class MetadataRouterTestCase(SimpleTestCase):
+  def testRoute(self):
+    router = MetadataRouter("metadata")
+    self.assertEqual(router.dbForRead(Adapter), "metadata")
+    self.assertEqual(router.dbForWrite(Adapter), "metadata")
+    self.assertTrue(router.allowRelation(Adapter(), History()))
+    self.assertTrue(router.allowMigrate("metadata", History))
+    self.assertFalse(router.allowMigrate("default", History))
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+
+##### Theory lib #####
+
+##### Theory third-party lib #####
+
+##### Local app #####
+from .testPool import *
+
+##### Theory app #####
+
+##### Misc #####
+
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+import os
+import shutil
+import tempfile
+import threading
+
+##### Theory lib #####
+from theory.db.backends.pool import ConnectionPool, PoolTimeout
+from theory.db.utils import ConnectionHandler
+from theory.test.testcases import SimpleTestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('ConnectionPoolTestCase', 'PooledConnectionHandlerTestCase',)
+
+class DummyConnection(object):
+  def __init__(self):
+    self.isClosed = False
+
+  def close(self):
+    self.isClosed = True
+
+class ConnectionPoolTestCase(SimpleTestCase):
+  def setUp(self):
+    self.createdLst = []
+
+  def _connector(self):
+    conn = DummyConnection()
+    self.createdLst.append(conn)
+    return conn
+
+  def testReuse(self):
+    pool = ConnectionPool("default", maxSize=2)
+    (conn, isNew) = pool.acquire(self._connector)
+    self.assertTrue(isNew)
+    pool.release(conn)
+    (reusedConn, isNew) = pool.acquire(self._connector)
+    self.assertFalse(isNew)
+    self.assertIs(reusedConn, conn)
+    self.assertEqual(len(self.createdLst), 1)
+    self.assertEqual(pool.stats()["reused"], 1)
+
+  def testMinSize(self):
+    pool = ConnectionPool("default", minSize=2, maxSize=3)
+    pool.acquire(self._connector)
+    self.assertEqual(len(self.createdLst), 2)
+    self.assertEqual(pool.stats()["idle"], 1)
+
+  def testMaxSize(self):
+    pool = ConnectionPool("default", maxSize=2, timeout=0.01)
+    pool.acquire(self._connector)
+    pool.acquire(self._connector)
+    self.assertRaises(PoolTimeout, pool.acquire, self._connector)
+    stats = pool.stats()
+    self.assertEqual(stats["inUse"], 2)
+    self.assertEqual(stats["timeouts"], 1)
+
+  def testReleaseFromOtherThread(self):
+    pool = ConnectionPool("default", maxSize=1, timeout=5)
+    (conn, isNew) = pool.acquire(self._connector)
+    timer = threading.Timer(0.05, pool.release, (conn,))
+    timer.start()
+    try:
+      # The waiter is woken up by the release of the other thread
+      (reusedConn, isNew) = pool.acquire(self._connector)
+    finally:
+      timer.join()
+    self.assertIs(reusedConn, conn)
+    self.assertFalse(isNew)
+    self.assertEqual(pool.stats()["waited"], 1)
+    self.assertEqual(pool.stats()["timeouts"], 0)
+
+  def testHealthCheck(self):
+    pool = ConnectionPool("default", maxSize=1)
+    (conn, isNew) = pool.acquire(self._connector)
+    pool.release(conn)
+    (newConn, isNew) = pool.acquire(self._connector, lambda c: False)
+    self.assertTrue(isNew)
+    self.assertTrue(conn.isClosed)
+    self.assertEqual(pool.stats()["discarded"], 1)
+
+  def testMaxLifetime(self):
+    pool = ConnectionPool("default", maxSize=1, maxLifetime=0)
+    (conn, isNew) = pool.acquire(self._connector)
+    pool.release(conn)
+    self.assertTrue(conn.isClosed)
+    self.assertEqual(pool.stats()["size"], 0)
+
+  def testDiscardOnRelease(self):
+    pool = ConnectionPool("default", maxSize=1)
+    (conn, isNew) = pool.acquire(self._connector)
+    pool.release(conn, discard=True)
+    self.assertTrue(conn.isClosed)
+    self.assertEqual(pool.stats()["idle"], 0)
+
+class PooledConnectionHandlerTestCase(SimpleTestCase):
+  def setUp(self):
+    self.tmpDir = tempfile.mkdtemp()
+    self.connections = ConnectionHandler({
+      "default": {
+        "ENGINE": "theory.db.backends.sqlite3",
+        "NAME": os.path.join(self.tmpDir, "pool.sqlite3"),
+        "POOL": {"MAX_SIZE": 1, "TIMEOUT": 0.01},
+      }
+    })
+
+  def tearDown(self):
+    self.connections.closePools()
+    shutil.rmtree(self.tmpDir)
+
+  def testConnectionReuse(self):
+    conn = self.connections["default"]
+    with conn.cursor() as cursor:
+      cursor.execute("SELECT 1")
+    rawConn = conn.connection
+    conn.close()
+    self.assertIsNone(conn.connection)
+
+    with conn.cursor() as cursor:
+      cursor.execute("SELECT 1")
+    self.assertIs(conn.connection, rawConn)
+
+    stats = self.connections.poolStats()["default"]
+    self.assertEqual(stats["created"], 1)
+    self.assertEqual(stats["reused"], 1)
+    self.assertEqual(stats["inUse"], 1)
+    conn.close()
+    self.assertEqual(self.connections.poolStats()["default"]["idle"], 1)
+
+  def testPoolIsSharedPerAlias(self):
+    self.assertIs(
+      self.connections.getPool("default"),
+      self.connections["default"].pool
+    )
+
+  def testPoolLimit(self):
+    conn = self.connections["default"]
+    conn.ensureConnection()
+    pool = self.connections.getPool("default")
+    self.assertRaises(PoolTimeout, pool.acquire, lambda: None)
+    conn.close()
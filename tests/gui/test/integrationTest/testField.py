@@ -3,6 +3,7 @@
 from collections import OrderedDict
 import copy
 from inspect import isclass
+import json
 from ludibrio import Stub
 import os
 import sys
@@ -14,6 +15,9 @@ from theory.core.exceptions import ValidationError
 from theory.gui import field
 from theory.gui import widget
 from theory.gui.model import ModelChoiceField, ModelMultipleChoiceField
+from theory.db.model.query import QuerySet
+from theory.gui.transformer.idSelection import compressIdLst
+from theory.gui.transformer.theoryJSONEncoder import TheoryJSONEncoder
 from theory.gui.form import *
 from theory.gui.util import LocalFileObject
 from theory.test.testcases import TestCase
@@ -38,7 +42,7 @@ __all__ = ('AdapterFieldTestCase', 'BooleanFieldTestCase',
     'TypedChoiceFieldTestCase', 'TypedMultipleChoiceFieldTestCase',
     'URLFieldTestCase', 'PythonModuleFieldTestCase',
     'PythonClassFieldTestCase', 'ModelChoiceFieldTestCase',
-    'ModelMultipleChoiceFieldTestCase',
+    'ModelMultipleChoiceFieldTestCase', 'QuerysetFieldIdSelectionTestCase',
     )
 
 class FieldTestCaseBase(object):
@@ -612,6 +616,42 @@ class PythonClassFieldTestCase(FieldTestCaseBase, TestCase):
 #    self.field.model = None
 #    self.assertEqual(self.field.clean(self.field.finalData), initData)
 
+class QuerysetFieldIdSelectionTestCase(TestCase):
+  fixtures = ["adapter",]
+
+  def setUp(self):
+    self.field = field.QuerysetField(
+        autoImport=True,
+        app="theory.apps",
+        model="Adapter",
+        )
+    self.queryset = Adapter.objects.all()
+    self.pkLst = list(self.queryset.valuesList("id", flat=True))
+
+  def testQuerysetData(self):
+    data = self.field.toPython(self.queryset)
+    self.assertEqual(data, {"idRange": compressIdLst(self.pkLst)})
+    self.assertEqual(
+        sorted(i.id for i in self.field.clean(data)),
+        sorted(self.pkLst)
+        )
+
+  def testQuerysetLikeData(self):
+    # An object passing as a QuerySet without valuesList is iterated
+    with Stub(type=QuerySet, proxy=list(self.queryset)) as queryset:
+      pass
+    self.assertEqual(
+        self.field.toPython(queryset),
+        {"idRange": compressIdLst(self.pkLst)}
+        )
+
+  def testRepeatedIds(self):
+    pkLst = self.pkLst + self.pkLst[:1]
+    data = self.field.toPython(pkLst)
+    self.assertEqual(data, [str(i) for i in pkLst])
+    with self.assertRaises(ValidationError):
+      self.field.clean(data)
+
 class ModelChoiceFieldTestCase(FieldTestCaseBase, TestCase):
   # will NOT validate invalid data
   fieldKlass = ModelChoiceField
@@ -723,3 +763,29 @@ class ModelMultipleChoiceFieldTestCase(FieldTestCaseBase, TestCase):
     self.assertEqual(self.field.finalData, initData)
     with self.assertRaises(ValidationError):
       self.assertEqual(self.field.clean(self.field.finalData), initData)
+
+  def testIdRangeData(self):
+    pkLst = list(self.queryset.valuesList('pk', flat=True))
+    data = json.loads(json.dumps(
+        self.field.toPython(self.field.clean(pkLst)),
+        cls=TheoryJSONEncoder
+        ))
+    self.assertEqual(data, {"idRange": compressIdLst(pkLst)})
+    self.assertEqual(
+        list(self.field.clean(data)),
+        list(self.queryset)
+        )
+
+    with self.assertRaises(ValidationError):
+      self.field.clean({"idRange": [[max(pkLst) + 1, max(pkLst) + 100]]})
+
+  def testStoredFilterData(self):
+    self.field.isStoreFilter = True
+    queryset = self.queryset.filter(pk__gt=0)
+    data = self.field.toPython(queryset)
+    self.assertIn("query", data)
+    self.assertEqual(list(self.field.clean(data)), list(queryset))
+
+    data["sign"] = "0" * len(data["sign"])
+    with self.assertRaises(ValidationError):
+      self.field.clean(data)
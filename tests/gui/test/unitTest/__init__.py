@@ -6,6 +6,9 @@
 ##### Theory third-party lib #####
 
 ##### Local app #####
+from .testFormCache import *
+from .testIdSelection import *
+from .testScrollback import *
 
 ##### Theory app #####
 
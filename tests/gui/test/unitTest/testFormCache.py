@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+
+##### Theory lib #####
+from theory.gui.formCache import ParamFormCache
+from theory.test.testcases import SimpleTestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('ParamFormCacheTestCase',)
+
+class ParamFormCacheTestCase(SimpleTestCase):
+  def testLeastRecentlyUsedEviction(self):
+    evictedLst = []
+    o = ParamFormCache(maxSize=2, evictFxn=evictedLst.append)
+    o.add("a", "formA")
+    o.add("b", "formB")
+    self.assertEqual(o.get("a"), "formA")
+    o.add("c", "formC")
+    self.assertEqual(evictedLst, ["formB"])
+    self.assertNotIn("b", o)
+    self.assertTrue(o.isCached("formA"))
+    self.assertEqual(len(o), 2)
+
+  def testPopDoesNotEvict(self):
+    evictedLst = []
+    o = ParamFormCache(maxSize=2, evictFxn=evictedLst.append)
+    o.add("a", "formA")
+    self.assertEqual(o.pop("a"), "formA")
+    self.assertIsNone(o.get("a"))
+    self.assertEqual(evictedLst, [])
+    o.add("b", "formB")
+    o.clear()
+    self.assertEqual(evictedLst, ["formB"])
+
+  def testDisabled(self):
+    o = ParamFormCache(maxSize=0)
+    o.add("a", "formA")
+    self.assertIsNone(o.get("a"))
+
+  def testStats(self):
+    o = ParamFormCache(maxSize=2)
+    o.recordLatency(False, 0.4)
+    o.recordLatency(True, 0.1)
+    o.recordLatency(True, 0.3)
+    stats = o.stats()
+    self.assertEqual(stats["hitNum"], 2)
+    self.assertEqual(stats["missNum"], 1)
+    self.assertAlmostEqual(stats["avgHitTime"], 0.2)
+    self.assertAlmostEqual(stats["avgMissTime"], 0.4)
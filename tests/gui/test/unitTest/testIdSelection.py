@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+
+##### Theory lib #####
+from theory.gui.transformer.idSelection import (
+    compressIdLst,
+    decodeIdLst,
+    encodeIdLst,
+    mergeRangeLst,
+    selectionToTxt,
+    txtToSelection,
+    )
+from theory.test.testcases import SimpleTestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('IdSelectionTestCase',)
+
+class IdSelectionTestCase(SimpleTestCase):
+  def testCompressIdLst(self):
+    self.assertEqual(
+        compressIdLst([5, "1", 2, 3, 3, 9, 10, 11]),
+        [[1, 3], [5, 5], [9, 11]]
+        )
+    self.assertEqual(compressIdLst([]), [])
+    self.assertIsNone(compressIdLst(["invalidId", 1]))
+    self.assertIsNone(compressIdLst([1, 2, 2], isDupAllowed=False))
+
+  def testEncodeDecode(self):
+    idLst = range(1, 100001) + [200000]
+    data = encodeIdLst(idLst)
+    self.assertEqual(data, {"idRange": [[1, 100000], [200000, 200000]]})
+    self.assertEqual(decodeIdLst(data), idLst)
+    # The former format is still understood
+    self.assertEqual(decodeIdLst(["1", "2"]), ["1", "2"])
+    self.assertEqual(encodeIdLst(["a", "b"]), ["a", "b"])
+    # The repeated ids are kept
+    self.assertEqual(encodeIdLst([1, 2, 2]), ["1", "2", "2"])
+
+  def testMergeRangeLst(self):
+    self.assertEqual(
+        mergeRangeLst([[8, 9], [1, 3], [4, 4], [2, 5]]),
+        [[1, 5], [8, 9]]
+        )
+
+  def testTxt(self):
+    data = {"idRange": [[1, 100], [205, 205]]}
+    self.assertEqual(selectionToTxt(data), "1-100,205")
+    self.assertEqual(txtToSelection("1-100,205"), data)
+    self.assertEqual(txtToSelection("3, 1,2"), [3, 1, 2])
+    self.assertEqual(selectionToTxt([3, 1, 2]), "3,1,2")
+    self.assertRaises(ValueError, txtToSelection, "1-a")
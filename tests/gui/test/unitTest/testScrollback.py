@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+
+##### Theory lib #####
+from theory.gui.scrollback import Scrollback
+from theory.test.testcases import SimpleTestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ('ScrollbackTestCase',)
+
+class ScrollbackTestCase(SimpleTestCase):
+  def testAppendChunk(self):
+    o = Scrollback(maxLineNum=10)
+    o.append("a")
+    o.append("b\nc")
+    o.append("\nd\n")
+    self.assertEqual(o.lineNum, 3)
+    self.assertEqual(o.getWindow(10), ["ab", "c", "d"])
+    o.append("e")
+    self.assertEqual(o.lineNum, 4)
+    self.assertEqual(o.getWindow(2), ["d", "e"])
+
+  def testRingBuffer(self):
+    o = Scrollback(maxLineNum=3)
+    o.append("\n".join(str(i) for i in range(10)) + "\n")
+    self.assertEqual(o.lineNum, 3)
+    self.assertEqual(o.droppedLineNum, 7)
+    self.assertEqual(o.getWindow(5), ["7", "8", "9"])
+
+  def testWindowOffset(self):
+    o = Scrollback(maxLineNum=100)
+    o.append("\n".join(str(i) for i in range(50)))
+    self.assertEqual(o.getWindow(3), ["47", "48", "49"])
+    self.assertEqual(o.getWindow(3, offset=10), ["37", "38", "39"])
+    self.assertEqual(o.getWindow(3, offset=49), ["0"])
+
+  def testClear(self):
+    o = Scrollback(maxLineNum=10, lineBreak="<br/>")
+    o.append("a<br/>b")
+    version = o.version
+    o.clear()
+    self.assertEqual(o.lineNum, 0)
+    self.assertEqual(o.getWindow(5), [])
+    self.assertGreater(o.version, version)
+
+  def testScrollBack(self):
+    o = Scrollback(maxLineNum=100)
+    o.append("\n".join(str(i) for i in range(50)))
+    self.assertTrue(o.scroll(10, 3))
+    self.assertEqual(o.getWindow(3), ["37", "38", "39"])
+
+    # The window stays on the same lines while more output comes
+    o.append("\n50\n51")
+    self.assertEqual(o.getWindow(3), ["37", "38", "39"])
+
+    # Up to the first line and back to the last one
+    o.scroll(1000, 3)
+    self.assertEqual(o.getWindow(3), ["0", "1", "2"])
+    self.assertFalse(o.scroll(1, 3))
+    o.scroll(-1000, 3)
+    self.assertEqual(o.getWindow(3), ["49", "50", "51"])
+    self.assertFalse(o.scroll(-1, 3))
+
+  def testScrollBackRingBuffer(self):
+    o = Scrollback(maxLineNum=5)
+    o.append("\n".join(str(i) for i in range(5)) + "\n")
+    o.scroll(2, 2)
+    self.assertEqual(o.getWindow(2), ["1", "2"])
+    o.append("5\n")
+    self.assertEqual(o.getWindow(2), ["1", "2"])
+    # The lines dropped by the ring buffer can't be shown anymore
+    o.append("6\n7\n")
+    self.assertEqual(o.getWindow(2), ["3"])
+    o.clear()
+    self.assertEqual(o.offset, 0)
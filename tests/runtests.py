@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 from argparse import ArgumentParser
 import logging
+import multiprocessing
 import os
 import shutil
 import subprocess
@@ -179,7 +180,8 @@ def teardown(state):
     setattr(settings, key, value)
 
 
-def theoryTests(verbosity, interactive, failfast, testLabels):
+def theoryTests(verbosity, interactive, failfast, testLabels, parallel=0,
+    keepdb=False):
   state = setup(verbosity, testLabels)
   extraTests = []
 
@@ -192,6 +194,8 @@ def theoryTests(verbosity, interactive, failfast, testLabels):
     verbosity=verbosity,
     interactive=interactive,
     failfast=failfast,
+    parallel=parallel,
+    keepdb=keepdb,
   )
   # Catch warnings thrown in test DB setup -- remove in Theory 1.9
   with warnings.catch_warnings():
@@ -317,6 +321,15 @@ if __name__ == "__main__":
     '--failfast', action='store_true', dest='failfast', default=False,
     help='Tells Theory to stop running the test suite after first failed '
        'test.')
+  parser.add_argument(
+    '--parallel', dest='parallel', nargs='?', default=0, type=int,
+    const=multiprocessing.cpu_count(), metavar='N',
+    help='Run the test cases in N processes, each one with its own clone '
+       'of the test database. Defaults to the number of CPUs if N is '
+       'omitted.')
+  parser.add_argument(
+    '--keepdb', action='store_true', dest='keepdb', default=False,
+    help='Tells Theory to preserve the test database between runs.')
   parser.add_argument(
     '--settings',
     help='Python path to settings module, e.g. "myproject.settings". If '
@@ -346,6 +359,7 @@ if __name__ == "__main__":
     pairedTests(options.pair, options, options.modules)
   else:
     failures = theoryTests(options.verbosity, options.interactive,
-                options.failfast, options.modules)
+                options.failfast, options.modules, options.parallel,
+                options.keepdb)
     if failures:
       sys.exit(bool(failures))
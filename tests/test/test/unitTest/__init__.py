@@ -7,6 +7,9 @@
 
 ##### Local app #####
 from .util import *
+from .bench import *
+from .runner import *
+from .testcases import *
 
 ##### Theory app #####
 
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+from StringIO import StringIO
+
+##### Theory lib #####
+from theory.conf import settings
+from theory.db import connections, DEFAULT_DB_ALIAS
+from theory.test.bench import (
+    BenchReport,
+    BenchResult,
+    BenchSkipped,
+    BenchSuite,
+    benchSuite,
+    useTestDatabases,
+    )
+from theory.test.testcases import SimpleTestCase, TestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = (
+    'BenchSuiteTestCase',
+    'BenchReportTestCase',
+    'UseTestDatabasesTestCase',
+    'RegisteredBenchmarkTestCase',
+    )
+
+class BenchSuiteTestCase(SimpleTestCase):
+  def setUp(self):
+    self.suite = BenchSuite()
+    self.callLst = []
+
+    def setUpFxn():
+      self.callLst.append("setUp")
+      return "state"
+
+    def tearDownFxn(state):
+      self.callLst.append("tearDown:" + state)
+
+    @self.suite.register(
+        "group.first",
+        setUpFxn=setUpFxn,
+        tearDownFxn=tearDownFxn,
+        innerLoopNum=3,
+        )
+    def benchFirst(state):
+      self.callLst.append(state)
+
+    @self.suite.register("group.second")
+    def benchSecond(state):
+      pass
+
+    def skippedSetUpFxn():
+      raise BenchSkipped("missing toolkit")
+
+    @self.suite.register("other", setUpFxn=skippedSetUpFxn)
+    def benchOther(state):
+      self.callLst.append("other")
+
+  def testRunWarmupAndRepetition(self):
+    report = self.suite.run(["group.first"], repeatNum=2, warmupNum=1)
+    self.assertEqual([i.name for i in report], ["group.first"])
+    # 1 warm-up and 2 repetitions of 3 inner loops
+    self.assertEqual(
+        self.callLst,
+        ["setUp"] + ["state"] * 7 + ["tearDown:state"]
+        )
+    result = report.getResult("group.first")
+    self.assertEqual(len(result.timeLst), 2)
+    self.assertFalse(result.isSkipped)
+
+  def testSelectByGroup(self):
+    self.assertEqual(
+        [i.name for i in self.suite.select(["group"])],
+        ["group.first", "group.second"]
+        )
+    self.assertEqual(len(self.suite.select()), 3)
+    self.assertEqual(self.suite.select(["grou"]), [])
+
+  def testSkippedBenchmark(self):
+    report = self.suite.run(["other"])
+    result = report.getResult("other")
+    self.assertTrue(result.isSkipped)
+    self.assertEqual(result.skipReason, "missing toolkit")
+    self.assertNotIn("other", self.callLst)
+    self.assertIn("skipped: missing toolkit", report.render())
+
+class BenchReportTestCase(SimpleTestCase):
+  def _getReport(self, timeLst):
+    return BenchReport(
+        [
+          BenchResult("fast", [0.001, 0.003, 0.002]),
+          BenchResult("slow", timeLst),
+          BenchResult("gui", skipReason="missing toolkit"),
+        ],
+        {"vendor": "sqlite"},
+        )
+
+  def testStatistic(self):
+    result = BenchResult("a", [0.004, 0.001, 0.003, 0.002])
+    self.assertEqual(result.min, 0.001)
+    self.assertEqual(result.median, 0.0025)
+    self.assertAlmostEqual(result.mean, 0.0025)
+    self.assertTrue(result.stdev > 0)
+    self.assertEqual(BenchResult("b").median, None)
+
+  def testJsonRoundTrip(self):
+    report = self._getReport([0.01, 0.01])
+    stream = StringIO()
+    report.dump(stream)
+    stream.seek(0)
+    loadedReport = BenchReport.load(stream)
+    self.assertEqual(loadedReport.meta, {"vendor": "sqlite"})
+    self.assertEqual(
+        [i.toDict() for i in loadedReport],
+        [i.toDict() for i in report]
+        )
+
+  def testCompareWithBaseline(self):
+    baseline = self._getReport([0.010, 0.010])
+    report = self._getReport([0.015, 0.015])
+    comparisonLst = report.compare(baseline, threshold=0.1)
+    self.assertEqual(
+        [(i[0], i[-1]) for i in comparisonLst],
+        [("fast", False), ("slow", True)]
+        )
+    self.assertAlmostEqual(comparisonLst[1][3], 1.5)
+    self.assertIn("REGRESSION", report.render(comparisonLst))
+
+    report = self._getReport([0.0105, 0.0105])
+    self.assertFalse(report.compare(baseline, threshold=0.1)[1][-1])
+
+class DummyRunner(object):
+  """Point the default database to a test database as createTestDb does"""
+  def __init__(self, isSetupFailed=False):
+    self.isSetupFailed = isSetupFailed
+    self.teardownLst = []
+
+  def setupDatabases(self):
+    settings.DATABASES[DEFAULT_DB_ALIAS]["NAME"] = "benchTestDb"
+    connections[DEFAULT_DB_ALIAS].settingsDict["NAME"] = "benchTestDb"
+    if(self.isSetupFailed):
+      raise RuntimeError("setup failed")
+    return ("oldConfig", [])
+
+  def teardownDatabases(self, oldConfig):
+    self.teardownLst.append(oldConfig)
+
+class UseTestDatabasesTestCase(SimpleTestCase):
+  def setUp(self):
+    self.oldName = connections[DEFAULT_DB_ALIAS].settingsDict["NAME"]
+
+  def _assertNameRestored(self):
+    self.assertEqual(
+        connections[DEFAULT_DB_ALIAS].settingsDict["NAME"],
+        self.oldName
+        )
+    self.assertEqual(
+        settings.DATABASES[DEFAULT_DB_ALIAS]["NAME"],
+        self.oldName
+        )
+
+  def testRestoreAfterBenchmarkFailed(self):
+    runner = DummyRunner()
+    with self.assertRaises(ValueError):
+      with useTestDatabases(runner) as oldConfig:
+        self.assertEqual(oldConfig, ("oldConfig", []))
+        self.assertEqual(
+            connections[DEFAULT_DB_ALIAS].settingsDict["NAME"],
+            "benchTestDb"
+            )
+        raise ValueError("benchmark failed")
+    self.assertEqual(runner.teardownLst, [("oldConfig", [])])
+    self._assertNameRestored()
+
+  def testRestoreAfterSetupFailed(self):
+    runner = DummyRunner(isSetupFailed=True)
+    with self.assertRaises(RuntimeError):
+      with useTestDatabases(runner):
+        pass
+    self.assertEqual(runner.teardownLst, [])
+    self._assertNameRestored()
+
+class RegisteredBenchmarkTestCase(TestCase):
+  def testRunEveryBenchmarkOnce(self):
+    # Register theory's own benchmarks
+    import theory.test.benchmarks
+
+    # The warm-up makes each benchmark run twice, so a benchmark which
+    # cannot be repeated on the same database fails here
+    report = benchSuite.run(repeatNum=1, warmupNum=1)
+    self.assertEqual(
+        [i.name for i in report],
+        [i.name for i in benchSuite.select()]
+        )
+    self.assertIn("probeApps", [i.name for i in report])
+    for result in report:
+      if(not result.isSkipped):
+        self.assertEqual(len(result.timeLst), 1, result.name)
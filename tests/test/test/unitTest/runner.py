@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+import multiprocessing
+import os
+import unittest
+
+##### Theory lib #####
+from theory.test.runner import (
+    ParallelTestSuite,
+    partitionSuiteByCase,
+    RemoteTestError,
+    RemoteTestResult,
+    replayEventLst,
+    )
+from theory.test.testcases import SimpleTestCase
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = (
+    'PartitionSuiteByCaseTestCase',
+    'RemoteTestResultTestCase',
+    'ParallelTestSuiteTestCase',
+    )
+
+def _getDummyTestCaseKlassTuple():
+  """
+  The test cases being run by the tests below. They fail on purpose, so they
+  are built on demand to avoid being collected by the test loader.
+  """
+  class DummyFirstTestCase(unittest.TestCase):
+    def testA(self):
+      pass
+
+    def testB(self):
+      self.fail("Expected failure")
+
+  class DummySecondTestCase(unittest.TestCase):
+    def testC(self):
+      raise ValueError("Expected error")
+
+    @unittest.skip("Expected skip")
+    def testD(self):
+      pass
+
+  return (DummyFirstTestCase, DummySecondTestCase)
+
+class PartitionSuiteByCaseTestCase(SimpleTestCase):
+  def testOneSubsuitePerTestCase(self):
+    (DummyFirstTestCase, DummySecondTestCase) = _getDummyTestCaseKlassTuple()
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite([
+      loader.loadTestsFromTestCase(DummyFirstTestCase),
+      unittest.TestSuite([
+        loader.loadTestsFromTestCase(DummySecondTestCase),
+        ]),
+      ])
+    subsuiteLst = partitionSuiteByCase(suite)
+    self.assertEqual(len(subsuiteLst), 2)
+    self.assertEqual(
+        [type(test) for test in subsuiteLst[0]],
+        [DummyFirstTestCase, DummyFirstTestCase]
+        )
+    self.assertEqual(
+        [type(test) for test in subsuiteLst[1]],
+        [DummySecondTestCase, DummySecondTestCase]
+        )
+
+class RemoteTestResultTestCase(SimpleTestCase):
+  def setUp(self):
+    (self.firstKlass, self.secondKlass) = _getDummyTestCaseKlassTuple()
+
+  def _runRemotely(self, testCaseKlass):
+    suite = unittest.TestLoader().loadTestsFromTestCase(testCaseKlass)
+    testLst = list(suite)
+    remoteResult = RemoteTestResult(testLst)
+    suite.run(remoteResult)
+    result = unittest.TestResult()
+    replayEventLst(result, testLst, remoteResult.eventLst)
+    return (remoteResult, result)
+
+  def testReplayFailure(self):
+    (remoteResult, result) = self._runRemotely(self.firstKlass)
+    self.assertEqual(result.testsRun, 2)
+    self.assertEqual(len(result.failures), 1)
+    self.assertEqual(result.failures[0][0].id(), remoteResult.failures[0][0].id())
+    self.assertIn("Expected failure", result.failures[0][1])
+    self.assertIn(RemoteTestError.__name__, result.failures[0][1])
+
+  def testReplayErrorAndSkip(self):
+    (remoteResult, result) = self._runRemotely(self.secondKlass)
+    self.assertEqual(result.testsRun, 2)
+    self.assertEqual(len(result.errors), 1)
+    self.assertIn("Expected error", result.errors[0][1])
+    self.assertEqual(len(result.skipped), 1)
+    self.assertEqual(result.skipped[0][1], "Expected skip")
+
+  def testEventIsPicklable(self):
+    import pickle
+    (remoteResult, result) = self._runRemotely(self.secondKlass)
+    self.assertEqual(
+        pickle.loads(pickle.dumps(remoteResult.eventLst)),
+        remoteResult.eventLst
+        )
+
+  def testStopReplayOnFailfast(self):
+    suite = unittest.TestLoader().loadTestsFromTestCase(self.firstKlass)
+    testLst = list(suite)
+    remoteResult = RemoteTestResult(testLst)
+    suite.run(remoteResult)
+    result = unittest.TestResult()
+    result.failfast = True
+    self.assertFalse(replayEventLst(result, testLst, remoteResult.eventLst))
+
+class ParallelTestSuiteTestCase(SimpleTestCase):
+  def setUp(self):
+    if(multiprocessing.current_process().daemon):
+      # A worker of the pool is not allowed to start another pool
+      self.skipTest("Already run in a parallel worker")
+
+  def testRunInWorkerProcess(self):
+    (DummyFirstTestCase, DummySecondTestCase) = _getDummyTestCaseKlassTuple()
+    mainPid = os.getpid()
+
+    class DummyThirdTestCase(unittest.TestCase):
+      def testE(self):
+        self.assertNotEqual(os.getpid(), mainPid)
+
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite([
+      loader.loadTestsFromTestCase(DummyFirstTestCase),
+      loader.loadTestsFromTestCase(DummySecondTestCase),
+      loader.loadTestsFromTestCase(DummyThirdTestCase),
+      ])
+    suite = ParallelTestSuite(partitionSuiteByCase(suite), 2)
+    result = unittest.TestResult()
+    suite.run(result)
+
+    self.assertEqual(result.testsRun, 5)
+    self.assertEqual(
+        [test.id().split(".")[-1] for (test, err) in result.failures],
+        ["testB"]
+        )
+    self.assertIn("Expected failure", result.failures[0][1])
+    self.assertEqual(
+        [test.id().split(".")[-1] for (test, err) in result.errors],
+        ["testC"]
+        )
+    self.assertEqual(
+        [(test.id().split(".")[-1], reason)
+          for (test, reason) in result.skipped],
+        [("testD", "Expected skip")]
+        )
+
+  def testStopOnFailfast(self):
+    (DummyFirstTestCase, DummySecondTestCase) = _getDummyTestCaseKlassTuple()
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite([
+      loader.loadTestsFromTestCase(DummyFirstTestCase),
+      loader.loadTestsFromTestCase(DummySecondTestCase),
+      ])
+    suite = ParallelTestSuite(partitionSuiteByCase(suite), 2, failfast=True)
+    result = unittest.TestResult()
+    result.failfast = True
+    suite.run(result)
+
+    self.assertTrue(result.shouldStop)
+    self.assertEqual(len(result.failures) + len(result.errors), 1)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+import os
+import shutil
+import tempfile
+
+##### Theory lib #####
+from theory.apps.command import loaddata
+from theory.apps.model import Adapter, Mood
+from theory.core import serializers
+from theory.db import DEFAULT_DB_ALIAS
+from theory.test import testcases
+from theory.test.testcases import TestCase, TransactionTestCase
+from theory.test.util import overrideSettings
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = (
+    'ClassLevelFixtureTestCase',
+    'FixtureCacheTestCase',
+    'NonTransactionalFixtureSetupTestCase',
+    )
+
+class ClassLevelFixtureTestCase(TestCase):
+  fixtures = ["adapter",]
+
+  @classmethod
+  def setUpTestData(cls):
+    cls.mood = Mood.objects.create(name="classLevel")
+
+  def testFixtureIsLoadedOnce(self):
+    self.assertEqual(Adapter.objects.count(), 7)
+    self.assertTrue(Mood.objects.filter(pk=self.mood.pk).exists())
+    self.assertTrue(
+        any(
+          key[0].endswith("adapter.json")
+          for key in loaddata._fixtureObjCache
+          )
+        )
+
+  def testChangeIsRolledBackA(self):
+    self._assertChangeIsRolledBack()
+
+  def testChangeIsRolledBackB(self):
+    self._assertChangeIsRolledBack()
+
+  def _assertChangeIsRolledBack(self):
+    # Whichever runs second must not see the change of the first one
+    self.assertFalse(Mood.objects.filter(name="perTest").exists())
+    self.assertEqual(Mood.objects.count(), 4)
+    self.assertTrue(Adapter.objects.filter(name="Terminal").exists())
+    Mood.objects.create(name="perTest")
+    Adapter.objects.filter(name="Terminal").update(name="Renamed")
+
+class FixtureCacheTestCase(TestCase):
+  def setUp(self):
+    self.tmpDir = tempfile.mkdtemp()
+    self.addCleanup(shutil.rmtree, self.tmpDir)
+    self.fixturePath = os.path.join(self.tmpDir, "cachedAdapter.json")
+    shutil.copy(
+        os.path.join(
+          os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.dirname(os.path.abspath(__file__))
+          ))),
+          "testBase",
+          "fixture",
+          "adapter.json"
+          ),
+        self.fixturePath
+        )
+
+    # Count how many times the fixture is parsed
+    self.parseNum = 0
+    deserialize = serializers.deserialize
+
+    def countedDeserialize(*args, **kwargs):
+      self.parseNum += 1
+      return deserialize(*args, **kwargs)
+
+    serializers.deserialize = countedDeserialize
+    self.addCleanup(setattr, serializers, "deserialize", deserialize)
+
+  def _load(self):
+    # The objects saved by the previous load are gone, as if rolled back
+    Adapter.objects.all().delete()
+    cmd = loaddata.Loaddata()
+    cmd.paramForm = cmd.ParamForm()
+    cmd.paramForm.fields["fixtureLabelLst"].finalData = ["cachedAdapter",]
+    cmd.paramForm.fields["verbosity"].finalData = 0
+    cmd.paramForm.fields["appLabel"].finalData = None
+    cmd.paramForm.fields["database"].finalData = DEFAULT_DB_ALIAS
+    cmd.paramForm.fields["isCacheFixture"].finalData = True
+    cmd.paramForm.isValid()
+    with overrideSettings(FIXTURE_DIRS=[self.tmpDir,]):
+      cmd.run()
+
+  def _getCacheKeyLst(self):
+    return [
+        key for key in loaddata._fixtureObjCache
+        if key[0]==self.fixturePath
+        ]
+
+  def testRestoreFromCache(self):
+    self._load()
+    adapterLst = list(Adapter.objects.orderBy("pk").valuesList("pk", "name"))
+    self.assertEqual(len(adapterLst), 7)
+    self.assertEqual(self.parseNum, 1)
+
+    self._load()
+    self.assertEqual(self.parseNum, 1)
+    self.assertEqual(
+        list(Adapter.objects.orderBy("pk").valuesList("pk", "name")),
+        adapterLst
+        )
+    self.assertEqual(len(self._getCacheKeyLst()), 1)
+
+  def testModifiedFixtureIsParsedAgain(self):
+    self._load()
+    mtime = os.path.getmtime(self.fixturePath)
+    os.utime(self.fixturePath, (mtime + 10, mtime + 10))
+    self._load()
+    self.assertEqual(self.parseNum, 2)
+    self.assertEqual(Adapter.objects.count(), 7)
+    # The objects of the previous content are dropped
+    self.assertEqual(len(self._getCacheKeyLst()), 1)
+
+  def testClearedByTeardown(self):
+    from theory.test.util import teardownTestEnvironment
+
+    self._load()
+    self.assertEqual(len(self._getCacheKeyLst()), 1)
+    teardownTestEnvironment()
+    self.assertEqual(loaddata._fixtureObjCache, {})
+
+class NonTransactionalFixtureSetupTestCase(TestCase):
+  def testFixturesLoadedBeforeTestData(self):
+    callLst = []
+
+    class DummyTestCase(TestCase):
+      @classmethod
+      def setUpTestData(cls):
+        callLst.append("setUpTestData")
+
+      def runTest(self):
+        pass
+
+    def fixtureSetup(self):
+      callLst.append("fixtures")
+
+    oldSupportFxn = testcases.connectionsSupportTransactions
+    oldFixtureSetup = TransactionTestCase._fixtureSetup
+    testcases.connectionsSupportTransactions = lambda: False
+    TransactionTestCase._fixtureSetup = fixtureSetup
+    try:
+      DummyTestCase()._fixtureSetup()
+    finally:
+      testcases.connectionsSupportTransactions = oldSupportFxn
+      TransactionTestCase._fixtureSetup = oldFixtureSetup
+    self.assertEqual(callLst, ["fixtures", "setUpTestData"])
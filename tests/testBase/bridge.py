@@ -17,8 +17,17 @@ class Bridge(TheoryBridge):
   """It is just a mock object. This fxn must be synced with the original bridge.
   Instead of delay(), the AsyncCommand is run as run() to skip the celery setup.
   """
-  def _executeCommand(self, cmd, cmdModel, uiParam={}):
-    if(cmdModel.runMode==cmdModel.RUN_MODE_ASYNC):
+  def _executeCommand(
+      self,
+      cmd,
+      cmdModel,
+      uiParam={},
+      forceSync=False,
+      runMode=None
+      ):
+    if runMode is None:
+      runMode = cmdModel.runMode
+    if(runMode==cmdModel.RUN_MODE_ASYNC):
       paramFormData = json.loads(cmd.paramForm.toJson())
       cmd.run(paramFormData=paramFormData)
     else:
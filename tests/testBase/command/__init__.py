@@ -11,6 +11,8 @@ from .simpleChain2 import SimpleChain2
 from .asyncChain1 import AsyncChain1
 from .asyncChain2 import AsyncChain2
 from .asyncCompositeChain1 import AsyncCompositeChain1
+from .streamChain1 import StreamChain1
+from .streamChain2 import StreamChain2
 
 ##### Theory app #####
 
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+
+##### Theory lib #####
+from theory.apps.command.baseCommand import SimpleCommand
+
+##### Theory third-party lib #####
+
+##### Local app #####
+from .baseChain import BaseChain
+
+##### Theory app #####
+
+##### Misc #####
+
+class StreamChain1(BaseChain, SimpleCommand):
+  name = "streamChain1"
+  verboseName = "streamChain1"
+  _gongs = ["FilenameList", ]
+  _streamGongs = ["FilenameList", ]
+  itemNum = 10
+
+  def _generate(self):
+    self.producedLst = []
+    for i in range(self.itemNum):
+      self.producedLst.append(i)
+      yield "file%d" % i
+
+  def run(self, uiParam={}):
+    if(self.isGongStreamed("FilenameList")):
+      self._filenameLst = self._generate()
+    else:
+      self._filenameLst = list(self._generate())
+    self._stdOut = "streamChain1"
+
+  @property
+  def filenameLst(self):
+    return self._filenameLst
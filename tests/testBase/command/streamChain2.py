@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+##### System wide lib #####
+
+##### Theory lib #####
+from theory.apps.command.baseCommand import SimpleCommand
+
+##### Theory third-party lib #####
+
+##### Local app #####
+from .baseChain import BaseChain
+
+##### Theory app #####
+
+##### Misc #####
+
+class StreamChain2(BaseChain, SimpleCommand):
+  name = "streamChain2"
+  verboseName = "streamChain2"
+  _notations = ["FilenameList", ]
+  _streamNotations = ["FilenameList", ]
+  filenameLst = ()
+
+  def run(self, uiParam={}):
+    self.consumedLst = []
+    for filename in self.filenameLst:
+      self.consumedLst.append(filename)
+    self._stdOut = "streamChain2"
@@ -15,6 +15,8 @@ from abc import ABCMeta, abstractmethod
 
 class BaseAdapter(object):
   abstract = True
+  # The properties which can be streamed to the next command
+  streamPropertyLst = ()
 
   def toDb(self):
     """This function is being used when the conversion needs to be
@@ -15,6 +15,16 @@ from .terminalAdapter import TerminalAdapter
 
 
 class FilenameListAdapter(TerminalAdapter):
+  streamPropertyLst = ("filenameLst",)
+
+  @property
+  def filenameLst(self):
+    return self._filenameLst
+
+  @filenameLst.setter
+  def filenameLst(self, filenameLst):
+    self._filenameLst = filenameLst
+
   @property
   def files(self):
     return self._files
@@ -3,6 +3,7 @@
 ##### System wide lib #####
 
 ##### Theory lib #####
+from theory.core.modelCatalog import modelCatalog
 from theory.gui.gtk.spreadsheet import SpreadsheetBuilder
 from theory.gui.transformer import (
     GtkSpreadsheetModelDataHandler,
@@ -98,7 +99,7 @@ class QuerysetAsSpreadsheetAdapter(BaseUIAdapter):
             newDataRow,
             newQueryset,
             columnHandlerLabel,
-            self.appModel.fieldParamMap.all(),
+            modelCatalog.get(self.appModel).fieldParamLst,
             )
       else:
         self.queryset = []
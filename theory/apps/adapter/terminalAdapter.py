@@ -56,6 +56,12 @@ class TerminalAdapter(BaseUIAdapter):
 
   def render(self, *args, **kwargs):
     super(TerminalAdapter, self).render(*args, **kwargs)
+    stdOutAppender = kwargs["uiParam"].get("stdOutAppenderFxn")
+    if(stdOutAppender is not None):
+      # Only the visible lines are rendered by the terminal
+      stdOutAppender(self.stdOut, isReset=True)
+      return
+
     bx = kwargs["uiParam"]["bx"]
     bx.clear()
 
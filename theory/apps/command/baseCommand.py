@@ -7,6 +7,7 @@ from theory.gui import field
 from theory.gui.form import CommandForm, Form
 
 ##### Theory lib #####
+from theory.core.signals import commandStarted, commandFinished
 
 ##### Theory third-party lib #####
 
@@ -43,6 +44,17 @@ class _BaseCommand(object):
   _gongs = []
   _notations = []
   _drums = {}
+  # The gongs whose properties may hold a generator, and the notations able
+  # to consume them while being produced. When both sides of a bridge are
+  # streamed, the adapter's streamPropertyLst is handed over through a
+  # bounded StreamChannel which is set on the next command as an attribute
+  # instead of going through its ParamForm.
+  _streamGongs = []
+  _streamNotations = []
+  # The streamed gongs which the next command consumes while being
+  # produced, set by Bridge.executePipeline() before run(). Any other gong
+  # should be materialized.
+  _streamedGongs = ()
   isSaveToHistory = True
 
   # stderr should be seen in log file
@@ -92,6 +104,9 @@ class _BaseCommand(object):
   def verbosity(self, verbosity):
     self._verbosity = verbosity
 
+  def isGongStreamed(self, gongName):
+    return gongName in self._streamedGongs
+
   @property
   def notations(self):
     return self._notations
@@ -177,3 +192,16 @@ class AsyncCommand(Task, _BaseCommand):
     for k,v in paramFormData.iteritems():
       self.paramForm.fields[k].finalData = v
     self.paramForm.isValid()
+
+  # Celery hooks, only called by the worker. They give async commands the
+  # same commandStarted/commandFinished scope as Bridge gives sync commands.
+  def __call__(self, *args, **kwargs):
+    commandStarted.send(sender=self.__class__, cmd=self)
+    return super(AsyncCommand, self).__call__(*args, **kwargs)
+
+  def after_return(self, status, *args, **kwargs):
+    commandFinished.send(
+        sender=self.__class__,
+        cmd=self,
+        isSuccess=(status=="SUCCESS")
+        )
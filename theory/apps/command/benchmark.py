@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+##### System wide lib #####
+
+##### Theory lib #####
+from theory.apps.command.baseCommand import SimpleCommand
+from theory.core.exceptions import CommandError
+from theory.db import connections, DEFAULT_DB_ALIAS
+from theory.gui import field
+from theory.test.bench import BenchReport, benchSuite, useTestDatabases
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+class Benchmark(SimpleCommand):
+  """
+  Time theory's hot paths, e.x: the command line parser, the forms, the
+  bridge and the queryset, against a test database. The results can be
+  written as json and be compared with the json of a previous run to find
+  the regressions.
+  """
+  name = "benchmark"
+  verboseName = "benchmark"
+  _notations = ["Command",]
+  _drums = {"Terminal": 1,}
+
+  class ParamForm(SimpleCommand.ParamForm):
+    benchLabelLst = field.ListField(
+        field.TextField(maxLength=64),
+        label="Benchmark Label",
+        helpText=(
+          "Run the benchmarks named by or starting with the labels, e.x: ",
+          "queryset or queryset.iterate. All benchmarks are run if empty."
+          ),
+        initData=[],
+        required=False,
+        )
+    repeatNum = field.IntegerField(
+        label="Repeat number",
+        helpText="How many times every benchmark is timed",
+        initData=5,
+        minValue=1,
+        required=False,
+        )
+    warmupNum = field.IntegerField(
+        label="Warm-up number",
+        helpText="How many times every benchmark runs before being timed",
+        initData=1,
+        minValue=0,
+        required=False,
+        )
+    output = field.TextField(
+        label="output",
+        helpText="Specifies file to which the json results are written.",
+        initData="",
+        required=False,
+        )
+    baseline = field.TextField(
+        label="baseline",
+        helpText="The json results of a previous run to compare with",
+        initData="",
+        required=False,
+        )
+    threshold = field.FloatField(
+        label="threshold",
+        helpText=(
+          "A benchmark slower than the baseline by more than this ratio is ",
+          "reported as a regression"
+          ),
+        initData=0.1,
+        required=False,
+        )
+    isUseTestDb = field.BooleanField(
+        label="is using test database",
+        helpText=(
+          "Run against a test database created for the benchmarks instead ",
+          "of the database in use"
+          ),
+        initData=True,
+        required=False,
+        )
+
+  def _loadBaseline(self, path):
+    try:
+      with open(path) as stream:
+        return BenchReport.load(stream)
+    except (IOError, ValueError, KeyError) as e:
+      raise CommandError("Unable to load the baseline %s: %s" % (path, e))
+
+  def _runBenchSuite(self, formData, repeatNum, warmupNum):
+    report = benchSuite.run(formData["benchLabelLst"], repeatNum, warmupNum)
+    report.meta["vendor"] = connections[DEFAULT_DB_ALIAS].vendor
+    return report
+
+  def run(self):
+    # Register theory's benchmarks
+    import theory.test.benchmarks
+
+    formData = self.paramForm.clean()
+    repeatNum = formData["repeatNum"] or 5
+    warmupNum = formData["warmupNum"]
+    if warmupNum is None:
+      warmupNum = 1
+    threshold = formData["threshold"]
+    if threshold is None:
+      threshold = 0.1
+
+    baseline = None
+    if formData["baseline"]:
+      baseline = self._loadBaseline(formData["baseline"])
+
+    if formData["isUseTestDb"]:
+      with useTestDatabases():
+        report = self._runBenchSuite(formData, repeatNum, warmupNum)
+    else:
+      report = self._runBenchSuite(formData, repeatNum, warmupNum)
+
+    comparisonLst = None
+    self._stdOut = ""
+    if baseline is not None:
+      comparisonLst = report.compare(baseline, threshold)
+      if baseline.meta.get("vendor") not in (None, report.meta["vendor"]):
+        self._stdOut = "Warning: the baseline was run against %s\n\n" \
+            % baseline.meta["vendor"]
+    self._stdOut += report.render(comparisonLst)
+
+    if formData["output"]:
+      with open(formData["output"], "w") as stream:
+        report.dump(stream)
+      self._stdOut += "\n\nThe results have been written into %s" \
+          % formData["output"]
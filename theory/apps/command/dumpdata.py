@@ -221,6 +221,14 @@ class Dumpdata(SimpleCommand):
           queryset = objects.using(database).orderBy(model._meta.pk.name)
           if primaryKeyLst:
             queryset = queryset.filter(pk__in=primaryKeyLst)
+          # The related objects are prefetched for each chunk of objects
+          # instead of being queried for every object.
+          m2mNameLst = [
+              field.name for field in model._meta.manyToMany
+              if field.rel.through._meta.autoCreated
+              ]
+          if m2mNameLst:
+            queryset = queryset.prefetchRelated(*m2mNameLst)
           for obj in queryset.iterator():
             yield obj
 
@@ -25,6 +25,7 @@ class FilenameScanner(SimpleCommand):
 
   _notations = ["Command",]
   _gongs = ["FilenameList", "FileObjectList", ]
+  _streamGongs = ["FilenameList", ]
   _drums = {"Terminal": 1, }
 
   class ParamForm(SimpleCommand.ParamForm):
@@ -219,11 +220,15 @@ class FilenameScanner(SimpleCommand):
         yield dirs
 
   def run(self):
-    self._filenameLst = []
     self._dirnameLst = []
 
-    for i in self.generateFileLst():
-      self._filenameLst.append(i)
+    yieldMethod = int(self.paramForm.cleanedData["yieldMethod"])
+    if(yieldMethod==self.paramForm.YIELD_MODE_FILE \
+        and self.isGongStreamed("FilenameList")):
+      # The files are scanned while the next command is consuming them
+      self._filenameLst = self.generateFileLst()
+    else:
+      self._filenameLst = list(self.generateFileLst())
 
     for i in self.generateDirLst():
       self._dirnameLst.extend(i)
@@ -232,7 +237,10 @@ class FilenameScanner(SimpleCommand):
 
   def _extractResultToStdOut(self):
     self._stdOut = "Filename List:\n"
-    self._stdOut += "\n".join(self._filenameLst)
+    if(isinstance(self._filenameLst, list)):
+      self._stdOut += "\n".join(self._filenameLst)
+    else:
+      self._stdOut += "(yielded file by file)"
     self._stdOut += "\nDirname List:\n"
     self._stdOut += "\n".join(self._dirnameLst)
 
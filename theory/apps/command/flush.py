@@ -12,6 +12,7 @@ from theory.db import connections, router, transaction, DEFAULT_DB_ALIAS
 from theory.core.bridge import Bridge
 from theory.gui.color import noStyle
 from theory.core.sql import sqlFlush, emitPostMigrateSignal
+from theory.db.model.instanceCache import instanceCache
 from theory.utils.six.moves import input
 from theory.utils.importlib import importModule
 from theory.utils import six
@@ -115,6 +116,7 @@ Are you sure you want to do this?
           with connection.cursor() as cursor:
             for sql in sqlList:
               cursor.execute(sql)
+        instanceCache.invalidate()
       except Exception as e:
         newMsg = (
           "Database %s couldn't be flushed. Possible reasons:\n"
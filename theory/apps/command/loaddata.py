@@ -16,6 +16,7 @@ from theory.gui import field
 
 from theory.apps import apps
 from theory.core import serializers
+from theory.core.serializers.base import DeserializedObject
 from theory.core.bridge import Bridge
 from theory.core.exceptions import CommandError
 from theory.gui.color import noStyle
@@ -42,6 +43,15 @@ except ImportError:
 
 ##### Misc #####
 
+# The deserialized objects of the fixtures installed with isCacheFixture,
+# keyed by the file, its modification time and the loading options. It is
+# shared by every Loaddata, e.x: by every TestCase class of a test run, and
+# cleared by the teardown of the test environment.
+_fixtureObjCache = {}
+
+def clearFixtureCache():
+  _fixtureObjCache.clear()
+
 class Loaddata(SimpleCommand):
   """
   Installs the named fixture(s) in the database.
@@ -88,6 +98,15 @@ class Loaddata(SimpleCommand):
         required=False,
         initData=False,
         )
+    isCacheFixture = field.BooleanField(
+        label="is caching fixture",
+        helpText=(
+          "Keep the parsed fixtures in memory, so loading the same fixture ",
+          "again does not read and parse its file"
+          ),
+        required=False,
+        initData=False,
+        )
 
 
   def run(self):
@@ -99,6 +118,7 @@ class Loaddata(SimpleCommand):
     self.appLabel = options.get('appLabel')
     self.hideEmpty = options.get('isHideEmpty')
     self.verbosity = options.get('verbosity')
+    self.isCacheFixture = options.get('isCacheFixture')
     fixtureLabelLst = options.get("fixtureLabelLst")
 
     with transaction.atomic(using=self.using):
@@ -174,7 +194,18 @@ class Loaddata(SimpleCommand):
     for fixtureFile, fixtureDir, fixtureName in self.findFixtures(fixtureLabel):
       _, serFmt, cmpFmt = self.parseName(os.path.basename(fixtureFile))
       openMethod, mode = self.compressionFormats[cmpFmt]
-      fixture = openMethod(fixtureFile, mode)
+      cacheKey = None
+      if self.isCacheFixture:
+        cacheKey = (
+            fixtureFile,
+            os.path.getmtime(fixtureFile),
+            self.using,
+            self.ignore,
+            )
+      if cacheKey in _fixtureObjCache:
+        fixture = None
+      else:
+        fixture = openMethod(fixtureFile, mode)
       try:
         self.fixtureCount += 1
         objectsInFixture = 0
@@ -183,8 +214,20 @@ class Loaddata(SimpleCommand):
           self.stdout.write("Installing %s fixture '%s' from %s." %
             (serFmt, fixtureName, humanize(fixtureDir)))
 
-        objects = serializers.deserialize(serFmt, fixture,
-          using=self.using, ignorenonexistent=self.ignore)
+        if fixture is None:
+          objects = self._restoreCachedObjLst(_fixtureObjCache[cacheKey])
+        else:
+          objects = serializers.deserialize(serFmt, fixture,
+            using=self.using, ignorenonexistent=self.ignore)
+          if cacheKey is not None:
+            objects = list(objects)
+            # The objects of the file before being modified are useless
+            for key in list(_fixtureObjCache):
+              if key[0] == fixtureFile and key[1] != cacheKey[1]:
+                del _fixtureObjCache[key]
+            _fixtureObjCache[cacheKey] = [
+                (obj.object, obj.object.pk, obj.m2mData) for obj in objects
+                ]
 
         for obj in objects:
           objectsInFixture += 1
@@ -209,7 +252,8 @@ class Loaddata(SimpleCommand):
           e.args = ("Problem installing fixture '%s': %s" % (fixtureFile, e),)
         raise
       finally:
-        fixture.close()
+        if fixture is not None:
+          fixture.close()
 
       # Warn if the fixture we loaded contains 0 objects.
       if objectsInFixture == 0:
@@ -219,6 +263,17 @@ class Loaddata(SimpleCommand):
           RuntimeWarning
         )
 
+  def _restoreCachedObjLst(self, cachedObjLst):
+    """
+    Rebuild the deserialized objects of a cached fixture. Saving has
+    assigned the pk and cleared the m2m data of the previous ones.
+    """
+    for (instance, pk, m2mData) in cachedObjLst:
+      instance.pk = pk
+      instance._state.adding = True
+      instance._state.db = None
+      yield DeserializedObject(instance, m2mData)
+
   @lruCache.lruCache(maxsize=None)
   def findFixtures(self, fixtureLabel):
     """
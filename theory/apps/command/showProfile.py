@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+##### System wide lib #####
+from StringIO import StringIO
+
+##### Theory lib #####
+from theory.apps.command.baseCommand import SimpleCommand
+from theory.core.exceptions import CommandError
+from theory.core.profiler import commandProfiler
+from theory.db.model.instanceCache import instanceCache
+from theory.gui import field
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+class ShowProfile(SimpleCommand):
+  """
+  Show or export the cost of the latest command executions recorded by the
+  command profiler.
+  """
+  name = "showProfile"
+  verboseName = "showProfile"
+  _notations = ["Command",]
+  _drums = {"Terminal": 1,}
+
+  class ParamForm(SimpleCommand.ParamForm):
+    outputFormat = field.ChoiceField(
+        label="output format",
+        helpText="summary per command, or every execution as json/csv",
+        choices=(
+          ("summary", "summary"),
+          ("json", "json"),
+          ("csv", "csv"),
+          ),
+        initData="summary",
+        required=False,
+        )
+    output = field.TextField(
+        label="output",
+        helpText="Specifies file to which the json/csv output is written.",
+        initData="",
+        required=False,
+        )
+    isClear = field.BooleanField(
+        label="is clear",
+        helpText="Clear the recorded profiles afterward",
+        initData=False,
+        required=False,
+        )
+
+  def _renderSummary(self):
+    lineLst = [
+        "%-24s %6s %10s %10s %8s %10s %10s" % (
+          "command", "runs", "wall(s)", "max(s)", "queries", "sql(s)", "rows"
+        )
+    ]
+    for summary in commandProfiler.summarize():
+      lineLst.append("%-24s %6d %10.3f %10.3f %8d %10.3f %10d" % (
+          summary["cmdName"],
+          summary["runNum"],
+          summary["wallTime"],
+          summary["maxWallTime"],
+          summary["queryNum"],
+          summary["sqlTime"],
+          summary["rowNum"],
+      ))
+    slowLst = sorted(
+        commandProfiler.profileLst,
+        key=lambda x: x.wallTime,
+        reverse=True
+        )[:1]
+    for profile in slowLst:
+      lineLst.append("")
+      lineLst.append("Slowest statements of %s:" % profile.cmdName)
+      for query in profile.slowQueryLst:
+        lineLst.append("  (%.3f) %s" % (query["time"], query["sql"]))
+    cacheStatDict = instanceCache.stats()
+    if cacheStatDict:
+      lineLst.append("")
+      lineLst.append("%-24s %8s %8s %8s" % ("cached model", "hits", "misses", "ratio"))
+      for (label, (hitNum, missNum, hitRatio)) in sorted(cacheStatDict.items()):
+        lineLst.append(
+            "%-24s %8d %8d %8.2f" % (label, hitNum, missNum, hitRatio)
+            )
+    return "\n".join(lineLst)
+
+  def run(self):
+    formData = self.paramForm.clean()
+    outputFormat = formData["outputFormat"] or "summary"
+    output = formData["output"]
+
+    if outputFormat == "summary":
+      self._stdOut = self._renderSummary()
+    else:
+      stream = open(output, "w") if output else StringIO()
+      try:
+        if outputFormat == "json":
+          commandProfiler.exportJson(stream)
+        elif outputFormat == "csv":
+          commandProfiler.exportCsv(stream)
+        else:
+          raise CommandError("Unknown export format: %s" % outputFormat)
+        if output:
+          self._stdOut = "Profiles have been written into %s" % output
+        else:
+          self._stdOut = stream.getvalue()
+      finally:
+        stream.close()
+
+    if formData["isClear"]:
+      commandProfiler.clear()
+      instanceCache.resetStats()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from theory.db import model, migrations
+import datetime
+import theory.contrib.postgres.fields
+
+
+class Migration(migrations.Migration):
+
+  dependencies = [
+  ]
+
+  operations = [
+        migrations.CreateModel(
+            name='Adapter',
+            fields=[
+                ('id', model.AutoField(autoCreated=True, serialize=False, verboseName='ID', primaryKey=True)),
+                ('name', model.CharField(verboseName='Adapter name', helpText='Adapter name', maxLength=256)),
+                ('importPath', model.CharField(verboseName='Import Path', unique=True, helpText='The path to import the adapter', maxLength=256)),
+                ('propertyLst', theory.contrib.postgres.fields.ArrayField(model.TextField(), default=[], verboseName='PropertyLst', helpText='The properties which accepted by this adapter', size=None)),
+            ],
+            options={
+            },
+            bases=(model.Model,),
+        ),
+        migrations.CreateModel(
+            name='AdapterBuffer',
+            fields=[
+                ('id', model.AutoField(autoCreated=True, serialize=False, verboseName='ID', primaryKey=True)),
+                ('data', model.TextField(verboseName='data', null=True, helpText='The data adapted to next command and stored in JSON format', blank=True)),
+                ('created', model.DateTimeField(default=datetime.datetime.utcnow)),
+                ('adapter', model.ForeignKey(to='apps.Adapter', helpText='The adapter being used', verboseName='adapter')),
+            ],
+            options={
+            },
+            bases=(model.Model,),
+        ),
+        migrations.CreateModel(
+            name='AppModel',
+            fields=[
+                ('id', model.AutoField(autoCreated=True, serialize=False, verboseName='ID', primaryKey=True)),
+                ('name', model.CharField(verboseName='App model name', helpText='Application model name', maxLength=256)),
+                ('app', model.CharField(verboseName='Application name', helpText='Application name', maxLength=256)),
+                ('tblField', theory.contrib.postgres.fields.ArrayField(model.TextField(maxLength=64), verboseName='Table field', helpText='The fields being showed in a table', size=None)),
+                ('formField', theory.contrib.postgres.fields.ArrayField(model.TextField(maxLength=64), verboseName='Form field', helpText='The fields being showed in a form', size=None)),
+                ('importPath', model.CharField(verboseName='Import path', unique=True, helpText='The path to import the model', maxLength=256)),
+                ('importanceRating', model.IntegerField(default=0, verboseName='importance rating', helpText='The level of importance of this model to the app. The\n        higher the rating, the more important model to the app.')),
+            ],
+            options={
+            },
+            bases=(model.Model,),
+        ),
+        migrations.CreateModel(
+            name='BinaryClassifierHistory',
+            fields=[
+                ('id', model.AutoField(autoCreated=True, serialize=False, verboseName='ID', primaryKey=True)),
+                ('ref', model.IntegerField()),
+                ('initState', theory.contrib.postgres.fields.ArrayField(model.BooleanField(), size=None)),
+                ('finalState', theory.contrib.postgres.fields.ArrayField(model.BooleanField(), size=None)),
+            ],
+            options={
+            },
+            bases=(model.Model,),
+        ),
+        migrations.CreateModel(
+            name='Command',
+            fields=[
+                ('id', model.AutoField(autoCreated=True, serialize=False, verboseName='ID', primaryKey=True)),
+                ('name', model.CharField(verboseName='Name', helpText='Command name', maxLength=256)),
+                ('app', model.CharField(verboseName='Application', helpText='The applications which carry this command', maxLength=256)),
+                ('sourceFile', model.CharField(helpText="Command's source code location", maxLength=1024)),
+                ('comment', model.TextField(null=True, helpText="Command's comment", blank=True)),
+                ('runMode', model.IntegerField(default=1, helpText='The way how this command to be run. Most users should neglect this field.', choices=[(1, b'Simple run-mode'), (2, b'Async run-mode')])),
+            ],
+            options={
+            },
+            bases=(model.Model,),
+        ),
+        migrations.CreateModel(
+            name='FieldParameter',
+            fields=[
+                ('id', model.AutoField(autoCreated=True, serialize=False, verboseName='ID', primaryKey=True)),
+                ('name', model.CharField(verboseName="Parameter's name", helpText='The name of this parameter. Regard as args if name is missing', maxLength=256)),
+                ('data', model.TextField(verboseName="Parameter's value", helpText='The type of this parameter')),
+                ('isField', model.BooleanField(default=False, verboseName='Is a field flag', helpText='Is a field flag')),
+                ('isCircular', model.BooleanField(default=False, verboseName='Is circular graph flag', helpText='Is circular graph flag')),
+                ('appModel', model.ForeignKey(relatedName=b'fieldParamMap', to='apps.AppModel', helpText="All fields' name and their parameter", verboseName='Field name and parameter map')),
+                ('parent', model.ForeignKey(relatedQueryName=b'childParam', relatedName=b'childParamLst', to='apps.FieldParameter', helpText="All fields' name and their parameter", blank=True, null=True, verboseName='Field name and parameter list')),
+            ],
+            options={
+            },
+            bases=(model.Model,),
+        ),
+        migrations.CreateModel(
+            name='History',
+            fields=[
+                ('id', model.AutoField(autoCreated=True, serialize=False, verboseName='ID', primaryKey=True)),
+                ('commandName', model.CharField(verboseName='Command in Text', helpText='Command in Text including paramter', maxLength=256)),
+                ('jsonData', model.TextField(verboseName='Json data', helpText='The data from the command paramForm and stored in JSON format')),
+                ('touched', model.DateTimeField(default=datetime.datetime.utcnow)),
+                ('repeated', model.IntegerField(default=1)),
+            ],
+            options={
+                'ordering': ['-touched'],
+            },
+            bases=(model.Model,),
+        ),
+        migrations.CreateModel(
+            name='Mood',
+            fields=[
+                ('id', model.AutoField(autoCreated=True, serialize=False, verboseName='ID', primaryKey=True)),
+                ('name', model.CharField(verboseName='Name', helpText='Mood name', maxLength=256)),
+            ],
+            options={
+            },
+            bases=(model.Model,),
+        ),
+        migrations.CreateModel(
+            name='Parameter',
+            fields=[
+                ('id', model.AutoField(autoCreated=True, serialize=False, verboseName='ID', primaryKey=True)),
+                ('name', model.CharField(verboseName="Parameter's name", helpText='The name of this parameter', maxLength=256)),
+                ('type', model.CharField(verboseName="Parameter's type", helpText='The type of this parameter', maxLength=256)),
+                ('isOptional', model.BooleanField(default=True, verboseName='Is optional flag', helpText='Is optional flag')),
+                ('isReadOnly', model.BooleanField(default=False, verboseName='Is read-only flag', helpText='Is read-only flag')),
+                ('comment', model.TextField(helpText="Parameter's comment")),
+                ('command', model.ForeignKey(to='apps.Command')),
+            ],
+            options={
+            },
+            bases=(model.Model,),
+        ),
+        migrations.AddField(
+            modelName='history',
+            name='moodSet',
+            field=model.ManyToManyField(verboseName='MoodSet', helpText='The moods where the command being executed', to='apps.Mood'),
+            preserveDefault=True,
+        ),
+        migrations.AddField(
+            modelName='command',
+            name='moodSet',
+            field=model.ManyToManyField(verboseName='MoodSet', helpText='The moods which carry this command', to='apps.Mood'),
+            preserveDefault=True,
+        ),
+        migrations.AddField(
+            modelName='command',
+            name='nextAvblCmd',
+            field=model.ManyToManyField(relatedName='nextAvblCmdRel_+', to='apps.Command', helpText='The commands which are able to concatenate the result of this command', blank=True, null=True, verboseName='Next available command'),
+            preserveDefault=True,
+        ),
+        migrations.AddField(
+            modelName='adapterbuffer',
+            name='fromCmd',
+            field=model.ForeignKey(to='apps.Command', helpText='The input command of the adapter', verboseName='From command'),
+            preserveDefault=True,
+        ),
+        migrations.AddField(
+            modelName='adapterbuffer',
+            name='toCmd',
+            field=model.ForeignKey(to='apps.Command', helpText='The output command of the adapter', verboseName='To command'),
+            preserveDefault=True,
+        ),
+  ]
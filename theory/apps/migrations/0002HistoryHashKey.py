@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import hashlib
+
+from theory.db import model, migrations
+import theory.apps.model
+
+
+def backfillHashKey(apps, schemaEditor):
+  """Fill in the hashKey of the existing history. The entries of the same
+  command and data are merged into the latest one."""
+  History = apps.getModel("apps", "History")
+  db = schemaEditor.connection.alias
+  historyDict = {}
+  for history in History.objects.using(db).orderBy("-touched", "-id"):
+    hashKey = hashlib.sha1(
+        u"{0}\0{1}".format(history.commandName, history.jsonData)\
+            .encode("utf-8")
+        ).hexdigest()
+    if hashKey in historyDict:
+      latest = historyDict[hashKey]
+      latest.repeated += history.repeated
+      history.delete(using=db)
+    else:
+      history.hashKey = hashKey
+      historyDict[hashKey] = history
+  for history in historyDict.values():
+    history.save(using=db, updateFields=["hashKey", "repeated"])
+
+
+def noop(apps, schemaEditor):
+  # The hashKey column is dropped by reversing the AddField
+  pass
+
+
+class Migration(migrations.Migration):
+
+  dependencies = [
+      ('apps', '0001Initial'),
+  ]
+
+  operations = [
+        migrations.AddField(
+            modelName='history',
+            name='hashKey',
+            field=theory.apps.model.HashKeyField(null=True, verboseName='Hash key', helpText='The sha1 of the commandName and jsonData, used to dedupe', unique=True),
+            preserveDefault=True,
+        ),
+        migrations.RunPython(backfillHashKey, noop),
+  ]
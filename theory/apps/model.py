@@ -2,6 +2,7 @@
 #!/usr/bin/env python
 ##### System wide lib #####
 import datetime
+import hashlib
 
 ##### Theory lib #####
 from theory.contrib.postgres.fields import ArrayField
@@ -57,6 +58,9 @@ class Mood(model.Model):
       helpText=_("Mood name")
       )
 
+  class Meta:
+    isCached = True
+
   def __str__(self):
     return self.name
 
@@ -113,6 +117,9 @@ class Command(model.Model):
       helpText=_("The way how this command to be run. Most users should neglect this field.")
       )
 
+  class Meta:
+    isCached = True
+
   def getDetailAutocompleteHints(self, crlf):
     comment = lambda x: x if(x) else "No comment"
     hints = "%s -- %s%sParameters:" % (self.name, comment(self.comment), crlf)
@@ -151,6 +158,28 @@ class Command(model.Model):
   def __str__(self):
     return "{0} - {1}".format(self.app, self.name)
 
+class HashKeyField(model.CharField):
+  """The sha1 of the commandName and jsonData of a History. It is filled in
+  preSave so that bulkCreate gets it as well as save."""
+  def __init__(self, *args, **kwargs):
+    kwargs["maxLength"] = 40
+    kwargs["editable"] = False
+    super(HashKeyField, self).__init__(*args, **kwargs)
+
+  def deconstruct(self):
+    name, path, args, kwargs = super(HashKeyField, self).deconstruct()
+    del kwargs["maxLength"]
+    del kwargs["editable"]
+    return name, path, args, kwargs
+
+  def preSave(self, modalInstance, add):
+    value = History.makeHashKey(
+        modalInstance.commandName,
+        modalInstance.jsonData
+        )
+    setattr(modalInstance, self.attname, value)
+    return value
+
 class History(model.Model):
   commandName = model.CharField(
       maxLength=256,
@@ -175,13 +204,27 @@ class History(model.Model):
         )
       )
   touched = model.DateTimeField(
-      default=datetime.datetime.utcnow()
+      default=datetime.datetime.utcnow
       )
   repeated = model.IntegerField(default=1)
+  # Rows loaded from fixtures are saved raw without the preSave, so the column
+  # is nullable rather than making them collide on an empty key
+  hashKey = HashKeyField(
+      null=True,
+      unique=True,
+      verboseName=_("Hash key"),
+      helpText=_("The sha1 of the commandName and jsonData, used to dedupe")
+      )
 
   class Meta:
     ordering = ['-touched',]
 
+  @classmethod
+  def makeHashKey(cls, commandName, jsonData):
+    return hashlib.sha1(
+        u"{0}\0{1}".format(commandName, jsonData).encode("utf-8")
+        ).hexdigest()
+
 class Adapter(model.Model):
   name = model.CharField(
       maxLength=256,
@@ -216,6 +259,9 @@ class Adapter(model.Model):
   #def propertyLst(self, propertyLst):
   #  self.propertyInTxt = ",".join(propertyLst)
 
+  class Meta:
+    isCached = True
+
   def __str__(self):
     return self.name
 
@@ -242,7 +288,7 @@ class AdapterBuffer(model.Model):
       blank=True,
       helpText=_("The data adapted to next command and stored in JSON format")
       )
-  created = model.DateTimeField(default=datetime.datetime.utcnow())
+  created = model.DateTimeField(default=datetime.datetime.utcnow)
 
   def __str__(self):
     return "{0} -> {1} ({2})".format(
@@ -339,5 +385,8 @@ class AppModel(model.Model):
         higher the rating, the more important model to the app."""),
       )
 
+  class Meta:
+    isCached = True
+
   def __str__(self):
     return "{0} - {1}".format(self.app, self.name)
@@ -2,6 +2,7 @@ from collections import Counter, defaultdict, OrderedDict
 import os
 import sys
 from gevent import threading
+import time
 import warnings
 
 from theory.core.exceptions import AppRegistryNotReady, ImproperlyConfigured
@@ -51,6 +52,9 @@ class Apps(object):
     # Pending lookups for lazy relations.
     self._pendingLookups = {}
 
+    # The (phase name, seconds) of every phase of populate().
+    self.populateTimeLst = []
+
     # Populate apps and models, unless it's the master registry.
     if installedApps is not None:
       self.populate(installedApps)
@@ -77,6 +81,8 @@ class Apps(object):
       if self.appConfigs:
         raise RuntimeError("populate() isn't reentrant")
 
+      startTime = time.time()
+
       # Load app configs and app modules.
       for entry in installedApps:
         if isinstance(entry, AppConfig):
@@ -101,6 +107,8 @@ class Apps(object):
           "duplicates: %s" % ", ".join(duplicates))
 
       self.appsReady = True
+      self.populateTimeLst.append(('importApps', time.time() - startTime))
+      startTime = time.time()
 
       # Load models.
       for appConfig in self.appConfigs.values():
@@ -110,10 +118,13 @@ class Apps(object):
       self.clearCache()
 
       self.modelsReady = True
+      self.populateTimeLst.append(('importModels', time.time() - startTime))
+      startTime = time.time()
 
       for appConfig in self.getAppConfigs():
         appConfig.ready()
 
+      self.populateTimeLst.append(('ready', time.time() - startTime))
       self.ready = True
 
   def checkAppsReady(self):
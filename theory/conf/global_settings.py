@@ -144,6 +144,17 @@ DEFAULT_MOOD = "norm"
 # Classes used to implement db routing behaviour
 DATABASE_ROUTERS = []
 
+# The database in DATABASES keeping theory's own models once
+# 'theory.db.utils.MetadataRouter' is in DATABASE_ROUTERS. An embedded sqlite
+# database makes reading the commands and the adapters cheap, e.x:
+#   'metadata': {
+#     'ENGINE': 'theory.db.backends.sqlite3',
+#     'NAME': '/path/to/metadata.sqlite3',
+#     'OPTIONS': {'pragmas': EMBEDDED_PRAGMAS},
+#   }
+# where EMBEDDED_PRAGMAS comes from theory.db.backends.sqlite3.base.
+METADATA_DATABASE_ALIAS = 'metadata'
+
 # List of strings representing installed moods.
 INSTALLED_MOODS = ()
 
@@ -164,6 +175,29 @@ UI_FONT_HEIGHT_RATIO = 15
 # field in the form
 UI_FORM_FIELD_HEIGHT_RATIO = 180
 
+# How many lines of command output are kept by the terminal. Older lines are
+# dropped.
+UI_SCROLLBACK_LINE_NUM = 10000
+
+# How many lines of command output a mouse wheel step scrolls. Page Up and
+# Page Down in the command line scroll by a whole window.
+UI_SCROLL_LINE_NUM = 3
+
+# How many rendered param forms are kept for reuse, one per command class.
+# Set it to 0 to rebuild the form every time.
+UI_PARAM_FORM_CACHE_SIZE = 16
+
+# The command history is read by the reactor in pages of this size, and at
+# most UI_HISTORY_PAGE_NUM pages around the current entry are kept in memory.
+UI_HISTORY_PAGE_SIZE = 50
+UI_HISTORY_PAGE_NUM = 4
+
+# Whether the reactor reloads the commands, adapters and models of the apps
+# once their files are changed, and how often the files are checked in
+# second.
+UI_HOT_RELOAD = False
+UI_HOT_RELOAD_INTERVAL = 0.5
+
 # If this is a admin settings module, this should be a list of
 # settings modules (in the format 'foo.bar.baz') for which this admin
 # is an admin.
@@ -342,6 +376,85 @@ LOGGING = {
   }
 }
 
+####################
+# COMMAND PROFILER #
+####################
+
+# Whether the cost (time, queries, rows) of every command execution is
+# recorded by the gui and the celery workers. It doesn't need DEBUG, but
+# every query of a command is observed while it is on.
+COMMAND_PROFILER_ENABLED = False
+
+# How many command executions are kept by the profiler.
+COMMAND_PROFILER_BUFFER_SIZE = 256
+
+# How many of the slowest statements are kept per command execution.
+COMMAND_PROFILER_SLOW_QUERY_NUM = 5
+
+##################
+# INSTANCE CACHE #
+##################
+
+# How many querysets are kept per model by the cache of the models whose Meta
+# enables isCached. Set it to 0 to disable the cache.
+MODEL_INSTANCE_CACHE_SIZE = 1024
+
+# How many seconds an entry is kept, which bounds how long the writes from the
+# other processes go unseen. None keeps the entries until being invalidated.
+MODEL_INSTANCE_CACHE_TIMEOUT = 60
+
+#####################
+# COMMAND STREAMING #
+#####################
+
+# How many items a streamed gong can produce ahead of the next command in a
+# pipeline before the producer is paused.
+STREAM_QUEUE_SIZE = 128
+
+#################
+# ASYNC COMMAND #
+#################
+
+# The class running the async commands. The celery backend needs a broker
+# and a worker started by "theory_start.py -c", while
+# 'theory.core.asyncBackend.LocalBackend' runs them in a local pool.
+ASYNC_COMMAND_BACKEND = 'theory.core.asyncBackend.CeleryBackend'
+
+# How many async commands are run at the same time by the local backend.
+ASYNC_COMMAND_MAX_WORKERS = 2
+
+# Whether the local backend runs the commands in processes instead of threads.
+ASYNC_COMMAND_USE_PROCESS = False
+
+# How often in second the gui checks for the async commands being finished.
+ASYNC_COMMAND_POLL_INTERVAL = 1
+
+###########
+# FAN-OUT #
+###########
+
+# How many inputs of Bridge.executeMany() share one validated form.
+FAN_OUT_CHUNK_SIZE = 100
+
+# How many chunks are run at the same time by Bridge.executeMany(), the chunks
+# are run by a pool of threads if it is more than 1.
+FAN_OUT_CONCURRENCY = 1
+
+################
+# MODEL CHECKS #
+################
+
+# The file keeping which models have passed the model checks, so that they are
+# checked again only once changed. The result is only kept in memory if None.
+MODEL_CHECK_CACHE_PATH = None
+
+# How many threads run the model checks at the same time. The checks are
+# mostly pure python which the GIL, or gevent, runs one thread at a time, so
+# starting a pool costs more than it saves unless the checks wait on the
+# database. Measured with the models of theory.apps: 9ms in the main thread,
+# 109ms with a pool of 2 to 8 threads.
+MODEL_CHECK_WORKERS = 1
+
 ###########
 # TESTING #
 ###########
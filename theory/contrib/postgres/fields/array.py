@@ -5,7 +5,8 @@ import sys
 from theory.gui.common.baseField import ListField
 from theory.contrib.postgres.validator import ArrayMaxLengthValidator
 from theory.core import checks, exceptions
-from theory.db.model import Field, Lookup, Transform, IntegerField
+from theory.db.backends.utils import JSON_DATA_TYPE, revTypecastJson
+from theory.db.model import Field, Lookup, Transform, IntegerField, SubfieldBase
 from theory.utils import six
 from theory.utils.translation import stringConcat, ugettextLazy as _
 
@@ -18,7 +19,7 @@ class AttributeSetter(object):
     setattr(self, name, value)
 
 
-class ArrayField(Field):
+class ArrayField(six.withMetaclass(SubfieldBase, Field)):
   emptyStringsAllowed = False
   defaultErrorMessages = {
     'itemInvalid': _('Item %(nth)s in the array did not validate: '),
@@ -68,6 +69,9 @@ class ArrayField(Field):
     return 'Array of %s' % self.baseField.description
 
   def dbType(self, connection):
+    if connection.vendor == 'sqlite':
+      # Stored as a json array
+      return JSON_DATA_TYPE
     size = self.size or ''
     return '%s[%s]' % (self.baseField.dbType(connection), size)
 
@@ -76,7 +80,21 @@ class ArrayField(Field):
       return [self.baseField.getPrepValue(i) for i in value]
     return value
 
+  def getDbPrepValue(self, value, connection, prepared=False):
+    if not prepared:
+      value = self.getPrepValue(value)
+    if connection.vendor == 'sqlite' and isinstance(value, (list, tuple)):
+      # Every item is stored as the base field stores it in a column, e.x: a
+      # decimal as its text, and is read back by toPython().
+      return revTypecastJson([
+        self.baseField.getDbPrepSave(i, connection) for i in value
+      ])
+    return value
+
   def getDbPrepLookup(self, lookupType, value, connection, prepared=False):
+    if (connection.vendor == 'sqlite' and
+        lookupType in ('contains', 'containedBy', 'overlap')):
+      return [self.getDbPrepValue(value, connection)]
     if lookupType == 'contains':
       return [self.getPrepValue(value)]
     return super(ArrayField, self).getDbPrepLookup(lookupType, value,
@@ -91,9 +109,14 @@ class ArrayField(Field):
 
   def toPython(self, value):
     if isinstance(value, six.stringTypes):
+      if value == '':
+        return value
       # Assume we're deserializing
-      vals = json.loads(value)
-      value = [self.baseField.toPython(val) for val in vals]
+      value = json.loads(value)
+    if isinstance(value, list):
+      # The items decoded from the json column of sqlite are in the format
+      # they have been saved
+      value = [self.baseField.toPython(val) for val in value]
     return value
 
   def getDefault(self):
@@ -170,6 +193,17 @@ class ArrayField(Field):
     return super(ArrayField, self).formfield(**defaults)
 
 
+def jsonArrayContainsSql(lhs, rhs):
+  """
+  The sql telling whether every item of the json array rhs is in the json
+  array lhs, like lhs @> rhs of postgres.
+  """
+  return (
+    'NOT EXISTS (SELECT 1 FROM json_each(%s) AS r WHERE NOT EXISTS '
+    '(SELECT 1 FROM json_each(%s) AS l WHERE l.value IS r.value))'
+  ) % (rhs, lhs)
+
+
 class ArrayContainsLookup(Lookup):
   lookupName = 'contains'
 
@@ -180,6 +214,11 @@ class ArrayContainsLookup(Lookup):
     typeCast = self.lhs.source.dbType(connection)
     return '%s @> %s::%s' % (lhs, rhs, typeCast), params
 
+  def as_sqlite(self, qn, connection):
+    lhs, lhsParams = self.processLhs(qn, connection)
+    rhs, rhsParams = self.processRhs(qn, connection)
+    return jsonArrayContainsSql(lhs, rhs), rhsParams + lhsParams
+
 
 ArrayField.registerLookup(ArrayContainsLookup)
 
@@ -193,6 +232,11 @@ class ArrayContainedByLookup(Lookup):
     params = lhsParams + rhsParams
     return '%s <@ %s' % (lhs, rhs), params
 
+  def as_sqlite(self, qn, connection):
+    lhs, lhsParams = self.processLhs(qn, connection)
+    rhs, rhsParams = self.processRhs(qn, connection)
+    return jsonArrayContainsSql(rhs, lhs), lhsParams + rhsParams
+
 
 ArrayField.registerLookup(ArrayContainedByLookup)
 
@@ -206,6 +250,15 @@ class ArrayOverlapLookup(Lookup):
     params = lhsParams + rhsParams
     return '%s && %s' % (lhs, rhs), params
 
+  def as_sqlite(self, qn, connection):
+    lhs, lhsParams = self.processLhs(qn, connection)
+    rhs, rhsParams = self.processRhs(qn, connection)
+    params = lhsParams + rhsParams
+    return (
+      'EXISTS (SELECT 1 FROM json_each(%s) AS l, json_each(%s) AS r '
+      'WHERE l.value IS r.value)' % (lhs, rhs)
+    ), params
+
 
 ArrayField.registerLookup(ArrayOverlapLookup)
 
@@ -221,6 +274,10 @@ class ArrayLenTransform(Transform):
     lhs, params = qn.compile(self.lhs)
     return 'array_length(%s, 1)' % lhs, params
 
+  def as_sqlite(self, qn, connection):
+    lhs, params = qn.compile(self.lhs)
+    return 'json_array_length(%s)' % lhs, params
+
 
 ArrayField.registerLookup(ArrayLenTransform)
 
@@ -236,6 +293,11 @@ class IndexTransform(Transform):
     lhs, params = qn.compile(self.lhs)
     return '%s[%s]' % (lhs, self.index), params
 
+  def as_sqlite(self, qn, connection):
+    lhs, params = qn.compile(self.lhs)
+    # json paths are 0-indexed
+    return "json_extract(%s, '$[%d]')" % (lhs, self.index - 1), params
+
   @property
   def outputField(self):
     return self.baseField
@@ -262,6 +324,14 @@ class SliceTransform(Transform):
     lhs, params = qn.compile(self.lhs)
     return '%s[%s:%s]' % (lhs, self.start, self.end), params
 
+  def as_sqlite(self, qn, connection):
+    lhs, params = qn.compile(self.lhs)
+    return (
+      "(SELECT json_group_array(CASE WHEN type IN ('array', 'object') "
+      "THEN json(value) ELSE value END) FROM json_each(%s) "
+      "WHERE key >= %d AND key < %d)" % (lhs, self.start - 1, self.end)
+    ), params
+
 
 class SliceTransformFactory(object):
 
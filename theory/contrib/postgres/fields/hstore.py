@@ -4,8 +4,9 @@ import sys
 from theory.contrib.postgres import form, lookup
 from theory.contrib.postgres.fields.array import ArrayField
 from theory.core import exceptions
+from theory.db.backends.utils import JSON_DATA_TYPE, revTypecastJson
 from theory.db.model import Field, TextField, Transform
-from theory.gui.common.baseField import TextField
+from theory.gui.common.baseField import TextField as TextFormField
 from theory.utils import six
 from theory.utils.translation import ugettextLazy as _
 
@@ -27,8 +28,29 @@ class HStoreField(Field):
     super(HStoreField, self).__init__(**kwargs)
 
   def dbType(self, connection):
+    if connection.vendor == 'sqlite':
+      # Stored as a json object
+      return JSON_DATA_TYPE
     return 'hstore'
 
+  def getDbPrepValue(self, value, connection, prepared=False):
+    if not prepared:
+      value = self.getPrepValue(value)
+    if connection.vendor == 'sqlite' and isinstance(value, dict):
+      return revTypecastJson(value)
+    return value
+
+  def getDbPrepLookup(self, lookupType, value, connection, prepared=False):
+    if connection.vendor == 'sqlite':
+      if lookupType in ('contains', 'contained_by'):
+        return [self.getDbPrepValue(value, connection)]
+      elif lookupType == 'has_keys':
+        return [revTypecastJson(list(value))]
+      elif lookupType == 'has_key':
+        return [value]
+    return super(HStoreField, self).getDbPrepLookup(lookupType, value,
+        connection, prepared=prepared)
+
   def getTransform(self, name):
     transform = super(HStoreField, self).getTransform(name)
     if transform:
@@ -71,8 +93,8 @@ class HStoreField(Field):
     else:
       maxLength = self.size
     defaults = {
-        'keyField': TextField,
-        'valueField': TextField,
+        'keyField': TextFormField,
+        'valueField': TextFormField,
         'formClass': form.HStoreField,
         'maxLength': maxLength,
     }
@@ -80,8 +102,32 @@ class HStoreField(Field):
     return super(HStoreField, self).formfield(**defaults)
 
 
-HStoreField.registerLookup(lookup.DataContains)
-HStoreField.registerLookup(lookup.ContainedBy)
+def jsonObjectContainsSql(lhs, rhs):
+  """
+  The sql telling whether every pair of the json object rhs is in the json
+  object lhs, like lhs @> rhs of postgres.
+  """
+  return (
+    'NOT EXISTS (SELECT 1 FROM json_each(%s) AS r WHERE NOT EXISTS '
+    '(SELECT 1 FROM json_each(%s) AS l '
+    'WHERE l.key = r.key AND l.value IS r.value))'
+  ) % (rhs, lhs)
+
+
+@HStoreField.registerLookup
+class DataContains(lookup.DataContains):
+  def as_sqlite(self, qn, connection):
+    lhs, lhsParams = self.processLhs(qn, connection)
+    rhs, rhsParams = self.processRhs(qn, connection)
+    return jsonObjectContainsSql(lhs, rhs), rhsParams + lhsParams
+
+
+@HStoreField.registerLookup
+class ContainedBy(lookup.ContainedBy):
+  def as_sqlite(self, qn, connection):
+    lhs, lhsParams = self.processLhs(qn, connection)
+    rhs, rhsParams = self.processRhs(qn, connection)
+    return jsonObjectContainsSql(rhs, lhs), lhsParams + rhsParams
 
 
 @HStoreField.registerLookup
@@ -89,12 +135,27 @@ class HasKeyLookup(lookup.PostgresSimpleLookup):
   lookupName = 'has_key'
   operator = '?'
 
+  def as_sqlite(self, qn, connection):
+    lhs, lhsParams = self.processLhs(qn, connection)
+    rhs, rhsParams = self.processRhs(qn, connection)
+    params = lhsParams + rhsParams
+    return 'EXISTS (SELECT 1 FROM json_each(%s) WHERE key = %s)' % (lhs, rhs), \
+        params
+
 
 @HStoreField.registerLookup
 class HasKeysLookup(lookup.PostgresSimpleLookup):
   lookupName = 'has_keys'
   operator = '?&'
 
+  def as_sqlite(self, qn, connection):
+    lhs, lhsParams = self.processLhs(qn, connection)
+    rhs, rhsParams = self.processRhs(qn, connection)
+    return (
+      'NOT EXISTS (SELECT 1 FROM json_each(%s) AS r WHERE NOT EXISTS '
+      '(SELECT 1 FROM json_each(%s) AS l WHERE l.key = r.value))' % (rhs, lhs)
+    ), rhsParams + lhsParams
+
 
 class KeyTransform(Transform):
   output_field = TextField()
@@ -107,6 +168,11 @@ class KeyTransform(Transform):
     lhs, params = compiler.compile(self.lhs)
     return "%s -> '%s'" % (lhs, self.keyName), params
 
+  def as_sqlite(self, compiler, connection):
+    lhs, params = compiler.compile(self.lhs)
+    return "(SELECT value FROM json_each(%s) WHERE key = %%s)" % lhs, \
+        list(params) + [self.keyName]
+
 
 class KeyTransformFactory(object):
 
@@ -123,9 +189,17 @@ class KeysTransform(lookup.FunctionTransform):
   function = 'akeys'
   outputField = ArrayField(TextField())
 
+  def as_sqlite(self, qn, connection):
+    lhs, params = qn.compile(self.lhs)
+    return "(SELECT json_group_array(key) FROM json_each(%s))" % lhs, params
+
 
 @HStoreField.registerLookup
 class ValuesTransform(lookup.FunctionTransform):
   lookupName = 'values'
   function = 'avals'
   outputField = ArrayField(TextField())
+
+  def as_sqlite(self, qn, connection):
+    lhs, params = qn.compile(self.lhs)
+    return "(SELECT json_group_array(value) FROM json_each(%s))" % lhs, params
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+##### System wide lib #####
+from collections import deque
+from functools import partial
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+from Queue import Empty, Queue
+import threading
+import time
+import traceback
+
+##### Theory lib #####
+from theory.conf import settings
+from theory.db import connections
+from theory.utils.importlib import importClass
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ("AsyncJob", "BaseAsyncBackend", "CeleryBackend", "LocalBackend",
+    "getAsyncBackend", "runJob",)
+
+class AsyncJob(object):
+  """The state of an async command submitted to a backend"""
+  STATUS_PENDING = "pending"
+  STATUS_RUNNING = "running"
+  STATUS_SUCCESS = "success"
+  STATUS_FAILURE = "failure"
+  STATUS_CANCELLED = "cancelled"
+
+  def __init__(self, jobId, cmdName, args):
+    self.id = jobId
+    self.cmdName = cmdName
+    # The picklable args of the job function
+    self.args = args
+    self.status = self.STATUS_PENDING
+    # The names of the commands bridged to, or the traceback if failed
+    self.result = None
+    self.submittedAt = time.time()
+    self.finishedAt = None
+    # The handle given by the backend, e.x: the AsyncResult of celery
+    self.handle = None
+
+  @property
+  def isDone(self):
+    return self.status in (
+        self.STATUS_SUCCESS,
+        self.STATUS_FAILURE,
+        self.STATUS_CANCELLED
+        )
+
+  def __str__(self):
+    return "{0} - {1}".format(self.cmdName, self.status)
+
+def runJob(classImportPath, cmdModelId, paramFormData):
+  """
+  Run an async command the way a celery worker does, i.e. the command only
+  gets the paramFormData, then write its result into the AdapterBuffer of
+  every next available command sharing an adapter with it, which is what
+  the nextStep command continues from. Return the names of those commands.
+  """
+  from theory.apps.model import Command
+  from theory.core.bridge import Bridge
+
+  bridge = Bridge()
+  cmd = importClass(classImportPath)()
+  bridge._runInScope(cmd, paramFormData=paramFormData)
+
+  tailNameLst = []
+  if(cmdModelId is None):
+    return tailNameLst
+  cmdModel = Command.objects.get(id=cmdModelId)
+  for tailModel in cmdModel.nextAvblCmd.all():
+    tailInst = importClass(tailModel.classImportPath)()
+    if(bridge._probeAdapter(cmd, tailInst) is None):
+      continue
+    bridge.bridgeToDb(cmd, tailModel)
+    tailNameLst.append(tailModel.name)
+  return tailNameLst
+
+def _runInWorker(jobFxn, args):
+  """Never raise, the exceptions of a process might not be picklable"""
+  try:
+    return (True, jobFxn(*args))
+  except Exception:
+    return (False, traceback.format_exc())
+  finally:
+    # The connections of a pool thread would never be closed otherwise
+    for conn in connections.all():
+      conn.close()
+
+class BaseAsyncBackend(object):
+  """
+  Runs the commands whose runMode is RUN_MODE_ASYNC. The backend is chosen
+  by settings.ASYNC_COMMAND_BACKEND and Bridge hands the commands over by
+  submit().
+  """
+  def __init__(self):
+    self._lastJobId = 0
+
+  def _createJob(self, cmd, cmdModel, paramFormData):
+    self._lastJobId += 1
+    return AsyncJob(
+        self._lastJobId,
+        cmd.name or cmd.__class__.__name__,
+        (
+          "{0}.{1}".format(cmd.__class__.__module__, cmd.__class__.__name__),
+          None if(cmdModel is None) else cmdModel.id,
+          paramFormData,
+        )
+        )
+
+  def submit(self, cmd, cmdModel, paramFormData):
+    """Return the AsyncJob of the command"""
+    raise NotImplementedError
+
+  def cancel(self, job):
+    """Return whether the job is cancelled before being run"""
+    raise NotImplementedError
+
+  def popFinishedLst(self):
+    """Return the jobs finished since the last call"""
+    return []
+
+  def shutdown(self, wait=True):
+    pass
+
+class CeleryBackend(BaseAsyncBackend):
+  """
+  Sends the commands to the celery workers, which need a broker. The result
+  is not reported back since it is not seen by this process.
+  """
+  def submit(self, cmd, cmdModel, paramFormData):
+    job = self._createJob(cmd, cmdModel, paramFormData)
+    job.handle = cmd.delay(paramFormData=paramFormData)
+    job.status = job.STATUS_RUNNING
+    return job
+
+  def cancel(self, job):
+    if(job.handle.state!="PENDING"):
+      return False
+    job.handle.revoke()
+    job.status = job.STATUS_CANCELLED
+    return True
+
+class LocalBackend(BaseAsyncBackend):
+  """
+  Runs the commands in a pool of threads, or of processes if isProcess, in
+  the running process without any broker. At most maxWorkers commands are
+  run at the same time and the others wait in a queue from which they can
+  be cancelled. A running command cannot be interrupted.
+
+  The pool calls back from its own thread, so the finished jobs are queued
+  and the reactor picks them up by popFinishedLst().
+  """
+  def __init__(self, maxWorkers=None, isProcess=None, jobFxn=runJob):
+    super(LocalBackend, self).__init__()
+    if(maxWorkers is None):
+      maxWorkers = settings.ASYNC_COMMAND_MAX_WORKERS
+    if(isProcess is None):
+      isProcess = settings.ASYNC_COMMAND_USE_PROCESS
+    self.maxWorkers = maxWorkers
+    self.isProcess = isProcess
+    self.jobFxn = jobFxn
+    self._pool = None
+    self._lock = threading.Lock()
+    self._pendingQueue = deque()
+    self._runningJobSet = set()
+    self._finishedQueue = Queue()
+
+  def _getPool(self):
+    if(self._pool is None):
+      if(self.isProcess):
+        # The workers must not share the sockets of this process
+        connections.closePools()
+        for conn in connections.all():
+          if(not conn.inAtomicBlock):
+            conn.close()
+        self._pool = multiprocessing.Pool(self.maxWorkers)
+      else:
+        self._pool = ThreadPool(self.maxWorkers)
+    return self._pool
+
+  def submit(self, cmd, cmdModel, paramFormData):
+    with self._lock:
+      job = self._createJob(cmd, cmdModel, paramFormData)
+      self._pendingQueue.append(job)
+    self._dispatch()
+    return job
+
+  def _dispatch(self):
+    with self._lock:
+      while(self._pendingQueue and len(self._runningJobSet)<self.maxWorkers):
+        job = self._pendingQueue.popleft()
+        job.status = job.STATUS_RUNNING
+        self._runningJobSet.add(job)
+        job.handle = self._getPool().apply_async(
+            _runInWorker,
+            (self.jobFxn, job.args),
+            callback=partial(self._onFinish, job)
+            )
+
+  def _onFinish(self, job, result):
+    (isSuccess, job.result) = result
+    job.status = job.STATUS_SUCCESS if(isSuccess) else job.STATUS_FAILURE
+    job.finishedAt = time.time()
+    with self._lock:
+      self._runningJobSet.discard(job)
+    self._finishedQueue.put(job)
+    self._dispatch()
+
+  def cancel(self, job):
+    with self._lock:
+      try:
+        self._pendingQueue.remove(job)
+      except ValueError:
+        return False
+    job.status = job.STATUS_CANCELLED
+    job.finishedAt = time.time()
+    self._finishedQueue.put(job)
+    return True
+
+  @property
+  def pendingNum(self):
+    return len(self._pendingQueue)
+
+  @property
+  def runningNum(self):
+    return len(self._runningJobSet)
+
+  def popFinishedLst(self):
+    jobLst = []
+    while(True):
+      try:
+        jobLst.append(self._finishedQueue.get_nowait())
+      except Empty:
+        return jobLst
+
+  def shutdown(self, wait=True):
+    """Cancel the pending jobs and stop the pool"""
+    with self._lock:
+      pendingLst = list(self._pendingQueue)
+    for job in pendingLst:
+      self.cancel(job)
+    if(self._pool is None):
+      return
+    if(wait):
+      self._pool.close()
+      self._pool.join()
+    else:
+      self._pool.terminate()
+    self._pool = None
+
+_asyncBackend = None
+
+def getAsyncBackend():
+  global _asyncBackend
+  if(_asyncBackend is None):
+    _asyncBackend = importClass(settings.ASYNC_COMMAND_BACKEND)()
+  return _asyncBackend
@@ -1,12 +1,24 @@
 # -*- coding: utf-8 -*-
 #!/usr/bin/env python
 ##### System wide lib #####
+import copy
+from itertools import islice
 import json
+from multiprocessing.pool import ThreadPool
+import traceback
 
 ##### Theory lib #####
 from theory.apps.adapter import BaseUIAdapter
+from theory.conf import settings
+from theory.core.asyncBackend import getAsyncBackend
 from theory.core.exceptions import CommandSyntaxError
+from theory.core.fanOut import FanOutItem, FanOutResult
+from theory.core.signals import commandStarted, commandFinished
+from theory.core.stream import StreamChannel
 from theory.apps.model import Adapter, AdapterBuffer, Command
+from theory.db import connections
+from theory.db.model.query import prefetchRelatedObjects
+from theory.gui.common.baseForm import FormBase
 from theory.utils.importlib import importClass
 
 ##### Theory third-party lib #####
@@ -25,6 +37,10 @@ class Bridge(object):
   independent in each round.
   """
 
+  def __init__(self):
+    # The StreamChannel opened by this bridge, kept for their counters
+    self.channelLst = []
+
   def _objAssign(self, o, k, v):
     setattr(o, k, v)
     return o
@@ -70,7 +86,14 @@ class Bridge(object):
     cmd = cmdKlass()
     cmdParamForm = importClass(cmdModel.classImportPath).ParamForm
     cmd.paramForm = cmdParamForm()
-    cmd.paramForm.fillInitFields(cmdModel, args, kwargs)
+    formKwargs = {}
+    for k, v in kwargs.iteritems():
+      if(isinstance(v, StreamChannel)):
+        # Validating a stream would drain it
+        setattr(cmd, k, v)
+      else:
+        formKwargs[k] = v
+    cmd.paramForm.fillInitFields(cmdModel, args, formKwargs)
     cmd.paramForm.isValid()
     return cmd
 
@@ -106,10 +129,44 @@ class Bridge(object):
     propertyLst = self._naivieAdapterPropertySelection(adapterModel, tailModel)
     adapter.run()
 
-    return (tailInst, self._propertiesAssign(adapter, \
+    storage = self._propertiesAssign(adapter, \
         self._dictAssign, \
         {}, \
-        propertyLst))
+        propertyLst)
+    if(self._isStreamable(commonAdapterName, headInst, tailInst)):
+      storage.update(self._openStream(headInst, adapter))
+    return (tailInst, storage)
+
+  def _isStreamable(self, adapterName, headInst, tailInst):
+    return adapterName in getattr(headInst, "_streamGongs", ()) \
+        and adapterName in getattr(tailInst, "_streamNotations", ())
+
+  def _getStreamedGongLst(self, headInst, tailModel):
+    """The gongs of headInst which the command of tailModel streams"""
+    tailInst = importClass(tailModel.classImportPath)()
+    adapterName = self._probeAdapter(headInst, tailInst)
+    if(self._isStreamable(adapterName, headInst, tailInst)):
+      return [adapterName,]
+    return []
+
+  def _openStream(self, headInst, adapter):
+    channelDict = {}
+    for property in adapter.streamPropertyLst:
+      try:
+        v = getattr(adapter, property)
+      except AttributeError:
+        continue
+      channel = StreamChannel("{0}.{1}".format(headInst.name, property), v)
+      self.channelLst.append(channel.start())
+      channelDict[property] = channel
+    return channelDict
+
+  def cancelStreams(self):
+    for channel in self.channelLst:
+      channel.cancel()
+
+  def streamStats(self):
+    return [channel.stats() for channel in self.channelLst]
 
   def bridgeToSelf(self, headInst):
     cmd = headInst.__class__()
@@ -264,16 +321,273 @@ class Bridge(object):
       runMode = cmdModel.runMode
     if(runMode==Command.RUN_MODE_ASYNC):
       if(forceSync):
-        cmd.run(paramFormData=cmd.paramForm.toPython())
+        self._runInScope(cmd, paramFormData=cmd.paramForm.toPython())
       else:
-        cmd.delay(paramFormData=cmd.paramForm.toPython())
+        cmd._asyncJob = getAsyncBackend().submit(
+            cmd,
+            cmdModel,
+            cmd.paramForm.toPython()
+            )
     else:
       if(not cmd.paramForm.isValid()):
         return False
       cmd._uiParam = uiParam
-      cmd.run()
+      self._runInScope(cmd)
     return True
 
+  def _runInScope(self, cmd, **kwargs):
+    commandStarted.send(sender=cmd.__class__, cmd=cmd)
+    isSuccess = False
+    try:
+      cmd.run(**kwargs)
+      isSuccess = True
+    finally:
+      commandFinished.send(sender=cmd.__class__, cmd=cmd, isSuccess=isSuccess)
+
+  def executePipeline(self, stageLst, uiParam={}):
+    """
+    Run chained commands like ``cmdA(...) | cmdB(...)``. The stageLst is a
+    list of (cmdModel, args, kwargs), or of (cmdModel, args, kwargs,
+    isFanOut). Every command is bridged to the next one as soon as it has
+    run, the kwargs given to a command override the properties coming from
+    the previous one. The adapter properties are handed over as they are, so
+    a gong holding a generator is consumed by the next command while being
+    produced instead of being materialized in between. All commands are run
+    synchronously.
+
+    A fan-out stage, ``cmdA(...) |* cmdB(...)``, runs the command once per
+    item of the iterable property bridged to it by executeMany(). Its
+    isFanOut can be the name of the property to fan out over, which is
+    needed if more than one iterable property is bridged. Its FanOutResult
+    is the command seen by the next stage.
+
+    Return the list of executed commands and whether all of them succeeded.
+    The streams left unconsumed are cancelled afterward, their counters are
+    available from streamStats().
+    """
+    cmdLst = []
+    headInst = None
+    stageLst = list(stageLst)
+    try:
+      for (idx, stage) in enumerate(stageLst):
+        (cmdModel, args, kwargs) = stage[:3]
+        isFanOut = len(stage) > 3 and stage[3]
+        # The name of the property to fan out over, if given
+        fanOutKey = isFanOut if(isinstance(isFanOut, basestring)) else None
+        if(headInst is None):
+          cmd = self.getCmdComplex(cmdModel, args, kwargs)
+        elif(isFanOut):
+          (tailInst, storage) = self.bridge(headInst, cmdModel)
+          (inputIter, sharedKwargs) = self._getFanOutInput(storage, fanOutKey)
+          sharedKwargs.update(kwargs)
+          cmd = self.executeMany(
+              cmdModel,
+              inputIter,
+              args=args,
+              kwargs=sharedKwargs,
+              uiParam=uiParam,
+              forceSync=True
+              )
+          cmdLst.append(cmd)
+          headInst = cmd
+          continue
+        else:
+          (tailInst, storage) = self.bridge(headInst, cmdModel)
+          storage.update(kwargs)
+          cmd = self.getCmdComplex(cmdModel, args, storage)
+        cmdLst.append(cmd)
+        nextStage = stageLst[idx + 1] if(idx + 1 < len(stageLst)) else None
+        if(nextStage is not None and not (len(nextStage) > 3 and nextStage[3])):
+          # A generator is only left in a gong the next command streams
+          cmd._streamedGongs = self._getStreamedGongLst(cmd, nextStage[0])
+        if(not self._executeCommand(cmd, cmdModel, uiParam, forceSync=True)):
+          return (cmdLst, False)
+        headInst = cmd
+      return (cmdLst, True)
+    finally:
+      self.cancelStreams()
+
+  def _prepareChunk(self, cmdModel, args, kwargs, chunk, startIdx):
+    """
+    Return the command used as template and the FanOutItem of the chunk.
+    The form of the template is validated once with the first input, then
+    every input is cleaned by cleanPartial(), which only cleans the fields
+    it gives before cleaning the whole form. The inputs are validated by a
+    form of their own if the first input is invalid or if the form
+    overrides fullClean().
+    """
+    itemLst = [
+        FanOutItem(startIdx + i, itemKwargs)
+        for (i, itemKwargs) in enumerate(chunk)
+        ]
+    templateKwargs = dict(kwargs)
+    templateKwargs.update(chunk[0])
+    templateCmd = self.getCmdComplex(cmdModel, args, templateKwargs)
+    form = templateCmd.paramForm
+    isTemplateReused = form.isValid() \
+        and type(form).fullClean.__func__ is FormBase.fullClean.__func__
+
+    for item in itemLst:
+      if(isTemplateReused):
+        itemForm = form.cleanPartial(item.kwargs)
+      else:
+        itemKwargs = dict(kwargs)
+        itemKwargs.update(item.kwargs)
+        itemForm = self.getCmdComplex(cmdModel, args, itemKwargs).paramForm
+      if(itemForm.isValid()):
+        item.cleanedData = itemForm.cleanedData
+      else:
+        item.error = itemForm.errors
+    return (templateCmd, itemLst)
+
+  def _runChunk(self, cmdModel, args, kwargs, chunk, startIdx, uiParam,
+      forceSync):
+    (templateCmd, itemLst) = self._prepareChunk(
+        cmdModel,
+        args,
+        kwargs,
+        chunk,
+        startIdx
+        )
+    form = templateCmd.paramForm
+    cmdKlass = templateCmd.__class__
+    isAsync = cmdModel.runMode==cmdModel.RUN_MODE_ASYNC
+    for item in itemLst:
+      if(item.cleanedData is None):
+        continue
+      cmd = cmdKlass()
+      cmd.paramForm = copy.copy(form)
+      # The input of the run is read from the fields too, e.x: by finalData,
+      # so the fields of the template are not shared
+      cmd.paramForm.fields = copy.deepcopy(form.fields)
+      for (k, v) in item.kwargs.iteritems():
+        if(k in cmd.paramForm.fields):
+          cmd.paramForm.fields[k].finalData = v
+      cmd.paramForm.cleanedData = item.cleanedData
+      item.cmd = cmd
+      try:
+        if(isAsync):
+          paramFormData = dict(
+              (k, form.fields[k].toPython(v))
+              for (k, v) in item.cleanedData.iteritems()
+              if(not form.fields[k].isSkipInHistory)
+              )
+          if(forceSync):
+            self._runInScope(cmd, paramFormData=paramFormData)
+          else:
+            item.job = getAsyncBackend().submit(cmd, cmdModel, paramFormData)
+        else:
+          cmd._uiParam = uiParam
+          self._runInScope(cmd)
+        item.isSuccess = True
+      except Exception:
+        item.error = traceback.format_exc()
+    return (templateCmd, itemLst)
+
+  def _runChunkInThread(self, chunkArgs):
+    try:
+      return self._runChunk(*chunkArgs)
+    finally:
+      # The connections of a pool thread would never be closed otherwise
+      for conn in connections.all():
+        conn.close()
+
+  def executeMany(
+      self,
+      cmdModel,
+      inputIter,
+      chunkSize=None,
+      concurrency=None,
+      args=[],
+      kwargs={},
+      uiParam={},
+      forceSync=False,
+      itemFxn=None
+      ):
+    """
+    Run the command once per input of inputIter, each input is a dict of
+    kwargs given on top of args and kwargs. The inputs are split into
+    chunks of chunkSize, each of them sharing one validated form. The
+    chunks are run one after another, or by a pool of concurrency threads.
+    An async command is handed to the async backend run by run unless
+    forceSync.
+
+    The itemFxn is called with every FanOutItem as soon as its chunk is
+    done, the errors of a run are kept in its item instead of being raised.
+    Return the FanOutResult of all runs.
+    """
+    if(chunkSize is None):
+      chunkSize = settings.FAN_OUT_CHUNK_SIZE
+    if(concurrency is None):
+      concurrency = settings.FAN_OUT_CONCURRENCY
+    # Every chunk reads the parameters from this instance instead of querying
+    # them, even from another thread
+    prefetchRelatedObjects([cmdModel], ["parameterSet"])
+
+    def iterChunkArgs():
+      inputIterator = iter(inputIter)
+      startIdx = 0
+      while(True):
+        chunk = list(islice(inputIterator, chunkSize))
+        if(not chunk):
+          return
+        yield (cmdModel, args, kwargs, chunk, startIdx, uiParam, forceSync)
+        startIdx += len(chunk)
+
+    pool = None
+    if(concurrency > 1):
+      pool = ThreadPool(concurrency)
+      chunkResultIter = pool.imap(self._runChunkInThread, iterChunkArgs())
+    else:
+      chunkResultIter = (self._runChunk(*i) for i in iterChunkArgs())
+
+    result = FanOutResult()
+    try:
+      for (templateCmd, itemLst) in chunkResultIter:
+        if(result.templateCmd is None):
+          result.templateCmd = templateCmd
+        result.itemLst.extend(itemLst)
+        if(itemFxn is not None):
+          for item in itemLst:
+            itemFxn(item)
+    finally:
+      if(pool is not None):
+        pool.close()
+        pool.join()
+    if(result.templateCmd is None):
+      # No input, the result still stands for the command
+      result.templateCmd = self.getCmdComplex(cmdModel, args, kwargs)
+    return result
+
+  def _getFanOutInput(self, storage, fanOutKey=None):
+    """
+    Split the properties bridged to a fan-out stage into the input of every
+    run and the kwargs shared by the runs. The property fanned out over is
+    the fanOutKey, or else the only property being an iterable other than
+    a string.
+    """
+    if(fanOutKey is None):
+      fanOutKeyLst = [
+          k for (k, v) in storage.iteritems()
+          if(hasattr(v, "__iter__") and not isinstance(v, (basestring, dict)))
+          ]
+      if(len(fanOutKeyLst)!=1):
+        raise CommandSyntaxError(
+            "Unable to fan out over {0}, the property to fan out over has to "
+            "be named".format(sorted(storage.keys()))
+            )
+      fanOutKey = fanOutKeyLst[0]
+    elif(fanOutKey not in storage):
+      raise CommandSyntaxError(
+          "Unable to fan out over {0}, which is not in {1}".format(
+            fanOutKey,
+            sorted(storage.keys())
+            )
+          )
+    sharedKwargs = dict(storage)
+    inputIter = ({fanOutKey: i} for i in sharedKwargs.pop(fanOutKey))
+    return (inputIter, sharedKwargs)
+
   def executeEzCommand(
       self,
       appName,
@@ -1,33 +1,290 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+import hashlib
 from itertools import chain
+import json
+from multiprocessing.pool import ThreadPool
+import os
+import sys
 import types
 
 from theory.apps import apps
+from theory.conf import settings
+from theory.utils import six
 
 from . import Error, Tags, register
 
 
+def _stableValue(value):
+  """
+  Turn a deconstructed value into something whose repr doesn't change
+  between two runs, e.x: functions are given by their import path.
+  """
+  if isinstance(value, dict):
+    return sorted((k, _stableValue(v)) for k, v in value.items())
+  if isinstance(value, (list, tuple, set, frozenset)):
+    valueLst = [_stableValue(v) for v in value]
+    return sorted(valueLst) if isinstance(value, (set, frozenset)) else valueLst
+  if isinstance(value, (six.stringTypes, six.integerTypes, float, bool)) \
+      or value is None:
+    return value
+  if isinstance(value, (type, types.FunctionType, types.MethodType)):
+    return '%s.%s' % (value.__module__, value.__name__)
+  r = repr(value)
+  if ' at 0x' in r:
+    return '%s.%s' % (value.__class__.__module__, value.__class__.__name__)
+  return r
+
+
+def getModelDefinitionHash(model):
+  """
+  Hash the definition of a model, i.e. its fields deconstructed the way the
+  migration autodetector does, its options and managers.
+  """
+  from theory.db.migrations.autodetector import deepDeconstruct
+
+  opts = model._meta
+  definition = (
+    '%s.%s' % (opts.appLabel, opts.objectName),
+    [(f.name, deepDeconstruct(f))
+      for f in opts.localFields + opts.localManyToMany],
+    [(name, getattr(opts, name, None)) for name in (
+      'dbTable', 'ordering', 'uniqueTogether', 'indexTogether', 'abstract',
+      'managed', 'proxy', 'swappable', 'swapped', 'autoCreated',
+    )],
+    ['%s.%s' % (parent._meta.appLabel, parent._meta.objectName)
+      for parent in opts.parents],
+    [(name, manager.__class__)
+      for __, name, manager in opts.concreteManagers + opts.abstractManagers],
+  )
+  return hashlib.md5(repr(_stableValue(definition)).encode('utf-8')).hexdigest()
+
+
+def _getModuleStamp(moduleName):
+  """
+  The modification time and size of the source of a module, which change
+  with the code of the checks defined in it.
+  """
+  path = getattr(sys.modules.get(moduleName), '__file__', None)
+  if path is None:
+    return moduleName
+  if path.endswith(('.pyc', '.pyo')):
+    path = path[:-1]
+  try:
+    stat = os.stat(path)
+  except OSError:
+    return moduleName
+  return '%s:%r:%d' % (moduleName, stat.st_mtime, stat.st_size)
+
+
+def getModelCheckCodeHash(model, moduleStampDict=None):
+  """
+  Hash the modules defining the classes of a model, its fields and managers,
+  so that the model is checked again once their check code, e.x: a custom
+  Field.check() or Model._check*(), has changed.
+  """
+  if moduleStampDict is None:
+    moduleStampDict = {}
+  opts = model._meta
+  klassSet = set(model.__mro__)
+  for f in opts.localFields + opts.localManyToMany:
+    klassSet.update(type(f).__mro__)
+  for __, name, manager in opts.concreteManagers + opts.abstractManagers:
+    klassSet.update(type(manager).__mro__)
+  stampLst = []
+  for moduleName in sorted(set(klass.__module__ for klass in klassSet)):
+    if moduleName not in moduleStampDict:
+      moduleStampDict[moduleName] = _getModuleStamp(moduleName)
+    stampLst.append(moduleStampDict[moduleName])
+  return hashlib.md5('\n'.join(stampLst).encode('utf-8')).hexdigest()
+
+
+def _getRelatedModelSet(model):
+  """ The models on the other side of the relations of a model. """
+  opts = model._meta
+  modelSet = set(opts.parents)
+  for f in opts.localFields + opts.localManyToMany:
+    if f.rel and not isinstance(f.rel.to, six.stringTypes):
+      modelSet.add(f.rel.to)
+      through = getattr(f.rel, 'through', None)
+      if through is not None and not isinstance(through, six.stringTypes):
+        modelSet.add(through)
+  for related in opts.getAllRelatedObjects(includeHidden=True):
+    modelSet.add(related.modal)
+  for related in opts.getAllRelatedManyToManyObjects():
+    modelSet.add(related.modal)
+  modelSet.discard(model)
+  return modelSet
+
+
+class ModelCheckCache(object):
+  """
+  The keys of the models which have passed the model checks. The key of a
+  model hashes its definition with the ones of the models up to two
+  relations away, since the clash checks of a relation look at the fields
+  of the other side and at the relations pointing to it. So a model is
+  only checked again once itself or a model around it has changed.
+
+  The key is salted with the modules of the classes of the model, its
+  fields and managers, as their check() can be overridden.
+
+  The keys are kept in the file at path between two runs if it is given.
+  """
+
+  def __init__(self, path=None):
+    self.path = path
+    self.passedKeySet = None
+    # The stats of the last checkAllModels() run
+    self.checkedNum = 0
+    self.skippedNum = 0
+
+  def _getSalt(self):
+    from theory import getVersion
+    from theory.db import connections
+
+    vendorLst = sorted(set(conn.vendor for conn in connections.all()))
+    return '%s:%s' % (getVersion(), ','.join(vendorLst))
+
+  def _load(self):
+    self.passedKeySet = set()
+    if self.path is None or not os.path.exists(self.path):
+      return
+    try:
+      with open(self.path) as f:
+        self.passedKeySet.update(json.load(f))
+    except (IOError, ValueError):
+      # A broken cache only costs a full check
+      pass
+
+  def save(self):
+    if self.path is None:
+      return
+    with open(self.path, 'w') as f:
+      json.dump(sorted(self.passedKeySet), f)
+
+  def getKeyDict(self, modelLst):
+    """ Return the key of every model of modelLst. """
+    salt = self._getSalt()
+    hashDict = {}
+    relatedDict = {}
+    moduleStampDict = {}
+
+    def getHash(model):
+      if model not in hashDict:
+        hashDict[model] = '%s%s' % (
+          getModelDefinitionHash(model),
+          getModelCheckCodeHash(model, moduleStampDict),
+        )
+      return hashDict[model]
+
+    def getRelatedSet(model):
+      if model not in relatedDict:
+        relatedDict[model] = _getRelatedModelSet(model)
+      return relatedDict[model]
+
+    keyDict = {}
+    for model in modelLst:
+      nearModelSet = set(getRelatedSet(model))
+      for relatedModel in list(nearModelSet):
+        nearModelSet.update(getRelatedSet(relatedModel))
+      nearModelSet.discard(model)
+      key = [salt, getHash(model)] + sorted(getHash(m) for m in nearModelSet)
+      keyDict[model] = hashlib.md5(':'.join(key).encode('utf-8')).hexdigest()
+    return keyDict
+
+  def isPassed(self, key):
+    if self.passedKeySet is None:
+      self._load()
+    return key in self.passedKeySet
+
+  def update(self, passedKeySet, isReplaced=False):
+    """
+    Record the keys of the models having passed the checks. If isReplaced,
+    the keys of the other models are forgotten.
+    """
+    if isReplaced:
+      self.passedKeySet = set()
+    elif self.passedKeySet is None:
+      self._load()
+    self.passedKeySet.update(passedKeySet)
+    self.save()
+
+
+_modelCheckCache = None
+
+
+def getModelCheckCache():
+  global _modelCheckCache
+  if _modelCheckCache is None:
+    _modelCheckCache = ModelCheckCache(settings.MODEL_CHECK_CACHE_PATH)
+  return _modelCheckCache
+
+
+def _checkModelInThread(modelAndKwargs):
+  from theory.db import connections
+
+  model, kwargs = modelAndKwargs
+  try:
+    return model.check(**kwargs)
+  finally:
+    # The connections of a pool thread would never be closed otherwise
+    for conn in connections.all():
+      conn.close()
+
+
 @register(Tags.models)
 def checkAllModels(appConfigs=None, **kwargs):
-  errors = [model.check(**kwargs)
-    for model in apps.getModels()
+  """
+  Run the checks of the models, skipping the models having passed them
+  since they were last changed. The others are checked by a pool of
+  MODEL_CHECK_WORKERS threads.
+  """
+  modelLst = [model for model in apps.getModels()
     if appConfigs is None or model._meta.appConfig in appConfigs]
+  cache = getModelCheckCache()
+  keyDict = cache.getKeyDict(modelLst)
+  uncheckedLst = [
+    model for model in modelLst if not cache.isPassed(keyDict[model])
+  ]
+
+  workerNum = min(settings.MODEL_CHECK_WORKERS, len(uncheckedLst))
+  if workerNum > 1:
+    pool = ThreadPool(workerNum)
+    try:
+      errors = pool.map(
+        _checkModelInThread,
+        [(model, kwargs) for model in uncheckedLst]
+      )
+    finally:
+      pool.close()
+      pool.join()
+  else:
+    errors = [model.check(**kwargs) for model in uncheckedLst]
+
+  failedModelSet = set(
+    model for model, modelErrors in zip(uncheckedLst, errors) if modelErrors
+  )
+  cache.update(
+    [keyDict[model] for model in modelLst if model not in failedModelSet],
+    isReplaced=appConfigs is None
+  )
+  cache.checkedNum = len(uncheckedLst)
+  cache.skippedNum = len(modelLst) - len(uncheckedLst)
   return list(chain(*errors))
 
 
 @register(Tags.models, Tags.signals)
 def checkModelSignals(appConfigs=None, **kwargs):
   """Ensure lazily referenced model signals senders are installed."""
-  from theory.db import models
+  from theory.db.model import signals
   errors = []
 
-  for name in dir(models.signals):
-    obj = getattr(models.signals, name)
-    if isinstance(obj, models.signals.ModelSignal):
+  for name in dir(signals):
+    obj = getattr(signals, name)
+    if isinstance(obj, signals.ModelSignal):
       for reference, receivers in obj.unresolvedReferences.items():
-        for receiver, _, _ in receivers:
+        for receiver, _, _, _ in receivers:
           # The receiver is either a function or an instance of class
           # defining a `__call__` method.
           if isinstance(receiver, types.FunctionType):
@@ -2,6 +2,7 @@
 from __future__ import unicode_literals
 
 from itertools import chain
+import time
 
 from theory.utils.itercompat import isIterable
 
@@ -20,6 +21,8 @@ class CheckRegistry(object):
 
   def __init__(self):
     self.registeredChecks = []
+    # The (check name, seconds) of every check of the last runChecks()
+    self.timeLst = []
 
   def register(self, *tags):
     """
@@ -55,12 +58,16 @@ class CheckRegistry(object):
     else:
       checks = self.registeredChecks
 
+    timeLst = []
     for check in checks:
+      startTime = time.time()
       newErrors = check(appConfigs=appConfigs)
+      timeLst.append((check.__name__, time.time() - startTime))
       assert isIterable(newErrors), (
         "The function %r did not return a list. All functions registered "
         "with the checks registry must return a list." % check)
       errors.extend(newErrors)
+    self.timeLst = timeLst
     return errors
 
   def tagExists(self, tag):
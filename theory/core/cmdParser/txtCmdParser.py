@@ -1,10 +1,10 @@
 # -*- coding: utf-8 -*-
 #!/usr/bin/env python
 ##### System wide lib #####
+from bisect import bisect_left
 import re
 
 ##### Theory lib #####
-from theory.core.exceptions import CommandSyntaxError
 
 ##### Theory third-party lib #####
 
@@ -14,7 +14,75 @@ from theory.core.exceptions import CommandSyntaxError
 
 ##### Misc #####
 
+__all__ = ('Token', 'CmdNode', 'TxtCmdParser',)
+
+class Token(object):
+  TYPE_NAME = "name"
+  TYPE_STRING = "string"
+  TYPE_OPEN_PAREN = "openParen"
+  TYPE_CLOSE_PAREN = "closeParen"
+  TYPE_COMMA = "comma"
+  TYPE_EQUAL = "equal"
+  TYPE_PIPE = "pipe"
+
+  # The pipe running the next command once per item of the input
+  FAN_OUT_PIPE = "|*"
+
+  __slots__ = ("type", "value", "start", "end",)
+
+  def __init__(self, type, value, start, end):
+    self.type = type
+    self.value = value
+    self.start = start
+    self.end = end
+
+  @property
+  def isClosed(self):
+    """Only meaningful for string, false while the closing quote is missing"""
+    return len(self.value) > 1 and self.value[-1] == self.value[0]
+
+  @property
+  def unquotedValue(self):
+    return self.value[1:-1] if self.isClosed else self.value[1:]
+
+  def __repr__(self):
+    return "<Token %s %r>" % (self.type, self.value)
+
+class CmdNode(object):
+  """
+  One command of a pipeline like ``cmdA(1, b=2) | cmdB()``. The token
+  indexes refer to TxtCmdParser's token list. A command following a
+  fan-out pipe, e.x: cmdB in ``cmdA() |* cmdB()``, is run once per item of
+  its input.
+  """
+  def __init__(self, firstTokenIdx, isFanOut=False):
+    self.cmdName = ""
+    self.args = []
+    self.kwargs = {}
+    self.firstTokenIdx = firstTokenIdx
+    self.isFanOut = isFanOut
+    # The index of the pipe token which ends this node, None for the last
+    # node.
+    self.pipeTokenIdx = None
+    self.openParenToken = None
+    self.closeParenToken = None
+    self.lastCommaToken = None
+    self.isError = False
+
+  @property
+  def isInParen(self):
+    return self.openParenToken is not None and self.closeParenToken is None
+
+  def __repr__(self):
+    return "<CmdNode %s %r %r>" % (self.cmdName, self.args, self.kwargs)
+
 class TxtCmdParser(object):
+  """
+  Parse the command line typed in the reactor into a list of CmdNode, one
+  per command of the pipeline. The parser keeps its tokens between two
+  run(), so only the tokens after the edit point are rebuilt and only the
+  commands after the last untouched pipe are parsed again.
+  """
   MODE_EMPTY = 0
   MODE_ERROR = 1
   MODE_COMMAND = 2
@@ -35,6 +103,22 @@ class TxtCmdParser(object):
       (MODE_DONE, "done"),
   )
 
+  # Anything between single quote or double qoute will not be considered as
+  # special char. A missing closing quote makes the string run to the end.
+  _tokenRePattern = re.compile(
+      r"""
+      (?P<space>\s+)
+      |(?P<string>"[^"]*"?|'[^']*'?)
+      |(?P<openParen>\()
+      |(?P<closeParen>\))
+      |(?P<comma>,)
+      |(?P<equal>=)
+      |(?P<pipe>\|\*?)
+      |(?P<name>[^\s()=,|'"]+)
+      """,
+      re.VERBOSE
+      )
+
   @property
   def cmdInTxt(self):
     return self._cmdInTxt
@@ -44,38 +128,53 @@ class TxtCmdParser(object):
     self._lastCmdInTxt = self._cmdInTxt
     self._cmdInTxt = cmdInTxt
 
+  @property
+  def pipeline(self):
+    return self._cmdNodeLst
+
+  @property
+  def _lastCmdNode(self):
+    try:
+      return self._cmdNodeLst[-1]
+    except IndexError:
+      return None
+
   @property
   def args(self):
-    return self._args
+    node = self._lastCmdNode
+    return node.args if node is not None else []
 
   @property
   def kwargs(self):
-    return self._kwargs
+    node = self._lastCmdNode
+    return node.kwargs if node is not None else {}
+
+  @property
+  def _kwargs(self):
+    return self.kwargs
 
   @property
   def cmdName(self):
-    return self._cmdName
+    node = self._lastCmdNode
+    return node.cmdName if node is not None else ""
 
   @property
-  def mode(self):
-    try:
-      isInParen = self._openParenIdx[-1] > self._closeParenIdx[-1]
-    except IndexError:
-      isInParen = False
+  def isError(self):
+    return any(node.isError for node in self._cmdNodeLst)
 
-    if(self._cmdInTxt==""):
+  @property
+  def mode(self):
+    if(self._cmdInTxt.strip()==""):
       return self.MODE_EMPTY
-    elif(self._isDetectError):
+    elif(self.isError):
       return self.MODE_ERROR
-    elif(len(self._singleQuoteIdx) % 2 != 0):
-      return self.MODE_SINGLE_QUOTE
-    elif(len(self._doubleQuoteIdx) % 2 != 0):
+
+    lastToken = self._tokenLst[-1]
+    if(lastToken.type==Token.TYPE_STRING and not lastToken.isClosed):
+      if(lastToken.value[0]=="'"):
+        return self.MODE_SINGLE_QUOTE
       return self.MODE_DOUBLE_QUOTE
-    elif(self._inKwargs):
-      return self.MODE_KWARGS
-    elif(len(self._openParenIdx)==1 and len(self._closeParenIdx)==0):
-      return self.MODE_ARGS if self._cmdInTxt[-1] != "=" else self.MODE_KWARGS
-    elif(isInParen):
+    elif(self._lastCmdNode.isInParen):
       return self.MODE_ARGS if self._cmdInTxt[-1] != "=" else self.MODE_KWARGS
     else:
       return self.MODE_COMMAND
@@ -91,12 +190,12 @@ class TxtCmdParser(object):
         ):
       return (mode, "")
     elif(mode==self.MODE_COMMAND):
-      return (mode, self._cmdName)
+      return (mode, self.cmdName)
     elif(mode==self.MODE_ARGS):
-      try:
-        return (mode, self._cmdInTxt[self._commaIdx[-1]:])
-      except IndexError:
-        return (mode, self._cmdInTxt[self._openParenIdx[-1]:])
+      node = self._lastCmdNode
+      if(node.lastCommaToken is not None):
+        return (mode, self._cmdInTxt[node.lastCommaToken.start:])
+      return (mode, self._cmdInTxt[node.openParenToken.start:])
     else:
       return (self.MODE_EMPTY, "")
 
@@ -105,140 +204,150 @@ class TxtCmdParser(object):
     self.initVar()
 
   def initVar(self):
-    self._cmdName = ""
-    self._args = []
-    self._kwargs = {}
-    self._singleQuoteIdx = []
-    self._doubleQuoteIdx = []
-    self._openParenIdx = []
-    self._closeParenIdx = []
-    self._commaIdx = []
     self._cmdInTxt = ""
     self._lastCmdInTxt = ""
-    self._lastEqualSignIdx = 0
-    self._inKwargs = False
-    self._isDetectError = False
-
-  def _checkFirstChar(self, c):
-    pass
-
-  def _buildSpecialCharIdx(self, cmdInTxt):
-    # reset mode and index
-    mode = self.MODE_EMPTY
-    self._openParenIdx = []
-    self._closeParenIdx = []
-
-    for i in range(len(cmdInTxt)):
-      c = cmdInTxt[i]
-      if(mode!=self.MODE_SINGLE_QUOTE and c=="\""):
-        self._doubleQuoteIdx.append(i)
-        mode = self.MODE_DOUBLE_QUOTE if len(self._doubleQuoteIdx) % 2!=0 else self.MODE_EMPTY
-      elif(mode!=self.MODE_DOUBLE_QUOTE and c=="'"):
-        self._singleQuoteIdx.append(i)
-        mode = self.MODE_SINGLE_QUOTE if len(self._singleQuoteIdx) % 2!=0 else self.MODE_EMPTY
-      # Anything between single quote or double qoute will not be considered as special char
-      elif(mode==self.MODE_SINGLE_QUOTE or mode==self.MODE_DOUBLE_QUOTE):
-        continue
-      elif(c==","):
-        self._commaIdx.append(i)
-      elif(c=="("):
-        self._openParenIdx.append(i)
-      elif(c==")"):
-        self._closeParenIdx.append(i)
-      elif(c=="="):
-        self._lastEqualSignIdx = i
-
-  # depreciated
-  # TODO: adding more rules
-  def _validateCmdByIdx(self, cmdInTxt):
-    if(self.mode() == self.MODE_COMMAND):
-      if(self._cmdName.contains(",\"'")):
-        raise CommandSyntaxError
-    elif(self.mode() == self.MODE_DONE):
-      #validate indexes
-      if(self._closeParenIdx[-1]+1!=len(cmdInTxt)):
-        raise CommandSyntaxError
-
-      for idx in ["_doubleQuoteIdx", "_singleQuoteIdx", ]:
-        if(len(getattr(self, idx)) % 2 != 0 ):
-          raise CommandSyntaxError
-
-      if((len(self._openParenIdx) + len(self._closeParenIdx)) % 2 != 0):
-          raise CommandSyntaxError
-
-  # TODO: support recursive cmd and chain cmd
-  def _parseCmdInTxt(self):
-    try:
-      self._cmdName = self.cmdInTxt[0:self._openParenIdx[0]]
-    except IndexError:
-      self._cmdName = self.cmdInTxt
-    if(not self.legitCmdNameRePattern.match(self._cmdName)):
-      self._isDetectError = True
-      return
+    # The text which _tokenLst and _cmdNodeLst were built from
+    self._parsedCmdInTxt = ""
+    self._tokenLst = []
+    self._tokenEndLst = []
+    self._cmdNodeLst = []
 
-    paramRegion = ""
-    try:
-      # for chain cmd, the idx should be replaced by for-loop kind structure
-      paramStart = self._openParenIdx[0] + 1
-      try:
-        paramEnd = self._closeParenIdx[0]
-      except IndexError:
-        paramEnd = len(self.cmdInTxt)
-    except IndexError:
-      paramStart = 0
-      paramEnd = 0
-    (self._args, self._kwargs) = self._parseParamRegion(paramStart, paramEnd)
-
-  def _locateIdxInRegion(self, idx, floor, ceiling):
-    idxLen = len(idx)
-    for i in range(idxLen):
-      if(idx[i]>ceiling):
-        return None
-      elif(floor<idx[i]<ceiling):
-        return idx[i]
-    return None
-
-  def _parseParamRegion(self, paramStart, paramEnd):
-    args = []
-    kwargs = {}
-    if(paramStart!=0 and paramEnd!=0):
-      lastCommaIdx = paramStart - 1
-      while(True):
-        commaIdx = self._locateIdxInRegion(self._commaIdx, lastCommaIdx, paramEnd)
-        if(commaIdx==None):
-          commaIdx = paramEnd
+  def _getEditPoint(self, oldTxt, newTxt):
+    """The length of the common prefix of both texts"""
+    if(newTxt.startswith(oldTxt)):
+      # The usual case, user is typing at the end of the line
+      return len(oldTxt)
+    low = 0
+    high = min(len(oldTxt), len(newTxt))
+    while(low < high):
+      mid = (low + high + 1) // 2
+      if(oldTxt[:mid]==newTxt[:mid]):
+        low = mid
+      else:
+        high = mid - 1
+    return low
+
+  def _tokenize(self, editPoint):
+    # A token ending at the edit point might grow, so it is rebuilt as well.
+    # Tokens are separated by whitespace only, so the tokenizer is always in
+    # its initial state at the end of a kept token.
+    keepTokenNum = bisect_left(self._tokenEndLst, editPoint)
+    del self._tokenLst[keepTokenNum:]
+    del self._tokenEndLst[keepTokenNum:]
+
+    cmdInTxt = self._cmdInTxt
+    pos = self._tokenLst[-1].end if self._tokenLst else 0
+    cmdInTxtLen = len(cmdInTxt)
+    match = self._tokenRePattern.match
+    while(pos < cmdInTxtLen):
+      m = match(cmdInTxt, pos)
+      type = m.lastgroup
+      end = m.end()
+      if(type!="space"):
+        self._tokenLst.append(Token(type, m.group(), pos, end))
+        self._tokenEndLst.append(end)
+      pos = end
+    return keepTokenNum
+
+  def _parseCmdNode(self, tokenIdx):
+    """Parse tokens from tokenIdx up to the next pipe or the end of line"""
+    tokenLst = self._tokenLst
+    node = CmdNode(
+        tokenIdx,
+        tokenIdx > 0 and tokenLst[tokenIdx - 1].value==Token.FAN_OUT_PIPE
+        )
+    tokenLen = len(tokenLst)
+
+    # command name
+    if(tokenIdx < tokenLen and tokenLst[tokenIdx].type==Token.TYPE_NAME):
+      node.cmdName = tokenLst[tokenIdx].value
+      tokenIdx += 1
+      if(not self.legitCmdNameRePattern.match(node.cmdName)):
+        node.isError = True
+    elif(tokenIdx < tokenLen):
+      # e.x: a pipe without the command in front of it
+      node.isError = True
+
+    if(tokenIdx < tokenLen \
+        and tokenLst[tokenIdx].type==Token.TYPE_OPEN_PAREN \
+        and not node.isError):
+      node.openParenToken = tokenLst[tokenIdx]
+      tokenIdx += 1
+      paramTokenLst = []
+      while(tokenIdx < tokenLen):
+        token = tokenLst[tokenIdx]
+        if(token.type==Token.TYPE_CLOSE_PAREN):
+          node.closeParenToken = token
+          tokenIdx += 1
+          break
+        elif(token.type==Token.TYPE_COMMA):
+          self._parseParam(node, paramTokenLst)
+          paramTokenLst = []
+          node.lastCommaToken = token
+        elif(token.type in (Token.TYPE_OPEN_PAREN, Token.TYPE_PIPE)):
+          # TODO: support recursive cmd
+          node.isError = True
           break
         else:
-          (args, kwargs) = self._parseParam(self._cmdInTxt[lastCommaIdx+1:commaIdx], args, kwargs)
-          lastCommaIdx = commaIdx
-      (args, kwargs) = self._parseParam(self._cmdInTxt[lastCommaIdx+1:commaIdx], args, kwargs)
-    return (args, kwargs)
-
-  def _parseParam(self, param, args, kwargs):
-    param = param.strip()
-    #r.append([i.strip() for i in param.split("=")])
-    if(param==""):
+          paramTokenLst.append(token)
+        tokenIdx += 1
+      self._parseParam(node, paramTokenLst)
+
+    # Skip the rest of the command in case of error, but still find the
+    # pipe to keep the following command parsable.
+    while(tokenIdx < tokenLen):
+      token = tokenLst[tokenIdx]
+      if(token.type==Token.TYPE_PIPE):
+        node.pipeTokenIdx = tokenIdx
+        break
+      node.isError = True
+      tokenIdx += 1
+    return node
+
+  def _getParamValue(self, tokenLst):
+    if(len(tokenLst)==1 and tokenLst[0].type==Token.TYPE_STRING):
+      return tokenLst[0].unquotedValue
+    return self._cmdInTxt[tokenLst[0].start:tokenLst[-1].end]\
+        .strip("'").strip('"')
+
+  def _parseParam(self, node, tokenLst):
+    if(not tokenLst):
       # for case like fxn()
-      return (args, kwargs)
-    elif(not param.startswith('"') and not param.startswith("'")):
-      paramLen = 0
-      param = param.split("=")
-      for i in range(len(param)):
-        paramLen += 1
-        param[i] = param[i].strip().strip("'").strip('"')
-      if(paramLen>1):
-        kwargs[param[0]] = param[1]
-      else:
-        args.append(param[0])
-    else:
-      args.append(param.strip().strip("'").strip('"'))
-    return (args, kwargs)
+      return
+    for i, token in enumerate(tokenLst):
+      if(token.type==Token.TYPE_EQUAL):
+        if(i==0):
+          node.isError = True
+        elif(i + 1 < len(tokenLst)):
+          node.kwargs[self._getParamValue(tokenLst[:i])] = \
+              self._getParamValue(tokenLst[i + 1:])
+        else:
+          node.kwargs[self._getParamValue(tokenLst[:i])] = ""
+        return
+    node.args.append(self._getParamValue(tokenLst))
 
   def run(self):
-    if(self.cmdInTxt==""):
+    if(self._cmdInTxt==""):
       self.initVar()
       return
-    self._checkFirstChar(self.cmdInTxt[0])
-    self._buildSpecialCharIdx(self.cmdInTxt)
-    self._parseCmdInTxt()
+    editPoint = self._getEditPoint(self._parsedCmdInTxt, self._cmdInTxt)
+    keepTokenNum = self._tokenize(editPoint)
+    self._parsedCmdInTxt = self._cmdInTxt
+
+    # Commands ended by a pipe which has been kept are unchanged.
+    while(self._cmdNodeLst):
+      pipeTokenIdx = self._cmdNodeLst[-1].pipeTokenIdx
+      if(pipeTokenIdx is not None and pipeTokenIdx < keepTokenNum):
+        break
+      self._cmdNodeLst.pop()
 
+    if(self._cmdNodeLst):
+      tokenIdx = self._cmdNodeLst[-1].pipeTokenIdx + 1
+    else:
+      tokenIdx = 0
+    while(True):
+      node = self._parseCmdNode(tokenIdx)
+      self._cmdNodeLst.append(node)
+      if(node.pipeTokenIdx is None):
+        break
+      tokenIdx = node.pipeTokenIdx + 1
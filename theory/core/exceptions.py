@@ -175,6 +175,10 @@ class CommandSyntaxError(Exception):
   """The syntax of requested command has error"""
   pass
 
+class StreamCancelled(Exception):
+  """The stream between two chained commands has been cancelled"""
+  pass
+
 class CommandError(Exception):
   """The requested command has error"""
   pass
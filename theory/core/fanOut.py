@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+##### System wide lib #####
+
+##### Theory lib #####
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ("FanOutItem", "FanOutResult",)
+
+class FanOutItem(object):
+  """One run of a command fanned out by Bridge.executeMany()"""
+  __slots__ = ("idx", "kwargs", "cleanedData", "cmd", "job", "isSuccess",
+      "error",)
+
+  def __init__(self, idx, kwargs):
+    self.idx = idx
+    # The input of this run, i.e. the kwargs on top of the shared ones
+    self.kwargs = kwargs
+    self.cleanedData = None
+    self.cmd = None
+    # The AsyncJob if the command has been handed to the async backend
+    self.job = None
+    self.isSuccess = False
+    # The errors of the form or the traceback of a failed run
+    self.error = None
+
+  def __repr__(self):
+    return "<FanOutItem %s %r %s>" % (
+        self.idx,
+        self.kwargs,
+        "ok" if(self.isSuccess) else "failed"
+        )
+
+class FanOutResult(object):
+  """
+  The runs of a command fanned out by Bridge.executeMany(), in input order.
+  It stands for the command in a pipeline: the name, the form and the
+  adapters come from the command used as template, while reading an output
+  of the command, i.e. a property or a data attribute but not a method,
+  gives the list of that output of every successful run. So the runs are
+  aggregated into a single gong output.
+  """
+  _templateAttrSet = frozenset([
+      "name",
+      "verboseName",
+      "paramForm",
+      "gongs",
+      "notations",
+      "_gongs",
+      "_notations",
+      "_drums",
+      "_streamGongs",
+      "_streamNotations",
+      "isSaveToHistory",
+      "_uiParam",
+      ])
+
+  def __init__(self, templateCmd=None):
+    self.templateCmd = templateCmd
+    self.itemLst = []
+
+  def __getattr__(self, name):
+    if(name.startswith("__") or name in ("templateCmd", "itemLst")):
+      raise AttributeError(name)
+    if(name in self._templateAttrSet):
+      if(self.templateCmd is None):
+        raise AttributeError(name)
+      return getattr(self.templateCmd, name)
+    if(not self._isOutputAttr(name)):
+      raise AttributeError(name)
+    return [getattr(i.cmd, name) for i in self.successLst]
+
+  def _isOutputAttr(self, name):
+    if(self.templateCmd is None):
+      return False
+    if(isinstance(getattr(type(self.templateCmd), name, None), property)):
+      return True
+    try:
+      return not callable(getattr(self.templateCmd, name))
+    except AttributeError:
+      return False
+
+  def __len__(self):
+    return len(self.itemLst)
+
+  def __iter__(self):
+    return iter(self.itemLst)
+
+  @property
+  def successLst(self):
+    return [i for i in self.itemLst if(i.isSuccess)]
+
+  @property
+  def errorLst(self):
+    return [i for i in self.itemLst if(not i.isSuccess)]
+
+  def __repr__(self):
+    return "<FanOutResult %s ok, %s failed>" % (
+        len(self.successLst),
+        len(self.errorLst)
+        )
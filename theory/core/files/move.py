@@ -22,7 +22,7 @@ except ImportError:
     if hasattr(os, 'chmod'):
       os.chmod(dst, mode)
 
-__all__ = ['fileMoveSafe']
+__all__ = ['fileMoveSafe', 'fileCopySafe']
 
 
 def _samefile(src, dst):
@@ -38,6 +38,54 @@ def _samefile(src, dst):
       os.path.normcase(os.path.abspath(dst)))
 
 
+def _copyFileData(oldFile, fd, chunkSize):
+  """
+  Copies the whole oldFile into the file descriptor. The kernel copies the
+  data by ``os.sendfile`` where it is available, otherwise the chunks are
+  streamed in Python.
+  """
+  sendfile = getattr(os, 'sendfile', None)
+  if sendfile is not None:
+    offset = 0
+    size = os.fstat(oldFile.fileno()).st_size
+    try:
+      while offset < size:
+        sent = sendfile(fd, oldFile.fileno(), offset, size - offset)
+        if sent == 0:
+          break
+        offset += sent
+      return
+    except OSError:
+      if offset:
+        raise
+      # e.x: the filesystem does not support it, fall back to streaming
+
+  currentChunk = None
+  while currentChunk != b'':
+    currentChunk = oldFile.read(chunkSize)
+    os.write(fd, currentChunk)
+
+
+def fileCopySafe(oldFileName, newFileName, chunkSize=1024 * 64, allowOverwrite=False):
+  """
+  Copies a file with its stat info. The new file is created exclusively, an
+  ``OSError`` with ``errno.EEXIST`` is raised if it exists and
+  ``allowOverwrite`` is ``False``.
+  """
+  # first open the old file, so that it won't go away
+  with open(oldFileName, 'rb') as oldFile:
+    # now open the new file, not forgetting allowOverwrite
+    fd = os.open(newFileName, (os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0) |
+                   (os.O_EXCL if not allowOverwrite else os.O_TRUNC)))
+    try:
+      locks.lock(fd, locks.LOCK_EX)
+      _copyFileData(oldFile, fd, chunkSize)
+    finally:
+      locks.unlock(fd)
+      os.close(fd)
+  copystat(oldFileName, newFileName)
+
+
 def fileMoveSafe(oldFileName, newFileName, chunkSize=1024 * 64, allowOverwrite=False):
   """
   Moves a file from one location to another in the safest way possible.
@@ -65,21 +113,7 @@ def fileMoveSafe(oldFileName, newFileName, chunkSize=1024 * 64, allowOverwrite=F
     # or when moving opened files on certain operating systems
     pass
 
-  # first open the old file, so that it won't go away
-  with open(oldFileName, 'rb') as oldFile:
-    # now open the new file, not forgetting allowOverwrite
-    fd = os.open(newFileName, (os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0) |
-                   (os.O_EXCL if not allowOverwrite else 0)))
-    try:
-      locks.lock(fd, locks.LOCK_EX)
-      currentChunk = None
-      while currentChunk != b'':
-        currentChunk = oldFile.read(chunkSize)
-        os.write(fd, currentChunk)
-    finally:
-      locks.unlock(fd)
-      os.close(fd)
-  copystat(oldFileName, newFileName)
+  fileCopySafe(oldFileName, newFileName, chunkSize, allowOverwrite)
 
   try:
     os.remove(oldFileName)
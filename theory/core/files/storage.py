@@ -1,13 +1,16 @@
 import os
 import errno
+import hashlib
 import itertools
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
 
 from theory.conf import settings
 from theory.core.exceptions import SuspiciousFileOperation
 from theory.core.files import locks, File
-from theory.core.files.move import fileMoveSafe
-from theory.utils.encoding import forceText, filepathToUri
+from theory.core.files.move import fileCopySafe, fileMoveSafe
+from theory.utils.encoding import forceBytes, forceText, filepathToUri
 from theory.utils.functional import LazyObject
 from theory.utils.moduleLoading import importString
 from theory.utils.six.moves.urllib.parse import urljoin
@@ -16,7 +19,8 @@ from theory.utils._os import safeJoin, abspathu
 from theory.utils.deconstruct import deconstructible
 
 
-__all__ = ('Storage', 'FileSystemStorage', 'DefaultStorage', 'defaultStorage')
+__all__ = ('Storage', 'FileSystemStorage', 'ContentAddressedStorage',
+    'DefaultStorage', 'defaultStorage')
 
 
 class Storage(object):
@@ -174,14 +178,13 @@ class FileSystemStorage(Storage):
   def _open(self, name, mode='rb'):
     return File(open(self.path(name), mode))
 
-  def _save(self, name, content):
-    fullPath = self.path(name)
-
-    # Create any intermediate directories that do not exist.
+  def _makeDirs(self, directory):
+    """
+    Create any intermediate directories that do not exist.
+    """
     # Note that there is a race between os.path.exists and os.makedirs:
     # if os.makedirs fails with EEXIST, the directory was created
     # concurrently, and we can continue normally. Refs #16082.
-    directory = os.path.dirname(fullPath)
     if not os.path.exists(directory):
       try:
         if self.directoryPermissionsMode is not None:
@@ -200,6 +203,10 @@ class FileSystemStorage(Storage):
     if not os.path.isdir(directory):
       raise IOError("%s exists and is not a directory." % directory)
 
+  def _save(self, name, content):
+    fullPath = self.path(name)
+    self._makeDirs(os.path.dirname(fullPath))
+
     # There's a potential race condition between getAvailableName and
     # saving the file; it's possible that two threads might return the
     # same name, at which point all sorts of fun happens. So we need to
@@ -250,6 +257,25 @@ class FileSystemStorage(Storage):
 
     return name
 
+  def getAvailableName(self, name):
+    """
+    Same as Storage.getAvailableName(), but the names being taken are read
+    by one listdir() instead of checking the suffixes one by one.
+    """
+    if not self.exists(name):
+      return name
+    dirName, fileName = os.path.split(name)
+    fileRoot, fileExt = os.path.splitext(fileName)
+    try:
+      takenNameSet = set(os.listdir(self.path(dirName)))
+    except OSError:
+      takenNameSet = set()
+    for i in itertools.count(1):
+      # fileExt includes the dot.
+      candidate = "%s_%s%s" % (fileRoot, i, fileExt)
+      if candidate not in takenNameSet:
+        return os.path.join(dirName, candidate)
+
   def delete(self, name):
     assert name, "The name argument is not allowed to be empty."
     name = self.path(name)
@@ -302,6 +328,218 @@ class FileSystemStorage(Storage):
     return datetime.fromtimestamp(os.path.getmtime(self.path(name)))
 
 
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+  """
+  Filesystem storage keeping a single copy of every distinct content. The
+  content is hashed while it is written and stored once as a blob named by
+  its digest; the file names are hardlinks to the blobs, so saving the same
+  content again costs a hash pass but no disk space. A blob is removed with
+  its last name. The files are copied from the blobs on filesystems
+  without hardlinks.
+
+  The blobs are read-only. Opening a name for writing gives it its own copy
+  of the content first, so the blob and the other names are left unchanged.
+  """
+  blobDirName = '.blob'
+  hashName = 'sha256'
+  chunkSize = 1024 * 64
+
+  @property
+  def blobLocation(self):
+    return os.path.join(self.location, self.blobDirName)
+
+  def blobPath(self, digest):
+    return os.path.join(self.blobLocation, digest[:2], digest[2:])
+
+  def digest(self, name):
+    """
+    Returns the hex digest of the content of the file specified by name.
+    """
+    return self._hashFile(self.path(name)).hexdigest()
+
+  @contextmanager
+  def _lockBlobs(self, flags):
+    """
+    Locks the blobs against collectGarbage(), which takes the lock
+    exclusively, between a blob being saved and linked.
+    """
+    tmpLocation = os.path.join(self.blobLocation, 'tmp')
+    self._makeDirs(tmpLocation)
+    with open(os.path.join(tmpLocation, 'lock'), 'ab') as f:
+      locks.lock(f, flags)
+      try:
+        yield
+      finally:
+        locks.unlock(f)
+
+  def _getFileMode(self):
+    if self.filePermissionsMode is not None:
+      return self.filePermissionsMode
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+  def _hashFile(self, path):
+    hasher = hashlib.new(self.hashName)
+    with open(path, 'rb') as f:
+      for chunk in iter(lambda: f.read(self.chunkSize), b''):
+        hasher.update(chunk)
+    return hasher
+
+  def _saveBlob(self, content):
+    """
+    Stores the content as a blob unless there is one with the same content,
+    returns the path of the blob.
+    """
+    tmpLocation = os.path.join(self.blobLocation, 'tmp')
+    self._makeDirs(tmpLocation)
+    if hasattr(content, 'temporaryFilePath'):
+      # It is moved rather than copied if the blob is new
+      tmpPath = content.temporaryFilePath()
+      hasher = self._hashFile(tmpPath)
+      isOwned = False
+    else:
+      hasher = hashlib.new(self.hashName)
+      fd, tmpPath = tempfile.mkstemp(dir=tmpLocation)
+      try:
+        with os.fdopen(fd, 'wb') as f:
+          for chunk in content.chunks():
+            chunk = forceBytes(chunk)
+            hasher.update(chunk)
+            f.write(chunk)
+      except Exception:
+        os.remove(tmpPath)
+        raise
+      isOwned = True
+
+    blobPath = self.blobPath(hasher.hexdigest())
+    if os.path.exists(blobPath):
+      if isOwned:
+        os.remove(tmpPath)
+      return blobPath
+
+    self._makeDirs(os.path.dirname(blobPath))
+    # The same content might be saved concurrently, either blob is fine
+    if isOwned:
+      os.rename(tmpPath, blobPath)
+    else:
+      fileMoveSafe(tmpPath, blobPath, allowOverwrite=True)
+    # The names share the blob, none of them is written in place.
+    # mkstemp() creates the file readable by the owner only.
+    os.chmod(blobPath, self._getFileMode() & ~0o222)
+    return blobPath
+
+  def _link(self, blobPath, fullPath):
+    if hasattr(os, 'link'):
+      try:
+        os.link(blobPath, fullPath)
+        return
+      except OSError as e:
+        if e.errno not in (errno.EPERM, errno.EXDEV, errno.EMLINK):
+          raise
+    fileCopySafe(blobPath, fullPath, self.chunkSize)
+    # The copy is not shared, unlike the read-only blob
+    os.chmod(fullPath, self._getFileMode())
+
+  def _breakLink(self, name, isTruncated):
+    """
+    Gives the file its own copy of the content, so writing it leaves the
+    blob and the other names of the same content unchanged.
+    """
+    fullPath = self.path(name)
+    try:
+      if os.stat(fullPath).st_nlink == 1:
+        return
+    except OSError as e:
+      if e.errno == errno.ENOENT:
+        return
+      raise
+    if isTruncated:
+      # The content is about to be dropped, no need to copy it
+      os.remove(fullPath)
+      return
+    fd, tmpPath = tempfile.mkstemp(dir=os.path.join(self.blobLocation, 'tmp'))
+    os.close(fd)
+    try:
+      fileCopySafe(fullPath, tmpPath, self.chunkSize, allowOverwrite=True)
+      os.chmod(tmpPath, self._getFileMode())
+      os.rename(tmpPath, fullPath)
+    except Exception:
+      os.remove(tmpPath)
+      raise
+
+  def _open(self, name, mode='rb'):
+    if 'w' in mode or 'a' in mode or '+' in mode:
+      self._breakLink(name, 'w' in mode)
+    return super(ContentAddressedStorage, self)._open(name, mode)
+
+  def _save(self, name, content):
+    fullPath = self.path(name)
+    self._makeDirs(os.path.dirname(fullPath))
+    # The blob has no name until it is linked
+    with self._lockBlobs(locks.LOCK_SH):
+      blobPath = self._saveBlob(content)
+      while True:
+        try:
+          self._link(blobPath, fullPath)
+        except OSError as e:
+          if e.errno == errno.EEXIST:
+            # Ooops, the file exists. We need a new file name.
+            name = self.getAvailableName(name)
+            fullPath = self.path(name)
+          else:
+            raise
+        else:
+          break
+    return name
+
+  def delete(self, name):
+    assert name, "The name argument is not allowed to be empty."
+    fullPath = self.path(name)
+    try:
+      # The blob and this file are the last two links of the content
+      isLastLink = os.stat(fullPath).st_nlink == 2
+    except OSError:
+      return
+    blobPath = None
+    if isLastLink:
+      blobPath = self.blobPath(self._hashFile(fullPath).hexdigest())
+    super(ContentAddressedStorage, self).delete(name)
+    if blobPath is None:
+      return
+    with self._lockBlobs(locks.LOCK_EX):
+      if os.path.exists(blobPath) and os.stat(blobPath).st_nlink == 1:
+        try:
+          os.remove(blobPath)
+        except OSError as e:
+          if e.errno != errno.ENOENT:
+            raise
+
+  def collectGarbage(self):
+    """
+    Removes the blobs without any file name, e.x: those left by the files
+    being copied instead of linked, and returns how many are removed.
+    """
+    removedNum = 0
+    with self._lockBlobs(locks.LOCK_EX):
+      for dirPath, dirNameLst, fileNameLst in os.walk(self.blobLocation):
+        if os.path.basename(dirPath) == 'tmp':
+          continue
+        for fileName in fileNameLst:
+          blobPath = os.path.join(dirPath, fileName)
+          if os.stat(blobPath).st_nlink == 1:
+            os.remove(blobPath)
+            removedNum += 1
+    return removedNum
+
+  def listdir(self, path):
+    directories, files = super(ContentAddressedStorage, self).listdir(path)
+    if os.path.normpath(self.path(path)) == self.location:
+      directories = [i for i in directories if i != self.blobDirName]
+    return directories, files
+
+
 def getStorageClass(importPath=None):
   return importString(importPath or settings.DEFAULT_FILE_STORAGE)
 
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+##### System wide lib #####
+from collections import OrderedDict
+from datetime import datetime
+
+##### Theory lib #####
+from theory.apps.model import History, Mood
+from theory.conf import settings
+from theory.db import IntegrityError, transaction
+from theory.db.model import F, Q
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ("HistoryCursor",)
+
+class HistoryCursor(object):
+  """
+  Read the command history, latest first, through a bounded window of
+  pages instead of loading every History row. A page next to a cached page
+  is fetched by keyset on (touched, id), so walking through the history
+  never scans the skipped rows; the pages far from the current one are
+  dropped.
+  """
+  _fieldNameTuple = ("id", "touched", "commandName", "jsonData")
+
+  def __init__(self, pageSize=None, maxPageNum=None):
+    if(pageSize is None):
+      pageSize = settings.UI_HISTORY_PAGE_SIZE
+    if(maxPageNum is None):
+      maxPageNum = settings.UI_HISTORY_PAGE_NUM
+    self.pageSize = pageSize
+    self.maxPageNum = max(maxPageNum, 1)
+    self._len = None
+    self._pageDict = OrderedDict()
+
+  def __len__(self):
+    if(self._len is None):
+      self._len = History.objects.count()
+    return self._len
+
+  def invalidate(self):
+    """The order of the history has changed, the pages must be fetched
+    again."""
+    self._pageDict.clear()
+
+  def reset(self):
+    self._len = None
+    self.invalidate()
+
+  def get(self, idx):
+    """Return the idx-th latest entry as a record having commandName and
+    jsonData, or None if it is out of range."""
+    if(idx < 0):
+      return None
+    (pageIdx, offset) = divmod(idx, self.pageSize)
+    page = self._getPage(pageIdx)
+    try:
+      return page[offset]
+    except IndexError:
+      return None
+
+  def _getPage(self, pageIdx):
+    try:
+      page = self._pageDict.pop(pageIdx)
+    except KeyError:
+      page = self._fetchPage(pageIdx)
+    # Move it to the end as the most recently used one
+    self._pageDict[pageIdx] = page
+    while(len(self._pageDict) > self.maxPageNum):
+      self._pageDict.popitem(last=False)
+    return page
+
+  def _fetchPage(self, pageIdx):
+    prevPage = self._pageDict.get(pageIdx - 1)
+    nextPage = self._pageDict.get(pageIdx + 1)
+    if(prevPage):
+      last = prevPage[-1]
+      queryset = History.objects.filter(
+          Q(touched__lt=last.touched)
+          | Q(touched=last.touched, id__lt=last.id)
+          ).orderBy("-touched", "-id")
+      return list(queryset.rows(*self._fieldNameTuple)[:self.pageSize])
+    elif(nextPage):
+      first = nextPage[0]
+      queryset = History.objects.filter(
+          Q(touched__gt=first.touched)
+          | Q(touched=first.touched, id__gt=first.id)
+          ).orderBy("touched", "id")
+      page = list(queryset.rows(*self._fieldNameTuple)[:self.pageSize])
+      page.reverse()
+      return page
+    start = pageIdx * self.pageSize
+    queryset = History.objects.orderBy("-touched", "-id")
+    return list(
+        queryset.rows(*self._fieldNameTuple)[start:start + self.pageSize]
+        )
+
+  def record(self, commandName, jsonData, moodName):
+    """Upsert the history entry by the hash of its commandName and jsonData.
+    """
+    hashKey = History.makeHashKey(commandName, jsonData)
+    touched = datetime.utcnow()
+    isUpdated = History.objects.filter(hashKey=hashKey).update(
+        touched=touched,
+        repeated=F("repeated") + 1,
+        )
+    if(not isUpdated):
+      try:
+        with transaction.atomic():
+          history = History.objects.create(
+              commandName=commandName,
+              jsonData=jsonData,
+              touched=touched,
+              )
+      except IntegrityError:
+        # Another process has recorded the same command in between
+        History.objects.filter(hashKey=hashKey).update(
+            touched=touched,
+            repeated=F("repeated") + 1,
+            )
+      else:
+        history.moodSet.add(Mood.objects.get(name=moodName))
+        if(self._len is not None):
+          self._len += 1
+    self.invalidate()
@@ -6,6 +6,7 @@ from celery.loaders.base import BaseLoader
 ##### Theory lib #####
 from theory.apps import apps
 from theory.apps.model import Command
+from theory.core.profiler import setupCommandProfiler
 from theory.utils import timezone
 from theory.utils.importlib import importModule
 from theory.utils.mood import loadMoodData
@@ -44,6 +45,7 @@ class CeleryLoader(BaseLoader):
       import warnings
       warnings.warn("Using settings.DEBUG leads to a memory leak, never "
                     "use this setting in production environments!")
+    setupCommandProfiler()
     self.import_default_modules()
 
   def import_default_modules(self):
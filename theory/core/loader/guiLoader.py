@@ -4,14 +4,21 @@
 from copy import deepcopy
 from datetime import datetime, timedelta
 import gevent
+import logging
 import os
 os.environ.setdefault("CELERY_LOADER", "theory.core.loader.celeryLoader.CeleryLoader")
 import signal
+import time
 
 ##### Theory lib #####
 from theory.apps import apps
 from theory.conf import settings
 from theory.apps.model import AdapterBuffer, Command
+from theory.core.asyncBackend import getAsyncBackend
+from theory.core.checks import runChecks, Tags
+from theory.core.checks.modelChecks import getModelCheckCache
+from theory.core.checks.registry import registry as checkRegistry
+from theory.core.profiler import setupCommandProfiler
 from theory.utils.importlib import importModule
 from theory.utils.mood import loadMoodData
 
@@ -24,6 +31,8 @@ from theory.gui.gtk.notify import getNotify
 
 ##### Misc #####
 
+logger = logging.getLogger("theory.core.loader")
+
 def _chkAdapterBuffer():
   while(True):
     adapterBufferModelLst = AdapterBuffer.objects.filter(
@@ -34,6 +43,14 @@ def _chkAdapterBuffer():
     gevent.sleep(60)
   return False
 
+def _chkAsyncJob(asyncBackend, reactor):
+  while(True):
+    for job in asyncBackend.popFinishedLst():
+      # The status of the job is shown as well
+      getNotify("Done", str(job))
+      reactor.reportAsyncJob(job)
+    gevent.sleep(settings.ASYNC_COMMAND_POLL_INTERVAL)
+
 def getDimensionHints():
   resolutionSet = settings.MOOD["RESOLUTION"]
   maxHeight = maxWidth = 0
@@ -58,10 +75,33 @@ def getDimensionHints():
       "maxHeight": maxHeight,
       }
 
+def _checkModels():
+  for msg in runChecks(tags=[Tags.models]):
+    if(msg.isSerious()):
+      logger.error(msg)
+    else:
+      logger.warning(msg)
+
+def _logStartupTime(timeLst):
+  modelCheckCache = getModelCheckCache()
+  logger.info(
+      "Started in %.3fs: %s (%s models checked, %s unchanged)" % (
+        sum(i[1] for i in timeLst),
+        ", ".join(["%s %.3fs" % i for i in timeLst]),
+        modelCheckCache.checkedNum,
+        modelCheckCache.skippedNum,
+        )
+      )
+
 def wakeup(settings_mod, argv=None):
   appNameLst = deepcopy(settings.INSTALLED_APPS)
   appNameLst.insert(0, "theory.apps")
   apps.populate(appNameLst)
+  timeLst = list(apps.populateTimeLst)
+  _checkModels()
+  timeLst.extend(checkRegistry.timeLst)
+  setupCommandProfiler()
+  startTime = time.time()
   try:
     Command.objects.count()
   except:
@@ -89,18 +129,26 @@ def wakeup(settings_mod, argv=None):
   else:
     for cmd in Command.objects.all():
       importModule(cmd.moduleImportPath)
+  timeLst.append(("loadCmd", time.time() - startTime))
+  startTime = time.time()
 
   loadMoodData()
 
   from theory.core.reactor import *
   getDimensionHints()
+  timeLst.append(("ui", time.time() - startTime))
+  _logStartupTime(timeLst)
   # in 0.13.8, it is shutdown
   #gevent.signal(signal.SIGQUIT, gevent.shutdown)
   # in 1.0.1
   gevent.signal(signal.SIGQUIT, gevent.kill)
-  gevent.joinall(
-      [
-        gevent.spawn(reactor.ui.drawAll),
-        gevent.spawn(_chkAdapterBuffer),
-      ]
-  )
+  greenletLst = [
+      gevent.spawn(reactor.ui.drawAll),
+      gevent.spawn(_chkAdapterBuffer),
+      gevent.spawn(_chkAsyncJob, getAsyncBackend(), reactor),
+  ]
+  if(settings.UI_HOT_RELOAD):
+    from .hotReloader import HotReloader
+    hotReloader = HotReloader(appNameLst, refreshFxn=reactor.refreshCache)
+    greenletLst.append(gevent.spawn(hotReloader.watch))
+  gevent.joinall(greenletLst)
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+##### System wide lib #####
+import gevent
+import logging
+import os
+import sys
+
+##### Theory lib #####
+from theory.apps import apps
+from theory.apps.model import Adapter, Command
+from theory.conf import settings
+from theory.core.resourceScan import *
+from theory.core.resourceScan.adapterClassScanner import AdapterClassScanner
+from theory.core.resourceScan.commandClassScanner import CommandClassScanner
+from theory.db import transaction
+from theory.utils.importlib import importModule
+
+##### Theory third-party lib #####
+
+##### Local app #####
+from .util import CommandModuleLoader, findFilesInAppDir, getMoodAppRel
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ("HotReloader",)
+
+logger = logging.getLogger("theory.core.loader")
+
+class HotReloader(object):
+  """
+  Watch the model, adapter and command modules of the apps from inside the
+  running reactor. A changed file is reloaded and only that file is
+  rescanned into the db, then refreshFxn is called with the module name to
+  let the reactor drop its cached commands and forms. The directories are
+  polled by mtime in a greenlet, which is cheap for a few directories and,
+  unlike inotifyCodeChanged(), never blocks the gui.
+
+  Other modules keep referring to the classes of the old module until they
+  are reloaded too, and a changed model still needs a migration.
+  """
+  # The models are reloaded first since the others might import them
+  dirNameTuple = ("model", "adapter", "command")
+
+  def __init__(self, appNameLst, refreshFxn=None, interval=None):
+    if(interval is None):
+      interval = settings.UI_HOT_RELOAD_INTERVAL
+    self.appNameLst = appNameLst
+    self.refreshFxn = refreshFxn
+    self.interval = interval
+    self._watchLst = self._findWatchLst()
+    self._mtimeDict = self._snapshot()
+
+  def _findWatchLst(self):
+    """Return the (appName, dirName, path, isPackage) to be watched"""
+    watchLst = []
+    for appName in self.appNameLst:
+      for dirName in self.dirNameTuple:
+        try:
+          (path, fileNameLst) = findFilesInAppDir(appName, dirName, True)
+        except ImportError:
+          continue
+        # A single file module like model.py gives the path of the app
+        isPackage = os.path.basename(path)==dirName \
+            and not os.path.isfile(os.path.join(path, dirName + ".py"))
+        watchLst.append((appName, dirName, path, isPackage))
+    return watchLst
+
+  def _snapshot(self):
+    mtimeDict = {}
+    for (appName, dirName, path, isPackage) in self._watchLst:
+      if(isPackage):
+        try:
+          fileNameLst = [i[:-3] for i in os.listdir(path) if i.endswith(".py")]
+        except OSError:
+          continue
+        filePathLst = [os.path.join(path, i + ".py") for i in fileNameLst]
+      else:
+        fileNameLst = ["__init__"]
+        filePathLst = [os.path.join(path, dirName + ".py")]
+      for (fileName, filePath) in zip(fileNameLst, filePathLst):
+        try:
+          mtime = os.stat(filePath).st_mtime
+        except OSError:
+          continue
+        mtimeDict[filePath] = (mtime, appName, dirName, fileName)
+    return mtimeDict
+
+  def findChangeLst(self):
+    """
+    Return the (appName, dirName, fileName, filePath, isDeleted) of the
+    files being created, modified or deleted since the last call.
+    """
+    mtimeDict = self._snapshot()
+    changeLst = []
+    for (filePath, (mtime, appName, dirName, fileName)) \
+        in mtimeDict.iteritems():
+      oldValue = self._mtimeDict.get(filePath)
+      if(oldValue is None or oldValue[0]!=mtime):
+        changeLst.append((appName, dirName, fileName, filePath, False))
+    for (filePath, (mtime, appName, dirName, fileName)) \
+        in self._mtimeDict.iteritems():
+      if(filePath not in mtimeDict):
+        changeLst.append((appName, dirName, fileName, filePath, True))
+    self._mtimeDict = mtimeDict
+    changeLst.sort(key=lambda i: self.dirNameTuple.index(i[1]))
+    return changeLst
+
+  def getModuleName(self, appName, dirName, fileName):
+    if(fileName=="__init__"):
+      return "%s.%s" % (appName, dirName)
+    return "%s.%s.%s" % (appName, dirName, fileName)
+
+  def _unregisterModel(self, moduleName):
+    """Remove the models of the module from the registry, otherwise they
+    would conflict with themselves once the module is reloaded."""
+    removedLst = []
+    for (appLabel, appModels) in apps.allModels.iteritems():
+      for (modelName, model) in appModels.items():
+        if(model.__module__==moduleName):
+          del appModels[modelName]
+          removedLst.append((appLabel, modelName, model))
+    apps.clearCache()
+    return removedLst
+
+  def _restoreModel(self, moduleName, removedLst):
+    # The models registered before the reload failed are dropped too
+    self._unregisterModel(moduleName)
+    for (appLabel, modelName, model) in removedLst:
+      apps.allModels[appLabel][modelName] = model
+    apps.clearCache()
+
+  def _reloadModule(self, moduleName):
+    module = sys.modules.get(moduleName)
+    if(module is None):
+      importModule(moduleName)
+    else:
+      reload(module)
+
+  def _getDefaultMoodNameLst(self, appName, cmdName):
+    moduleLoader = CommandModuleLoader(CommandScanManager, "command", [appName])
+    moduleLoader.moodAppRel = getMoodAppRel()
+    paramLst = [[appName, cmdName, None, ["lost"]]]
+    if(appName=="theory.apps"):
+      paramLst = moduleLoader.postPackFxnForTheory(paramLst)
+    else:
+      paramLst = moduleLoader.postPackFxn(paramLst)
+    return paramLst[0][-1]
+
+  def _rescanCommand(self, appName, fileName, filePath, isDeleted):
+    if(fileName=="__init__"):
+      return
+    cmdQuery = Command.objects.filter(app=appName, name=fileName)
+    if(isDeleted):
+      cmdQuery.delete()
+      return
+    cmdModel = cmdQuery.orderBy("id").first()
+    if(cmdModel is None):
+      scanManager = CommandScanManager()
+      scanManager.paramList = [[
+          appName,
+          fileName,
+          filePath,
+          self._getDefaultMoodNameLst(appName, fileName)
+          ]]
+      scanManager.scan()
+      return
+
+    # The row is rescanned in place, so the AdapterBuffer pointing to it and
+    # the moods set by the user are kept
+    cmdModel.parameterSet.all().delete()
+    cmdModel.sourceFile = filePath
+    cmdModel.runMode = Command.RUN_MODE_SIMPLE
+    o = CommandClassScanner()
+    o.cmdModel = cmdModel
+    o.scan()
+    if(o.cmdModel is None):
+      # The file does not carry the command anymore
+      cmdQuery.delete()
+
+  def _rescanAdapter(self, appName, fileName, filePath, isDeleted):
+    if(fileName=="__init__"):
+      # The adapters in the __init__ cannot be told apart from the adapters
+      # imported from the other files, so the whole app is rescanned.
+      adapterQuery = Adapter.objects.filter(
+          importPath__startswith=appName + ".adapter"
+          )
+      fileNameLst = []
+      if(not isDeleted):
+        fileNameLst = findFilesInAppDir(appName, "adapter", True)[1]
+    else:
+      adapterQuery = Adapter.objects.filter(
+          importPath__startswith="%s.adapter.%s." % (appName, fileName)
+          )
+      fileNameLst = [] if isDeleted else [fileName,]
+
+    adapterLst = []
+    for i in fileNameLst:
+      o = AdapterClassScanner()
+      o.adapterTemplate = Adapter(importPath=".".join([appName, i]))
+      o.scan()
+      adapterLst.extend(o.adapterList)
+
+    # The rows are updated in place, so the AdapterBuffer pointing to them
+    # are kept
+    importPathLst = [i.importPath for i in adapterLst]
+    oldAdapterIdDict = dict(
+        Adapter.objects.filter(importPath__in=importPathLst).valuesList(
+          "importPath",
+          "id"
+          )
+        )
+    for adapter in adapterLst:
+      adapter.id = oldAdapterIdDict.get(adapter.importPath)
+      adapter.save()
+    adapterQuery.exclude(importPath__in=importPathLst).delete()
+
+  def _rescanModel(self, appName, fileName, filePath, isDeleted):
+    if(fileName=="__init__"):
+      modelAppName = appName
+    else:
+      modelAppName = ".".join([appName, fileName])
+    scanManager = ModelScanManager()
+    scanManager.drop(modelAppName)
+    if(isDeleted):
+      return
+    scanManager.paramList = [".".join([appName, fileName]),]
+    scanManager.scan()
+
+  def reloadFile(self, appName, dirName, fileName, filePath, isDeleted=False):
+    """Reload the module of the file and rescan it. If it fails, the records
+    are rolled back and the old models are registered again. The module has
+    been partly run by then, so it might mix the old and the new code until
+    the file is fixed."""
+    moduleName = self.getModuleName(appName, dirName, fileName)
+    removedModelLst = []
+    try:
+      if(dirName=="model"):
+        removedModelLst = self._unregisterModel(moduleName)
+      if(isDeleted):
+        sys.modules.pop(moduleName, None)
+      else:
+        self._reloadModule(moduleName)
+      with transaction.atomic():
+        getattr(self, "_rescan" + dirName.capitalize())(
+            appName,
+            fileName,
+            filePath,
+            isDeleted
+            )
+    except Exception:
+      logger.exception("Unable to reload %s", moduleName)
+      if(dirName=="model"):
+        self._restoreModel(moduleName, removedModelLst)
+      return False
+
+    if(self.refreshFxn is not None):
+      self.refreshFxn(moduleName)
+    return True
+
+  def check(self):
+    for change in self.findChangeLst():
+      self.reloadFile(*change)
+
+  def watch(self):
+    while(True):
+      self.check()
+      gevent.sleep(self.interval)
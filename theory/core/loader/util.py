@@ -187,6 +187,8 @@ class CommandModuleLoader(ModuleLoader):
       "tester": ["norm"],
       "loadDbData": ["norm"],
       "listCommand": ["norm"],
+      "showProfile": ["norm"],
+      "benchmark": ["norm"],
       "probeModule": ["norm"],
       "switchMood": ["norm"],
       "filenameScanner": ["norm"],
@@ -217,16 +219,20 @@ class CommandModuleLoader(ModuleLoader):
         o[-1] = self.moodAppRel[o[0]]
     return lst
 
-def probeApps(apps, isDropAll=False):
+def getMoodAppRel():
+  """Return the names of the moods using each app"""
   moodAppRel = {}
   for moodDirName in settings.INSTALLED_MOODS:
     config = importModule("%s.config" % (moodDirName))
     for appName in config.APPS:
       if(moodAppRel.has_key(appName)):
-        moodAppRel[appName] += moodDirName
+        moodAppRel[appName].append(moodDirName)
       else:
         moodAppRel[appName] = [moodDirName]
+  return moodAppRel
 
+def probeApps(apps, isDropAll=False):
+  moodAppRel = getMoodAppRel()
 
   moduleLoader = ModuleLoader(ModelScanManager, "model", apps)
   moduleLoader.lstPackFxn = \
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+##### System wide lib #####
+from collections import defaultdict, namedtuple
+
+##### Theory lib #####
+from theory.apps.model import AppModel, FieldParameter
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ("FieldParamRecord", "ModelCatalogEntry", "ModelCatalog",
+    "modelCatalog",)
+
+# A read-only FieldParameter, its childParamLst is a tuple of records
+FieldParamRecord = namedtuple(
+    "FieldParamRecord",
+    ("id", "name", "data", "isField", "isCircular", "parentId",
+      "childParamLst")
+    )
+
+class ModelCatalogEntry(object):
+  """
+  The FieldParameter tree of an AppModel, built from the rows of one query
+  and indexed by field name and by the name of the parent.
+  """
+  _fieldNameTuple = ("id", "name", "data", "isField", "isCircular", "parent")
+
+  def __init__(self, appModel, rowLst):
+    self.appModel = appModel
+    childRowMap = defaultdict(list)
+    for row in rowLst:
+      childRowMap[row[-1]].append(row)
+
+    recordMap = {}
+    def build(row):
+      record = FieldParamRecord(
+          *row,
+          childParamLst=tuple(build(i) for i in childRowMap[row[0]])
+          )
+      recordMap[record.id] = record
+      return record
+
+    self.rootFieldParamLst = tuple(build(i) for i in childRowMap[None])
+    self.fieldParamLst = tuple(
+        recordMap[row[0]] for row in rowLst if(row[0] in recordMap)
+        )
+    self._fieldParamByName = dict(
+        (i.name, i) for i in self.rootFieldParamLst
+        )
+    childParamByParentName = defaultdict(list)
+    for record in self.fieldParamLst:
+      if(record.parentId is not None):
+        childParamByParentName[recordMap[record.parentId].name].append(record)
+    self._childParamByParentName = dict(
+        (k, tuple(v)) for (k, v) in childParamByParentName.iteritems()
+        )
+
+  @classmethod
+  def load(cls, appModel):
+    rowLst = list(
+        FieldParameter.objects.filter(appModel=appModel).orderBy("id")
+        .valuesList(*cls._fieldNameTuple)
+        )
+    return cls(appModel, rowLst)
+
+  def getFieldParam(self, fieldName):
+    """Return the record of a field, or None if it is not found"""
+    return self._fieldParamByName.get(fieldName)
+
+  def getChildParamLst(self, parentName):
+    """Return the records whose parent is named parentName, like
+    filter(parent__name=parentName)"""
+    return self._childParamByParentName.get(parentName, ())
+
+class ModelCatalog(object):
+  """
+  Keeps the AppModel and its FieldParameter tree in memory once they are
+  read, for the spreadsheets and the transformers which read them again on
+  every render or click. It must be invalidated when the models are
+  probed again, which ModelScanManager does.
+  """
+  def __init__(self):
+    self._entryMap = {}
+    self._idMap = {}
+
+  def __len__(self):
+    return len(self._entryMap)
+
+  def get(self, appModel):
+    try:
+      return self._entryMap[appModel.id]
+    except KeyError:
+      pass
+    entry = ModelCatalogEntry.load(appModel)
+    self._entryMap[appModel.id] = entry
+    self._idMap[(appModel.app, appModel.name)] = appModel.id
+    return entry
+
+  def getByName(self, appName, modelName):
+    """Like AppModel.objects.get(app=appName, name=modelName), the
+    DoesNotExist is raised if the model has not been probed."""
+    try:
+      return self._entryMap[self._idMap[(appName, modelName)]]
+    except KeyError:
+      pass
+    return self.get(AppModel.objects.get(app=appName, name=modelName))
+
+  def invalidate(self):
+    self._entryMap.clear()
+    self._idMap.clear()
+
+modelCatalog = ModelCatalog()
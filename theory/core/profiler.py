@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+##### System wide lib #####
+from collections import deque
+import csv
+import heapq
+import json
+import os
+import time
+
+##### Theory lib #####
+from theory.conf import settings
+from theory.core.signals import commandStarted, commandFinished
+from theory.db import connections
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = (
+    "CommandProfile",
+    "CommandProfiler",
+    "commandProfiler",
+    "setupCommandProfiler",
+    )
+
+def _cpuTime():
+  t = os.times()
+  return t[0] + t[1]
+
+class CommandProfile(object):
+  """
+  The cost of one command execution. Instances are registered as query
+  observers on every connection of the running thread, so they see the
+  queries even when DEBUG is off.
+  """
+  CSV_FIELD_LST = (
+      "cmdName",
+      "started",
+      "wallTime",
+      "cpuTime",
+      "queryNum",
+      "sqlTime",
+      "rowNum",
+      "isSuccess",
+      )
+
+  def __init__(self, cmdName, slowQueryNum):
+    self.cmdName = cmdName
+    self.slowQueryNum = slowQueryNum
+    self.started = time.time()
+    self.wallTime = 0.0
+    self.cpuTime = 0.0
+    self.queryNum = 0
+    self.sqlTime = 0.0
+    self.rowNum = 0
+    self.isSuccess = None
+    # min-heap of (duration, sql), holding the slowest statements only
+    self._slowQueryHeap = []
+    self._cpuStarted = _cpuTime()
+
+  def recordQuery(self, sql, duration):
+    self.queryNum += 1
+    self.sqlTime += duration
+    if self.slowQueryNum <= 0:
+      return
+    if len(self._slowQueryHeap) < self.slowQueryNum:
+      heapq.heappush(self._slowQueryHeap, (duration, sql))
+    elif duration > self._slowQueryHeap[0][0]:
+      heapq.heapreplace(self._slowQueryHeap, (duration, sql))
+
+  def recordRows(self, rowNum):
+    self.rowNum += rowNum
+
+  def finish(self, isSuccess=True):
+    self.wallTime = time.time() - self.started
+    self.cpuTime = _cpuTime() - self._cpuStarted
+    self.isSuccess = isSuccess
+
+  @property
+  def slowQueryLst(self):
+    return [
+        {"sql": sql, "time": duration}
+        for (duration, sql) in sorted(self._slowQueryHeap, reverse=True)
+        ]
+
+  def toDict(self):
+    r = dict((k, getattr(self, k)) for k in self.CSV_FIELD_LST)
+    r["slowQueryLst"] = self.slowQueryLst
+    return r
+
+class CommandProfiler(object):
+  """
+  Keeps the profile of the latest command executions in a ring buffer. It
+  listens to commandStarted/commandFinished, so both the commands run by
+  Bridge and the async commands run by a celery worker are covered; each
+  process keeps its own buffer.
+  """
+
+  def __init__(self, bufferSize=None, slowQueryNum=None):
+    if bufferSize is None:
+      bufferSize = settings.COMMAND_PROFILER_BUFFER_SIZE
+    if slowQueryNum is None:
+      slowQueryNum = settings.COMMAND_PROFILER_SLOW_QUERY_NUM
+    self.slowQueryNum = slowQueryNum
+    self._profileLst = deque(maxlen=bufferSize)
+    self._runningProfileMap = {}
+
+  @property
+  def _dispatchUid(self):
+    # Each profiler has its own receivers, e.x: the one of the tests
+    return ("commandProfiler", id(self))
+
+  def enable(self):
+    commandStarted.connect(self._startProfile, dispatchUid=self._dispatchUid)
+    commandFinished.connect(
+        self._finishProfile,
+        dispatchUid=self._dispatchUid
+        )
+
+  def disable(self):
+    commandStarted.disconnect(dispatchUid=self._dispatchUid)
+    commandFinished.disconnect(dispatchUid=self._dispatchUid)
+
+  def _startProfile(self, sender, cmd, **kwargs):
+    profile = CommandProfile(
+        getattr(cmd, "name", None) or sender.__name__,
+        self.slowQueryNum
+        )
+    self._runningProfileMap[id(cmd)] = profile
+    for conn in connections.all():
+      conn.queryObservers.append(profile)
+
+  def _finishProfile(self, sender, cmd, isSuccess=True, **kwargs):
+    profile = self._runningProfileMap.pop(id(cmd), None)
+    if profile is None:
+      return
+    for conn in connections.all():
+      try:
+        conn.queryObservers.remove(profile)
+      except ValueError:
+        # The connection was created after the command had started.
+        pass
+    profile.finish(isSuccess)
+    self._profileLst.append(profile)
+
+  @property
+  def profileLst(self):
+    return list(self._profileLst)
+
+  def clear(self):
+    self._profileLst.clear()
+
+  def summarize(self):
+    """
+    Aggregates the buffered profiles by command name, slowest first.
+    """
+    summaryMap = {}
+    for profile in self._profileLst:
+      summary = summaryMap.setdefault(
+          profile.cmdName,
+          {
+            "cmdName": profile.cmdName,
+            "runNum": 0,
+            "wallTime": 0.0,
+            "maxWallTime": 0.0,
+            "cpuTime": 0.0,
+            "queryNum": 0,
+            "sqlTime": 0.0,
+            "rowNum": 0,
+          }
+          )
+      summary["runNum"] += 1
+      summary["wallTime"] += profile.wallTime
+      summary["maxWallTime"] = max(summary["maxWallTime"], profile.wallTime)
+      summary["cpuTime"] += profile.cpuTime
+      summary["queryNum"] += profile.queryNum
+      summary["sqlTime"] += profile.sqlTime
+      summary["rowNum"] += profile.rowNum
+    return sorted(
+        summaryMap.values(),
+        key=lambda x: x["wallTime"],
+        reverse=True
+        )
+
+  def exportJson(self, stream):
+    json.dump([i.toDict() for i in self._profileLst], stream, indent=2)
+
+  def exportCsv(self, stream):
+    writer = csv.writer(stream)
+    writer.writerow(CommandProfile.CSV_FIELD_LST)
+    for profile in self._profileLst:
+      writer.writerow(
+          [getattr(profile, k) for k in CommandProfile.CSV_FIELD_LST]
+          )
+
+commandProfiler = CommandProfiler()
+
+def setupCommandProfiler():
+  """
+  Enables the commandProfiler if COMMAND_PROFILER_ENABLED. It is called by
+  the loader of every process running commands, i.e. the gui and the celery
+  workers.
+  """
+  if settings.COMMAND_PROFILER_ENABLED:
+    commandProfiler.enable()
@@ -1,17 +1,20 @@
 # -*- coding: utf-8 -*-
 #!/usr/bin/env python
 ##### System wide lib #####
-from datetime import datetime
 import json
 import sys
+import time
 
 ##### Theory lib #####
 from theory.apps.adapter.reactorAdapter import ReactorAdapter
-from theory.apps.model import Command, Adapter, History, Mood
+from theory.apps.model import Command, Adapter, Mood
 from theory.core.bridge import Bridge
 from theory.core.cmdParser.txtCmdParser import TxtCmdParser
+from theory.core.fanOut import FanOutResult
+from theory.core.history import HistoryCursor
 from theory.conf import settings
 from theory.db.model import Q
+from theory.gui.formCache import ParamFormCache
 from theory.gui.terminal import Terminal
 from theory.utils.importlib import importClass
 
@@ -41,7 +44,6 @@ class Reactor(object):
   originalQuest = ""
   paramForm = None
   historyIndex = -1  # It should be working reversely
-  historyLen = 0
   formHasBeenCleared = False
 
   @property
@@ -51,6 +53,11 @@ class Reactor(object):
   @mood.setter
   def mood(self, mood):
     self._mood = mood
+    self._cmdModelCache = {}
+
+  @property
+  def historyLen(self):
+    return len(self.history)
 
   @property
   def avblCmd(self):
@@ -76,8 +83,12 @@ class Reactor(object):
     self.ui.adapter = self.adapter
     settings.CRTWIN = self.ui.win
     settings.CRT = self.ui.bxCrt
-    self.historyModel = History.objects.all()
-    self.historyLen = len(self.historyModel)
+    self.paramFormCache = ParamFormCache(
+        evictFxn=lambda paramForm: paramForm.destroyForm()
+        )
+    self.ui.registerPreCleanUpCrtFxn(self._detachParamForm)
+    self.history = HistoryCursor()
+    self._cmdModelCache = {}
 
   def _queryCommandAutocomplete(self, frag):
     # which means user keeps tabbing
@@ -119,43 +130,35 @@ class Reactor(object):
       entrySetterFxn("")
     elif(self.historyIndex + 1 < self.historyLen):
       self.historyIndex += 1
-      self.adapter.cleanUpCrt()
-      commandName = self.historyModel[self.historyIndex].commandName
-      self.adapter.entrySetAndSelectFxn(commandName)
-      self.parser.cmdInTxt = commandName
-      try:
-        self.cmdModel = Command.objects.get(
-            Q(name=commandName)
-            & (Q(moodSet__name=self.mood) | Q(moodSet__name="norm"))
-            )
-      except Command.DoesNotExist as errMsg:
-        getNotify(
-            "Command not found",
-            "{0} ({1})".format(errMsg, commandName)
-        )
-        raise
-
-      self._buildParamForm(
-          json.loads(self.historyModel[self.historyIndex].jsonData)
-      )
+      self._showHistory()
 
   def _showNextCmdRequest(self, entrySetterFxn):
     if(self.historyIndex == -1):
       entrySetterFxn("")
     elif(self.historyIndex - 1 >= 0):
       self.historyIndex -= 1
-      self.adapter.cleanUpCrt()
-      commandName = self.historyModel[self.historyIndex].commandName
-      self.adapter.entrySetAndSelectFxn(commandName)
-      self.parser.cmdInTxt = commandName
-      self.cmdModel = Command.objects.get(
-          Q(name=commandName)
-          & (Q(moodSet__name=self.mood) | Q(moodSet__name="norm"))
-          )
+      self._showHistory()
 
-      self._buildParamForm(
-          json.loads(self.historyModel[self.historyIndex].jsonData)
+  def _showHistory(self):
+    history = self.history.get(self.historyIndex)
+    if(history is None):
+      # The history has been changed by others
+      self.history.reset()
+      return
+    self.adapter.cleanUpCrt()
+    commandName = history.commandName
+    self.adapter.entrySetAndSelectFxn(commandName)
+    self.parser.cmdInTxt = commandName
+    try:
+      self.cmdModel = self._getCmdModel(commandName)
+    except Command.DoesNotExist as errMsg:
+      getNotify(
+          "Command not found",
+          "{0} ({1})".format(errMsg, commandName)
       )
+      raise
+
+    self._buildParamForm(json.loads(history.jsonData))
 
   def _escapeRequest(self, entrySetterFxn):
     self.historyIndex = -1
@@ -185,7 +188,8 @@ class Reactor(object):
       self.adapter.restoreCmdLine()
       self.paramForm.focusOnTheFirstChild()
       return
-    self.parser.initVar()
+    # The parser is not reset in here, it reparses from the edit point only
+    # on the next tab.
 
   def cleanParamForm(self, btn, dummy):
     self.paramForm.fullClean()
@@ -201,23 +205,45 @@ class Reactor(object):
 
     return self._buildParamForm()
 
+  def _detachParamForm(self):
+    """Keep the widgets of a cached form from being deleted with the crt"""
+    if(self.paramForm is not None \
+        and self.paramForm.isAttached \
+        and self.paramFormCache.isCached(self.paramForm)):
+      self.paramForm.detachForm()
+
   def _buildParamForm(self, finalDataDict={}):
-    cmdParamFormKlass = importClass(self.cmdModel.classImportPath).ParamForm
-    self.paramForm = cmdParamFormKlass()
-    self.paramForm._nextBtnClick = self.cleanParamForm
+    started = time.time()
+    classImportPath = self.cmdModel.classImportPath
+    paramForm = self.paramFormCache.get(classImportPath)
+    isHit = paramForm is not None
+    if(isHit):
+      # The widgets are rebound instead of being rebuilt
+      paramForm.recycleForm(finalDataDict)
+      if(not paramForm.isAttached):
+        paramForm.attachForm()
+    else:
+      cmdParamFormKlass = importClass(classImportPath).ParamForm
+      paramForm = cmdParamFormKlass()
+      paramForm._nextBtnClick = self.cleanParamForm
 
-    self.paramForm.fillInitData(finalDataDict)
+      paramForm.fillInitData(finalDataDict)
 
-    self.paramForm.generateFilterForm(**self.adapter.uiParam)
-    self.paramForm.generateStepControl(cleanUpCrtFxn=self.adapter.cleanUpCrt)
+      paramForm.generateFilterForm(**self.adapter.uiParam)
+      paramForm.generateStepControl(cleanUpCrtFxn=self.adapter.cleanUpCrt)
+      self.paramFormCache.add(classImportPath, paramForm)
 
+    self.paramForm = paramForm
+    self.paramFormCache.recordLatency(isHit, time.time() - started)
     return True
 
   def _parse(self):
     self.parser.cmdInTxt = self.adapter.cmdInTxt
     self.parser.run()
-    # should change for chained command
-    #if(self.parser.mode==self.parser.MODE_DONE):
+
+    if(len(self.parser.pipeline) > 1):
+      self._runPipeline()
+      return
 
     if(not self._loadCmdModel()):
       return
@@ -248,20 +274,57 @@ class Reactor(object):
       self.formHasBeenCleared = False
     self.paramForm = None
     self.historyIndex = -1
+    # The command just run might have reprobed the commands
+    self._cmdModelCache = {}
+
+  def refreshCache(self, moduleName):
+    """Drop the commands and the param forms built from the old version of
+    a hot reloaded module"""
+    self._avblCmd = None
+    self._cmdModelCache = {}
+    prefix = moduleName + "."
+    for classImportPath in self.paramFormCache.keys():
+      if(not classImportPath.startswith(prefix)):
+        continue
+      paramForm = self.paramFormCache.pop(classImportPath)
+      # The form being shown is destroyed with the crt as usual
+      if(paramForm is not self.paramForm):
+        paramForm.destroyForm()
+
+  def reportAsyncJob(self, job):
+    """Append the result of an async command finished by the backend to the
+    output. The commands bridged to can be continued by nextStep."""
+    if(job.status==job.STATUS_SUCCESS):
+      txt = "{0} is done".format(job.cmdName)
+      if(job.result):
+        txt += ", continue by nextStep: {0}".format(", ".join(job.result))
+    elif(job.status==job.STATUS_FAILURE):
+      txt = "{0} failed\n{1}".format(job.cmdName, job.result)
+    else:
+      txt = "{0} is {1}".format(job.cmdName, job.status)
+    self.adapter.uiParam["stdOutAppenderFxn"](txt + "\n")
 
   def _fillParamForm(self, cmdModel):
     bridge = Bridge()
     return bridge.getCmdComplex(cmdModel, self.parser.args, self.parser.kwargs)
 
+  def _getCmdModel(self, cmdName):
+    try:
+      return self._cmdModelCache[cmdName]
+    except KeyError:
+      pass
+    cmdModel = Command.objects.get(
+        Q(name=cmdName)
+        & (Q(moodSet__name=self.mood) | Q(moodSet__name="norm"))
+    )
+    self._cmdModelCache[cmdName] = cmdModel
+    return cmdModel
+
   def _loadCmdModel(self):
     """Error should be handle within this fxn, return False in case not found"""
     cmdName = self.parser.cmdName
-    # should change for chained command
     try:
-      self.cmdModel = Command.objects.get(
-          Q(name=cmdName)
-          & (Q(moodSet__name=self.mood) | Q(moodSet__name="norm"))
-      )
+      self.cmdModel = self._getCmdModel(cmdName)
       self.parser.cmdInTxt = self.cmdModel.name
     except Command.DoesNotExist:
       # TODO: integrate with std reactor error system
@@ -271,50 +334,54 @@ class Reactor(object):
     return True
 
   def _updateHistory(self, jsonData):
-    # Temp disable. During the development stage, reprobeAllModule is run almost
-    # everytime which delete all command module. However, since the
-    # reverse_delete_rule of the command field is cascade, all history record
-    # will be lost. This field should re-enable in the future.
-    #History(commandName=self.parser.cmdInTxt, command=self.cmdModel,
-    from theory.db.model import F
-
-    #History.objects(
-    #    commandName=self.parser.cmdInTxt,
-    #    moodSet=self.mood,
-    #    jsonData=jsonData,
-    #    ).update_one(
-    #        inc__repeated=1,
-    #        set__touched=datetime.utcnow(),
-    #        upsert=True
-    #        )
-    #History.objects.updateOrCreate(
-    #    commandName=self.parser.cmdInTxt,
-    #    #moodSet=Mood.objects.get(name=self.mood),
-    #    jsonData=jsonData,
-    #    defaults={
-    #      "touched": datetime.utcnow(),
-    #      "repeated": F("repeated") + 1,
-    #      }
-    #    )
-    historyQuery = History.objects.filter(
-        commandName=self.parser.cmdInTxt,
-        jsonData=jsonData,
-        )
-    if len(historyQuery) > 0:
-      historyQuery[0].touched = datetime.utcnow()
-      historyQuery[0].repeated += 1
-      historyQuery[0].save()
-    else:
-      h = History(
-          commandName=self.parser.cmdInTxt,
-          #moodSet=Mood.objects.filter(name=self.mood),
-          jsonData=jsonData,
+    # The command field of History is temp disabled. During the development
+    # stage, reprobeAllModule is run almost everytime which delete all command
+    # module. However, since the reverse_delete_rule of the command field is
+    # cascade, all history record will be lost.
+    self.history.record(self.parser.cmdInTxt, jsonData, self.mood)
+
+  def _runPipeline(self):
+    if(self.parser.mode==self.parser.MODE_ERROR):
+      self.adapter.printTxt("Your command is invalid")
+      self.reset()
+      return
+
+    stageLst = []
+    for cmdNode in self.parser.pipeline:
+      try:
+        cmdModel = self._getCmdModel(cmdNode.cmdName)
+      except Command.DoesNotExist:
+        # TODO: integrate with std reactor error system
+        self.adapter.printTxt("Command not found: {0}".format(cmdNode.cmdName))
+        self.reset()
+        return
+      stageLst.append(
+          (cmdModel, cmdNode.args, cmdNode.kwargs, cmdNode.isFanOut)
           )
-      h.save()
-      h.moodSet.add(Mood.objects.get(name=self.mood))
 
-    self.historyModel = History.objects.all()
-    self.historyLen = len(self.historyModel)
+    bridge = Bridge()
+    (cmdLst, isSuccess) = bridge.executePipeline(
+        stageLst,
+        self.adapter.uiParam
+        )
+    if(not isSuccess):
+      # TODO: integrate with std reactor error system
+      print cmdLst[-1].paramForm.errors
+      self.adapter.restoreCmdLine()
+      return
+
+    for cmd in cmdLst:
+      if(isinstance(cmd, FanOutResult) and cmd.errorLst):
+        self.adapter.printTxt("{0}: {1} of {2} runs failed".format(
+            cmd.name,
+            len(cmd.errorLst),
+            len(cmd)
+            ))
+
+    # A pipeline cannot be replayed from a single history record, so only
+    # the output of the last command is shown.
+    self._performDrums(cmdLst[-1])
+    self.reset()
 
   # TODO: refactor this function, may be with bridge
   def run(self):
@@ -324,6 +391,9 @@ class Reactor(object):
       cmdKlass = importClass(self.cmdModel.classImportPath)
       cmd = cmdKlass()
       cmd.paramForm = self.paramForm
+      # The command owns the form from now on, it must not be recycled
+      # while the command is using it.
+      self.paramFormCache.pop(self.cmdModel.classImportPath)
 
     bridge = Bridge()
     if(not bridge._executeCommand(cmd, self.cmdModel, self.adapter.uiParam)):
@@ -53,6 +53,7 @@ class AdapterClassScanner(BaseClassScanner):
 
 
   def scan(self):
+    self._adapterLst = []
     adapterClassLst = self._loadAdapterClass(self.adapterTemplate.importPath)
     for adapterClassName, adapterClass in adapterClassLst:
       # Should add debug flag checking and dump to log file instead
@@ -301,6 +301,16 @@ class ModelClassScanner(BaseClassScanner):
         r.append(fieldParam)
     return r
 
+  def _getAppName(self, meta):
+    try:
+      return meta.appConfig.module.__name__
+    except AttributeError:
+      return meta.appLabel
+
+  def _getModelLabel(self, meta):
+    """The label of a model in the modelDepMap"""
+    return "{0}|{1}".format(self._getAppName(meta), meta.objectName)
+
   def _createFieldParam(self, fieldType, theoryTypeDict, appModel):
     for typeName, typeKlass in theoryTypeDict.iteritems():
       if (isinstance(fieldType, typeKlass)
@@ -334,11 +344,7 @@ class ModelClassScanner(BaseClassScanner):
           fieldParam.data = typeName
 
           meta = fieldType.relatedFields[0][1].modal._meta
-          try:
-            appName = meta.appConfig.module.__name__,
-            appName = appName[0]
-          except AttributeError:
-            appName = meta.appLabel
+          appName = self._getAppName(meta)
 
           # This is app name
           fieldParam.save()
@@ -358,7 +364,9 @@ class ModelClassScanner(BaseClassScanner):
               ).save()
 
           # Declare dependency to check circular dependency later
-          self.modelDepMap[self.modelAppClassName].append(fieldParam)
+          self.modelDepMap[self.modelAppClassName].append(
+              (self._getModelLabel(meta), fieldParam)
+              )
         elif(typeName in [
             "ManyToManyField",
             "OneToOneField",
@@ -367,11 +375,7 @@ class ModelClassScanner(BaseClassScanner):
           fieldParam.data = typeName
 
           meta = fieldType.related.parentModel._meta
-          try:
-            appName = meta.appConfig.module.__name__,
-            appName = appName[0]
-          except AttributeError:
-            appName = meta.appLabel
+          appName = self._getAppName(meta)
 
           # This is app name
           fieldParam.save()
@@ -391,7 +395,9 @@ class ModelClassScanner(BaseClassScanner):
               ).save()
 
           # Declare dependency to check circular dependency later
-          self.modelDepMap[self.modelAppClassName].append(fieldParam)
+          self.modelDepMap[self.modelAppClassName].append(
+              (self._getModelLabel(meta), fieldParam)
+              )
         elif(typeName == "IntegerField"):
           if hasattr(fieldType, "choices") and len(fieldType.choices) > 0:
             # For enum field
@@ -485,7 +491,7 @@ class ModelClassScanner(BaseClassScanner):
     elif(len(token)==1):
       model.importPath += ".model." + modelClassName
 
-    self.modelAppClassName = "{0}|{1}".format(token[0], modelClassName)
+    self.modelAppClassName = self._getModelLabel(modelClass._meta)
     self.modelAppName = model.app
     model.name = modelClassName
     model.tblField = model.formField = []
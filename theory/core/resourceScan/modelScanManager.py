@@ -5,7 +5,8 @@ from collections import defaultdict
 
 ##### Theory lib #####
 from theory.core.resourceScan.modelClassScanner import ModelClassScanner
-from theory.apps.model import AppModel
+from theory.apps.model import AppModel, FieldParameter
+from theory.core.modelCatalog import modelCatalog
 
 ##### Theory third-party lib #####
 
@@ -16,29 +17,78 @@ from baseScanManager import BaseScanManager
 
 ##### Misc #####
 
+def getStronglyConnectedComponentMap(graph):
+  """
+  Map every node of the graph, which maps a node to the nodes it points
+  to, to the index of its strongly connected component. It is Tarjan's
+  algorithm in O(V+E), with an explicit stack instead of recursion, so a
+  long chain of models cannot hit the recursion limit.
+  """
+  indexMap = {}
+  lowLinkMap = {}
+  componentMap = {}
+  nodeStack = []
+  onStackSet = set()
+  componentNum = 0
+
+  for root in graph:
+    if(root in indexMap):
+      continue
+    indexMap[root] = lowLinkMap[root] = len(indexMap)
+    nodeStack.append(root)
+    onStackSet.add(root)
+    workLst = [(root, iter(graph[root]))]
+    while(workLst):
+      (node, childIter) = workLst[-1]
+      for child in childIter:
+        if(child not in indexMap):
+          indexMap[child] = lowLinkMap[child] = len(indexMap)
+          nodeStack.append(child)
+          onStackSet.add(child)
+          workLst.append((child, iter(graph.get(child, ()))))
+          break
+        elif(child in onStackSet):
+          lowLinkMap[node] = min(lowLinkMap[node], indexMap[child])
+      else:
+        # All children of the node have been visited
+        workLst.pop()
+        if(workLst):
+          parent = workLst[-1][0]
+          lowLinkMap[parent] = min(lowLinkMap[parent], lowLinkMap[node])
+        if(lowLinkMap[node]==indexMap[node]):
+          while(True):
+            member = nodeStack.pop()
+            onStackSet.discard(member)
+            componentMap[member] = componentNum
+            if(member==node):
+              break
+          componentNum += 1
+  return componentMap
+
 class ModelScanManager(BaseScanManager):
 
-  def _getLabelFromFieldParam(self, fieldParam):
-    return "{0}|{1}".format(
-        fieldParam.childParamLst.all()[0].data,
-        fieldParam.childParamLst.all()[1].data
+  def _markCircular(self):
+    """
+    A relation is circular if both of its models are in the same strongly
+    connected component of the relation graph, including a model relating
+    to itself. The graph is built from the labels recorded by the scanner,
+    so no query is needed until the circular relations are saved.
+    """
+    graph = dict(
+        (label, [refLabel for (refLabel, fieldParam) in depLst])
+        for (label, depLst) in self.modelDepMap.iteritems()
         )
-
-  def _markCircular(self, rootLabel, fieldParam, parentLabelLst=[]):
-    refLabel = self._getLabelFromFieldParam(fieldParam)
-    if(refLabel==rootLabel):
-      fieldParam.isCircular = True
-      return True
-    if(refLabel in parentLabelLst):
-      return False
-    elif(self.modelDepMap.has_key(refLabel)):
-      isEitherOneCircular = False
-      parentLabelLst.append(refLabel)
-      for i in self.modelDepMap[refLabel]:
-        r = self._markCircular(rootLabel, i, parentLabelLst)
-      return False
-    else:
-      return False
+    componentMap = getStronglyConnectedComponentMap(graph)
+    circularIdLst = []
+    for (label, depLst) in self.modelDepMap.iteritems():
+      for (refLabel, fieldParam) in depLst:
+        if(componentMap[label]==componentMap[refLabel]):
+          fieldParam.isCircular = True
+          circularIdLst.append(fieldParam.id)
+    if(circularIdLst):
+      FieldParameter.objects.filter(id__in=circularIdLst).update(
+          isCircular=True
+          )
 
   def drop(self, app=None):
     if app is None:
@@ -47,6 +97,7 @@ class ModelScanManager(BaseScanManager):
       AppModel.objects.filter(
           app=app
           ).delete()
+    modelCatalog.invalidate()
 
   def scan(self):
     self.modelDepMap = defaultdict(list)
@@ -60,9 +111,8 @@ class ModelScanManager(BaseScanManager):
       o.scan()
       modelLst.extend(o.modelList)
 
-    for k, v in self.modelDepMap.iteritems():
-      for i in v:
-        self._markCircular(k, i)
+    self._markCircular()
 
     for model in modelLst:
       model.save()
+    modelCatalog.invalidate()
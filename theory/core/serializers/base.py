@@ -114,6 +114,16 @@ class Serializer(object):
     """
     raise NotImplementedError('subclasses of Serializer must provide an handleM2mField() method')
 
+  def iterM2mRelated(self, obj, field):
+    """
+    Iterates the objects related by a ManyToManyField, using the objects
+    prefetched by prefetchRelated() if there are.
+    """
+    prefetched = getattr(obj, '_prefetchedObjectsCache', {}).get(field.name)
+    if prefetched is not None:
+      return iter(prefetched)
+    return getattr(obj, field.name).iterator()
+
   def getvalue(self):
     """
     Return the fully serialized queryset (or None if the output stream is
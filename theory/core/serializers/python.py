@@ -72,7 +72,7 @@ class Serializer(base.Serializer):
       else:
         m2mValue = lambda value: smartText(value._getPkVal(), stringsOnly=True)
       self._current[field.name] = [m2mValue(related)
-                for related in getattr(obj, field.name).iterator()]
+                for related in self.iterM2mRelated(obj, field)]
 
   def getvalue(self):
     return self.objects
@@ -129,7 +129,7 @@ class Serializer(base.Serializer):
           self.xml.addQuickElement("object", attrs={
             'pk': smartText(value._getPkVal())
           })
-      for relobj in getattr(obj, field.name).iterator():
+      for relobj in self.iterM2mRelated(obj, field):
         handleM2m(relobj)
 
       self.xml.endElement("field")
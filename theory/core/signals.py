@@ -3,3 +3,9 @@ from theory.dispatch import Signal
 requestStarted = Signal()
 requestFinished = Signal()
 gotRequestException = Signal(providingArgs=["request"])
+
+# Sent around every command execution. Commands are what requests are to a
+# web framework, so per-command resources (e.g. pooled connections) are
+# released on commandFinished.
+commandStarted = Signal(providingArgs=["cmd"])
+commandFinished = Signal(providingArgs=["cmd", "isSuccess"])
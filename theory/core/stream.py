@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+##### System wide lib #####
+import gevent
+from gevent import GreenletExit
+from gevent.queue import Full, Queue
+import sys
+import time
+
+##### Theory lib #####
+from theory.conf import settings
+from theory.core.exceptions import StreamCancelled
+from theory.utils import six
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ("StreamChannel",)
+
+class StreamChannel(object):
+  """
+  A bounded queue between a streamed gong of a command and the notation of
+  the next command in a pipeline. A producer greenlet pulls the upstream
+  iterable and is paused once maxSize items are waiting, so a slow consumer
+  slows the producer down instead of letting the items pile up in memory.
+  The channel is iterated by the consumer, and only once.
+  """
+  _END = object()
+
+  def __init__(self, name, iterable, maxSize=None):
+    if maxSize is None:
+      maxSize = settings.STREAM_QUEUE_SIZE
+    self.name = name
+    self.maxSize = maxSize
+    self._iterable = iterable
+    self._queue = Queue(maxsize=maxSize)
+    self._producer = None
+    self._excInfo = None
+
+    self.isCancelled = False
+    self.isDone = False
+    self.producedNum = 0
+    self.consumedNum = 0
+    # How many times the producer has been paused by a full queue
+    self.blockedNum = 0
+    self.startedAt = None
+    self.finishedAt = None
+
+  def start(self):
+    if(self._producer is None):
+      self.startedAt = time.time()
+      self._producer = gevent.spawn(self._produce)
+    return self
+
+  def _produce(self):
+    queue = self._queue
+    try:
+      for item in self._iterable:
+        if(queue.full()):
+          self.blockedNum += 1
+        queue.put(item)
+        self.producedNum += 1
+    except GreenletExit:
+      raise
+    except Exception:
+      # Handed over to the consumer, which is the one able to report it
+      self._excInfo = sys.exc_info()
+    queue.put(self._END)
+
+  def cancel(self):
+    """Stop the producer and make the consumer raise StreamCancelled"""
+    if(self.isDone or self.isCancelled):
+      return
+    self.isCancelled = True
+    self.finishedAt = time.time()
+    if(self._producer is not None):
+      self._producer.kill(block=False)
+    close = getattr(self._iterable, "close", None)
+    if(close is not None):
+      try:
+        close()
+      except ValueError:
+        # The generator is running in the producer which is being killed
+        pass
+    try:
+      # Wake the consumer up in case it is waiting for the next item
+      self._queue.put_nowait(self._END)
+    except Full:
+      pass
+
+  def __iter__(self):
+    self.start()
+    queue = self._queue
+    while(True):
+      item = queue.get()
+      if(self.isCancelled):
+        raise StreamCancelled("Stream {0} has been cancelled".format(self.name))
+      elif(item is self._END):
+        self.isDone = True
+        self.finishedAt = time.time()
+        if(self._excInfo is not None):
+          six.reraise(*self._excInfo)
+        return
+      self.consumedNum += 1
+      yield item
+
+  def stats(self):
+    if(self.startedAt is None):
+      elapsed = 0.0
+    else:
+      elapsed = (self.finishedAt or time.time()) - self.startedAt
+    return {
+        "name": self.name,
+        "producedNum": self.producedNum,
+        "consumedNum": self.consumedNum,
+        "blockedNum": self.blockedNum,
+        "queuedNum": self._queue.qsize(),
+        "elapsed": elapsed,
+        "throughput": self.consumedNum / elapsed if elapsed else 0.0,
+        "isCancelled": self.isCancelled,
+        "isDone": self.isDone,
+        }
@@ -110,3 +110,13 @@ def closeOldConnections(**kwargs):
     conn.closeIfUnusableOrObsolete()
 signals.requestStarted.connect(closeOldConnections)
 signals.requestFinished.connect(closeOldConnections)
+
+
+# Hand pooled connections back to their pool once a command is done, so that
+# greenlets and celery tasks only hold a connection while they run.
+def releasePooledConnections(**kwargs):
+  for conn in connections.all():
+    if (conn.pool is not None and conn.connection is not None
+        and not conn.inAtomicBlock):
+      conn.close()
+signals.commandFinished.connect(releasePooledConnections)
@@ -40,6 +40,9 @@ class BaseDatabaseWrapper(object):
     self.settingsDict = settingsDict
     self.alias = alias
     self.useDebugCursor = False
+    # Objects with recordQuery(sql, duration) and recordRows(rowNum) methods
+    # which are told about every statement run, even when DEBUG is off.
+    self.queryObservers = []
 
     # Savepoint management related attributes
     self.savepointState = 0
@@ -71,6 +74,10 @@ class BaseDatabaseWrapper(object):
     self.allowThreadSharing = allowThreadSharing
     self._threadIdent = thread.get_ident()
 
+    # ConnectionPool shared with the other threads, set by ConnectionHandler
+    # when the POOL setting is enabled.
+    self.pool = None
+
   def __eq__(self, other):
     if isinstance(other, BaseDatabaseWrapper):
       return self.alias == other.alias
@@ -119,10 +126,29 @@ class BaseDatabaseWrapper(object):
     self.errorsOccurred = False
     # Establish the connection
     connParams = self.getConnectionParams()
-    self.connection = self.getNewConnection(connParams)
+    if self.pool is None:
+      self.connection = self.getNewConnection(connParams)
+      isNew = True
+    else:
+      self.connection, isNew = self.pool.acquire(
+        lambda: self.getNewConnection(connParams),
+        self._isPooledConnectionUsable)
     self.setAutocommit(self.settingsDict['AUTOCOMMIT'])
     self.initConnectionState()
-    connectionCreated.send(sender=self.__class__, connection=self)
+    if isNew:
+      connectionCreated.send(sender=self.__class__, connection=self)
+
+  def _isPooledConnectionUsable(self, connection):
+    """
+    Health check run by the pool on an idle raw connection before reusing
+    it. isUsable() works on self.connection, so swap it in temporarily.
+    """
+    current = self.connection
+    self.connection = connection
+    try:
+      return self.isUsable()
+    finally:
+      self.connection = current
 
   def ensureConnection(self):
     """
@@ -151,9 +177,24 @@ class BaseDatabaseWrapper(object):
 
   def _close(self):
     if self.connection is not None:
+      if self.pool is not None:
+        return self._releaseToPool()
       with self.wrapDatabaseErrors:
         return self.connection.close()
 
+  def _releaseToPool(self):
+    """
+    Hands the raw connection back to the pool instead of closing it. Any
+    pending transaction is rolled back so that the next user starts clean.
+    """
+    discard = self.errorsOccurred
+    if not discard and not self.autocommit:
+      try:
+        self.connection.rollback()
+      except self.Database.Error:
+        discard = True
+    self.pool.release(self.connection, discard=discard)
+
   ##### Generic wrappers for PEP-249 connection methods #####
 
   def cursor(self):
@@ -163,6 +204,8 @@ class BaseDatabaseWrapper(object):
     self.validateThreadSharing()
     if self.queriesLogged:
       cursor = self.makeDebugCursor(self._cursor())
+    elif self.queryObservers:
+      cursor = utils.CursorProfileWrapper(self._cursor(), self)
     else:
       cursor = utils.CursorWrapper(self._cursor(), self)
     return cursor
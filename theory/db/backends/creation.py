@@ -339,10 +339,12 @@ class BaseDatabaseCreation(object):
       ";",
     ]
 
-  def createTestDb(self, verbosity=1, autoclobber=False, serialize=True):
+  def createTestDb(self, verbosity=1, autoclobber=False, serialize=True,
+      keepdb=False):
     """
     Creates a test database, prompting the user for confirmation if the
     database already exists. Returns the name of the test database created.
+    With keepdb, an existing test database is reused and only migrated.
     """
     # Don't import theory.core.management if it isn't needed.
     #from theory.core.management import callCommand
@@ -355,10 +357,13 @@ class BaseDatabaseCreation(object):
       testDbRepr = ''
       if verbosity >= 2:
         testDbRepr = " ('%s')" % testDatabaseName
-      print("Creating test database for alias '%s'%s..." % (
-        self.connection.alias, testDbRepr))
+      action = 'Creating'
+      if keepdb:
+        action = "Using existing"
+      print("%s test database for alias '%s'%s..." % (
+        action, self.connection.alias, testDbRepr))
 
-    self._createTestDb(verbosity, autoclobber)
+    self._createTestDb(verbosity, autoclobber, keepdb)
 
     self.connection.close()
     settings.DATABASES[self.connection.alias]["NAME"] = testDatabaseName
@@ -383,7 +388,7 @@ class BaseDatabaseCreation(object):
           "verbosity": max(verbosity - 1, 0),
           "database": self.connection.alias,
           "isTestDatabase": True,
-          "isTestFlush": True,
+          "isTestFlush": not keepdb,
         }
     )
 
@@ -464,7 +469,7 @@ class BaseDatabaseCreation(object):
       return self.connection.settingsDict['TEST']['NAME']
     return TEST_DATABASE_PREFIX + self.connection.settingsDict['NAME']
 
-  def _createTestDb(self, verbosity, autoclobber):
+  def _createTestDb(self, verbosity, autoclobber, keepdb=False):
     """
     Internal implementation - creates the test db tables.
     """
@@ -480,6 +485,9 @@ class BaseDatabaseCreation(object):
         cursor.execute(
           "CREATE DATABASE %s %s" % (qn(testDatabaseName), suffix))
       except Exception as e:
+        # The database already exists and is kept between the runs
+        if keepdb:
+          return testDatabaseName
         sys.stderr.write(
           "Got an error creating the test database: %s\n" % e)
         if not autoclobber:
@@ -506,21 +514,67 @@ class BaseDatabaseCreation(object):
 
     return testDatabaseName
 
-  def destroyTestDb(self, oldDatabaseName, verbosity=1):
+  def getTestDbCloneSettings(self, number):
+    """
+    Returns a modified connection settings dict for the n-th clone of the
+    test database, used by the n-th worker of the parallel test runner.
+    """
+    settingsDict = self.connection.settingsDict.copy()
+    settingsDict['NAME'] = '%s_%d' % (settingsDict['NAME'], number)
+    return settingsDict
+
+  def cloneTestDb(self, number, verbosity=1, keepdb=False):
+    """
+    Clone the test database, which must have been created and migrated,
+    for the n-th worker of the parallel test runner.
+    """
+    sourceDatabaseName = self.connection.settingsDict['NAME']
+    if verbosity >= 1:
+      testDbRepr = ''
+      action = 'Cloning test database'
+      if verbosity >= 2:
+        testDbRepr = " ('%s')" % sourceDatabaseName
+      if keepdb:
+        action = 'Using existing clone'
+      print("%s for alias '%s'%s..." % (
+        action, self.connection.alias, testDbRepr))
+
+    self._cloneTestDb(number, verbosity, keepdb)
+
+  def _cloneTestDb(self, number, verbosity, keepdb=False):
+    """
+    Internal implementation - duplicate the test db tables.
+    """
+    raise NotImplementedError(
+      "The database backend doesn't support cloning databases. "
+      "Disable the option to run tests in parallel processes.")
+
+  def destroyTestDb(self, oldDatabaseName=None, verbosity=1, keepdb=False,
+      number=None):
     """
     Destroy a test database, prompting the user for confirmation if the
-    database already exists.
+    database already exists. The n-th clone is destroyed if the number is
+    given.
     """
     self.connection.close()
-    testDatabaseName = self.connection.settingsDict['NAME']
+    if number is None:
+      testDatabaseName = self.connection.settingsDict['NAME']
+    else:
+      testDatabaseName = self.getTestDbCloneSettings(number)['NAME']
     if verbosity >= 1:
       testDbRepr = ''
+      action = 'Destroying'
       if verbosity >= 2:
         testDbRepr = " ('%s')" % testDatabaseName
-      print("Destroying test database for alias '%s'%s..." % (
-        self.connection.alias, testDbRepr))
-
-    self._destroyTestDb(testDatabaseName, verbosity)
+      if keepdb:
+        action = 'Preserving'
+      print("%s test database for alias '%s'%s..." % (
+        action, self.connection.alias, testDbRepr))
+
+    # if we want to preserve the database
+    # skip the actual destroying piece.
+    if not keepdb:
+      self._destroyTestDb(testDatabaseName, verbosity)
 
   def _destroyTestDb(self, testDatabaseName, verbosity):
     """
@@ -0,0 +1,207 @@
+import threading
+import time
+from collections import deque
+
+from theory.db.utils import OperationalError
+
+
+class PoolTimeout(OperationalError):
+  pass
+
+
+class _PooledConnection(object):
+  """
+  Book keeping for one raw DB-API connection owned by a ConnectionPool.
+  """
+  __slots__ = ('connection', 'createdAt', 'lastUsedAt')
+
+  def __init__(self, connection):
+    self.connection = connection
+    self.createdAt = self.lastUsedAt = time.time()
+
+
+class ConnectionPool(object):
+  """
+  A bounded pool of raw DB-API connections for one database alias.
+
+  The pool is shared by every thread asking for the same alias, e.x: the
+  workers of the local async backend running beside the gui. It is guarded
+  by the threading primitives, which gevent turns into cooperative ones in
+  the monkey patched processes, so a greenlet waiting for a free connection
+  yields to the others there.
+  DatabaseWrapper acquires a raw connection in connect() and hands it back
+  in close(), so the commandFinished hook run after every command and
+  celery task becomes the checkin point.
+  """
+  def __init__(self, alias, minSize=0, maxSize=10, maxLifetime=None,
+         timeout=30):
+    if maxSize < 1:
+      raise ValueError("The pool of '%s' needs a MAX_SIZE of at least 1." % alias)
+    self.alias = alias
+    self.minSize = min(minSize, maxSize)
+    self.maxSize = maxSize
+    self.maxLifetime = maxLifetime
+    self.timeout = timeout
+
+    self._idle = deque()
+    # Maps id(rawConnection) to its _PooledConnection while checked out.
+    self._inUse = {}
+    # The number of connections which may still be checked out, waited for
+    # on the condition of the pool lock.
+    self._freeSlotNum = maxSize
+    self._lock = threading.RLock()
+    self._slotReleased = threading.Condition(self._lock)
+    self._isFilled = False
+    self._stats = {
+      'created': 0,
+      'reused': 0,
+      'discarded': 0,
+      'waited': 0,
+      'timeouts': 0,
+      'peakInUse': 0,
+    }
+
+  @classmethod
+  def fromSettings(cls, alias, poolSettings):
+    return cls(
+      alias,
+      minSize=poolSettings['MIN_SIZE'],
+      maxSize=poolSettings['MAX_SIZE'],
+      maxLifetime=poolSettings['MAX_LIFETIME'],
+      timeout=poolSettings['TIMEOUT'],
+    )
+
+  @property
+  def size(self):
+    return len(self._idle) + len(self._inUse)
+
+  def _isExpired(self, pooled, now):
+    return (self.maxLifetime is not None
+        and now - pooled.createdAt >= self.maxLifetime)
+
+  def _discard(self, pooled):
+    self._stats['discarded'] += 1
+    try:
+      pooled.connection.close()
+    except Exception:
+      # The connection is being thrown away because it is broken or too
+      # old; failing to close it cleanly doesn't matter.
+      pass
+
+  def acquire(self, connector, validator=None):
+    """
+    Checks out a raw connection. ``connector`` opens a new one when no idle
+    connection can be reused; ``validator`` is called on idle connections
+    and must return False for connections which can't be reused.
+
+    Returns a ``(connection, isNew)`` tuple. Raises PoolTimeout when the
+    pool stays exhausted for longer than its timeout.
+    """
+    self._acquireSlot()
+    try:
+      if not self._isFilled:
+        self._fill(connector)
+      while True:
+        with self._lock:
+          # LIFO keeps the hottest connections in use and lets the rest age
+          # out through maxLifetime.
+          pooled = self._idle.pop() if self._idle else None
+        if pooled is None:
+          break
+        if self._isExpired(pooled, time.time()) or (
+            validator is not None and not validator(pooled.connection)):
+          self._discard(pooled)
+          continue
+        self._stats['reused'] += 1
+        return self._checkout(pooled), False
+
+      pooled = _PooledConnection(connector())
+      self._stats['created'] += 1
+      return self._checkout(pooled), True
+    except Exception:
+      self._releaseSlot()
+      raise
+
+  def _acquireSlot(self):
+    with self._lock:
+      if self._freeSlotNum <= 0:
+        self._stats['waited'] += 1
+        deadline = time.time() + self.timeout
+        while self._freeSlotNum <= 0:
+          remaining = deadline - time.time()
+          if remaining <= 0:
+            self._stats['timeouts'] += 1
+            raise PoolTimeout(
+              "No connection available in the pool of '%s' after %ss "
+              "(MAX_SIZE=%d)." % (self.alias, self.timeout, self.maxSize))
+          self._slotReleased.wait(remaining)
+      self._freeSlotNum -= 1
+
+  def _releaseSlot(self):
+    with self._lock:
+      self._freeSlotNum += 1
+      self._slotReleased.notify()
+
+  def _fill(self, connector):
+    with self._lock:
+      if self._isFilled:
+        return
+      self._isFilled = True
+      missing = self.minSize - self.size
+    for i in range(missing):
+      pooled = _PooledConnection(connector())
+      self._stats['created'] += 1
+      with self._lock:
+        self._idle.appendleft(pooled)
+
+  def _checkout(self, pooled):
+    pooled.lastUsedAt = time.time()
+    with self._lock:
+      self._inUse[id(pooled.connection)] = pooled
+      self._stats['peakInUse'] = max(self._stats['peakInUse'], len(self._inUse))
+    return pooled.connection
+
+  def release(self, connection, discard=False):
+    """
+    Checks a raw connection back in. Broken or expired connections are
+    closed instead of being kept for reuse.
+    """
+    with self._lock:
+      pooled = self._inUse.pop(id(connection), None)
+    if pooled is None:
+      # Not checked out from this pool; just close it.
+      self._discard(_PooledConnection(connection))
+      return
+    try:
+      if discard or self._isExpired(pooled, time.time()):
+        self._discard(pooled)
+      else:
+        pooled.lastUsedAt = time.time()
+        with self._lock:
+          self._idle.append(pooled)
+    finally:
+      self._releaseSlot()
+
+  def clear(self):
+    """
+    Closes every idle connection. Checked out connections are closed when
+    they are released.
+    """
+    with self._lock:
+      idleLst = list(self._idle)
+      self._idle.clear()
+      self._isFilled = False
+    for pooled in idleLst:
+      self._discard(pooled)
+
+  def stats(self):
+    with self._lock:
+      stats = dict(self._stats)
+      stats.update({
+        'alias': self.alias,
+        'idle': len(self._idle),
+        'inUse': len(self._inUse),
+        'size': self.size,
+        'maxSize': self.maxSize,
+      })
+    return stats
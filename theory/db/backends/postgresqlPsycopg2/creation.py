@@ -1,3 +1,5 @@
+import sys
+
 from theory.db.backends.creation import BaseDatabaseCreation
 from theory.db.backends.utils import truncateName
 
@@ -81,3 +83,29 @@ class DatabaseCreation(BaseDatabaseCreation):
         output.append(getIndexSql('%s_%sLike' % (dbTable, f.column),
                       ' textPatternOps'))
     return output
+
+  def _cloneTestDb(self, number, verbosity, keepdb=False):
+    # CREATE DATABASE ... WITH TEMPLATE ... requires closing connections
+    # to the template database.
+    self.connection.close()
+
+    qn = self.connection.ops.quoteName
+    sourceDatabaseName = self.connection.settingsDict['NAME']
+    targetDatabaseName = self.getTestDbCloneSettings(number)['NAME']
+    createSql = "CREATE DATABASE %s WITH TEMPLATE %s" % (
+      qn(targetDatabaseName), qn(sourceDatabaseName))
+
+    with self._nodbConnection.cursor() as cursor:
+      try:
+        cursor.execute(createSql)
+      except Exception as e:
+        if keepdb:
+          return
+        try:
+          if verbosity >= 1:
+            print("Destroying old test database '%s'..." % targetDatabaseName)
+          cursor.execute("DROP DATABASE %s" % qn(targetDatabaseName))
+          cursor.execute(createSql)
+        except Exception as e:
+          sys.stderr.write("Got an error cloning the test database: %s\n" % e)
+          sys.exit(2)
@@ -67,6 +67,17 @@ def adaptDatetimeWithTimezoneSupport(value):
   return value.isoformat(str(" "))
 
 
+# The pragmas recommended for an embedded database which is mostly read, e.x:
+# theory's metadata. They can be given as OPTIONS['pragmas'].
+EMBEDDED_PRAGMAS = (
+  ('journal_mode', 'WAL'),
+  ('synchronous', 'NORMAL'),
+  ('temp_store', 'MEMORY'),
+  ('cache_size', -16000),
+  ('mmap_size', 268435456),
+)
+
+
 def decoder(convFunc):
   """ The Python sqlite3 interface returns always byte strings.
     This function converts the received value to a regular string before
@@ -74,19 +85,24 @@ def decoder(convFunc):
   """
   return lambda s: convFunc(s.decode('utf-8'))
 
-Database.registerConverter(str("bool"), decoder(lambda s: s == '1'))
-Database.registerConverter(str("time"), decoder(parseTime))
-Database.registerConverter(str("date"), decoder(parseDate))
-Database.registerConverter(str("datetime"), decoder(parseDatetimeWithTimezoneSupport))
-Database.registerConverter(str("timestamp"), decoder(parseDatetimeWithTimezoneSupport))
-Database.registerConverter(str("TIMESTAMP"), decoder(parseDatetimeWithTimezoneSupport))
-Database.registerConverter(str("decimal"), decoder(backendUtils.typecastDecimal))
-
-Database.registerAdapter(datetime.datetime, adaptDatetimeWithTimezoneSupport)
-Database.registerAdapter(decimal.Decimal, backendUtils.revTypecastDecimal)
+Database.register_converter(str("bool"), decoder(lambda s: s == '1'))
+Database.register_converter(str("time"), decoder(parseTime))
+Database.register_converter(str("date"), decoder(parseDate))
+Database.register_converter(str("datetime"), decoder(parseDatetimeWithTimezoneSupport))
+Database.register_converter(str("timestamp"), decoder(parseDatetimeWithTimezoneSupport))
+Database.register_converter(str("TIMESTAMP"), decoder(parseDatetimeWithTimezoneSupport))
+Database.register_converter(str("decimal"), decoder(backendUtils.typecastDecimal))
+# The ArrayField and the HStoreField are stored as json
+Database.register_converter(
+  str(backendUtils.JSON_DATA_TYPE),
+  decoder(backendUtils.typecastJson)
+)
+
+Database.register_adapter(datetime.datetime, adaptDatetimeWithTimezoneSupport)
+Database.register_adapter(decimal.Decimal, backendUtils.revTypecastDecimal)
 if six.PY2:
-  Database.registerAdapter(str, lambda s: s.decode('utf-8'))
-  Database.registerAdapter(SafeBytes, lambda s: s.decode('utf-8'))
+  Database.register_adapter(str, lambda s: s.decode('utf-8'))
+  Database.register_adapter(SafeBytes, lambda s: s.decode('utf-8'))
 
 
 class DatabaseFeatures(BaseDatabaseFeatures):
@@ -116,7 +132,7 @@ class DatabaseFeatures(BaseDatabaseFeatures):
 
   @cachedProperty
   def usesSavepoints(self):
-    return Database.sqliteVersionInfo >= (3, 6, 8)
+    return Database.sqlite_version_info >= (3, 6, 8)
 
   @cachedProperty
   def supportsStddev(self):
@@ -141,6 +157,17 @@ class DatabaseFeatures(BaseDatabaseFeatures):
   def hasZoneinfoDatabase(self):
     return pytz is not None
 
+  @cachedProperty
+  def supportsJson(self):
+    """Whether sqlite is built with the json1 extension, which is used by
+    the lookups of the ArrayField and the HStoreField."""
+    with self.connection.cursor() as cursor:
+      try:
+        cursor.execute("SELECT json('[]')")
+      except utils.OperationalError:
+        return False
+    return True
+
 
 class DatabaseOperations(BaseDatabaseOperations):
   def bulkBatchSize(self, fields, objs):
@@ -350,7 +377,7 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         "Please supply the NAME value.")
     kwargs = {
       'database': settingsDict['NAME'],
-      'detectTypes': Database.PARSE_DECLTYPES | Database.PARSE_COLNAMES,
+      'detect_types': Database.PARSE_DECLTYPES | Database.PARSE_COLNAMES,
     }
     kwargs.update(settingsDict['OPTIONS'])
     # Always allow the underlying SQLite connection to be shareable
@@ -359,26 +386,32 @@ class DatabaseWrapper(BaseDatabaseWrapper):
     # property. This is necessary as the shareability is disabled by
     # default in pysqlite and it cannot be changed once a connection is
     # opened.
-    if 'checkSameThread' in kwargs and kwargs['checkSameThread']:
+    if 'check_same_thread' in kwargs and kwargs['check_same_thread']:
       warnings.warn(
-        'The `checkSameThread` option was provided and set to '
+        'The `check_same_thread` option was provided and set to '
         'True. It will be overridden with False. Use the '
         '`DatabaseWrapper.allowThreadSharing` property instead '
         'for controlling thread shareability.',
         RuntimeWarning
       )
-    kwargs.update({'checkSameThread': False})
+    kwargs.update({'check_same_thread': False})
     return kwargs
 
   def getNewConnection(self, connParams):
+    connParams = dict(connParams)
+    pragmas = connParams.pop('pragmas', ())
     conn = Database.connect(**connParams)
-    conn.createFunction("theoryDateExtract", 2, _sqliteDateExtract)
-    conn.createFunction("theoryDateTrunc", 2, _sqliteDateTrunc)
-    conn.createFunction("theoryDatetimeExtract", 3, _sqliteDatetimeExtract)
-    conn.createFunction("theoryDatetimeTrunc", 3, _sqliteDatetimeTrunc)
-    conn.createFunction("regexp", 2, _sqliteRegexp)
-    conn.createFunction("theoryFormatDtdelta", 5, _sqliteFormatDtdelta)
-    conn.createFunction("theoryPower", 2, _sqlitePower)
+    conn.create_function("theoryDateExtract", 2, _sqliteDateExtract)
+    conn.create_function("theoryDateTrunc", 2, _sqliteDateTrunc)
+    conn.create_function("theoryDatetimeExtract", 3, _sqliteDatetimeExtract)
+    conn.create_function("theoryDatetimeTrunc", 3, _sqliteDatetimeTrunc)
+    conn.create_function("regexp", 2, _sqliteRegexp)
+    conn.create_function("theoryFormatDtdelta", 5, _sqliteFormatDtdelta)
+    conn.create_function("theoryPower", 2, _sqlitePower)
+    if isinstance(pragmas, dict):
+      pragmas = pragmas.items()
+    for (name, value) in pragmas:
+      conn.execute('PRAGMA %s = %s' % (name, value))
     return conn
 
   def initConnectionState(self):
@@ -417,7 +450,7 @@ class DatabaseWrapper(BaseDatabaseWrapper):
     # 'isolationLevel' is a misleading API.
     # SQLite always runs at the SERIALIZABLE isolation level.
     with self.wrapDatabaseErrors:
-      self.connection.isolationLevel = level
+      self.connection.isolation_level = level
 
   def checkConstraints(self, tableNames=None):
     """
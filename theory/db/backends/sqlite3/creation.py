@@ -1,4 +1,5 @@
 import os
+import shutil
 import sys
 
 from theory.db.backends.creation import BaseDatabaseCreation
@@ -52,8 +53,10 @@ class DatabaseCreation(BaseDatabaseCreation):
       return testDatabaseName
     return ':memory:'
 
-  def _createTestDb(self, verbosity, autoclobber):
+  def _createTestDb(self, verbosity, autoclobber, keepdb=False):
     testDatabaseName = self._getTestDbName()
+    if keepdb:
+      return testDatabaseName
     if testDatabaseName != ':memory:':
       # Erase the old test database
       if verbosity >= 1:
@@ -72,6 +75,33 @@ class DatabaseCreation(BaseDatabaseCreation):
           sys.exit(1)
     return testDatabaseName
 
+  def getTestDbCloneSettings(self, number):
+    settingsDict = self.connection.settingsDict.copy()
+    sourceDatabaseName = settingsDict['NAME']
+    if sourceDatabaseName and sourceDatabaseName != ':memory:':
+      (root, ext) = os.path.splitext(sourceDatabaseName)
+      settingsDict['NAME'] = '%s_%d%s' % (root, number, ext)
+    # An in-memory database is copied into the worker when it is forked
+    return settingsDict
+
+  def _cloneTestDb(self, number, verbosity, keepdb=False):
+    sourceDatabaseName = self.connection.settingsDict['NAME']
+    targetDatabaseName = self.getTestDbCloneSettings(number)['NAME']
+    if not sourceDatabaseName or sourceDatabaseName == ':memory:':
+      return
+    if keepdb and os.access(targetDatabaseName, os.F_OK):
+      return
+    if verbosity >= 1:
+      print("Cloning test database '%s' into '%s'..." % (
+        sourceDatabaseName, targetDatabaseName))
+    try:
+      if os.access(targetDatabaseName, os.F_OK):
+        os.remove(targetDatabaseName)
+      shutil.copy(sourceDatabaseName, targetDatabaseName)
+    except Exception as e:
+      sys.stderr.write("Got an error cloning the test database: %s\n" % e)
+      sys.exit(2)
+
   def _destroyTestDb(self, testDatabaseName, verbosity):
     if testDatabaseName and testDatabaseName != ":memory:":
       # Remove the SQLite database file
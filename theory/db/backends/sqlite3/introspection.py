@@ -58,8 +58,8 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
     # Skip the sqliteSequence system table used for autoincrement key
     # generation.
     cursor.execute("""
-      SELECT name FROM sqliteMaster
-      WHERE type in ('table', 'view') AND NOT name='sqliteSequence'
+      SELECT name FROM sqlite_master
+      WHERE type in ('table', 'view') AND NOT name='sqlite_sequence'
       ORDER BY name""")
     return [row[0] for row in cursor.fetchall()]
 
@@ -78,7 +78,7 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
     relations = {}
 
     # Schema for this table
-    cursor.execute("SELECT sql FROM sqliteMaster WHERE tblName = %s AND type = %s", [tableName, "table"])
+    cursor.execute("SELECT sql FROM sqlite_master WHERE tbl_name = %s AND type = %s", [tableName, "table"])
     try:
       results = cursor.fetchone()[0].strip()
     except TypeError:
@@ -100,7 +100,7 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
 
       table, column = [s.strip('"') for s in m.groups()]
 
-      cursor.execute("SELECT sql FROM sqliteMaster WHERE tblName = %s", [table])
+      cursor.execute("SELECT sql FROM sqlite_master WHERE tbl_name = %s", [table])
       result = cursor.fetchall()[0]
       otherTableResults = result[0].strip()
       li, ri = otherTableResults.index('('), otherTableResults.rindex(')')
@@ -126,7 +126,7 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
     keyColumns = []
 
     # Schema for this table
-    cursor.execute("SELECT sql FROM sqliteMaster WHERE tblName = %s AND type = %s", [tableName, "table"])
+    cursor.execute("SELECT sql FROM sqlite_master WHERE tbl_name = %s AND type = %s", [tableName, "table"])
     results = cursor.fetchone()[0].strip()
     results = results[results.index('(') + 1:results.rindex(')')]
 
@@ -153,10 +153,10 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
       if info['pk'] != 0:
         indexes[info['name']] = {'primaryKey': True,
                      'unique': False}
-    cursor.execute('PRAGMA indexList(%s)' % self.connection.ops.quoteName(tableName))
+    cursor.execute('PRAGMA index_list(%s)' % self.connection.ops.quoteName(tableName))
     # seq, name, unique
     for index, unique in [(field[1], field[2]) for field in cursor.fetchall()]:
-      cursor.execute('PRAGMA indexInfo(%s)' % self.connection.ops.quoteName(index))
+      cursor.execute('PRAGMA index_info(%s)' % self.connection.ops.quoteName(index))
       info = cursor.fetchall()
       # Skip indexes across multiple fields
       if len(info) != 1:
@@ -171,7 +171,7 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
     Get the column name of the primary key for the given table.
     """
     # Don't use PRAGMA because that causes issues with some transactions
-    cursor.execute("SELECT sql FROM sqliteMaster WHERE tblName = %s AND type = %s", [tableName, "table"])
+    cursor.execute("SELECT sql FROM sqlite_master WHERE tbl_name = %s AND type = %s", [tableName, "table"])
     row = cursor.fetchone()
     if row is None:
       raise ValueError("Table %s does not exist" % tableName)
@@ -185,7 +185,7 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
     return None
 
   def _tableInfo(self, cursor, name):
-    cursor.execute('PRAGMA tableInfo(%s)' % self.connection.ops.quoteName(name))
+    cursor.execute('PRAGMA table_info(%s)' % self.connection.ops.quoteName(name))
     # cid, name, type, notnull, dfltValue, pk
     return [{'name': field[1],
          'type': field[2],
@@ -200,10 +200,10 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
     """
     constraints = {}
     # Get the index info
-    cursor.execute("PRAGMA indexList(%s)" % self.connection.ops.quoteName(tableName))
+    cursor.execute("PRAGMA index_list(%s)" % self.connection.ops.quoteName(tableName))
     for number, index, unique in cursor.fetchall():
       # Get the index info for that index
-      cursor.execute('PRAGMA indexInfo(%s)' % self.connection.ops.quoteName(index))
+      cursor.execute('PRAGMA index_info(%s)' % self.connection.ops.quoteName(index))
       for indexRank, columnRank, column in cursor.fetchall():
         if index not in constraints:
           constraints[index] = {
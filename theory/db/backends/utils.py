@@ -3,6 +3,7 @@ from __future__ import unicode_literals
 import datetime
 import decimal
 import hashlib
+import json
 import logging
 from time import time
 
@@ -13,6 +14,12 @@ from theory.utils.timezone import utc
 
 logger = logging.getLogger('theory.db.backends')
 
+# The type of the columns holding json on the backends without a json type,
+# e.x: the ArrayField and the HStoreField on sqlite. The sqlite3 module picks
+# the converter by its name, and sqlite gives it the text affinity since it
+# contains "text".
+JSON_DATA_TYPE = 'jsontext'
+
 
 class CursorWrapper(object):
   def __init__(self, cursor, db):
@@ -71,7 +78,60 @@ class CursorWrapper(object):
       return self.cursor.executemany(sql, paramList)
 
 
-class CursorDebugWrapper(CursorWrapper):
+class CursorProfileWrapper(CursorWrapper):
+  """
+  Reports the duration of every statement and the number of fetched rows to
+  the query observers of the connection (see CommandProfile).
+  """
+
+  def _notifyQuery(self, sql, duration):
+    for observer in self.db.queryObservers:
+      observer.recordQuery(sql, duration)
+
+  def _notifyRows(self, rowNum):
+    for observer in self.db.queryObservers:
+      observer.recordRows(rowNum)
+
+  def execute(self, sql, params=None):
+    start = time()
+    try:
+      return super(CursorProfileWrapper, self).execute(sql, params)
+    finally:
+      self._notifyQuery(sql, time() - start)
+
+  def executemany(self, sql, paramList):
+    start = time()
+    try:
+      return super(CursorProfileWrapper, self).executemany(sql, paramList)
+    finally:
+      self._notifyQuery(sql, time() - start)
+
+  def fetchone(self):
+    with self.db.wrapDatabaseErrors:
+      row = self.cursor.fetchone()
+    if row is not None:
+      self._notifyRows(1)
+    return row
+
+  def fetchmany(self, *args, **kwargs):
+    with self.db.wrapDatabaseErrors:
+      rows = self.cursor.fetchmany(*args, **kwargs)
+    self._notifyRows(len(rows))
+    return rows
+
+  def fetchall(self):
+    with self.db.wrapDatabaseErrors:
+      rows = self.cursor.fetchall()
+    self._notifyRows(len(rows))
+    return rows
+
+  def __iter__(self):
+    for row in self.cursor:
+      self._notifyRows(1)
+      yield row
+
+
+class CursorDebugWrapper(CursorProfileWrapper):
 
   # XXX callproc isn't instrumented at this time.
 
@@ -167,6 +227,12 @@ def typecastDecimal(s):
   return decimal.Decimal(s)
 
 
+def typecastJson(s):
+  if not s:
+    return None
+  return json.loads(s)
+
+
 ###############################################
 # Converters from Python to database (string) #
 ###############################################
@@ -177,6 +243,14 @@ def revTypecastDecimal(d):
   return str(d)
 
 
+def revTypecastJson(value):
+  """
+  Dumps the value in the format of sqlite's json functions, so the values
+  can be compared as strings.
+  """
+  return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
 def truncateName(name, length=None, hashLen=4):
   """Shortens a string to a repeatable mangled version with the given length.
   """
@@ -13,6 +13,28 @@ from theory.db.migrations.optimizer import MigrationOptimizer
 from theory.db.migrations.operations.model import AlterModelOptions
 
 
+def deepDeconstruct(obj):
+  """
+  Recursive deconstruction for a field and its arguments, also used by the
+  model checks to tell whether a model definition has changed.
+  """
+  if not hasattr(obj, 'deconstruct'):
+    return obj
+  deconstructed = obj.deconstruct()
+  if isinstance(obj, model.Field):
+    # we have a field which also returns a name
+    deconstructed = deconstructed[1:]
+  path, args, kwargs = deconstructed
+  return (
+    path,
+    [deepDeconstruct(value) for value in args],
+    dict(
+      (key, deepDeconstruct(value))
+      for key, value in kwargs.items()
+    ),
+  )
+
+
 class MigrationAutodetector(object):
   """
   Takes a pair of ProjectStates, and compares them to see what the
@@ -49,21 +71,7 @@ class MigrationAutodetector(object):
     Used for full comparison for rename/alter; sometimes a single-level
     deconstruction will not compare correctly.
     """
-    if not hasattr(obj, 'deconstruct'):
-      return obj
-    deconstructed = obj.deconstruct()
-    if isinstance(obj, model.Field):
-      # we have a field which also returns a name
-      deconstructed = deconstructed[1:]
-    path, args, kwargs = deconstructed
-    return (
-      path,
-      [self.deepDeconstruct(value) for value in args],
-      dict(
-        (key, self.deepDeconstruct(value))
-        for key, value in kwargs.items()
-      ),
-    )
+    return deepDeconstruct(obj)
 
   def onlyRelationAgnosticFields(self, fields):
     """
@@ -195,8 +195,8 @@ class ModelState(object):
     # Extract the options
     options = {}
     for name in DEFAULT_NAMES:
-      # Ignore some special options
-      if name in ["apps", "appLabel"]:
+      # Ignore some special options, the instance cache doesn't touch the db
+      if name in ["apps", "appLabel", "isCached"]:
         continue
       elif name in modal._meta.originalAttrs:
         if name == "uniqueTogether":
@@ -20,6 +20,7 @@ from theory.db import (router, transaction, DatabaseError,
 from theory.db.model.query import Q
 from theory.db.model.queryUtils import DeferredAttribute, deferredClassFactory
 from theory.db.model.deletion import Collector
+from theory.db.model.instanceCache import instanceCache
 from theory.db.model.options import Options
 from theory.db.model import signals
 from theory.utils import six
@@ -340,6 +341,10 @@ class ModelBase(type):
       cls.getAbsoluteUrl = update_wrapper(curry(getAbsoluteUrl, opts, cls.getAbsoluteUrl),
                          cls.getAbsoluteUrl)
 
+    # Saving a proxy or a child of a cached model changes its rows too
+    if any(m._meta.isCached for m in [cls, opts.concreteModel] + list(opts.getParentList())):
+      instanceCache.register(cls)
+
     signals.classPrepared.send(sender=cls)
 
 
@@ -359,7 +364,9 @@ class Model(six.withMetaclass(ModelBase)):
   _deferred = False
 
   def __init__(self, *args, **kwargs):
-    signals.preInit.send(sender=self.__class__, args=args, kwargs=kwargs)
+    cls = self.__class__
+    if not signals.preInit.hasNoReceivers(cls):
+      signals.preInit.send(sender=cls, args=args, kwargs=kwargs)
 
     # Set up the storage for instance state
     self._state = ModelState()
@@ -452,7 +459,84 @@ class Model(six.withMetaclass(ModelBase)):
       if kwargs:
         raise TypeError("'%s' is an invalid keyword argument for this function" % list(kwargs)[0])
     super(Model, self).__init__()
-    signals.postInit.send(sender=self.__class__, instance=self)
+    if not signals.postInit.hasNoReceivers(cls):
+      signals.postInit.send(sender=cls, instance=self)
+
+  @classmethod
+  def fromDb(cls, db, attnames, values):
+    """
+    Creates an instance from values loaded from the database. ``attnames``
+    is the tuple of attnames matching ``values``; any field not listed must
+    be deferred on ``cls``.
+
+    Unlike __init__(), the instance __dict__ is filled directly by a loader
+    built once per (class, attnames); see _buildDbLoader().
+    """
+    try:
+      loader = cls.__dict__['_dbLoaderMap'][attnames]
+    except KeyError:
+      loader = cls._buildDbLoader(attnames)
+    return loader(db, values)
+
+  @classmethod
+  def _buildDbLoader(cls, attnames):
+    if '_dbLoaderMap' not in cls.__dict__:
+      cls._dbLoaderMap = {}
+    preInit = signals.preInit
+    postInit = signals.postInit
+    isAllConcreteFields = attnames == cls._meta.concreteAttnames
+
+    # Unbound methods are built on every access on Python 2, so compare the
+    # functions behind them.
+    funcOf = lambda method: getattr(method, '__func__', method)
+    if (funcOf(cls.__init__) is not funcOf(Model.__init__)
+        or funcOf(cls.__setattr__) is not funcOf(Model.__setattr__)):
+      # The model customizes instantiation, so honour it.
+      def loader(db, values):
+        if isAllConcreteFields:
+          obj = cls(*values)
+        else:
+          obj = cls(**dict(zip(attnames, values)))
+        obj._state.db = db
+        obj._state.adding = False
+        return obj
+      cls._dbLoaderMap[attnames] = loader
+      return loader
+
+    # Data descriptors (e.g. FileDescriptor) living on an attname get the
+    # value through setattr() after the plain attributes are in place.
+    setattrLst = []
+    for i, attname in enumerate(attnames):
+      for klass in cls.__mro__:
+        if attname in klass.__dict__:
+          descriptor = klass.__dict__[attname]
+          if (hasattr(type(descriptor), '__set__')
+              and not isinstance(descriptor, DeferredAttribute)):
+            setattrLst.append((i, attname))
+          break
+    setattrLst = tuple(setattrLst)
+    new = object.__new__
+
+    def loader(db, values):
+      if not preInit.hasNoReceivers(cls):
+        if isAllConcreteFields:
+          preInit.send(sender=cls, args=tuple(values), kwargs={})
+        else:
+          preInit.send(sender=cls, args=(), kwargs=dict(zip(attnames, values)))
+      obj = new(cls)
+      objDict = obj.__dict__
+      state = ModelState(db)
+      state.adding = False
+      objDict['_state'] = state
+      objDict.update(zip(attnames, values))
+      for i, attname in setattrLst:
+        setattr(obj, attname, values[i])
+      if not postInit.hasNoReceivers(cls):
+        postInit.send(sender=cls, instance=obj)
+      return obj
+
+    cls._dbLoaderMap[attnames] = loader
+    return loader
 
   def __repr__(self):
     try:
@@ -3,6 +3,7 @@ from operator import attrgetter
 
 from theory.db import connections, transaction, IntegrityError
 from theory.db.model import signals, sql
+from theory.db.model.instanceCache import instanceCache
 from theory.utils import six
 
 
@@ -22,7 +23,7 @@ def CASCADE(collector, field, subObjs, using):
 def PROTECT(collector, field, subObjs, using):
   raise ProtectedError("Cannot delete some instances of modal '%s' because "
     "they are referenced through a protected foreign key: '%s.%s'" % (
-      field.rel.to.__name__, subObjs[0].__class__.__name__, field.name
+      field.rel.to.__name__, field.modal.__name__, field.name
     ),
     subObjs
   )
@@ -60,6 +61,10 @@ class Collector(object):
     # fastDeletes is a list of queryset-likes that can be deleted without
     # fetching the objects into memory.
     self.fastDeletes = []
+    # fastUpdates is a list of (queryset, {fieldName: value}) planned by
+    # planSetBasedDelete(). They run before any delete so the subqueries
+    # they are built on still see the rows being deleted.
+    self.fastUpdates = []
 
     # Tracks deletion-order dependency for databases without transactions
     # or ability to defer constraint checks. Only concrete modal classes
@@ -79,7 +84,7 @@ class Collector(object):
     if not objs:
       return []
     newObjs = []
-    modal = objs[0].__class__
+    modal = self._getModel(objs)
     instances = self.data.setdefault(modal, set())
     for obj in objs:
       if obj not in instances:
@@ -102,11 +107,24 @@ class Collector(object):
     """
     if not objs:
       return
-    modal = objs[0].__class__
+    modal = self._getModel(objs)
     self.fieldUpdates.setdefault(
       modal, {}).setdefault(
       (field, value), set()).update(objs)
 
+  def _getModel(self, objs):
+    # Related objects without delete receivers are fetched with their pk
+    # only; file their deferred class under the real modal.
+    modal = objs[0].__class__
+    if modal._deferred:
+      modal = modal._meta.proxyForModel
+    return modal
+
+  def hasDeleteListeners(self, modal):
+    return (signals.preDelete.hasListeners(modal)
+        or signals.postDelete.hasListeners(modal)
+        or signals.m2mChanged.hasListeners(modal))
+
   def canFastDelete(self, objs, fromField=None):
     """
     Determines if the objects in the given queryset-like can be
@@ -123,9 +141,7 @@ class Collector(object):
     if not (hasattr(objs, 'modal') and hasattr(objs, '_rawDelete')):
       return False
     modal = objs.modal
-    if (signals.preDelete.hasListeners(modal)
-        or signals.postDelete.hasListeners(modal)
-        or signals.m2mChanged.hasListeners(modal)):
+    if self.hasDeleteListeners(modal):
       return False
     # The use of fromField comes from the need to avoid cascade back to
     # parent when parent delete is cascading to child.
@@ -144,6 +160,82 @@ class Collector(object):
         return False
     return True
 
+  def planSetBasedDelete(self, objs, fromField=None, seenModels=frozenset()):
+    """
+    Plans the deletion of the queryset-like 'objs' and of everything
+    cascading from it without fetching a single object: each CASCADE becomes
+    a ``DELETE ... WHERE fk IN (SELECT ...)`` and each SET_NULL/SET_DEFAULT
+    an ``UPDATE`` of the same shape, so the number of statements depends on
+    the number of relations, not on the number of rows.
+
+    Returns a list of (queryset, values) steps, children first, where
+    values is None for a delete and the update kwargs otherwise. Returns
+    None if the plan would skip Python-level behaviour (signal receivers,
+    PROTECT or custom onDelete handlers, parent links, generic relations)
+    or if the relations are circular; the caller has to collect the objects
+    then.
+    """
+    if fromField and fromField.rel.onDelete is not CASCADE:
+      return None
+    if not (hasattr(objs, 'modal') and hasattr(objs, '_rawDelete')):
+      return None
+    modal = objs.modal
+    opts = modal._meta
+    concreteModel = opts.concreteModel
+    if concreteModel in seenModels or self.hasDeleteListeners(modal):
+      return None
+    if any(link != fromField for link in concreteModel._meta.parents.values()):
+      return None
+    for field in opts.virtualFields:
+      if hasattr(field, 'bulkRelatedObjects'):
+        return None
+    seenModels = seenModels | frozenset([concreteModel])
+
+    stepLst = []
+    for related in opts.getAllRelatedObjects(
+        includeHidden=True, includeProxyEq=True):
+      field = related.field
+      onDelete = field.rel.onDelete
+      if onDelete is DO_NOTHING:
+        continue
+      if getattr(field.rel, 'fieldName', None) != opts.pk.name:
+        # The subquery selects the pk only.
+        return None
+      subObjs = self.relatedObjects(related, objs)
+      if onDelete is CASCADE:
+        subStepLst = self.planSetBasedDelete(
+          subObjs, fromField=field, seenModels=seenModels)
+        if subStepLst is None:
+          return None
+        stepLst.extend(subStepLst)
+      elif onDelete is SET_NULL:
+        stepLst.append((subObjs, {field.name: None}))
+      elif onDelete is SET_DEFAULT:
+        stepLst.append((subObjs, {field.name: field.getDefault()}))
+      else:
+        return None
+    stepLst.append((objs, None))
+    return stepLst
+
+  def addSetBasedDelete(self, stepLst):
+    for (qs, values) in stepLst:
+      if values is None:
+        self.fastDeletes.append(qs)
+      else:
+        self.fastUpdates.append((qs, values))
+
+  def getDelBatches(self, objs, field):
+    """
+    Splits 'objs' so that the IN lists built on them stay within the
+    limits of the backend.
+    """
+    ops = connections[self.using].ops
+    batchSize = ops.maxInListSize() or max(
+      ops.bulkBatchSize([field.name], objs), 1)
+    if len(objs) <= batchSize:
+      return [objs]
+    return [objs[i:i + batchSize] for i in range(0, len(objs), batchSize)]
+
   def collect(self, objs, source=None, nullable=False, collectRelated=True,
       sourceAttr=None, reverseDependency=False):
     """
@@ -161,8 +253,9 @@ class Collector(object):
     model, the one case in which the cascade follows the forwards
     direction of an FK rather than the reverse direction.)
     """
-    if self.canFastDelete(objs):
-      self.fastDeletes.append(objs)
+    stepLst = self.planSetBasedDelete(objs)
+    if stepLst is not None:
+      self.addSetBasedDelete(stepLst)
       return
     newObjs = self.add(objs, source, nullable,
               reverseDependency=reverseDependency)
@@ -192,11 +285,18 @@ class Collector(object):
         field = related.field
         if field.rel.onDelete == DO_NOTHING:
           continue
-        subObjs = self.relatedObjects(related, newObjs)
-        if self.canFastDelete(subObjs, fromField=field):
-          self.fastDeletes.append(subObjs)
-        elif subObjs:
-          field.rel.onDelete(self, field, subObjs, self.using)
+        for batch in self.getDelBatches(newObjs, field):
+          subObjs = self.relatedObjects(related, batch)
+          stepLst = self.planSetBasedDelete(subObjs, fromField=field)
+          if stepLst is not None:
+            self.addSetBasedDelete(stepLst)
+            continue
+          if not self.hasDeleteListeners(related.modal):
+            # Nobody will look at these objects, the pk is enough to
+            # cascade and to delete them.
+            subObjs = subObjs.only(related.modal._meta.pk.name)
+          if subObjs:
+            field.rel.onDelete(self, field, subObjs, self.using)
       for field in modal._meta.virtualFields:
         if hasattr(field, 'bulkRelatedObjects'):
           # Its something like generic foreign key.
@@ -251,12 +351,16 @@ class Collector(object):
 
     with transaction.commitOnSuccessUnlessManaged(using=self.using):
       # send preDelete signals
-      for modal, obj in self.instancesWithModel():
+      for modal, instances in six.iteritems(self.data):
         if not modal._meta.autoCreated:
-          signals.preDelete.send(
-            sender=modal, instance=obj, using=self.using
+          signals.preDelete.sendBatch(
+            sender=modal, instanceLst=instances, using=self.using
           )
 
+      # set-based updates, before anything they select from is deleted
+      for (qs, values) in self.fastUpdates:
+        qs.update(**values)
+
       # fast deletes
       for qs in self.fastDeletes:
         qs._rawDelete(using=self.using)
@@ -279,10 +383,13 @@ class Collector(object):
         query.deleteBatch(pkList, self.using)
 
         if not modal._meta.autoCreated:
-          for obj in instances:
-            signals.postDelete.send(
-              sender=modal, instance=obj, using=self.using
-            )
+          signals.postDelete.sendBatch(
+            sender=modal, instanceLst=instances, using=self.using
+          )
+
+    # the fast deletes and updates have been invalidated by the querysets
+    for modal in set(self.data) | set(self.fieldUpdates):
+      instanceCache.invalidate(modal)
 
     # update collected instances
     for modal, instancesForFieldvalues in six.iteritems(self.fieldUpdates):
@@ -0,0 +1,250 @@
+"""
+An in-process, read-through cache of the model instances for the models
+whose Meta enables ``isCached``. It is meant for the metadata models which
+are read all the time but only change when the apps are probed again.
+
+The results of ``get()`` and of the querysets built only from the manager by
+``all()``, ``filter()`` with keyword arguments on the model's own concrete
+fields, ``orderBy()`` and slicing are kept per model in a LRU. The rows are
+stored instead of the instances, so every read gets its own instances.
+
+The entries of a model are dropped by its postSave signal, by the
+Collector deleting its rows and by the bulk operations of its querysets.
+Listening to postDelete or m2mChanged would make the Collector fetch every
+row being deleted, and the many-to-many rows are never cached anyway. The
+writes from the other processes are only seen once the entries expire after
+MODEL_INSTANCE_CACHE_TIMEOUT seconds. The cache is shared by the threads
+of the process, e.x: the workers of the local async backend, so the LRUs are
+only touched under a lock.
+"""
+
+from collections import OrderedDict
+import copy
+import datetime
+import decimal
+import threading
+import time
+
+from theory.conf import settings
+from theory.db import connections
+from theory.db.model import signals
+from theory.db.model.constants import LOOKUP_SEP
+from theory.db.model.sql.constants import QUERY_TERMS
+from theory.utils import six
+
+__all__ = ('InstanceCache', 'instanceCache', 'getFilterKey',
+  'isOwnFieldOrdering')
+
+_SIMPLE_TYPES = (
+  bool, float, decimal.Decimal, datetime.date, datetime.time, type(None)
+) + six.stringTypes + six.integerTypes
+
+
+def _getSimpleValue(value):
+  """
+  Returns a hashable version of a lookup value, or raises ValueError if the
+  lookup cannot be told apart by its value, e.x: a model instance or an
+  expression.
+  """
+  if isinstance(value, _SIMPLE_TYPES):
+    return value
+  if isinstance(value, (list, tuple)):
+    return tuple(_getSimpleValue(i) for i in value)
+  if isinstance(value, (set, frozenset)):
+    return frozenset(_getSimpleValue(i) for i in value)
+  raise ValueError(value)
+
+
+def _getFieldMap(modal):
+  fieldMap = {'pk': modal._meta.pk}
+  for field in modal._meta.concreteFields:
+    fieldMap[field.name] = field
+    fieldMap[field.attname] = field
+  return fieldMap
+
+
+def isOwnFieldOrdering(modal, fieldNames):
+  """
+  Whether orderBy(*fieldNames) only orders by the model's own concrete
+  fields, the ordering by a relation depends on the related model.
+  """
+  fieldMap = _getFieldMap(modal)
+  for fieldName in fieldNames:
+    if not isinstance(fieldName, six.stringTypes):
+      return False
+    fieldName = fieldName.lstrip('-+')
+    field = fieldMap.get(fieldName)
+    if field is None:
+      return False
+    if field.rel and fieldName != field.attname:
+      return False
+  return True
+
+
+def getFilterKey(modal, kwargs):
+  """
+  Returns the part of the cache key of filter(**kwargs), or None if the
+  lookups are not on the model's own concrete fields.
+  """
+  fieldMap = _getFieldMap(modal)
+  keyLst = []
+  for (lookup, value) in kwargs.items():
+    partLst = lookup.split(LOOKUP_SEP)
+    if partLst[0] not in fieldMap:
+      return None
+    if len(partLst) > 2 or (len(partLst) == 2 and partLst[1] not in QUERY_TERMS):
+      return None
+    try:
+      keyLst.append((lookup, _getSimpleValue(value)))
+    except (ValueError, TypeError):
+      return None
+  keyLst.sort()
+  return tuple(keyLst)
+
+
+class InstanceCache(object):
+  """
+  The rows of the cached querysets in a LRU per concrete model, together
+  with the hits and misses of every model.
+  """
+  def __init__(self, maxSize=None, timeout=None):
+    self._maxSize = maxSize
+    self._timeout = timeout
+    self._storeMap = {}
+    self._statMap = {}
+    self._lock = threading.RLock()
+    # Bumped by every invalidation
+    self._version = 0
+
+  @property
+  def maxSize(self):
+    if self._maxSize is None:
+      return settings.MODEL_INSTANCE_CACHE_SIZE
+    return self._maxSize
+
+  @property
+  def timeout(self):
+    if self._timeout is None:
+      return settings.MODEL_INSTANCE_CACHE_TIMEOUT
+    return self._timeout
+
+  def register(self, modal):
+    """
+    Connects the signal which invalidates the entries of the model. Called
+    by ModelBase for the models whose Meta enables isCached.
+    """
+    signals.postSave.connect(
+      self._onChange,
+      sender=modal,
+      weak=False,
+      dispatchUid='instanceCache.%s.%s' % (
+        modal._meta.appLabel, modal._meta.objectName
+      )
+    )
+
+  def _onChange(self, sender, **kwargs):
+    self.invalidate(sender)
+
+  def _getStat(self, modal):
+    label = '%s.%s' % (modal._meta.appLabel, modal._meta.objectName)
+    try:
+      return self._statMap[label]
+    except KeyError:
+      stat = self._statMap[label] = [0, 0]
+      return stat
+
+  def get(self, queryset):
+    """
+    Returns the instances of the queryset, from the cache if it holds them.
+    """
+    modal = queryset.modal
+    db = queryset.db
+    concreteModel = modal._meta.concreteModel
+    key = (modal, db, queryset._cacheKey)
+    attnames = modal._meta.concreteAttnames
+    now = time.time()
+
+    with self._lock:
+      store = self._storeMap.get(concreteModel)
+      stat = self._getStat(modal)
+      rowLst = None
+      if store is not None:
+        try:
+          (expireAt, rowLst) = store[key]
+        except KeyError:
+          pass
+        else:
+          del store[key]
+          if expireAt is None or expireAt > now:
+            store[key] = (expireAt, rowLst)
+          else:
+            rowLst = None
+      if rowLst is not None:
+        stat[0] += 1
+      else:
+        stat[1] += 1
+        # The rows read while the model is being invalidated are not kept
+        version = self._version
+    if rowLst is not None:
+      return [
+        modal.fromDb(db, attnames, copy.deepcopy(row)) for row in rowLst
+      ]
+
+    instanceLst = list(queryset._iterator())
+    # The rows read in a transaction might be rolled back
+    if self.maxSize <= 0 or connections[db].inAtomicBlock:
+      return instanceLst
+    rowLst = tuple(
+      copy.deepcopy(tuple(getattr(obj, i) for i in attnames))
+      for obj in instanceLst
+    )
+    timeout = self.timeout
+    with self._lock:
+      if version != self._version:
+        return instanceLst
+      store = self._storeMap.setdefault(concreteModel, OrderedDict())
+      store[key] = (None if timeout is None else now + timeout, rowLst)
+      while len(store) > self.maxSize:
+        store.popitem(last=False)
+    return instanceLst
+
+  def invalidate(self, modal=None):
+    """
+    Drops the entries of the model, of its parents and of its children, or
+    every entry if modal is None.
+    """
+    with self._lock:
+      self._version += 1
+      if modal is None:
+        self._storeMap.clear()
+        return
+      opts = modal._meta
+      relatedSet = set(opts.getParentList())
+      relatedSet.add(opts.concreteModel)
+      for concreteModel in list(self._storeMap):
+        if (concreteModel in relatedSet or
+            opts.concreteModel in concreteModel._meta.getParentList()):
+          del self._storeMap[concreteModel]
+
+  def stats(self):
+    """
+    Returns {modelLabel: (hitNum, missNum, hitRatio)} of the models read.
+    """
+    statDict = {}
+    with self._lock:
+      statLst = [(i, tuple(j)) for (i, j) in self._statMap.items()]
+    for (label, (hitNum, missNum)) in statLst:
+      total = hitNum + missNum
+      statDict[label] = (
+        hitNum,
+        missNum,
+        float(hitNum) / total if total else 0.0
+      )
+    return statDict
+
+  def resetStats(self):
+    with self._lock:
+      self._statMap.clear()
+
+
+instanceCache = InstanceCache()
@@ -22,7 +22,7 @@ DEFAULT_NAMES = ('verboseName', 'verboseNamePlural', 'dbTable', 'ordering',
          'orderWithRespectTo', 'appLabel', 'dbTablespace',
          'abstract', 'managed', 'proxy', 'swappable', 'autoCreated',
          'indexTogether', 'apps', 'defaultPermissions',
-         'selectOnSave')
+         'selectOnSave', 'isCached')
 
 
 def normalizeTogether(optionTogether):
@@ -61,6 +61,7 @@ class Options(object):
     self.uniqueTogether = []
     self.indexTogether = []
     self.selectOnSave = False
+    self.isCached = False
     self.defaultPermissions = ('add', 'change', 'delete')
     self.permissions = []
     self.objectName = None
@@ -233,6 +234,10 @@ class Options(object):
           del self.localConcreteFields
         except AttributeError:
           pass
+        try:
+          del self.concreteAttnames
+        except AttributeError:
+          pass
 
     if hasattr(self, '_nameMap'):
       del self._nameMap
@@ -325,6 +330,13 @@ class Options(object):
   def concreteFields(self):
     return [f for f in self.fields if f.column is not None]
 
+  @cachedProperty
+  def concreteAttnames(self):
+    """
+    The attnames of concreteFields, as the tuple Model.fromDb() expects.
+    """
+    return tuple(f.attname for f in self.concreteFields)
+
   @cachedProperty
   def localConcreteFields(self):
     return [f for f in self.localFields if f.column is not None]
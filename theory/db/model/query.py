@@ -4,18 +4,22 @@ The main QuerySet implementation. This provides the public API for the ORM.
 
 from collections import deque
 import copy
+from itertools import islice
+from operator import itemgetter
 import sys
 
 from theory.conf import settings
 from theory.core import exceptions
 from theory.db import connections, router, transaction, IntegrityError
 from theory.db.model.constants import LOOKUP_SEP
-from theory.db.model.fields import AutoField, Empty
+from theory.db.model.fields import AutoField, Empty, FieldDoesNotExist
 from theory.db.model.queryUtils import (Q, selectRelatedDescend,
   deferredClassFactory, InvalidQuery)
 from theory.db.model.deletion import Collector
+from theory.db.model.instanceCache import (getFilterKey, instanceCache,
+  isOwnFieldOrdering)
 from theory.db.model.sql.constants import CURSOR
-from theory.db.model import sql
+from theory.db.model import signals, sql
 from theory.utils.functional import partition
 from theory.utils import six
 from theory.utils import timezone
@@ -27,6 +31,10 @@ MAX_GET_RESULTS = 20
 # The maximum number of items to display in a QuerySet.__repr__
 REPR_OUTPUT_SIZE = 20
 
+# The number of objects whose related objects are prefetched together by
+# QuerySet.iterator()
+ITERATOR_PREFETCH_CHUNK_SIZE = 2000
+
 # Pull into this namespace for backwards compatibility.
 EmptyResultSet = sql.EmptyResultSet
 
@@ -59,6 +67,11 @@ class QuerySet(object):
     self._prefetchRelatedLookups = []
     self._prefetchDone = False
     self._knownRelatedObjects = {}        # {relField, {pk: relObj}}
+    # How the queryset is built from the manager if the result can be
+    # served by the instance cache, otherwise None
+    self._cacheKey = None
+    if query is None and modal is not None and modal._meta.isCached:
+      self._cacheKey = ()
 
   def asManager(cls):
     # Address the circular dependency between `Queryset` and `Manager`.
@@ -135,7 +148,7 @@ class QuerySet(object):
          tuples. In some cases the return values are converted to
          Python values at this location (see resolveColumns(),
          resolveAggregate()).
-      3. self.iterator()
+      3. self._iterator()
         - Responsible for turning the rows into modal objects.
     """
     self._fetchAll()
@@ -170,10 +183,12 @@ class QuerySet(object):
       else:
         stop = None
       qs.query.setLimits(start, stop)
+      qs._cacheKey = self._chainCacheKey('limit', start, stop)
       return list(qs)[::k.step] if k.step else qs
 
     qs = self._clone()
     qs.query.setLimits(k, k + 1)
+    qs._cacheKey = self._chainCacheKey('limit', k, k + 1)
     return list(qs)[0]
 
   def __and__(self, other):
@@ -202,10 +217,32 @@ class QuerySet(object):
   # METHODS THAT DO DATABASE QUERIES #
   ####################################
 
-  def iterator(self):
+  def iterator(self, chunkSize=None):
     """
     An iterator over the results from applying this QuerySet to the
-    database.
+    database. The results are not cached. If prefetchRelated() has been
+    called, the related objects are prefetched for every chunkSize results,
+    so the memory is bounded by the chunk instead of the whole result.
+    """
+    if self._prefetchRelatedLookups:
+      return self._prefetchingIterator(
+        chunkSize or ITERATOR_PREFETCH_CHUNK_SIZE)
+    return self._iterator()
+
+  def _prefetchingIterator(self, chunkSize):
+    iterable = self._iterator()
+    while True:
+      chunk = list(islice(iterable, chunkSize))
+      if not chunk:
+        return
+      prefetchRelatedObjects(chunk, self._prefetchRelatedLookups)
+      for obj in chunk:
+        yield obj
+
+  def _iterator(self):
+    """
+    Yields the results without prefetching. The subclasses override it to
+    yield the other kinds of results.
     """
     fillCache = False
     if connections[self.db].features.supportsSelectRelated:
@@ -242,10 +279,13 @@ class QuerySet(object):
     indexStart = len(extraSelect)
     aggregateStart = indexStart + len(loadFields or self.modal._meta.concreteFields)
 
-    skip = None
+    # Cache db and modal outside the loop
+    db = self.db
+    modalCls = self.modal
+    initAttnames = self.modal._meta.concreteAttnames
     if loadFields and not fillCache:
-      # Some fields have been deferred, so we have to initialize
-      # via keyword arguments.
+      # Some fields have been deferred, so only the loaded ones are
+      # given to the deferred class.
       skip = set()
       initList = []
       for field in fields:
@@ -254,13 +294,11 @@ class QuerySet(object):
         else:
           initList.append(field.attname)
       modalCls = deferredClassFactory(self.modal, skip)
-
-    # Cache db and modal outside the loop
-    db = self.db
-    modal = self.modal
+      initAttnames = tuple(initList)
+    fromDb = modalCls.fromDb
     compiler = self.query.getCompiler(using=db)
     if fillCache:
-      klassInfo = getKlassInfo(modal, maxDepth=maxDepth,
+      klassInfo = getKlassInfo(self.modal, maxDepth=maxDepth,
                     requested=requested, onlyLoad=onlyLoad)
     for row in compiler.resultsIter():
       if fillCache:
@@ -268,16 +306,7 @@ class QuerySet(object):
                     offset=len(aggregateSelect))
       else:
         # Omit aggregates in object creation.
-        rowData = row[indexStart:aggregateStart]
-        if skip:
-          obj = modalCls(**dict(zip(initList, rowData)))
-        else:
-          obj = modal(*rowData)
-
-        # Store the source database of the object
-        obj._state.db = db
-        # This object came from the database; it's not being added.
-        obj._state.adding = False
+        obj = fromDb(db, initAttnames, row[indexStart:aggregateStart])
 
       if extraSelect:
         for i, k in enumerate(extraSelect):
@@ -375,9 +404,10 @@ class QuerySet(object):
   def bulkCreate(self, objs, batchSize=None):
     """
     Inserts each of the instances into the database. This does *not* call
-    save() on each of the instances, does not send any pre/post save
-    signals, and does not set the primary key attribute if it is an
-    autoincrement field.
+    save() on each of the instances, does not send any pre save signal nor
+    per instance post save signal, and does not set the primary key
+    attribute if it is an autoincrement field. The postSave receivers
+    connected with isBatch are called once with all the objs.
     """
     # So this case is fun. When you bulk insert you don't get the primary
     # keys back (if it's an autoincrement), so you can't insert into the
@@ -407,6 +437,11 @@ class QuerySet(object):
         if objsWithoutPk:
           fields = [f for f in fields if not isinstance(f, AutoField)]
           self._batchedInsert(objsWithoutPk, fields, batchSize)
+    signals.postSave.sendBatch(
+      sender=self.modal, instanceLst=objs, isBatchOnly=True, created=True,
+      raw=False, using=self.db, updateFields=None
+    )
+    instanceCache.invalidate(self.modal)
 
     return objs
 
@@ -567,6 +602,7 @@ class QuerySet(object):
     query. No signals are sent, and there is no protection for cascades.
     """
     sql.DeleteQuery(self.modal).deleteQs(self, using)
+    instanceCache.invalidate(self.modal)
   _rawDelete.altersData = True
 
   def update(self, **kwargs):
@@ -582,6 +618,7 @@ class QuerySet(object):
     with transaction.commitOnSuccessUnlessManaged(using=self.db):
       rows = query.getCompiler(self.db).executeSql(CURSOR)
     self._resultCache = None
+    instanceCache.invalidate(self.modal)
     return rows
   update.altersData = True
 
@@ -597,6 +634,7 @@ class QuerySet(object):
     query = self.query.clone(sql.UpdateQuery)
     query.addUpdateFields(values)
     self._resultCache = None
+    instanceCache.invalidate(self.modal)
     return query.getCompiler(self.db).executeSql(CURSOR)
   _update.altersData = True
   _update.querysetOnly = False
@@ -635,6 +673,15 @@ class QuerySet(object):
     return self._clone(klass=ValuesListQuerySet, setup=True, flat=flat,
         _fields=fields)
 
+  def rows(self, *fields):
+    """
+    Returns light read-only records instead of modal instances. The records
+    are tuples whose items can also be read by field name (by attname for
+    relations, i.e. the FK ids); see RowRecord.
+    """
+    return self._clone(klass=RowsQuerySet, setup=True, flat=False,
+        _fields=fields)
+
   def dates(self, fieldName, kind, order='ASC'):
     """
     Returns a list of date objects representing all available dates for
@@ -681,14 +728,19 @@ class QuerySet(object):
     Returns a new QuerySet that is a copy of the current one. This allows a
     QuerySet to proxy for a modal manager in some cases.
     """
-    return self._clone()
+    return self._clone(_cacheKey=self._cacheKey)
 
   def filter(self, *args, **kwargs):
     """
     Returns a new QuerySet instance with the args ANDed to the existing
     set.
     """
-    return self._filterOrExclude(False, *args, **kwargs)
+    clone = self._filterOrExclude(False, *args, **kwargs)
+    if self._cacheKey is not None and not args:
+      filterKey = getFilterKey(self.modal, kwargs)
+      if filterKey is not None:
+        clone._cacheKey = self._chainCacheKey('filter', filterKey)
+    return clone
 
   def exclude(self, *args, **kwargs):
     """
@@ -812,6 +864,8 @@ class QuerySet(object):
     obj = self._clone()
     obj.query.clearOrdering(forceEmpty=False)
     obj.query.addOrdering(*fieldNames)
+    if self._cacheKey is not None and isOwnFieldOrdering(self.modal, fieldNames):
+      obj._cacheKey = self._chainCacheKey('orderBy', fieldNames)
     return obj
 
   def distinct(self, *fieldNames):
@@ -963,10 +1017,24 @@ class QuerySet(object):
 
   def _fetchAll(self):
     if self._resultCache is None:
-      self._resultCache = list(self.iterator())
+      if (self._cacheKey is not None and not self._prefetchRelatedLookups
+          and not self._knownRelatedObjects):
+        self._resultCache = instanceCache.get(self)
+      else:
+        # The related objects of the whole result are prefetched at once below
+        self._resultCache = list(self._iterator())
     if self._prefetchRelatedLookups and not self._prefetchDone:
       self._prefetchRelatedObjects()
 
+  def _chainCacheKey(self, *step):
+    """
+    Returns the cache key of the queryset built from this one by the step,
+    or None if this one cannot be cached.
+    """
+    if self._cacheKey is None:
+      return None
+    return self._cacheKey + (step,)
+
   def _nextIsSticky(self):
     """
     Indicates that the next filter call and the one following that should
@@ -1069,7 +1137,7 @@ class ValuesQuerySet(QuerySet):
   def defer(self, *fields):
     raise NotImplementedError("ValuesQuerySet does not implement defer()")
 
-  def iterator(self):
+  def _iterator(self):
     # Purge any extra columns that haven't been explicitly asked for
     extraNames = list(self.query.extraSelect)
     fieldNames = self.fieldNames
@@ -1197,7 +1265,7 @@ class ValuesQuerySet(QuerySet):
 
 
 class ValuesListQuerySet(ValuesQuerySet):
-  def iterator(self):
+  def _iterator(self):
     if self.flat and len(self._fields) == 1:
       for row in self.query.getCompiler(self.db).resultsIter():
         yield row[0]
@@ -1233,8 +1301,116 @@ class ValuesListQuerySet(ValuesQuerySet):
     return clone
 
 
+class RowRecord(tuple):
+  """
+  Base class of the records returned by QuerySet.rows(). Subclasses are
+  generated by rowRecordFactory() and only add one property per field, so a
+  record costs no more memory than the tuple it is.
+  """
+  __slots__ = ()
+  _fields = ()
+  _modal = None
+  _db = None
+
+  def __repr__(self):
+    return '%s(%s)' % (self.__class__.__name__, ', '.join(
+      '%s=%r' % (name, value) for name, value in zip(self._fields, self)))
+
+  def __reduce__(self):
+    return (
+      _unpickleRowRecord,
+      (self._modal._meta.appLabel, self._modal._meta.objectName,
+       self._fields, self._db, tuple(self))
+    )
+
+  def toDict(self):
+    return dict(zip(self._fields, self))
+
+  def toModel(self):
+    """
+    Converts the record into a modal instance. Fields which are not in the
+    record are deferred, so the primary key has to be in the record.
+    """
+    opts = self._modal._meta
+    if opts.pk.attname not in self._fields:
+      raise InvalidQuery(
+        "The primary key must be one of the rows() fields to build a %s."
+        % opts.objectName)
+    attnames = []
+    values = []
+    for name, value in zip(self._fields, self):
+      if name in opts.concreteAttnames:
+        attnames.append(name)
+        values.append(value)
+    skip = set(opts.concreteAttnames).difference(attnames)
+    modalCls = deferredClassFactory(self._modal, skip) if skip else self._modal
+    return modalCls.fromDb(self._db, tuple(attnames), values)
+
+
+_rowRecordKlassCache = {}
+
+
+def rowRecordFactory(modal, names, using):
+  """
+  Returns the RowRecord subclass for the given modal, field names and db,
+  creating it on first use.
+  """
+  key = (modal, names, using)
+  try:
+    return _rowRecordKlassCache[key]
+  except KeyError:
+    pass
+  classDict = {
+    '__slots__': (),
+    '_fields': names,
+    '_modal': modal,
+    '_db': using,
+  }
+  for i, name in enumerate(names):
+    classDict[name] = property(itemgetter(i))
+  klass = type(str('%sRow' % modal.__name__), (RowRecord,), classDict)
+  _rowRecordKlassCache[key] = klass
+  return klass
+
+
+def _unpickleRowRecord(appLabel, modalName, names, using, values):
+  from theory.apps import apps
+  modal = apps.getModel(appLabel, modalName)
+  return rowRecordFactory(modal, names, using)(values)
+
+
+class RowsQuerySet(ValuesListQuerySet):
+  """
+  QuerySet returned by rows(). It shares the compiler path of valuesList()
+  and wraps each tuple into a RowRecord.
+  """
+  def _getRecordNames(self):
+    if self._fields:
+      names = list(self._fields) + [
+        f for f in self.query.aggregateSelect if f not in self._fields]
+    else:
+      names = (list(self.query.extraSelect) + self.fieldNames
+           + list(self.query.aggregateSelect))
+    opts = self.modal._meta
+    recordNames = []
+    for name in names:
+      try:
+        # Relations are exposed by attname, i.e. as ids.
+        recordNames.append(opts.getField(name, manyToMany=False).attname)
+      except FieldDoesNotExist:
+        recordNames.append(name)
+    return tuple(recordNames)
+
+  def _iterator(self):
+    recordKlass = rowRecordFactory(
+      self.modal, self._getRecordNames(), self.db)
+    new = tuple.__new__
+    for row in super(RowsQuerySet, self)._iterator():
+      yield new(recordKlass, row)
+
+
 class DateQuerySet(QuerySet):
-  def iterator(self):
+  def _iterator(self):
     return self.query.getCompiler(self.db).resultsIter()
 
   def _setupQuery(self):
@@ -1259,7 +1435,7 @@ class DateQuerySet(QuerySet):
 
 
 class DateTimeQuerySet(QuerySet):
-  def iterator(self):
+  def _iterator(self):
     return self.query.getCompiler(self.db).resultsIter()
 
   def _setupQuery(self):
@@ -1433,17 +1609,13 @@ def getCachedRow(row, indexStart, using, klassInfo, offset=0,
      fields[pkIdx] == '')):
     obj = None
   elif fieldNames:
-    fields = list(fields)
-    for relField, value in parentData:
-      fieldNames.append(relField.attname)
-      fields.append(value)
-    obj = klass(**dict(zip(fieldNames, fields)))
+    attnames = tuple(fieldNames)
+    if parentData:
+      fields = tuple(fields) + tuple(value for _, value in parentData)
+      attnames += tuple(relField.attname for relField, _ in parentData)
+    obj = klass.fromDb(using, attnames, fields)
   else:
-    obj = klass(*fields)
-  # If an object was retrieved, set the database state.
-  if obj:
-    obj._state.db = using
-    obj._state.adding = False
+    obj = klass.fromDb(using, klass._meta.concreteAttnames, fields)
 
   # Instantiate related fields
   indexEnd = indexStart + fieldCount + offset
@@ -1554,12 +1726,11 @@ class RawQuerySet(object):
         modalCls = deferredClassFactory(self.modal, skip)
       else:
         modalCls = self.modal
-        # All modal's fields are present in the query. So, it is possible
-        # to use *args based modal instantiation. For each field of the modal,
-        # record the query column position matching that field.
-        modalInitFieldPos = []
-        for field in self.modal._meta.fields:
-          modalInitFieldPos.append(modalInitFieldNames[field.attname])
+      # For each loaded field of the modal, record the query column position
+      # matching that field.
+      modalInitAttnames = tuple(modalInitFieldNames)
+      modalInitFieldPos = [modalInitFieldNames[k] for k in modalInitAttnames]
+      fromDb = modalCls.fromDb
       if needResolvColumns:
         fields = [self.modalFields.get(c, None) for c in self.columns]
       # Begin looping through the query values.
@@ -1567,21 +1738,12 @@ class RawQuerySet(object):
         if needResolvColumns:
           values = compiler.resolveColumns(values, fields)
         # Associate fields to values
-        if skip:
-          modalInitKwargs = {}
-          for attname, pos in six.iteritems(modalInitFieldNames):
-            modalInitKwargs[attname] = values[pos]
-          instance = modalCls(**modalInitKwargs)
-        else:
-          modalInitArgs = [values[pos] for pos in modalInitFieldPos]
-          instance = modalCls(*modalInitArgs)
+        instance = fromDb(
+          db, modalInitAttnames, [values[pos] for pos in modalInitFieldPos])
         if annotationFields:
           for column, pos in annotationFields:
             setattr(instance, column, values[pos])
 
-        instance._state.db = db
-        instance._state.adding = False
-
         yield instance
     finally:
       # Done iterating the Query. If it has its own cursor, close it.
@@ -9,10 +9,12 @@ classPrepared = Signal(providingArgs=["class"])
 class ModelSignal(Signal):
   """
   Signal subclass that allows the sender to be lazily specified as a string
-  of the `appLabel.ModelName` form.
+  of the `appLabel.ModelName` form. The receivers are cached per sender by
+  default, since the model signals are sent for every instance.
   """
 
   def __init__(self, *args, **kwargs):
+    kwargs.setdefault('useCaching', True)
     super(ModelSignal, self).__init__(*args, **kwargs)
     self.unresolvedReferences = {}
     classPrepared.connect(self._resolveReferences)
@@ -25,12 +27,14 @@ class ModelSignal(Signal):
     except KeyError:
       pass
     else:
-      for receiver, weak, dispatchUid in receivers:
+      for receiver, weak, dispatchUid, isBatch in receivers:
         super(ModelSignal, self).connect(
-          receiver, sender=sender, weak=weak, dispatchUid=dispatchUid
+          receiver, sender=sender, weak=weak, dispatchUid=dispatchUid,
+          isBatch=isBatch
         )
 
-  def connect(self, receiver, sender=None, weak=True, dispatchUid=None):
+  def connect(self, receiver, sender=None, weak=True, dispatchUid=None,
+      isBatch=False):
     if isinstance(sender, six.stringTypes):
       try:
         appLabel, modelName = sender.split('.')
@@ -44,23 +48,25 @@ class ModelSignal(Signal):
       except LookupError:
         ref = (appLabel, modelName)
         refs = self.unresolvedReferences.setdefault(ref, [])
-        refs.append((receiver, weak, dispatchUid))
+        refs.append((receiver, weak, dispatchUid, isBatch))
         return
     super(ModelSignal, self).connect(
-      receiver, sender=sender, weak=weak, dispatchUid=dispatchUid
+      receiver, sender=sender, weak=weak, dispatchUid=dispatchUid,
+      isBatch=isBatch
     )
 
-preInit = ModelSignal(providingArgs=["instance", "args", "kwargs"], useCaching=True)
-postInit = ModelSignal(providingArgs=["instance"], useCaching=True)
+preInit = ModelSignal(providingArgs=["instance", "args", "kwargs"])
+postInit = ModelSignal(providingArgs=["instance"])
 
-preSave = ModelSignal(providingArgs=["instance", "raw", "using", "updateFields"],
-            useCaching=True)
-postSave = ModelSignal(providingArgs=["instance", "raw", "created", "using", "updateFields"], useCaching=True)
+preSave = ModelSignal(providingArgs=["instance", "raw", "using", "updateFields"])
+# Also sent by bulkCreate() to the batch receivers only, see
+# Signal.sendBatch().
+postSave = ModelSignal(providingArgs=["instance", "raw", "created", "using", "updateFields"])
 
-preDelete = ModelSignal(providingArgs=["instance", "using"], useCaching=True)
-postDelete = ModelSignal(providingArgs=["instance", "using"], useCaching=True)
+preDelete = ModelSignal(providingArgs=["instance", "using"])
+postDelete = ModelSignal(providingArgs=["instance", "using"])
 
-m2mChanged = ModelSignal(providingArgs=["action", "instance", "reverse", "modal", "pkSet", "using"], useCaching=True)
+m2mChanged = ModelSignal(providingArgs=["action", "instance", "reverse", "modal", "pkSet", "using"])
 
 preMigrate = Signal(providingArgs=["appConfig", "verbosity", "interactive", "using"])
 postMigrate = Signal(providingArgs=["appConfig", "verbosity", "interactive", "using"])
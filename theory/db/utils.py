@@ -1,7 +1,7 @@
 from importlib import import_module
 import os
 import pkgutil
-from threading import local
+from threading import local, Lock
 import warnings
 
 from theory.conf import settings
@@ -141,6 +141,9 @@ class ConnectionHandler(object):
     """
     self._databases = databases
     self._connections = local()
+    # Pools are shared by all threads, unlike the connections themselves.
+    self._pools = {}
+    self._poolLock = Lock()
 
   @cachedProperty
   def databases(self):
@@ -181,6 +184,15 @@ class ConnectionHandler(object):
     conn.setdefault('TIME_ZONE', 'UTC' if settings.USE_TZ else settings.TIME_ZONE)
     for setting in ['NAME', 'USER', 'PASSWORD', 'HOST', 'PORT']:
       conn.setdefault(setting, '')
+    # POOL is None (no pooling) or a dict; True is a shortcut for {}.
+    conn.setdefault('POOL', None)
+    if conn['POOL'] is True:
+      conn['POOL'] = {}
+    if conn['POOL'] is not None:
+      conn['POOL'].setdefault('MIN_SIZE', 0)
+      conn['POOL'].setdefault('MAX_SIZE', 10)
+      conn['POOL'].setdefault('MAX_LIFETIME', None)
+      conn['POOL'].setdefault('TIMEOUT', 30)
 
   TEST_SETTING_RENAMES = {
     'CREATE': 'CREATE_DB',
@@ -241,6 +253,7 @@ class ConnectionHandler(object):
     db = self.databases[alias]
     backend = loadBackend(db['ENGINE'])
     conn = backend.DatabaseWrapper(db, alias)
+    conn.pool = self.getPool(alias)
     setattr(self._connections, alias, conn)
     return conn
 
@@ -256,6 +269,38 @@ class ConnectionHandler(object):
   def all(self):
     return [self[alias] for alias in self]
 
+  def getPool(self, alias):
+    """
+    Returns the connection pool shared by all threads for the given alias,
+    or None if the POOL setting of that database isn't enabled.
+    """
+    self.ensureDefaults(alias)
+    poolSettings = self.databases[alias]['POOL']
+    if poolSettings is None:
+      return None
+    with self._poolLock:
+      if alias not in self._pools:
+        from theory.db.backends.pool import ConnectionPool
+        self._pools[alias] = ConnectionPool.fromSettings(alias, poolSettings)
+      return self._pools[alias]
+
+  def poolStats(self):
+    """
+    Returns the metrics of every pool created so far, keyed by alias.
+    """
+    with self._poolLock:
+      pools = list(self._pools.items())
+    return dict((alias, pool.stats()) for alias, pool in pools)
+
+  def closePools(self):
+    """
+    Closes the idle connections of every pool, e.g. before forking workers.
+    """
+    with self._poolLock:
+      pools = list(self._pools.values())
+    for pool in pools:
+      pool.clear()
+
 
 class ConnectionRouter(object):
   def __init__(self, routers=None):
@@ -338,3 +383,38 @@ class ConnectionRouter(object):
     """
     model = appConfig.getModels(includeAutoCreated=includeAutoCreated)
     return [modal for modal in model if self.allowMigrate(db, modal)]
+
+
+class MetadataRouter(object):
+  """
+  Routes theory's own models, e.x: the commands, the adapters and the
+  models being probed, to the database settings.METADATA_DATABASE_ALIAS
+  while the models of the other apps stay on the default database. It makes
+  the metadata be read from an embedded sqlite database for example.
+  """
+  appLabelSet = frozenset(['apps'])
+
+  def __init__(self, alias=None):
+    self.alias = alias or settings.METADATA_DATABASE_ALIAS
+
+  def _isMetadata(self, modal):
+    return modal._meta.appLabel in self.appLabelSet
+
+  def dbForRead(self, modal, **hints):
+    if self._isMetadata(modal):
+      return self.alias
+    return None
+
+  dbForWrite = dbForRead
+
+  def allowRelation(self, obj1, obj2, **hints):
+    if self._isMetadata(obj1) or self._isMetadata(obj2):
+      return self._isMetadata(obj1) and self._isMetadata(obj2)
+    return None
+
+  def allowMigrate(self, db, modal):
+    if self._isMetadata(modal):
+      return db == self.alias
+    if db == self.alias:
+      return False
+    return None
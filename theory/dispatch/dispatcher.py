@@ -27,7 +27,7 @@ class Signal(object):
   Internal attributes:
 
     receivers
-      { receiverkey (id) : weakref(receiver) }
+      [ (receiverkey (id), weakref(receiver), isBatch) ]
   """
   def __init__(self, providingArgs=None, useCaching=False):
     """
@@ -50,7 +50,8 @@ class Signal(object):
     self.senderReceiversCache = weakref.WeakKeyDictionary() if useCaching else {}
     self._deadReceivers = False
 
-  def connect(self, receiver, sender=None, weak=True, dispatchUid=None):
+  def connect(self, receiver, sender=None, weak=True, dispatchUid=None,
+      isBatch=False):
     """
     Connect receiver to sender for signal.
 
@@ -82,6 +83,11 @@ class Signal(object):
         An identifier used to uniquely identify a particular instance of
         a receiver. This will usually be a string, though it may be
         anything hashable.
+
+      isBatch
+        Whether sendBatch() calls the receiver once with all the instances
+        as ``instanceLst`` instead of once per ``instance``. It only applies
+        to this sender.
     """
     from theory.conf import settings
 
@@ -126,11 +132,11 @@ class Signal(object):
 
     with self.lock:
       self._clearDeadReceivers()
-      for rKey, _ in self.receivers:
+      for rKey, _, _ in self.receivers:
         if rKey == lookupKey:
           break
       else:
-        self.receivers.append((lookupKey, receiver))
+        self.receivers.append((lookupKey, receiver, isBatch))
       self.senderReceiversCache.clear()
 
   def disconnect(self, receiver=None, sender=None, weak=True, dispatchUid=None):
@@ -163,7 +169,7 @@ class Signal(object):
     with self.lock:
       self._clearDeadReceivers()
       for index in xrange(len(self.receivers)):
-        (rKey, _) = self.receivers[index]
+        (rKey, _, _) = self.receivers[index]
         if rKey == lookupKey:
           del self.receivers[index]
           break
@@ -172,6 +178,15 @@ class Signal(object):
   def hasListeners(self, sender=None):
     return bool(self._liveReceivers(sender))
 
+  def hasNoReceivers(self, sender):
+    """
+    Cheap check of whether sending from sender is surely a no-op, without
+    resolving the receivers. Once a sender has been found without any
+    receiver, it costs a dict lookup if the signal uses caching.
+    """
+    return (not self.receivers
+        or self.senderReceiversCache.get(sender) is NO_RECEIVERS)
+
   def send(self, sender, **named):
     """
     Send signal from sender to all connected receivers.
@@ -191,7 +206,7 @@ class Signal(object):
     Returns a list of tuple pairs [(receiver, response), ... ].
     """
     responses = []
-    if not self.receivers or self.senderReceiversCache.get(sender) is NO_RECEIVERS:
+    if self.hasNoReceivers(sender):
       return responses
 
     for receiver in self._liveReceivers(sender):
@@ -199,6 +214,44 @@ class Signal(object):
       responses.append((receiver, response))
     return responses
 
+  def sendBatch(self, sender, instanceLst, isBatchOnly=False, **named):
+    """
+    Send signal from sender for many instances at once, e.x: from the bulk
+    operations of the ORM.
+
+    The receivers connected with isBatch are called once with the list of
+    instances as ``instanceLst``. The other receivers are called once per
+    instance as ``instance``, like by send(), unless isBatchOnly which is
+    used by the operations never sending the signal per instance.
+
+    Returns a list of tuple pairs [(receiver, response), ... ], one per
+    call.
+    """
+    responses = []
+    if not instanceLst or self.hasNoReceivers(sender):
+      return responses
+
+    batchReceivers = []
+    receivers = []
+    for (receiver, isBatch) in self._liveReceivers(sender, isWithBatch=True):
+      if isBatch:
+        batchReceivers.append(receiver)
+      elif not isBatchOnly:
+        receivers.append(receiver)
+    if receivers:
+      for instance in instanceLst:
+        for receiver in receivers:
+          response = receiver(
+            signal=self, sender=sender, instance=instance, **named
+          )
+          responses.append((receiver, response))
+    for receiver in batchReceivers:
+      response = receiver(
+        signal=self, sender=sender, instanceLst=instanceLst, **named
+      )
+      responses.append((receiver, response))
+    return responses
+
   def sendRobust(self, sender, **named):
     """
     Send signal from sender to all connected receivers catching errors.
@@ -224,7 +277,7 @@ class Signal(object):
     ``__traceback__``.
     """
     responses = []
-    if not self.receivers or self.senderReceiversCache.get(sender) is NO_RECEIVERS:
+    if self.hasNoReceivers(sender):
       return responses
 
     # Call each receiver with whatever arguments it can accept.
@@ -251,12 +304,12 @@ class Signal(object):
         newReceivers.append(r)
       self.receivers = newReceivers
 
-  def _liveReceivers(self, sender):
+  def _liveReceivers(self, sender, isWithBatch=False):
     """
     Filter sequence of receivers to get resolved, live receivers.
 
     This checks for weak references and resolves them, then returning only
-    live receivers.
+    live receivers. If isWithBatch, (receiver, isBatch) pairs are returned.
     """
     receivers = None
     if self.useCaching and not self._deadReceivers:
@@ -270,9 +323,9 @@ class Signal(object):
         self._clearDeadReceivers()
         senderkey = _makeId(sender)
         receivers = []
-        for (receiverkey, rSenderkey), receiver in self.receivers:
+        for (receiverkey, rSenderkey), receiver, isBatch in self.receivers:
           if rSenderkey == NONE_ID or rSenderkey == senderkey:
-            receivers.append(receiver)
+            receivers.append((receiver, isBatch))
         if self.useCaching:
           if not receivers:
             self.senderReceiversCache[sender] = NO_RECEIVERS
@@ -280,14 +333,13 @@ class Signal(object):
             # Note, we must cache the weakref versions.
             self.senderReceiversCache[sender] = receivers
     nonWeakReceivers = []
-    for receiver in receivers:
+    for (receiver, isBatch) in receivers:
       if isinstance(receiver, weakref.ReferenceType):
         # Dereference the weak reference.
         receiver = receiver()
-        if receiver is not None:
-          nonWeakReceivers.append(receiver)
-      else:
-        nonWeakReceivers.append(receiver)
+        if receiver is None:
+          continue
+      nonWeakReceivers.append((receiver, isBatch) if isWithBatch else receiver)
     return nonWeakReceivers
 
   def _removeReceiver(self, receiver=None):
@@ -20,6 +20,18 @@ from io import BytesIO
 from theory.conf import settings
 from theory.core import validators
 from theory.core.exceptions import ValidationError
+from theory.gui.transformer.idSelection import (
+    ID_RANGE_KEY,
+    compressIdLst,
+    decodeIdLst,
+    decodeQueryset,
+    encodeIdLst,
+    encodeQueryset,
+    isEncodedIdLst,
+    isEncodedQuery,
+    isRangeLstInQueryset,
+    rangeFilterQ,
+    )
 from theory.gui.util import (
     ErrorList,
     fromCurrentTimezone,
@@ -1808,11 +1820,14 @@ class QuerysetField(Field):
     'configInvalid': _('Configuration has been invalid'),
   }
 
-  def __init__(self, autoImport=False, app=None, model=None, *args, **kwargs):
+  def __init__(self, autoImport=False, app=None, model=None,
+      isStoreFilter=False, *args, **kwargs):
     super(QuerysetField, self).__init__(*args, **kwargs)
     self.autoImport = autoImport
     self.app = app
     self.model = model
+    # Store the filter expression of a queryset instead of its ids
+    self.isStoreFilter = isStoreFilter
 
   @property
   def app(self):
@@ -1843,6 +1858,7 @@ class QuerysetField(Field):
 
     Raises ValidationError for any errors.
     """
+    from theory.db.model.query import QuerySet
     self.validate(value)
     self.runValidators(value)
 
@@ -1850,6 +1866,8 @@ class QuerysetField(Field):
       return []
 
     if(not self.autoImport):
+      if(isEncodedIdLst(value)):
+        return decodeIdLst(value)
       return value
 
     try:
@@ -1858,10 +1876,28 @@ class QuerysetField(Field):
         self.model
         )
       )
+      if(isEncodedQuery(value)):
+        return decodeQueryset(dbClass, value)
+      elif(isEncodedIdLst(value)):
+        rangeLst = value[ID_RANGE_KEY]
+        value = dbClass.objects.filter(rangeFilterQ(rangeLst))
+      elif(isinstance(value, QuerySet)):
+        return value
+      else:
+        rangeLst = compressIdLst(
+            [getattr(i, "id", i) for i in value],
+            isDupAllowed=False
+            )
       # We are not actually return the new queryset, instead, we just check if
-      # the id set is in the given queryset
-      if len(value)!=\
-          dbClass.objects.filter(id__in=[i.id for i in value]).count():
+      # the id set is in the given queryset. The ids are checked by ranges in
+      # chunks, so a large selection doesn't end up in a giant IN list.
+      if(rangeLst is None):
+        isValid = len(value)==dbClass.objects.filter(
+            id__in=[getattr(i, "id", i) for i in value]
+            ).count()
+      else:
+        isValid = isRangeLstInQueryset(dbClass.objects.all(), rangeLst)
+      if(not isValid):
         raise ValidationError(
             self.errorMessages['dbInvalid'] % {'value': value}
         )
@@ -1896,7 +1932,17 @@ class QuerysetField(Field):
     return True
 
   def toPython(self, value):
-    return [str(i.id) for i in value]
+    from theory.db.model.query import QuerySet
+    if(isEncodedIdLst(value) or isEncodedQuery(value)):
+      return value
+    elif(isinstance(value, QuerySet)):
+      if(self.isStoreFilter):
+        return encodeQueryset(value)
+      if(hasattr(type(value), "valuesList")):
+        return encodeIdLst(value.valuesList("id", flat=True))
+      # Anything else passing as a QuerySet, e.x: a proxy of a list, is
+      # iterated
+    return encodeIdLst([getattr(i, "id", i) for i in value])
 
   def renderWidget(self, *args, **kwargs):
     if("attrs" not in kwargs):
@@ -315,16 +315,7 @@ class FormBase(object):
       value = field.finalData
       #value = field.widget.valueFromDatadict(self.data, self.files, self.addPrefix(name))
       try:
-        isEmptyForgiven = True if name in self.emptyForgivenLst else False
-        if isinstance(field, FormField.FileField):
-          initData = self.initData.get(name, field.initData)
-          value = field.clean(value, initData, isEmptyForgiven)
-        else:
-          value = field.clean(value, isEmptyForgiven)
-        self.cleanedData[name] = value
-        if hasattr(self, 'clean_%s' % name):
-          value = getattr(self, 'clean_%s' % name)()
-          self.cleanedData[name] = value
+        self._cleanField(name, field, value)
       except ValidationError as e:
         if(self.isLazy):
           field.finalData = None
@@ -332,6 +323,38 @@ class FormBase(object):
         if name in self.cleanedData:
           del self.cleanedData[name]
 
+  def _cleanField(self, name, field, value):
+    isEmptyForgiven = True if name in self.emptyForgivenLst else False
+    if isinstance(field, FormField.FileField):
+      initData = self.initData.get(name, field.initData)
+      value = field.clean(value, initData, isEmptyForgiven)
+    else:
+      value = field.clean(value, isEmptyForgiven)
+    self.cleanedData[name] = value
+    if hasattr(self, 'clean_%s' % name):
+      value = getattr(self, 'clean_%s' % name)()
+      self.cleanedData[name] = value
+
+  def cleanPartial(self, valueDict):
+    """
+    Return a copy of this cleaned form in which the fields of valueDict are
+    cleaned with those values. The fields and the whole form are cleaned
+    the way fullClean() does, but the other fields are not cleaned again
+    and the fields are shared with this form, so they are left untouched.
+    """
+    form = copy.copy(self)
+    form._errors = {}
+    form.jsonData = None
+    form.cleanedData = dict(self.cleanedData)
+    for (name, value) in valueDict.items():
+      try:
+        form._cleanField(name, self.fields[name], value)
+      except ValidationError as e:
+        form.addError(name, e)
+    form._cleanForm()
+    form._postClean()
+    return form
+
   def _cleanForm(self):
     try:
       cleanedData = self.clean()
@@ -3,6 +3,7 @@
 
 ##### System wide lib #####
 from collections import OrderedDict
+import copy
 
 ##### Theory lib #####
 from theory.conf import settings
@@ -26,6 +27,9 @@ from element import Button
 __all__ = ("Form", "CommandForm", "SimpleGuiForm", "FlexibleGuiForm")
 
 class GuiFormBase(BasePacker):
+  # Whether the rendered containers are packed into self.bx
+  isAttached = False
+
   def _preFillFieldProperty(self):
     """It is used to prefill fields which depends on the fields'
     value. It will only be called in the __init__() and when the form
@@ -70,12 +74,55 @@ class GuiFormBase(BasePacker):
     # other field's initData
     self._preFillFieldProperty()
 
+  def recycleForm(self, initDataAsDict):
+    """Rebind a rendered form to another set of data. Fields missing in the
+    initDataAsDict go back to their default, so nothing is left from the
+    previous use of the form.
+    """
+    dataDict = dict(
+        (fieldName, copy.deepcopy(field.initData))
+        for fieldName, field in self.baseFields.iteritems()
+        )
+    dataDict.update(initDataAsDict)
+    if(self._errors):
+      for fieldName in self._errors:
+        try:
+          self.fields[fieldName].widget.resetLabel()
+        except KeyError:
+          pass
+    self._errors = None
+    self.jsonData = None
+    self.reFillInitData(dataDict)
+
+  def _getFormContainerLst(self):
+    return []
+
+  def detachForm(self):
+    """Unpack the rendered form without deleting its widgets, so it can be
+    packed again by attachForm()."""
+    for container in self._getFormContainerLst():
+      self.bx.unpack(container.obj)
+      container.obj.hide()
+    self.isAttached = False
+
+  def attachForm(self):
+    for container in self._getFormContainerLst():
+      self.bx.pack_end(container.obj)
+      container.obj.show()
+    self.isAttached = True
+
+  def destroyForm(self):
+    for container in self._getFormContainerLst():
+      container.obj.delete()
+    self.isAttached = False
+
   def generateForm(self, win, bx, unFocusFxn):
     pass
 
   def _createFormSkeleton(self, win, bx):
     self.win = win
     self.bx = bx
+    self.isAttached = True
 
 class FlexibleGuiFormBase(GuiFormBase):
   def __init__(self, *args, **kwargs):
@@ -207,6 +254,20 @@ class SimpleGuiFormBase(GuiFormBase):
     self.formBx.bx = self.bx
     self.formBx.generate()
 
+  def _getFormContainerLst(self):
+    if(hasattr(self, "formBx")):
+      return [self.formBx]
+    return []
+
+  def recycleForm(self, initDataAsDict):
+    super(SimpleGuiFormBase, self).recycleForm(initDataAsDict)
+    if(hasattr(self, "optionalMenu")):
+      self.optionalMenu.resetFilter()
+
+  def attachForm(self):
+    super(SimpleGuiFormBase, self).attachForm()
+    self._changeFormWindowHeight(self.formMaxHeight)
+
   def generateForm(self, win, bx, unFocusFxn, **kwargs):
     self.unFocusFxn = unFocusFxn
     self._createFormSkeleton(win, bx)
@@ -228,7 +289,8 @@ class SimpleGuiFormBase(GuiFormBase):
         self.formBx.addInput(field.widget)
 
     self.formBx.postGenerate()
-    self._changeFormWindowHeight(settings.dimensionHints["maxHeight"] - 200)
+    self.formMaxHeight = settings.dimensionHints["maxHeight"] - 200
+    self._changeFormWindowHeight(self.formMaxHeight)
 
   def generateFilterForm(self, win, bx, unFocusFxn, **kwargs):
     self.unFocusFxn = unFocusFxn
@@ -267,7 +329,8 @@ class SimpleGuiFormBase(GuiFormBase):
     self.formBx.postGenerate()
     optionalMenu.generate()
     optionalMenu.postGenerate()
-    self._changeFormWindowHeight(settings.dimensionHints["maxHeight"])
+    self.formMaxHeight = settings.dimensionHints["maxHeight"]
+    self._changeFormWindowHeight(self.formMaxHeight)
 
   def showErrInFieldLabel(self):
     for fieldName, errMsg in self.errors.iteritems():
@@ -277,6 +340,12 @@ class StepFormBase(SimpleGuiFormBase):
   def _nextBtnClick(self):
     pass
 
+  def _getFormContainerLst(self):
+    containerLst = super(StepFormBase, self)._getFormContainerLst()
+    if(hasattr(self, "stepControlBox")):
+      containerLst.append(self.stepControlBox)
+    return containerLst
+
   def generateStepControl(self, *args, **kwargs):
     self.stepControlBox = self._createContainer({"isHorizontal": True, "isWeightExpand": False})
     self.stepControlBox.bx = self.bx
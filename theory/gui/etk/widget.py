@@ -6,6 +6,14 @@ import copy
 import os
 
 ##### Theory lib #####
+from theory.gui.transformer.idSelection import (
+    decodeIdLst,
+    encodeIdLst,
+    isEncodedIdLst,
+    isEncodedQuery,
+    selectionToTxt,
+    txtToSelection,
+    )
 from theory.gui.util import LocalFileObject
 from theory.utils import datetimeSafe, formats
 from theory.utils.importlib import importClass
@@ -213,6 +221,11 @@ class BaseLabelInput(BaseFieldInput):
     helpLabel = self.widgetLst[-1]
     helpLabel.reset(errData=txt)
 
+  def resetLabel(self):
+    """Show the help text again after reFillLabel()"""
+    helpLabel = self.widgetLst[-1]
+    helpLabel.reset(finalData=helpLabel.attrs["initData"])
+
 class HiddenInput(BaseLabelInput):
   def generate(self, *args, **kwargs):
     pass
@@ -946,6 +959,9 @@ class DictInput(ListInput):
       valueInputBox.reset(**row)
 
 class QueryIdInput(StringInput):
+  # Shown instead of the ids when the selection is a stored filter expression
+  storedFilterTxt = "(stored filter)"
+
   def __init__(
       self,
       fieldSetter,
@@ -982,22 +998,27 @@ class QueryIdInput(StringInput):
     if initData is None or len(initData)==0:
       self.finalData = ""
       return ""
-    s = ""
-    for i in initData:
-      s += str(i) + ","
-    self.finalData = s[:-1]
+    if isEncodedQuery(initData):
+      self.finalData = self.storedFilterTxt
+      return self.finalData
+    if type(initData).__name__=="QuerySet":
+      initData = encodeIdLst(initData.valuesList("pk", flat=True))
+    elif not isEncodedIdLst(initData):
+      initData = [getattr(i, "id", i) for i in initData]
+    self.finalData = selectionToTxt(initData)
     return self.finalData
 
+  def _getIdLst(self):
+    if self.finalData in ("", self.storedFilterTxt):
+      return []
+    return decodeIdLst(txtToSelection(self.finalData))
+
   def refreshData(self, idLst):
     entryWidget = self.widgetLst[0].widgetChildrenLst[0]
 
     # We should differentiate by isMultiple in here or in the actual
     # selection widget for better UI experience.
-    finalData = ""
-    for id in idLst:
-      finalData += "," + str(id)
-
-    self.finalData = finalData[1:]
+    self.finalData = selectionToTxt(encodeIdLst(idLst))
     entryWidget.finalData = self.finalData
 
   def _createInstanceCallback(self, btn, dummy):
@@ -1011,7 +1032,7 @@ class QueryIdInput(StringInput):
         {"isInNewWindow": True,},
         )
     cmd.postApplyChange = lambda: self.refreshData(
-        self.finalData.split(",") + [cmd.modelForm.instance.id,]
+        self._getIdLst() + [cmd.modelForm.instance.id,]
         )
     bridge._executeCommand(cmd, cmdModel)
 
@@ -1024,8 +1045,7 @@ class QueryIdInput(StringInput):
     kwargs = {
         "appName": self.app,
         "modelName": self.model,
-        "queryset": \
-            self.finalData.split(",") if self.finalData != "" else []
+        "queryset": self._getIdLst(),
         }
     cmd = bridge.getCmdComplex(
         cmdModel,
@@ -1077,9 +1097,13 @@ class QueryIdInput(StringInput):
   def updateField(self):
     try:
       entryWidget = self.widgetLst[0].widgetChildrenLst[0]
-      if entryWidget.finalData != "":
+      if entryWidget.finalData == self.storedFilterTxt:
+        # The stored filter expression is untouched
+        queryset = self.rawInitData
+      elif entryWidget.finalData != "":
         if self.attrs["isMultiple"]:
-          queryset = [int(i) for i in entryWidget.finalData.split(",")]
+          # "1-100,205" is given as id ranges
+          queryset = txtToSelection(entryWidget.finalData)
         else:
           # For ModelChoiceField, we want to receive as int not list
           queryset = int(entryWidget.finalData.split(",")[0])
@@ -1120,6 +1144,12 @@ class FilterFormLayout(BasePacker):
       if(name.startswith(requestFieldNamePrefix.lower())):
         input.mainContainer.show()
 
+  def resetFilter(self):
+    """Show every input again, used when the form is recycled"""
+    self.filterEntryBox.widgetChildrenLst[1].obj.entry_set("")
+    for (name, input) in self.inputLst:
+      input.mainContainer.show()
+
   def setFocusOnFilterEntry(self):
     # The first widget must be label and the second one will be the entry box
     self.filterEntryBox.widgetChildrenLst[1].setFocus()
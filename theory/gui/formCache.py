@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+##### System wide lib #####
+from collections import OrderedDict
+
+##### Theory lib #####
+from theory.conf import settings
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ("ParamFormCache",)
+
+class ParamFormCache(object):
+  """
+  Keeps the rendered param form of the latest commands, one per command
+  class, so reopening a form only rebinds its data instead of rebuilding
+  every widget. The least recently used form is dropped once the cache is
+  full and evictFxn is called to release its widgets. The time spent on
+  building or recycling the forms is recorded for comparison.
+  """
+  def __init__(self, maxSize=None, evictFxn=None):
+    if(maxSize is None):
+      maxSize = settings.UI_PARAM_FORM_CACHE_SIZE
+    self.maxSize = maxSize
+    self.evictFxn = evictFxn
+    self._formDict = OrderedDict()
+    self.hitNum = 0
+    self.missNum = 0
+    self.hitTime = 0.0
+    self.missTime = 0.0
+
+  def __len__(self):
+    return len(self._formDict)
+
+  def __contains__(self, key):
+    return key in self._formDict
+
+  def keys(self):
+    return self._formDict.keys()
+
+  def isCached(self, form):
+    return any(i is form for i in self._formDict.itervalues())
+
+  def get(self, key):
+    try:
+      form = self._formDict.pop(key)
+    except KeyError:
+      return None
+    # Move it to the end as the most recently used one
+    self._formDict[key] = form
+    return form
+
+  def add(self, key, form):
+    if(self.maxSize <= 0):
+      return
+    self.discard(key)
+    self._formDict[key] = form
+    while(len(self._formDict) > self.maxSize):
+      (oldKey, oldForm) = self._formDict.popitem(last=False)
+      self._evict(oldForm)
+
+  def pop(self, key):
+    """Remove the form without releasing its widgets, the caller owns it."""
+    return self._formDict.pop(key, None)
+
+  def discard(self, key):
+    form = self._formDict.pop(key, None)
+    if(form is not None):
+      self._evict(form)
+
+  def clear(self):
+    while(self._formDict):
+      (key, form) = self._formDict.popitem(last=False)
+      self._evict(form)
+
+  def _evict(self, form):
+    if(self.evictFxn is not None):
+      self.evictFxn(form)
+
+  def recordLatency(self, isHit, elapsed):
+    if(isHit):
+      self.hitNum += 1
+      self.hitTime += elapsed
+    else:
+      self.missNum += 1
+      self.missTime += elapsed
+
+  def stats(self):
+    return {
+        "size": len(self._formDict),
+        "maxSize": self.maxSize,
+        "hitNum": self.hitNum,
+        "missNum": self.missNum,
+        "avgHitTime": self.hitTime / self.hitNum if self.hitNum else 0.0,
+        "avgMissTime": self.missTime / self.missNum if self.missNum else 0.0,
+        }
@@ -5,7 +5,7 @@ from collections import OrderedDict
 import gevent
 
 ##### Theory lib #####
-from theory.apps.model import AppModel
+from theory.core.modelCatalog import modelCatalog
 from theory.gui.transformer import TheoryModelBSONTblDataHandler
 
 ##### Theory third-party lib #####
@@ -306,7 +306,7 @@ class SpreadsheetBuilder(TheoryModelBSONTblDataHandler):
       self.isEditable = isEditable
       self.appConfigModel = appConfigModel
       super(SpreadsheetBuilder, self).run(
-          appConfigModel.fieldParamMap.filter(parent__isnull=True)
+          modelCatalog.get(appConfigModel).rootFieldParamLst
           )
     else:
       self.modelKlassName = "Unknown model"
@@ -361,17 +361,17 @@ class SpreadsheetBuilder(TheoryModelBSONTblDataHandler):
       # or may be for one to one?
       queryset = [queryset] if(queryset is not None) else []
 
-    buf = self.appConfigModel.fieldParamMap.filter(
-        parent__name=self.modelFieldnameMap[colIdx]
+    buf = modelCatalog.get(self.appConfigModel).getChildParamLst(
+        self.modelFieldnameMap[colIdx]
         )
     for i in buf:
       if i.name == "foreignApp":
-        appName = buf[0].data
+        appName = i.data
       elif i.name == "foreignModel":
-        modelName = buf[1].data
+        modelName = i.data
 
     print appName, modelName
-    appConfigModel = AppModel.objects.get(app=appName, name=modelName)
+    appConfigModel = modelCatalog.getByName(appName, modelName).appModel
     clone = SpreadsheetBuilder()
     # We don't assume modifying the stack data is possible, so we can
     # treat the pre-selected item list as empty
@@ -13,6 +13,18 @@ from theory.core.exceptions import (
 from theory.gui.field import Field, QuerysetField
 from theory.gui.common.baseForm import DeclarativeFieldsMetaclass, FormBase
 from theory.gui.formset import BaseFormSet, formsetFactory
+from theory.gui.transformer.idSelection import (
+    ID_RANGE_KEY,
+    chunkRangeLst,
+    compressIdLst,
+    decodeQueryset,
+    encodeQueryset,
+    expandRangeLst,
+    isEncodedIdLst,
+    isEncodedQuery,
+    isRangeLstInQueryset,
+    rangeFilterQ,
+    )
 from theory.gui.util import ErrorList
 from theory.gui.widget import (
     QueryIdInput,
@@ -1238,19 +1250,56 @@ class ModelMultipleChoiceField(ModelChoiceField):
     'invalidPkValue': _('"%(pk)s" is not a valid value for a primary key.')
   }
 
+  _intPkTypeTuple = (
+    "AutoField", "IntegerField", "BigIntegerField", "SmallIntegerField",
+    "PositiveIntegerField", "PositiveSmallIntegerField",
+  )
+
   def __init__(self, queryset, cacheChoices=None, required=True,
          widget=None, label=None, initData=None,
-         helpText='', *args, **kwargs):
+         helpText='', isStoreFilter=False, *args, **kwargs):
     super(ModelMultipleChoiceField, self).__init__(queryset,
       cacheChoices, required, widget, label, initData, helpText,
       *args, **kwargs)
+    # Store the filter expression of the selection instead of its ids
+    self.isStoreFilter = isStoreFilter
 
   def toPython(self, value):
     if not value:
       return []
+    elif isEncodedIdLst(value) or isEncodedQuery(value):
+      return value
+    elif type(value).__name__=="QuerySet":
+      # It has been cleaned already. TheoryJSONEncoder stores it as id ranges
+      if self.isStoreFilter:
+        return encodeQueryset(value)
+      return value
     toPy = super(ModelMultipleChoiceField, self).toPython
     return [toPy(val) for val in value]
 
+  def _isRangeSelectable(self):
+    return (self.toFieldName is None
+        and self.queryset.modal._meta.pk.getInternalType()
+        in self._intPkTypeTuple)
+
+  def _cleanRangeLst(self, rangeLst, value):
+    """Check the ranges chunk by chunk instead of building an IN list with
+    every id."""
+    if not isRangeLstInQueryset(self.queryset, rangeLst):
+      # Only look for the invalid id once the selection is known invalid
+      for chunk in chunkRangeLst(rangeLst):
+        pks = set(self.queryset.filter(rangeFilterQ(chunk))
+            .valuesList('pk', flat=True))
+        for pk in expandRangeLst(chunk):
+          if pk not in pks:
+            raise ValidationError(
+              self.errorMessages['invalidChoice'],
+              code='invalidChoice',
+              params={'value': pk},
+            )
+    self.runValidators(value)
+    return self.queryset.filter(rangeFilterQ(rangeLst))
+
   def clean(self, value, isEmptyForgiven=False):
     if self.required and not value:
       raise ValidationError(self.errorMessages['required'], code='required')
@@ -1258,8 +1307,21 @@ class ModelMultipleChoiceField(ModelChoiceField):
       return self.queryset.none()
     elif type(value).__name__=="QuerySet":
       return value
+    elif isEncodedQuery(value):
+      try:
+        queryset = decodeQueryset(self.queryset.modal, value)
+      except Exception:
+        raise ValidationError(self.errorMessages['list'], code='list')
+      self.runValidators(value)
+      return self.queryset & queryset
+    elif isEncodedIdLst(value):
+      return self._cleanRangeLst(value[ID_RANGE_KEY], value)
     if not isinstance(value, (list, tuple)):
       raise ValidationError(self.errorMessages['list'], code='list')
+    if self._isRangeSelectable():
+      rangeLst = compressIdLst(value)
+      if rangeLst is not None:
+        return self._cleanRangeLst(rangeLst, value)
     key = self.toFieldName or 'pk'
     for pk in value:
       try:
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+##### System wide lib #####
+from collections import deque
+from itertools import chain, islice
+
+##### Theory lib #####
+from theory.conf import settings
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = ("Scrollback",)
+
+class Scrollback(object):
+  """
+  The output shown by the terminal, kept as a bounded ring buffer of lines.
+  Chunks can be appended while a command is running. The number of lines is
+  maintained on append, so neither the height of the output nor the visible
+  window needs a scan of the whole text. The window can be scrolled back,
+  it then stays on the same lines while more output is appended.
+  """
+  def __init__(self, maxLineNum=None, lineBreak="\n"):
+    if(maxLineNum is None):
+      maxLineNum = settings.UI_SCROLLBACK_LINE_NUM
+    self.lineBreak = lineBreak
+    self._lineLst = deque(maxlen=maxLineNum)
+    # The text after the last line break
+    self._partialLine = ""
+    self.droppedLineNum = 0
+    # How many lines the window is scrolled back from the last line
+    self.offset = 0
+    # Bumped on every change, so a renderer can skip an unchanged buffer
+    self.version = 0
+
+  @property
+  def maxLineNum(self):
+    return self._lineLst.maxlen
+
+  @property
+  def lineNum(self):
+    return len(self._lineLst) + (1 if self._partialLine else 0)
+
+  def append(self, chunk):
+    if(not chunk):
+      return
+    oldTotalLineNum = self.droppedLineNum + self.lineNum
+    lineLst = chunk.split(self.lineBreak)
+    if(len(lineLst)==1):
+      self._partialLine += chunk
+    else:
+      lineLst[0] = self._partialLine + lineLst[0]
+      self._partialLine = lineLst.pop()
+      overflowNum = len(self._lineLst) + len(lineLst) - self.maxLineNum
+      if(overflowNum > 0):
+        self.droppedLineNum += overflowNum
+      self._lineLst.extend(lineLst)
+    if(self.offset):
+      self.offset = min(
+          self.offset + self.droppedLineNum + self.lineNum - oldTotalLineNum,
+          self.lineNum - 1
+          )
+    self.version += 1
+
+  def clear(self):
+    self._lineLst.clear()
+    self._partialLine = ""
+    self.droppedLineNum = 0
+    self.offset = 0
+    self.version += 1
+
+  def scroll(self, lineNum, height):
+    """
+    Scroll the window of height lines back by lineNum lines, or forward if
+    lineNum is negative. Return whether the window has moved.
+    """
+    offset = min(max(self.offset + lineNum, 0), max(self.lineNum - height, 0))
+    if(offset==self.offset):
+      return False
+    self.offset = offset
+    self.version += 1
+    return True
+
+  def getWindow(self, height, offset=None):
+    """
+    Return the list of height lines ending offset lines above the last one,
+    the scroll offset by default. Only the lines being returned and skipped
+    are visited.
+    """
+    if(offset is None):
+      offset = self.offset
+    if(self._partialLine):
+      reversedLineLst = chain((self._partialLine,), reversed(self._lineLst))
+    else:
+      reversedLineLst = reversed(self._lineLst)
+    window = list(islice(reversedLineLst, offset, offset + height))
+    window.reverse()
+    return window
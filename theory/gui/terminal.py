@@ -8,6 +8,8 @@ import signal
 
 ##### Theory lib #####
 from theory.conf import settings
+from theory.gui.scrollback import Scrollback
+from theory.utils.html import escape
 
 ##### Theory third-party lib #####
 
@@ -43,6 +45,8 @@ def my_entry_anchor_test(obj, en, *args, **kwargs):
 class Terminal(object):
   lb = None
   crlf = "<br/>"
+  # The delay in second to coalesce the output chunks into one rendering
+  renderInterval = 0.05
 
   @property
   def adapter(self):
@@ -58,6 +62,7 @@ class Terminal(object):
         ("bx", self.bxCrt),
         ("unFocusFxn", self.unFocusFxn),
         ("cleanUpCrtFxn", self.cleanUpCrt),
+        ("stdOutAppenderFxn", self.appendStdOut),
     ])
     self._adapter.registerEntrySetterFxn(self._cmdLineEntry.entry_set)
     self._adapter.registerEntrySetAndSelectFxn(self.cmdLineSetter)
@@ -76,31 +81,97 @@ class Terminal(object):
   # keep the *args. It might be called from toolkits which pass widget as param
   def cleanUpCrt(self, *args, **kwargs):
     """To reset to original form."""
-    self.bxCrt.clear()
+    self._clearCrt()
+    # The output label has been deleted with the content of bxCrt
+    self._stdOutLb = None
+    self.scrollback.clear()
     self.win.resize(self.initCrtSize[0], self.initCrtSize[1])
     self._cmdLineEntry.focus_set(True)
 
+  def registerPreCleanUpCrtFxn(self, fxn):
+    """The fxn is called before the content of the crt being deleted, so it
+    can take out the widgets which it wants to keep."""
+    self._preCleanUpCrtFxnLst.append(fxn)
+
+  def _clearCrt(self):
+    for fxn in self._preCleanUpCrtFxnLst:
+      fxn()
+    self.bxCrt.clear()
+
   def stdOutAdjuster(self, txt, crlf=None):
     if crlf is None:
-      window = len(self.crlf)
-      length = len(txt) - window
-      counter = 0
-      for i in range(length):
-        if txt[i:i+window] == self.crlf:
-          counter += 1
-      height = counter * settings.UI_FONT_HEIGHT_RATIO + 130
-    else:
-      height = txt.count(crlf) * settings.UI_FONT_HEIGHT_RATIO + 130
+      crlf = self.crlf
+    self._adjustCrtHeight(txt.count(crlf))
+
+  def _adjustCrtHeight(self, lineNum):
+    height = lineNum * settings.UI_FONT_HEIGHT_RATIO + 130
     if height > self.maxHeight:
       height = self.maxHeight
     self.win.resize(self.initCrtSize[0], height)
 
+  @property
+  def visibleLineNum(self):
+    return max((self.maxHeight - 130) // settings.UI_FONT_HEIGHT_RATIO, 1)
+
+  def appendStdOut(self, chunk, lineBreak="\n", isReset=False):
+    """
+    Append a chunk of plain text output. It can be called many times while a
+    command is running, the chunks appended within renderInterval are
+    rendered at once and only the visible lines are rendered.
+    """
+    if(isReset):
+      self._clearCrt()
+      self._stdOutLb = None
+      self.scrollback.clear()
+    if(lineBreak!=self.scrollback.lineBreak):
+      chunk = chunk.replace(lineBreak, self.scrollback.lineBreak)
+    self.scrollback.append(chunk)
+    if(not self._isRenderScheduled):
+      self._isRenderScheduled = True
+      ecore.timer_add(self.renderInterval, self._renderScrollback)
+
+  def scrollStdOut(self, lineNum):
+    """
+    Scroll the output back by lineNum lines, or forward if lineNum is
+    negative, and render the lines scrolled to.
+    """
+    if(self.scrollback.scroll(lineNum, self.visibleLineNum)):
+      self._renderScrollback()
+
+  def _onStdOutMouseWheel(self, obj, event, *args, **kwargs):
+    # A positive z is a scroll down
+    self.scrollStdOut(-event.z * settings.UI_SCROLL_LINE_NUM)
+
+  def _renderScrollback(self):
+    self._isRenderScheduled = False
+    if(self._renderedVersion==self.scrollback.version):
+      return False
+    self._renderedVersion = self.scrollback.version
+
+    if(self._stdOutLb is None):
+      self._stdOutLb = elementary.Label(self.win)
+      self._stdOutLb.size_hint_weight_set(evas.EVAS_HINT_EXPAND, 0.0)
+      self._stdOutLb.size_hint_align_set(evas.EVAS_HINT_FILL, 0.0)
+      self.bxCrt.pack_end(self._stdOutLb)
+      self._stdOutLb.show()
+
+    lineLst = self.scrollback.getWindow(self.visibleLineNum)
+    self._stdOutLb.text_set(self.crlf.join([escape(i) for i in lineLst]))
+    self._adjustCrtHeight(len(lineLst))
+    # Don't repeat the ecore timer
+    return False
+
   def _getDimensionHints(self):
     self.initCrtSize = (settings.dimensionHints["minWidth"] * 3 / 4, 30)
     settings.initCrtSize = self.initCrtSize
     self.maxHeight = settings.dimensionHints["maxHeight"]
 
   def __init__(self):
+    self.scrollback = Scrollback()
+    self._stdOutLb = None
+    self._isRenderScheduled = False
+    self._renderedVersion = None
+    self._preCleanUpCrtFxnLst = []
     elementary.init()
     self.win = elementary.Window("theory", elementary.ELM_WIN_BASIC)
     self.win.autodel = True
@@ -173,6 +244,10 @@ class Terminal(object):
       self.adapter.showPreviousCmdRequest()
     elif(event.keyname=="Down"):
       self.adapter.showNextCmdRequest()
+    elif(event.keyname=="Prior"):
+      self.scrollStdOut(self.visibleLineNum)
+    elif(event.keyname=="Next"):
+      self.scrollStdOut(-self.visibleLineNum)
     elif(event.keyname=="Escape"):
       self.adapter.escapeRequest()
     elif(
@@ -256,6 +331,8 @@ class Terminal(object):
     sc.size_hint_weight = (evas.EVAS_HINT_EXPAND, evas.EVAS_HINT_EXPAND)
     self.bx.pack_end(sc)
     sc.show()
+    # Only the visible lines are rendered, so the wheel scrolls the scrollback
+    sc.on_mouse_wheel_add(self._onStdOutMouseWheel)
 
     self.bxCrt = elementary.Box(self.win)
     self.bxCrt.size_hint_weight_set(evas.EVAS_HINT_EXPAND, evas.EVAS_HINT_EXPAND)
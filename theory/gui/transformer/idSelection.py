@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+##### System wide lib #####
+import base64
+from itertools import groupby
+import pickle
+
+##### Theory lib #####
+from theory.utils.crypto import constantTimeCompare, saltedHmac
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = (
+    "ID_RANGE_KEY", "QUERY_KEY", "compressIdLst", "mergeRangeLst",
+    "expandRangeLst", "encodeIdLst", "decodeIdLst", "isEncodedIdLst",
+    "isEncodedQuery", "encodeQueryset", "decodeQueryset", "rangeFilterQ",
+    "chunkRangeLst", "isRangeLstInQueryset", "selectionToTxt",
+    "txtToSelection",
+    )
+
+# The selection of ids is stored as {ID_RANGE_KEY: [[start, end], ...]} and
+# a stored filter expression as {QUERY_KEY: ..., "model": ...} in the json
+# of History and AdapterBuffer. A plain list of ids is still accepted.
+ID_RANGE_KEY = "idRange"
+QUERY_KEY = "query"
+
+# How many ranges are checked in one query when validating a selection
+RANGE_CHUNK_SIZE = 500
+
+_QUERY_SALT = "theory.gui.transformer.idSelection"
+
+def compressIdLst(idLst, isDupAllowed=True):
+  """Turn the ids into a sorted list of [start, end] ranges, both ends are
+  inclusive. Return None if any of the ids is not an integer, or if an id is
+  repeated and isDupAllowed is False since the ranges can't keep it."""
+  try:
+    intIdLst = [int(i) for i in idLst]
+  except (TypeError, ValueError):
+    return None
+  idLst = sorted(set(intIdLst))
+  if(not isDupAllowed and len(idLst)!=len(intIdLst)):
+    return None
+  # The consecutive ids share the same difference with their index
+  return [
+      [group[0][1], group[-1][1]]
+      for group in (
+        list(g) for k, g in groupby(enumerate(idLst), lambda x: x[1] - x[0])
+        )
+      ]
+
+def mergeRangeLst(rangeLst):
+  """Sort the ranges and merge the overlapping or adjacent ones"""
+  mergedLst = []
+  for (start, end) in sorted(rangeLst):
+    if(mergedLst and start <= mergedLst[-1][1] + 1):
+      mergedLst[-1][1] = max(mergedLst[-1][1], end)
+    else:
+      mergedLst.append([start, end])
+  return mergedLst
+
+def expandRangeLst(rangeLst):
+  for (start, end) in rangeLst:
+    for i in xrange(start, end + 1):
+      yield i
+
+def isEncodedIdLst(data):
+  return isinstance(data, dict) and ID_RANGE_KEY in data
+
+def isEncodedQuery(data):
+  return isinstance(data, dict) and QUERY_KEY in data
+
+def encodeIdLst(idLst):
+  """Encode the ids as ranges. Ids which are not integer or repeated are
+  kept as a list of string like before."""
+  idLst = list(idLst)
+  rangeLst = compressIdLst(idLst, isDupAllowed=False)
+  if(rangeLst is None):
+    return [str(i) for i in idLst]
+  return {ID_RANGE_KEY: rangeLst}
+
+def decodeIdLst(data):
+  """Return the list of ids of an encoded or a plain selection"""
+  if(isEncodedIdLst(data)):
+    return list(expandRangeLst(data[ID_RANGE_KEY]))
+  return list(data)
+
+def selectionToTxt(data):
+  """The text shown in the entry, e.x: "1-100,205" """
+  if(isEncodedIdLst(data)):
+    return ",".join(
+        str(start) if start==end else "{0}-{1}".format(start, end)
+        for (start, end) in data[ID_RANGE_KEY]
+        )
+  return ",".join(str(i) for i in data)
+
+def txtToSelection(txt):
+  """Parse the text of selectionToTxt(). A text without range gives a list
+  of int like before."""
+  rangeLst = []
+  for token in txt.split(","):
+    token = token.strip()
+    if(token==""):
+      continue
+    (start, sep, end) = token.partition("-")
+    rangeLst.append([int(start), int(end) if sep else int(start)])
+  if(all(start==end for (start, end) in rangeLst)):
+    return [start for (start, end) in rangeLst]
+  return {ID_RANGE_KEY: mergeRangeLst(rangeLst)}
+
+def _signQuery(pickledQuery):
+  return saltedHmac(_QUERY_SALT, pickledQuery).hexdigest()
+
+def encodeQueryset(queryset):
+  """Store the filter expression of the queryset instead of its ids. The
+  pickled query is signed, so a tampered history is never unpickled."""
+  pickledQuery = base64.b64encode(pickle.dumps(queryset.query, -1))
+  return {
+      QUERY_KEY: pickledQuery,
+      "model": "{0}.{1}".format(
+        queryset.modal._meta.appLabel,
+        queryset.modal._meta.objectName
+        ),
+      "sign": _signQuery(pickledQuery),
+      }
+
+def decodeQueryset(modal, data):
+  pickledQuery = str(data[QUERY_KEY])
+  sign = str(data.get("sign", ""))
+  if(not constantTimeCompare(sign, _signQuery(pickledQuery))):
+    raise ValueError("The signature of the stored query is invalid")
+  queryset = modal._defaultManager.all()
+  queryset.query = pickle.loads(base64.b64decode(pickledQuery))
+  if(queryset.query.modal is not modal):
+    raise ValueError("The stored query belongs to another model")
+  return queryset
+
+def rangeFilterQ(rangeLst, fieldName="pk"):
+  """Build a Q matching the ranges, with a BETWEEN for each range and an IN
+  for the single ids."""
+  from theory.db.model import Q
+  singleIdLst = []
+  q = Q()
+  for (start, end) in rangeLst:
+    if(start==end):
+      singleIdLst.append(start)
+    else:
+      q |= Q(**{"{0}__range".format(fieldName): (start, end)})
+  if(singleIdLst):
+    q |= Q(**{"{0}__in".format(fieldName): singleIdLst})
+  return q
+
+def chunkRangeLst(rangeLst, chunkSize=RANGE_CHUNK_SIZE):
+  for i in xrange(0, len(rangeLst), chunkSize):
+    yield rangeLst[i:i + chunkSize]
+
+def isRangeLstInQueryset(queryset, rangeLst, fieldName="pk",
+    chunkSize=RANGE_CHUNK_SIZE):
+  """Check if every id of the ranges is in the queryset, with one count()
+  per chunk of ranges instead of an IN list holding every id."""
+  for chunk in chunkRangeLst(rangeLst, chunkSize):
+    expectedNum = sum(end - start + 1 for (start, end) in chunk)
+    if(queryset.filter(rangeFilterQ(chunk, fieldName)).count()!=expectedNum):
+      return False
+  return True
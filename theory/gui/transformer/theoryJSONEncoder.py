@@ -15,6 +15,7 @@ from theory.utils.timezone import isAware
 ##### Theory third-party lib #####
 
 ##### Local app #####
+from .idSelection import encodeIdLst
 
 ##### Theory app #####
 
@@ -46,7 +47,8 @@ class TheoryJSONEncoder(json.JSONEncoder):
     elif(isinstance(o, decimal.Decimal) or isinstance(o, UUID)):
       return str(o)
     elif isinstance(o, QuerySet):
-      return [str(i.id) for i in o]
+      # Large selections are stored as id ranges
+      return encodeIdLst(o.valuesList("pk", flat=True))
     elif type(o).__name__=="LocalFileObject":
       # We don't want to store the data because JSON cannot store binary
       # natively and no storing solution can provide human readibility
@@ -40,12 +40,14 @@ class TheoryModelDetectorBase(object):
         continue
       handlerFxnName = self._typeCatMap[fieldParam.data][0]
       choices = None
+      # It is a tuple if the fieldParam comes from the modelCatalog
+      childParamLst = fieldParam.childParamLst
+      if(hasattr(childParamLst, "all")):
+        childParamLst = childParamLst.all()
       if(handlerFxnName=="listField"):
-        handlerFxnName += self._typeCatMap[
-            fieldParam.childParamLst.first().data
-            ][1]
+        handlerFxnName += self._typeCatMap[childParamLst[0].data][1]
       elif(handlerFxnName=="intField"):
-        for i in fieldParam.childParamLst.all():
+        for i in childParamLst:
           if(i.name=="choices"):
             handlerFxnName = self._typeCatMap["EnumField"][0]
             choices = i.data
@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+##### System wide lib #####
+from collections import OrderedDict
+from contextlib import contextmanager
+import gc
+import json
+import math
+import platform
+import time
+import timeit
+
+try:
+  import resource
+except ImportError:
+  resource = None
+
+##### Theory lib #####
+from theory.conf import settings
+from theory.db import connections
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+__all__ = (
+    "BenchSkipped", "BenchResult", "Benchmark", "BenchReport", "BenchSuite",
+    "benchSuite", "useTestDatabases",
+    )
+
+def _getMemPeak():
+  """The high-water mark of the resident memory of this process in KB"""
+  if(resource is None):
+    return None
+  memPeak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  if(platform.system()=="Darwin"):
+    # It is in bytes on OSX
+    memPeak //= 1024
+  return memPeak
+
+class BenchSkipped(Exception):
+  """Raised by the setUpFxn of a benchmark which cannot run here, e.x: the
+  gui toolkit is missing."""
+
+class BenchResult(object):
+  """
+  The timing of one benchmark. Every item of timeLst is the duration of
+  one repetition divided by the innerLoopNum, in second.
+  """
+  def __init__(
+      self,
+      name,
+      timeLst=None,
+      memPeak=None,
+      memGrowth=None,
+      skipReason=None
+      ):
+    self.name = name
+    self.timeLst = timeLst or []
+    self.memPeak = memPeak
+    self.memGrowth = memGrowth
+    self.skipReason = skipReason
+
+  @property
+  def isSkipped(self):
+    return self.skipReason is not None
+
+  @property
+  def min(self):
+    return min(self.timeLst) if self.timeLst else None
+
+  @property
+  def max(self):
+    return max(self.timeLst) if self.timeLst else None
+
+  @property
+  def mean(self):
+    if(not self.timeLst):
+      return None
+    return sum(self.timeLst) / len(self.timeLst)
+
+  @property
+  def median(self):
+    if(not self.timeLst):
+      return None
+    timeLst = sorted(self.timeLst)
+    (mid, isOdd) = divmod(len(timeLst), 2)
+    if(isOdd):
+      return timeLst[mid]
+    return (timeLst[mid - 1] + timeLst[mid]) / 2.0
+
+  @property
+  def stdev(self):
+    if(len(self.timeLst) < 2):
+      return 0.0
+    mean = self.mean
+    return math.sqrt(
+        sum((i - mean) ** 2 for i in self.timeLst) / (len(self.timeLst) - 1)
+        )
+
+  def toDict(self):
+    return {
+        "name": self.name,
+        "timeLst": self.timeLst,
+        "min": self.min,
+        "median": self.median,
+        "mean": self.mean,
+        "stdev": self.stdev,
+        "memPeak": self.memPeak,
+        "memGrowth": self.memGrowth,
+        "skipReason": self.skipReason,
+        }
+
+  @classmethod
+  def fromDict(cls, data):
+    return cls(
+        data["name"],
+        data.get("timeLst"),
+        data.get("memPeak"),
+        data.get("memGrowth"),
+        data.get("skipReason"),
+        )
+
+class Benchmark(object):
+  """
+  A piece of code being timed. The setUpFxn returns the state which is
+  given to the fxn and the tearDownFxn, its cost is not counted. The fxn is
+  called warmupNum times before being timed repeatNum times, each timing
+  covers innerLoopNum calls to make the short fxn measurable.
+  """
+  def __init__(
+      self,
+      name,
+      fxn,
+      setUpFxn=None,
+      tearDownFxn=None,
+      innerLoopNum=1
+      ):
+    self.name = name
+    self.fxn = fxn
+    self.setUpFxn = setUpFxn
+    self.tearDownFxn = tearDownFxn
+    self.innerLoopNum = innerLoopNum
+
+  def _timeOnce(self, state):
+    fxn = self.fxn
+    start = timeit.default_timer()
+    for i in xrange(self.innerLoopNum):
+      fxn(state)
+    return (timeit.default_timer() - start) / self.innerLoopNum
+
+  def run(self, repeatNum=5, warmupNum=1):
+    try:
+      state = self.setUpFxn() if self.setUpFxn is not None else None
+    except BenchSkipped as e:
+      return BenchResult(self.name, skipReason=str(e) or "skipped")
+
+    try:
+      for i in xrange(warmupNum):
+        self.fxn(state)
+
+      memPeak = _getMemPeak()
+      timeLst = []
+      # Like timeit, the collector would add noise to the timing
+      isGcEnabled = gc.isenabled()
+      gc.disable()
+      try:
+        for i in xrange(repeatNum):
+          timeLst.append(self._timeOnce(state))
+      finally:
+        if(isGcEnabled):
+          gc.enable()
+      memGrowth = None
+      if(memPeak is not None):
+        memGrowth = _getMemPeak() - memPeak
+        memPeak += memGrowth
+    finally:
+      if(self.tearDownFxn is not None):
+        self.tearDownFxn(state)
+    return BenchResult(self.name, timeLst, memPeak, memGrowth)
+
+class BenchReport(object):
+  """The results of a run, which can be stored as json and be compared with
+  the results of another run, usually the baseline of the previous
+  release."""
+  def __init__(self, resultLst=None, meta=None):
+    self.resultLst = resultLst or []
+    if(meta is None):
+      meta = {
+          "created": time.time(),
+          "python": platform.python_version(),
+          "platform": platform.platform(),
+          }
+    self.meta = meta
+
+  def __iter__(self):
+    return iter(self.resultLst)
+
+  def getResult(self, name):
+    for result in self.resultLst:
+      if(result.name==name):
+        return result
+    return None
+
+  def toJson(self):
+    return json.dumps(
+        {
+          "meta": self.meta,
+          "resultLst": [i.toDict() for i in self.resultLst],
+        },
+        indent=2,
+        sort_keys=True,
+        )
+
+  def dump(self, stream):
+    stream.write(self.toJson())
+
+  @classmethod
+  def fromJson(cls, jsonData):
+    data = json.loads(jsonData)
+    return cls(
+        [BenchResult.fromDict(i) for i in data["resultLst"]],
+        data.get("meta", {}),
+        )
+
+  @classmethod
+  def load(cls, stream):
+    return cls.fromJson(stream.read())
+
+  def compare(self, baseline, threshold=0.1):
+    """
+    Compare the median of every benchmark with the one in the baseline.
+    Return a list of (name, baselineMedian, median, ratio, isRegression),
+    the benchmark is regressed if it is slower than the baseline by more
+    than the threshold, e.x: 0.1 for 10%.
+    """
+    comparisonLst = []
+    for result in self.resultLst:
+      baselineResult = baseline.getResult(result.name)
+      if(result.isSkipped
+          or baselineResult is None
+          or baselineResult.isSkipped
+          or not baselineResult.median
+          ):
+        continue
+      ratio = result.median / baselineResult.median
+      comparisonLst.append((
+          result.name,
+          baselineResult.median,
+          result.median,
+          ratio,
+          ratio > 1 + threshold,
+          ))
+    return comparisonLst
+
+  def render(self, comparisonLst=None):
+    lineLst = [
+        "%-32s %6s %12s %12s %12s %10s" % (
+          "benchmark", "runs", "min(ms)", "median(ms)", "stdev(ms)",
+          "mem(KB)"
+        )
+    ]
+    for result in self.resultLst:
+      if(result.isSkipped):
+        lineLst.append("%-32s skipped: %s" % (result.name, result.skipReason))
+        continue
+      lineLst.append("%-32s %6d %12.3f %12.3f %12.3f %10s" % (
+          result.name,
+          len(result.timeLst),
+          result.min * 1000,
+          result.median * 1000,
+          result.stdev * 1000,
+          result.memGrowth if result.memGrowth is not None else "-",
+      ))
+    if(comparisonLst):
+      lineLst.append("")
+      lineLst.append("%-32s %12s %12s %8s" % (
+          "compared with baseline", "before(ms)", "after(ms)", "ratio"
+      ))
+      for (name, baselineMedian, median, ratio, isRegression) \
+          in comparisonLst:
+        lineLst.append("%-32s %12.3f %12.3f %8.2f%s" % (
+            name,
+            baselineMedian * 1000,
+            median * 1000,
+            ratio,
+            " REGRESSION" if isRegression else "",
+        ))
+    return "\n".join(lineLst)
+
+class BenchSuite(object):
+  """
+  A registry of benchmarks. The benchmark names are dotted, e.x:
+  "queryset.iterate", so a label like "queryset" selects a group of them.
+  """
+  def __init__(self):
+    self.benchmarkDict = OrderedDict()
+
+  def __len__(self):
+    return len(self.benchmarkDict)
+
+  def add(self, benchmark):
+    self.benchmarkDict[benchmark.name] = benchmark
+    return benchmark
+
+  def register(self, name, setUpFxn=None, tearDownFxn=None, innerLoopNum=1):
+    """Decorator to add the fxn as a benchmark"""
+    def decorator(fxn):
+      self.add(Benchmark(name, fxn, setUpFxn, tearDownFxn, innerLoopNum))
+      return fxn
+    return decorator
+
+  def select(self, labelLst=None):
+    if(not labelLst):
+      return list(self.benchmarkDict.itervalues())
+    return [
+        benchmark for (name, benchmark) in self.benchmarkDict.iteritems()
+        if any(
+          name==label or name.startswith(label + ".") for label in labelLst
+          )
+        ]
+
+  def run(self, labelLst=None, repeatNum=5, warmupNum=1, meta=None):
+    report = BenchReport(meta=meta)
+    for benchmark in self.select(labelLst):
+      report.resultLst.append(benchmark.run(repeatNum, warmupNum))
+    return report
+
+# The benchmarks of theory itself are registered by theory.test.benchmarks
+benchSuite = BenchSuite()
+
+@contextmanager
+def useTestDatabases(runner=None):
+  """
+  Run the benchmarks against the test databases set up by the runner. The
+  test databases are torn down and every connection is pointed back to the
+  database in use afterward, even if the setup or the benchmarks fail
+  halfway, because the benchmark command runs inside the live process.
+  """
+  if(runner is None):
+    from theory.test.runner import DiscoverRunner
+    runner = DiscoverRunner(verbosity=0, interactive=False)
+  oldNameDict = dict(
+      (alias, connections[alias].settingsDict["NAME"]) for alias in connections
+      )
+  oldSettingsNameDict = dict(
+      (alias, db["NAME"]) for (alias, db) in settings.DATABASES.items()
+      )
+  oldConfig = None
+  try:
+    oldConfig = runner.setupDatabases()
+    yield oldConfig
+  finally:
+    try:
+      if(oldConfig is not None):
+        runner.teardownDatabases(oldConfig)
+    finally:
+      for (alias, name) in oldSettingsNameDict.items():
+        settings.DATABASES[alias]["NAME"] = name
+      for (alias, name) in oldNameDict.items():
+        connections[alias].settingsDict["NAME"] = name
+        connections[alias].close()
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+##### System wide lib #####
+
+##### Theory lib #####
+from theory.apps.model import AppModel, Command, Parameter
+from theory.core import serializers
+from theory.core.bridge import Bridge
+from theory.core.cmdParser.txtCmdParser import TxtCmdParser
+from theory.core.loader.util import probeApps
+from theory.db import connections, DEFAULT_DB_ALIAS
+from theory.db.migrations.executor import MigrationExecutor
+from theory.test.bench import BenchSkipped, benchSuite
+
+##### Theory third-party lib #####
+
+##### Local app #####
+
+##### Theory app #####
+
+##### Misc #####
+
+# The benchmarks of theory's hot paths. They run against the test database
+# prepared by the benchmark command and probe theory's own commands and
+# models into it when needed.
+
+_PROBE_APP_LST = ["theory.apps",]
+_BULK_ROW_NUM = 500
+
+def _ensureProbed():
+  if(not Command.objects.filter(app="theory.apps").exists()):
+    probeApps(_PROBE_APP_LST)
+
+def _getAnyCmdModel():
+  _ensureProbed()
+  return Command.objects.filter(app="theory.apps").orderBy("id")[0]
+
+##### Command line #####
+
+# What the reactor parses while a pipeline is being typed
+_CMD_IN_TXT = 'listCommand(appName="all", mood="norm") ' \
+    '| modelSelect("theory.apps", "Command", verbosity=2)'
+_TYPED_CMD_IN_TXT_LST = [
+    _CMD_IN_TXT[:i] for i in xrange(1, len(_CMD_IN_TXT) + 1)
+    ]
+
+@benchSuite.register("txtCmdParser.run")
+def benchTxtCmdParserRun(state):
+  parser = TxtCmdParser()
+  for cmdInTxt in _TYPED_CMD_IN_TXT_LST:
+    parser.cmdInTxt = cmdInTxt
+    parser.run()
+
+def _setUpReactor():
+  try:
+    from theory.apps.adapter.reactorAdapter import ReactorAdapter
+    from theory.core.reactor import Reactor
+  except ImportError as e:
+    raise BenchSkipped("The gui toolkit is unavailable: %s" % e)
+  _ensureProbed()
+  # Skip __init__, it would build the terminal
+  reactor = Reactor.__new__(Reactor)
+  reactor.parser = TxtCmdParser()
+  reactor.adapter = ReactorAdapter({})
+  return reactor
+
+@benchSuite.register("reactor.autocomplete", setUpFxn=_setUpReactor)
+def benchReactorAutocomplete(reactor):
+  for frag in ("l", "list", "model", "modelTbl", "probeModule", "x"):
+    reactor._queryCommandAutocomplete(frag)
+
+##### Form #####
+
+def _getParamFormKlass():
+  from theory.apps.command.benchmark import Benchmark
+  return Benchmark.ParamForm
+
+@benchSuite.register(
+    "form.construct",
+    setUpFxn=_getParamFormKlass,
+    innerLoopNum=10
+    )
+def benchFormConstruct(paramFormKlass):
+  paramFormKlass()
+
+def _setUpFormToJson():
+  paramForm = _getParamFormKlass()()
+  paramForm.fields["benchLabelLst"].finalData = ["queryset", "form"]
+  paramForm.fields["repeatNum"].finalData = 3
+  paramForm.fields["output"].finalData = "/tmp/bench.json"
+  return paramForm
+
+@benchSuite.register(
+    "form.toJson",
+    setUpFxn=_setUpFormToJson,
+    innerLoopNum=10
+    )
+def benchFormToJson(paramForm):
+  # The validation and the json are cached by the form
+  paramForm._errors = None
+  paramForm.jsonData = None
+  paramForm.toJson()
+
+##### Bridge #####
+
+@benchSuite.register("bridge.chain", setUpFxn=_ensureProbed)
+def benchBridgeChain(state):
+  bridge = Bridge()
+  (headInst, isSuccess) = bridge.executeEzCommand(
+      "theory",
+      "listCommand",
+      [],
+      {},
+      forceSync=True
+      )
+  (adapterModel, adapter) = bridge.adaptFromCmd("StdPipe", headInst)
+  adapter.run()
+  bridge._propertiesAssign(
+      adapter,
+      bridge._dictAssign,
+      {},
+      adapterModel.propertyLst
+      )
+
+##### Loader #####
+
+@benchSuite.register("probeApps")
+def benchProbeApps(state):
+  # Probing an app again leaves the adapters of its adapter/__init__.py
+  # behind and fails on their importPath, so every run drops all probed rows
+  # as the reprobe does. The theory.apps is always probed in this way.
+  probeApps([], isDropAll=True)
+
+def _setUpMigrationPlan():
+  return connections[DEFAULT_DB_ALIAS]
+
+@benchSuite.register("migration.plan", setUpFxn=_setUpMigrationPlan)
+def benchMigrationPlan(connection):
+  executor = MigrationExecutor(connection)
+  executor.migrationPlan(executor.loader.graph.leafNodes())
+
+##### Queryset #####
+
+def _buildParameterLst(cmdModel):
+  return [
+      Parameter(
+        name="benchParam%d" % i,
+        type="str",
+        command=cmdModel,
+        comment="",
+        )
+      for i in xrange(_BULK_ROW_NUM)
+      ]
+
+def _deleteParameter(state):
+  Parameter.objects.filter(name__startswith="benchParam").delete()
+
+def _setUpQuerysetIterate():
+  cmdModel = _getAnyCmdModel()
+  Parameter.objects.bulkCreate(_buildParameterLst(cmdModel))
+  return None
+
+@benchSuite.register(
+    "queryset.iterate",
+    setUpFxn=_setUpQuerysetIterate,
+    tearDownFxn=_deleteParameter,
+    )
+def benchQuerysetIterate(state):
+  for param in Parameter.objects.filter(name__startswith="benchParam"):
+    param.name
+
+@benchSuite.register(
+    "queryset.bulkCreate",
+    setUpFxn=_getAnyCmdModel,
+    tearDownFxn=_deleteParameter,
+    )
+def benchQuerysetBulkCreate(cmdModel):
+  Parameter.objects.bulkCreate(_buildParameterLst(cmdModel))
+  _deleteParameter(None)
+
+##### Serializer #####
+
+@benchSuite.register("serializers.json", setUpFxn=_ensureProbed)
+def benchSerializersJson(state):
+  data = serializers.serialize("json", Command.objects.all())
+  list(serializers.deserialize("json", data))
+
+##### Spreadsheet #####
+
+def _setUpSpreadsheet():
+  try:
+    from theory.gui.gtk.spreadsheet import SpreadsheetBuilder
+  except ImportError as e:
+    raise BenchSkipped("The gui toolkit is unavailable: %s" % e)
+  _ensureProbed()
+
+  class HeadlessSpreadsheetBuilder(SpreadsheetBuilder):
+    def _showWidget(self, *args, **kwargs):
+      pass
+
+  appModel = AppModel.objects.filter(name="Command").first()
+  if(appModel is None):
+    raise BenchSkipped("The Command model has not been probed")
+  return (HeadlessSpreadsheetBuilder, appModel)
+
+@benchSuite.register("spreadsheet.dataModel", setUpFxn=_setUpSpreadsheet)
+def benchSpreadsheetDataModel(state):
+  (builderKlass, appModel) = state
+  builderKlass().run(list(Command.objects.all()), appModel)
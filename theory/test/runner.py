@@ -1,8 +1,11 @@
 import ipdb
 from importlib import import_module
+import itertools
+import multiprocessing
 import os
 import unittest
 from unittest import TestSuite, defaultTestLoader
+from unittest.suite import _ErrorHolder
 
 from theory.conf import settings
 from theory.core.exceptions import ImproperlyConfigured
@@ -23,7 +26,7 @@ class DiscoverRunner(object):
 
   def __init__(self, pattern=None, topLevel=None,
          verbosity=1, interactive=True, failfast=False, keepdb=False,
-         **kwargs):
+         parallel=0, **kwargs):
 
     self.pattern = pattern
     self.topLevel = topLevel
@@ -32,6 +35,7 @@ class DiscoverRunner(object):
     self.interactive = interactive
     self.failfast = failfast
     self.keepdb = keepdb
+    self.parallel = parallel
 
   @classmethod
   def addArguments(cls, parser):
@@ -44,6 +48,10 @@ class DiscoverRunner(object):
     parser.addArgument('-k', '--keepdb', action='storeTrue', dest='keepdb',
       default=False,
       help='Preserve the test DB between runs. Defaults to False')
+    parser.addArgument('--parallel', action='store', dest='parallel',
+      type=int, default=0,
+      help='Run the test cases in the given number of processes, each '
+      'one with its own clone of the test DB. Defaults to 0 (disabled)')
 
   def setupTestEnvironment(self, **kwargs):
     setupTestEnvironment()
@@ -110,10 +118,22 @@ class DiscoverRunner(object):
     for test in extraTests:
       suite.addTest(test)
 
-    return reorderSuite(suite, self.reorderBy)
+    suite = reorderSuite(suite, self.reorderBy)
+
+    if self.parallel > 1:
+      subsuiteLst = partitionSuiteByCase(suite)
+      processNum = min(self.parallel, len(subsuiteLst))
+      if processNum > 1:
+        suite = ParallelTestSuite(subsuiteLst, processNum, self.failfast)
+      # Only clone the test DB for the processes which will be started
+      self.parallel = processNum
+
+    return suite
 
   def setupDatabases(self, **kwargs):
-    return setupDatabases(self.verbosity, self.interactive, self.keepdb, **kwargs)
+    return setupDatabases(
+      self.verbosity, self.interactive, self.keepdb, self.parallel,
+      **kwargs)
 
   def runSuite(self, suite, **kwargs):
     return self.testRunner(
@@ -128,10 +148,17 @@ class DiscoverRunner(object):
     oldNames, mirrors = oldConfig
     for connection, oldName, destroy in oldNames:
       if destroy:
+        if self.parallel > 1:
+          for index in range(self.parallel):
+            connection.creation.destroyTestDb(
+                number=index + 1,
+                verbosity=self.verbosity,
+                keepdb=self.keepdb,
+                )
         connection.creation.destroyTestDb(
             oldName,
             self.verbosity,
-            #self.keepdb
+            self.keepdb
             )
 
   def teardownTestEnvironment(self, **kwargs):
@@ -265,7 +292,196 @@ def partitionSuite(suite, classes, bins):
         bins[-1].addTest(test)
 
 
-def setupDatabases(verbosity, interactive, keepdb=False, **kwargs):
+def partitionSuiteByCase(suite):
+  """
+  Splits a test suite into one suite per test case class, keeping the
+  order given by reorderSuite(), so the setUpClass() of a test case class
+  runs once in a single process.
+  """
+  suiteClass = type(suite)
+  return [
+    suiteClass(testLst)
+    for testType, testLst in itertools.groupby(iterTestCases(suite), type)
+  ]
+
+
+def iterTestCases(suite):
+  suiteClass = type(suite)
+  for test in suite:
+    if isinstance(test, suiteClass):
+      for subTest in iterTestCases(test):
+        yield subTest
+    else:
+      yield test
+
+
+class RemoteTestError(Exception):
+  """
+  Stands for an exception raised in a worker process, whose traceback has
+  been formatted before being sent to the main process.
+  """
+
+
+class RemoteTestResult(unittest.TestResult):
+  """
+  Records the outcome of the tests run in a worker process as a list of
+  picklable events, which are replayed on the real result by the main
+  process. The tests are referred by their index in the subsuite.
+  """
+
+  def __init__(self, testLst):
+    super(RemoteTestResult, self).__init__()
+    self.testIdxDict = dict((id(test), idx) for idx, test in enumerate(testLst))
+    self.eventLst = []
+
+  def _getTestKey(self, test):
+    try:
+      return self.testIdxDict[id(test)]
+    except KeyError:
+      # The error holder of setUpClass() or setUpModule()
+      return str(test)
+
+  def _addEvent(self, methodName, test, *args):
+    self.eventLst.append((methodName, self._getTestKey(test), args))
+
+  def startTest(self, test):
+    super(RemoteTestResult, self).startTest(test)
+    self._addEvent('startTest', test)
+
+  def stopTest(self, test):
+    super(RemoteTestResult, self).stopTest(test)
+    self._addEvent('stopTest', test)
+
+  def addSuccess(self, test):
+    super(RemoteTestResult, self).addSuccess(test)
+    self._addEvent('addSuccess', test)
+
+  def addError(self, test, err):
+    self._addEvent('addError', test, self._exc_info_to_string(err, test))
+    super(RemoteTestResult, self).addError(test, err)
+
+  def addFailure(self, test, err):
+    self._addEvent('addFailure', test, self._exc_info_to_string(err, test))
+    super(RemoteTestResult, self).addFailure(test, err)
+
+  def addSkip(self, test, reason):
+    super(RemoteTestResult, self).addSkip(test, reason)
+    self._addEvent('addSkip', test, reason)
+
+  def addExpectedFailure(self, test, err):
+    self._addEvent(
+      'addExpectedFailure', test, self._exc_info_to_string(err, test))
+    super(RemoteTestResult, self).addExpectedFailure(test, err)
+
+  def addUnexpectedSuccess(self, test):
+    super(RemoteTestResult, self).addUnexpectedSuccess(test)
+    self._addEvent('addUnexpectedSuccess', test)
+
+
+def replayEventLst(result, testLst, eventLst):
+  """
+  Replays the events of a RemoteTestResult on the result of the main
+  process. Returns False once the result has been asked to stop.
+  """
+  errMethodNameSet = set(['addError', 'addFailure', 'addExpectedFailure'])
+  for methodName, testKey, args in eventLst:
+    if isinstance(testKey, int):
+      test = testLst[testKey]
+    else:
+      test = _ErrorHolder(testKey)
+    if methodName in errMethodNameSet:
+      args = ((RemoteTestError, RemoteTestError(args[0]), None),)
+    getattr(result, methodName)(test, *args)
+    if result.shouldStop:
+      return False
+  return True
+
+
+# The subsuites are inherited by the forked worker processes, only their
+# index is sent through the pool.
+_subsuiteLst = []
+
+
+def _initWorker(counter):
+  """
+  Switches the connections of the worker to its own clone of the test DB.
+  """
+  with counter.get_lock():
+    counter.value += 1
+    workerId = counter.value
+
+  for alias in connections:
+    connection = connections[alias]
+    settingsDict = connection.creation.getTestDbCloneSettings(workerId)
+    if settingsDict['NAME'] != connection.settingsDict['NAME']:
+      connection.settingsDict.update(settingsDict)
+      connection.close()
+
+
+def _runSubsuite(args):
+  subsuiteIdx, failfast = args
+  subsuite = _subsuiteLst[subsuiteIdx]
+  result = RemoteTestResult(list(subsuite))
+  result.failfast = failfast
+  subsuite.run(result)
+  return subsuiteIdx, result.eventLst
+
+
+class ParallelTestSuite(TestSuite):
+  """
+  Runs a list of subsuites, usually one per test case class, in a pool of
+  processes. Each process runs its subsuites against its own clone of the
+  test DB, which must have been created by setupDatabases() beforehand.
+  """
+
+  def __init__(self, subsuiteLst, processNum, failfast=False):
+    super(ParallelTestSuite, self).__init__(subsuiteLst)
+    self.subsuiteLst = subsuiteLst
+    self.processNum = processNum
+    self.failfast = failfast
+
+  def run(self, result):
+    global _subsuiteLst
+    _subsuiteLst = self.subsuiteLst
+
+    # The workers must not share the sockets of the main process, except
+    # for an in-memory DB which is copied into the workers by the fork.
+    connections.closePools()
+    for alias in connections:
+      connection = connections[alias]
+      settingsDict = connection.creation.getTestDbCloneSettings(1)
+      if settingsDict['NAME'] != connection.settingsDict['NAME']:
+        connection.close()
+
+    counter = multiprocessing.Value('i', 0)
+    pool = multiprocessing.Pool(
+      processes=self.processNum,
+      initializer=_initWorker,
+      initargs=(counter,),
+    )
+    argsLst = [
+      (subsuiteIdx, self.failfast)
+      for subsuiteIdx in range(len(self.subsuiteLst))
+    ]
+    try:
+      for subsuiteIdx, eventLst in pool.imap_unordered(_runSubsuite, argsLst):
+        testLst = list(self.subsuiteLst[subsuiteIdx])
+        if not replayEventLst(result, testLst, eventLst):
+          pool.terminate()
+          break
+      else:
+        pool.close()
+    except:
+      pool.terminate()
+      raise
+    finally:
+      pool.join()
+      _subsuiteLst = []
+    return result
+
+
+def setupDatabases(verbosity, interactive, keepdb=False, parallel=0,
+    **kwargs):
   # First pass -- work out which databases actually need to be created,
   # and which ones are test mirrors or duplicate entries in DATABASES
   mirroredAliases = {}
@@ -309,9 +525,16 @@ def setupDatabases(verbosity, interactive, keepdb=False, **kwargs):
         testDbName = connection.creation.createTestDb(
           verbosity,
           autoclobber=not interactive,
-          #keepdb=keepdb,
+          keepdb=keepdb,
           serialize=connection.settingsDict.get("TEST_SERIALIZE", True),
         )
+        if parallel > 1:
+          for index in range(parallel):
+            connection.creation.cloneTestDb(
+              number=index + 1,
+              verbosity=verbosity,
+              keepdb=keepdb,
+            )
         destroy = True
       else:
         connection.settingsDict['NAME'] = testDbName
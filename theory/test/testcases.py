@@ -681,10 +681,11 @@ class TransactionTestCase(SimpleTestCase):
 
       raise
 
-  def _databasesNames(self, includeMirrors=True):
+  @classmethod
+  def _databasesNames(cls, includeMirrors=True):
     # If the test case has a multiDb=True flag, act on all databases,
     # including mirrors or not. Otherwise, just on the default DB.
-    if getattr(self, 'multiDb', False):
+    if getattr(cls, 'multiDb', False):
       return [alias for alias in connections
           if includeMirrors or not connections[alias].settingsDict['TEST']['MIRROR']]
     else:
@@ -753,8 +754,9 @@ class TransactionTestCase(SimpleTestCase):
       # tests (e.g., losing a timezone setting causing objects to be
       # created with the wrong time). To make sure this doesn't happen,
       # get a clean connection at the start of every test.
-      for conn in connections.all():
-        conn.close()
+      if self._shouldReloadConnections():
+        for conn in connections.all():
+          conn.close()
     finally:
       if self.availableApps is not None:
         apps.unsetAvailableApps()
@@ -763,6 +765,9 @@ class TransactionTestCase(SimpleTestCase):
                    value=settings.INSTALLED_APPS,
                    enter=False)
 
+  def _shouldReloadConnections(self):
+    return True
+
   def _fixtureTeardown(self):
     # Allow TRUNCATE ... CASCADE and don't emit the postMigrate signal
     # when flushing only a subset of the apps
@@ -828,49 +833,100 @@ class TestCase(TransactionTestCase):
   to do nothing, and rollsback the test transaction at the end of the test.
   You have to use TransactionTestCase, if you need transaction management
   inside a test.
+
+  The fixtures and the data of setUpTestData() are installed once per
+  class inside an outer transaction, and every test runs in a savepoint
+  which is rolled back at the end of the test.
   """
 
+  @classmethod
+  def _enterAtomics(cls):
+    """Helper method to open atomic blocks for multiple databases"""
+    atomics = {}
+    for dbName in cls._databasesNames():
+      atomics[dbName] = transaction.atomic(using=dbName)
+      atomics[dbName].__enter__()
+    return atomics
+
+  @classmethod
+  def _rollbackAtomics(cls, atomics):
+    """Rollback atomic blocks opened through the previous method"""
+    for dbName in reversed(cls._databasesNames()):
+      # Hack to force a rollback
+      connections[dbName].needsRollback = True
+      atomics[dbName].__exit__(None, None, None)
+
+  @classmethod
+  def _loadFixtures(cls, dbName):
+    cmd = Loaddata()
+    cmd.paramForm = cmd.ParamForm()
+    cmd.paramForm.fields["fixtureLabelLst"].finalData = cls.fixtures
+    cmd.paramForm.fields["verbosity"].finalData = 0
+    cmd.paramForm.fields["appLabel"].finalData = None
+    cmd.paramForm.fields["database"].finalData = dbName
+    # The same fixture is usually installed by many classes
+    cmd.paramForm.fields["isCacheFixture"].finalData = True
+    cmd.paramForm.isValid()
+    cmd.run()
+
+  @classmethod
+  def setUpClass(cls):
+    super(TestCase, cls).setUpClass()
+    if not connectionsSupportTransactions():
+      return
+    cls.clsAtomics = cls._enterAtomics()
+
+    if cls.fixtures:
+      for dbName in cls._databasesNames(includeMirrors=False):
+        try:
+          cls._loadFixtures(dbName)
+        except Exception:
+          cls._rollbackAtomics(cls.clsAtomics)
+          raise
+    try:
+      cls.setUpTestData()
+    except Exception:
+      cls._rollbackAtomics(cls.clsAtomics)
+      raise
+
+  @classmethod
+  def tearDownClass(cls):
+    if connectionsSupportTransactions():
+      cls._rollbackAtomics(cls.clsAtomics)
+      for conn in connections.all():
+        conn.close()
+    super(TestCase, cls).tearDownClass()
+
+  @classmethod
+  def setUpTestData(cls):
+    """Load initial data for the TestCase"""
+    pass
+
+  def _shouldReloadConnections(self):
+    if connectionsSupportTransactions():
+      return False
+    return super(TestCase, self)._shouldReloadConnections()
+
   def _fixtureSetup(self):
     if not connectionsSupportTransactions():
-      return super(TestCase, self)._fixtureSetup()
+      # If the backend does not support transactions, we should reload
+      # class data before each test, after the fixtures it may rely on
+      super(TestCase, self)._fixtureSetup()
+      self.setUpTestData()
+      return
 
     assert not self.resetSequences, 'resetSequences cannot be used on TestCase instances'
-
-    self.atomics = {}
-    for dbName in self._databasesNames():
-      self.atomics[dbName] = transaction.atomic(using=dbName)
-      self.atomics[dbName].__enter__()
+    self.atomics = self._enterAtomics()
     # Remove this when the legacy transaction management goes away.
     disableTransactionMethods()
 
-    for dbName in self._databasesNames(includeMirrors=False):
-      if self.fixtures:
-        try:
-          cmd = Loaddata()
-          cmd.paramForm = cmd.ParamForm()
-          cmd.paramForm.fields["fixtureLabelLst"].finalData = self.fixtures
-          cmd.paramForm.fields["verbosity"].finalData = 0
-          cmd.paramForm.fields["appLabel"].finalData = None
-          #cmd.paramForm.fields["appLabel"].finalData = "theory.apps"
-          cmd.paramForm.fields["database"].finalData = dbName
-          #cmd.paramForm.fields["commit"].finalData = False
-          #cmd.paramForm.fields["skipChecks"].finalData = True
-          cmd.paramForm.isValid()
-          cmd.run()
-        except Exception:
-          self._fixtureTeardown()
-          raise
-
   def _fixtureTeardown(self):
     if not connectionsSupportTransactions():
       return super(TestCase, self)._fixtureTeardown()
 
     # Remove this when the legacy transaction management goes away.
     restoreTransactionMethods()
-    for dbName in reversed(self._databasesNames()):
-      # Hack to force a rollback
-      connections[dbName].needsRollback = True
-      self.atomics[dbName].__exit__(None, None, None)
+    self._rollbackAtomics(self.atomics)
 
 
 class CheckCondition(object):
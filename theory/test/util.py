@@ -87,8 +87,12 @@ def setupTestEnvironment():
 
 def teardownTestEnvironment():
   """Perform any global post-test teardown. This involves:
+
+    - Dropping the fixtures cached by the TestCase classes.
   """
-  pass
+  from theory.apps.command.loaddata import clearFixtureCache
+
+  clearFixtureCache()
 
 def getRunner(settings, testRunnerClass=None):
   if not testRunnerClass:
@@ -364,7 +368,7 @@ class CaptureQueriesContext(object):
   def __enter__(self):
     self.useDebugCursor = self.connection.useDebugCursor
     self.connection.useDebugCursor = True
-    self.initialQueries = len(self.connection.queriesLog)
+    self.initialQueries = len(self.connection.queries)
     self.finalQueries = None
     requestStarted.disconnect(resetQueries)
     return self
@@ -374,7 +378,7 @@ class CaptureQueriesContext(object):
     requestStarted.connect(resetQueries)
     if excType is not None:
       return
-    self.finalQueries = len(self.connection.queriesLog)
+    self.finalQueries = len(self.connection.queries)
 
 
 class IgnoreDeprecationWarningsMixin(object):